@@ -0,0 +1,277 @@
+"""
+Tests for connection pooling in the database adapter layer.
+"""
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from todorama.db_adapter import (
+    SQLiteAdapter,
+    SQLiteWriteQueue,
+    ThreadLocalConnectionPool,
+    BoundedConnectionPool,
+    PooledConnection,
+)
+from todorama.exceptions import DatabaseError
+
+
+class FakeConnection:
+    """Minimal DB-API connection used to exercise the bounded pool."""
+
+    def __init__(self):
+        self.closed = False
+        self.rollbacks = 0
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def execute(self, query, params=None):
+                if conn.closed:
+                    raise RuntimeError("connection closed")
+
+            def fetchone(self):
+                return (1,)
+
+            def close(self):
+                pass
+
+        return _Cursor()
+
+    def rollback(self):
+        if self.closed:
+            raise RuntimeError("connection closed")
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sqlite_adapter(tmp_path):
+    """SQLite adapter with pooling enabled."""
+    adapter = SQLiteAdapter(str(tmp_path / "pool.db"))
+    yield adapter
+    adapter.dispose()
+
+
+def test_sqlite_connection_reused_on_same_thread(sqlite_adapter):
+    """Closing a pooled SQLite connection keeps it open for the next borrower."""
+    conn = sqlite_adapter.connect()
+    assert isinstance(conn, PooledConnection)
+    raw = conn.raw_connection
+    sqlite_adapter.close(conn)
+
+    conn = sqlite_adapter.connect()
+    assert conn.raw_connection is raw
+    conn.close()
+
+    metrics = sqlite_adapter.get_pool_metrics()
+    assert metrics["connections_created"] == 1
+    assert metrics["reused"] == 1
+    assert metrics["in_use"] == 0
+    assert metrics["idle"] == 1
+
+
+def test_sqlite_pooled_connection_keeps_pragmas_and_row_factory(sqlite_adapter):
+    """Pooled connections are configured once and behave like the raw connection."""
+    conn = sqlite_adapter.connect()
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA foreign_keys")
+    assert cursor.fetchone()[0] == 1
+    cursor.execute("SELECT 1 AS one")
+    assert cursor.fetchone()["one"] == 1
+    conn.close()
+
+
+def test_sqlite_nested_borrows_get_separate_connections(sqlite_adapter):
+    """A second borrow while the first is out must not share its transaction."""
+    outer = sqlite_adapter.connect()
+    inner = sqlite_adapter.connect()
+    assert outer.raw_connection is not inner.raw_connection
+    inner.close()
+    outer.close()
+
+
+def test_sqlite_uncommitted_work_rolled_back_on_release(sqlite_adapter):
+    """Work left uncommitted by a borrower does not leak to the next one."""
+    conn = sqlite_adapter.connect()
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    conn.commit()
+    conn.execute("INSERT INTO items (id) VALUES (1)")
+    conn.close()
+
+    conn = sqlite_adapter.connect()
+    assert conn.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 0
+    conn.close()
+
+
+def test_sqlite_connections_are_per_thread(sqlite_adapter):
+    """Each thread gets its own persistent connection."""
+    raws = []
+
+    def borrow():
+        conn = sqlite_adapter.connect()
+        raws.append(conn.raw_connection)
+        conn.close()
+
+    borrow()
+    worker = threading.Thread(target=borrow)
+    worker.start()
+    worker.join()
+
+    assert len(raws) == 2
+    assert raws[0] is not raws[1]
+
+
+def test_broken_connection_replaced_by_health_check(tmp_path):
+    """A connection that fails its health check is discarded and replaced."""
+    pool = ThreadLocalConnectionPool(
+        lambda: sqlite3.connect(str(tmp_path / "health.db")),
+        health_check_interval=0
+    )
+    conn = pool.acquire()
+    raw = conn.raw_connection
+    conn.close()
+    raw.close()
+
+    conn = pool.acquire()
+    assert conn.raw_connection is not raw
+    conn.execute("SELECT 1")
+    conn.close()
+    assert pool.get_metrics()["health_check_failures"] == 1
+
+
+def test_connection_recycled_after_max_lifetime(tmp_path):
+    """Connections older than max_lifetime are closed and reopened."""
+    pool = ThreadLocalConnectionPool(
+        lambda: sqlite3.connect(str(tmp_path / "recycle.db")),
+        max_lifetime=0.01
+    )
+    conn = pool.acquire()
+    raw = conn.raw_connection
+    conn.close()
+    time.sleep(0.02)
+
+    conn = pool.acquire()
+    assert conn.raw_connection is not raw
+    conn.close()
+    assert pool.get_metrics()["recycled"] == 1
+
+
+def test_bounded_pool_reuses_and_caps_connections():
+    """The bounded pool never opens more than pool_size + max_overflow connections."""
+    created = []
+
+    def factory():
+        created.append(FakeConnection())
+        return created[-1]
+
+    pool = BoundedConnectionPool(factory, pool_size=1, max_overflow=1, timeout=0.05)
+    first = pool.acquire()
+    second = pool.acquire()
+
+    with pytest.raises(DatabaseError):
+        pool.acquire()
+
+    first.close()
+    third = pool.acquire()
+    assert third.raw_connection is created[0]
+    assert len(created) == 2
+
+    second.close()
+    third.close()
+    metrics = pool.get_metrics()
+    assert metrics["timeouts"] == 1
+    assert metrics["open"] == 1  # overflow connection closed on release
+    assert metrics["idle"] == 1
+    assert sum(conn.closed for conn in created) == 1
+
+
+def test_bounded_pool_waiter_gets_released_connection():
+    """A thread waiting on an exhausted pool is woken when a connection is returned."""
+    pool = BoundedConnectionPool(FakeConnection, pool_size=1, max_overflow=0, timeout=5)
+    held = pool.acquire()
+    acquired = []
+
+    def waiter():
+        conn = pool.acquire()
+        acquired.append(conn.raw_connection)
+        conn.close()
+
+    worker = threading.Thread(target=waiter)
+    worker.start()
+    time.sleep(0.05)
+    raw = held.raw_connection
+    held.close()
+    worker.join(timeout=5)
+
+    assert acquired == [raw]
+    assert pool.get_metrics()["waits"] == 1
+
+
+def test_pooling_can_be_disabled(tmp_path):
+    """With pooling disabled the adapter hands out plain driver connections."""
+    adapter = SQLiteAdapter(str(tmp_path / "nopool.db"), pool_enabled=False)
+    conn = adapter.connect()
+    assert isinstance(conn, sqlite3.Connection)
+    adapter.close(conn)
+    assert adapter.get_pool_metrics() is None
+
+
+def test_sqlite_performance_profile_applied(sqlite_adapter):
+    """New SQLite connections use WAL and the configured pragmas."""
+    conn = sqlite_adapter.connect()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+        assert conn.execute("PRAGMA cache_size").fetchone()[0] == -64000
+    finally:
+        conn.close()
+
+
+def test_sqlite_invalid_pragma_rejected(tmp_path):
+    """Pragma values are validated before being interpolated into SQL."""
+    with pytest.raises(ValueError):
+        SQLiteAdapter(str(tmp_path / "bad.db"), journal_mode="wal; DROP TABLE tasks")
+
+
+def test_write_queue_admits_writers_in_order():
+    """Writers queue up in arrival order and only one holds the queue at a time."""
+    queue = SQLiteWriteQueue()
+    order = []
+    queue.acquire()
+
+    def writer(index):
+        with queue:
+            order.append(index)
+
+    threads = []
+    for index in range(3):
+        thread = threading.Thread(target=writer, args=(index,))
+        thread.start()
+        threads.append(thread)
+        # Wait until the writer is queued before starting the next one
+        while queue.get_metrics()["queue_length"] < index + 1:
+            time.sleep(0.001)
+    queue.release()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == [0, 1, 2]
+    metrics = queue.get_metrics()
+    assert metrics["writes"] == 4
+    assert metrics["waits"] == 3
+    assert metrics["max_queue_length"] == 3
+
+
+def test_write_queue_is_reentrant():
+    """The active writer can enter the queue again without deadlocking."""
+    queue = SQLiteWriteQueue()
+    with queue:
+        with queue:
+            pass
+    assert queue.get_metrics()["writes"] == 1
@@ -1438,3 +1438,22 @@ class TestConversationSharing:
         # Share should be gone (cascade delete)
         share = storage.get_share(share_id)
         assert share is None
+
+
+def test_storage_never_opens_a_dsn_with_sqlite(tmp_path, monkeypatch):
+    """Test the adapter follows the connection string, so SQLite never creates a file named after a DSN."""
+    from todorama.db_adapter import PostgreSQLAdapter, SQLiteAdapter, get_database_adapter
+    
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("DB_TYPE", raising=False)
+    monkeypatch.setenv("CONVERSATIONS_DB_PATH", str(tmp_path / "conversations.db"))
+    storage = ConversationStorage()
+    assert storage.db_type == "sqlite"
+    assert isinstance(storage.adapter, SQLiteAdapter)
+    assert storage.db_path == str(tmp_path / "conversations.db")
+    
+    dsn = "host=localhost port=5432 dbname=conversations user=postgres"
+    assert isinstance(get_database_adapter(dsn), PostgreSQLAdapter)
+    with pytest.raises(ValueError):
+        get_database_adapter(dsn, db_type="sqlite")
+    assert all(name.startswith("conversations.db") for name in os.listdir(tmp_path))
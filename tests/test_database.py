@@ -4,9 +4,11 @@ Tests for database operations.
 import pytest
 import sqlite3
 import os
+import time
 import tempfile
 import shutil
 from pathlib import Path
+from unittest.mock import patch
 
 import sys
 # Package is now at top level, no sys.path.insert needed
@@ -349,6 +351,92 @@ def test_prevent_circular_blocking_dependency(temp_db):
         db.create_relationship(task_b_id, task_a_id, "blocking", "test-agent")
 
 
+def test_circular_dependency_reports_cycle_path_in_deep_chain(temp_db):
+    """Test that cycles are found across a long chain and the error names the cycle."""
+    db, _ = temp_db
+    task_ids = [
+        db.create_task(
+            title=f"Task {i}",
+            task_type="concrete",
+            task_instruction="Do something",
+            verification_instruction="Check it works",
+            agent_id="test-agent"
+        )
+        for i in range(60)
+    ]
+    for blocked_id, blocker_id in zip(task_ids, task_ids[1:]):
+        db.create_relationship(blocked_id, blocker_id, "blocked_by", "test-agent")
+    
+    expected_cycle = " -> ".join(str(task_id) for task_id in task_ids + [task_ids[0]])
+    with pytest.raises(ValueError, match="(?i)circular dependency") as exc_info:
+        db.create_relationship(task_ids[-1], task_ids[0], "blocked_by", "test-agent")
+    assert f"(cycle: {expected_cycle})" in str(exc_info.value)
+
+
+def test_circular_dependency_check_is_linear_on_dense_graphs(temp_db):
+    """Test the cycle check does not enumerate paths on a ladder of blocking relationships."""
+    db, _ = temp_db
+    task_ids = [
+        db.create_task(
+            title=f"Task {i}",
+            task_type="concrete",
+            task_instruction="Do something",
+            verification_instruction="Check it works",
+            agent_id="test-agent"
+        )
+        for i in range(60)
+    ]
+    # Task i is blocked by i+1 and i+2, so the number of paths grows exponentially.
+    # Written directly: create_relationship already treats such diamonds as cycles.
+    conn = db._get_connection()
+    try:
+        for i, blocked_id in enumerate(task_ids):
+            for blocker_id in task_ids[i + 1:i + 3]:
+                conn.execute(
+                    "INSERT INTO task_relationships (parent_task_id, child_task_id, relationship_type) "
+                    "VALUES (?, ?, 'blocked_by')",
+                    (blocked_id, blocker_id)
+                )
+        conn.commit()
+    finally:
+        conn.close()
+    
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="(?i)circular dependency") as exc_info:
+        db.create_relationship(task_ids[-1], task_ids[0], "blocked_by", "test-agent")
+    assert time.perf_counter() - start < 10
+    
+    # The reported cycle is a shortest path through the ladder
+    cycle = [int(task_id) for task_id in str(exc_info.value).split("(cycle: ")[1].rstrip(").").split(" -> ")]
+    assert cycle[0] == cycle[-1] == task_ids[0]
+    assert len(cycle) == 32
+
+
+def test_check_circular_dependencies_batch(temp_db):
+    """Test batch validation against existing relationships and earlier edges in the batch."""
+    db, _ = temp_db
+    a, b, c, d = [
+        db.create_task(
+            title=f"Task {name}",
+            task_type="concrete",
+            task_instruction="Do something",
+            verification_instruction="Check it works",
+            agent_id="test-agent"
+        )
+        for name in "ABCD"
+    ]
+    db.create_relationship(a, b, "blocked_by", "test-agent")
+    
+    results = db.check_circular_dependencies([
+        (b, a, "blocked_by"),   # closes a cycle with the existing A blocked_by B
+        (c, d, "blocking"),     # fine
+        (d, c, "blocking"),     # closes a cycle with the previous edge in the batch
+        (a, c, "subtask"),      # non-blocking types are never cycles
+        (b, c, "blocked_by"),   # fine
+    ])
+    assert results == [[a, b, a], None, [d, c, d], None, None]
+
+
 def test_allow_non_blocking_relationships_to_reuse_tasks(temp_db):
     """Test that non-blocking relationship types (subtask, related) can reuse tasks without circular checks."""
     db, _ = temp_db
@@ -1313,22 +1401,22 @@ def test_search_tasks_ranks_by_relevance(temp_db):
         verification_instruction="Verify schema",
         agent_id="test-agent"
     )
+    # Created last, so it would come first if ranking fell back to recency
     task3_id = db.create_task(
-        title="API documentation",
+        title="Schema migration",
         task_type="concrete",
-        task_instruction="Write API documentation",
+        task_instruction="Write the migration scripts",
         verification_instruction="Verify docs",
-        agent_id="test-agent"
+        agent_id="test-agent",
+        notes="Mention the API change in the changelog"
     )
     
-    # Search for "API" - task1 should rank highest (multiple mentions)
+    # Search for "API" - task1 should rank highest (title and text match, not only the notes)
     results = db.search_tasks("API")
     # Filter to only our test tasks (test isolation)
     our_task_ids = {task1_id, task2_id, task3_id}
     our_results = [r for r in results if r["id"] in our_task_ids]
-    assert len(our_results) >= 2  # Should find task1 and task3
-    # First result should be task1 (most relevant)
-    assert our_results[0]["id"] == task1_id
+    assert [r["id"] for r in our_results] == [task1_id, task3_id]
 
 
 def test_search_tasks_with_special_characters(temp_db):
@@ -2107,6 +2195,286 @@ def test_get_available_tasks_for_agent_excludes_blocked_parents(temp_db):
     assert parent_id not in available_ids
 
 
+def test_claim_next_task_locks_oldest_available_task(temp_db):
+    """Test that claim_next_task picks the oldest claimable task and locks it."""
+    db, _ = temp_db
+    epic_id = db.create_task(
+        title="Epic",
+        task_type="epic",
+        task_instruction="Break down",
+        verification_instruction="Broken down",
+        agent_id="test-agent"
+    )
+    first_id = db.create_task(
+        title="First",
+        task_type="concrete",
+        task_instruction="Do first",
+        verification_instruction="First done",
+        agent_id="test-agent"
+    )
+    second_id = db.create_task(
+        title="Second",
+        task_type="concrete",
+        task_instruction="Do second",
+        verification_instruction="Second done",
+        agent_id="test-agent"
+    )
+    
+    task = db.claim_next_task("implementation", "agent-1")
+    assert task["id"] == first_id
+    assert task["task_status"] == "in_progress"
+    assert task["assigned_agent"] == "agent-1"
+    assert task["started_at"] is not None
+    
+    history = db.get_change_history(first_id)
+    assert any(h["change_type"] == "locked" and h["old_value"] == "available" for h in history)
+    
+    assert db.claim_next_task("implementation", "agent-2")["id"] == second_id
+    assert db.claim_next_task("implementation", "agent-3") is None
+    assert db.claim_next_task("breakdown", "agent-4")["id"] == epic_id
+    assert db.claim_next_task("unknown", "agent-5") is None
+
+
+def test_claim_next_task_skips_blocked_tasks(temp_db):
+    """Test that claim_next_task skips blocked_by tasks and parents of blocked subtasks."""
+    db, _ = temp_db
+    parent_id = db.create_task(
+        title="Parent Task",
+        task_type="abstract",
+        task_instruction="Complete all subtasks",
+        verification_instruction="All subtasks complete",
+        agent_id="test-agent"
+    )
+    subtask_id = db.create_task(
+        title="Subtask",
+        task_type="concrete",
+        task_instruction="Do step",
+        verification_instruction="Step done",
+        agent_id="test-agent"
+    )
+    blocked_id = db.create_task(
+        title="Blocked",
+        task_type="concrete",
+        task_instruction="Wait",
+        verification_instruction="Waited",
+        agent_id="test-agent"
+    )
+    free_id = db.create_task(
+        title="Free",
+        task_type="concrete",
+        task_instruction="Do it",
+        verification_instruction="Done",
+        agent_id="test-agent"
+    )
+    db.create_relationship(parent_id, subtask_id, "subtask", "test-agent")
+    db.create_relationship(blocked_id, subtask_id, "blocked_by", "test-agent")
+    
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE tasks SET task_status = 'blocked' WHERE id = ?", (subtask_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    
+    available_ids = [t["id"] for t in db.get_available_tasks_for_agent("implementation")]
+    assert available_ids == [free_id]
+    assert db.claim_next_task("breakdown", "agent-1") is None
+    assert db.claim_next_task("implementation", "agent-1")["id"] == free_id
+    assert db.claim_next_task("implementation", "agent-2") is None
+
+
+def test_claim_next_task_concurrent_agents_claim_each_task_once(temp_db):
+    """Test that concurrent agents never claim the same task."""
+    import threading
+    
+    db, _ = temp_db
+    task_ids = [
+        db.create_task(
+            title=f"Task {i}",
+            task_type="concrete",
+            task_instruction="Do something",
+            verification_instruction="Check it works",
+            agent_id="test-agent"
+        )
+        for i in range(20)
+    ]
+    claimed = []
+    lock = threading.Lock()
+    
+    def agent(agent_index):
+        while True:
+            task = db.claim_next_task("implementation", f"agent-{agent_index}")
+            if task is None:
+                return
+            with lock:
+                claimed.append(task["id"])
+    
+    threads = [threading.Thread(target=agent, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=30)
+    
+    assert sorted(claimed) == sorted(task_ids)
+
+
+def test_blocked_index_tracks_hierarchy_and_status_changes(temp_db):
+    """Test that the blocked ancestor index follows relationship and status changes."""
+    db, _ = temp_db
+    ids = [
+        db.create_task(
+            title=f"Level {level}",
+            task_type="abstract" if level < 3 else "concrete",
+            task_instruction="Do something",
+            verification_instruction="Check it works",
+            agent_id="test-agent"
+        )
+        for level in range(4)
+    ]
+    for parent_id, child_id in zip(ids, ids[1:]):
+        db.create_relationship(parent_id, child_id, "subtask", "test-agent")
+    
+    assert db._find_tasks_with_blocked_subtasks_batch(ids) == set()
+    
+    def set_status(task_id, status):
+        conn = db._get_connection()
+        try:
+            conn.execute("UPDATE tasks SET task_status = ? WHERE id = ?", (status, task_id))
+            conn.commit()
+        finally:
+            conn.close()
+    
+    def blocked_ids():
+        return {task["id"] for task in db.query_tasks(task_status="blocked")}
+    
+    assert blocked_ids() == set()
+    
+    # Status written outside TodoDatabase is still picked up
+    set_status(ids[3], "blocked")
+    assert db._find_tasks_with_blocked_subtasks_batch(ids) == set(ids[:3])
+    assert db.get_task(ids[0])["task_status"] == "blocked"
+    assert blocked_ids() == set(ids)
+    
+    # A new branch under a blocked ancestor is reflected on the next read
+    other_id = db.create_task(
+        title="Other root",
+        task_type="abstract",
+        task_instruction="Do something",
+        verification_instruction="Check it works",
+        agent_id="test-agent"
+    )
+    db.create_relationship(other_id, ids[2], "subtask", "test-agent")
+    assert db.get_task(other_id)["task_status"] == "blocked"
+    assert other_id in blocked_ids()
+    
+    set_status(ids[3], "available")
+    assert db._find_tasks_with_blocked_subtasks_batch(ids + [other_id]) == set()
+    assert db.get_task(ids[0])["task_status"] == "available"
+    assert blocked_ids() == set()
+    assert db.verify_blocked_index()["consistent"] is True
+    
+    # Changes arrive through the feed; the hierarchy was loaded only once
+    metrics = db._blocked_index.get_metrics()
+    assert metrics["hierarchy_loads"] == 1
+    assert metrics["feed_entries"] >= 3
+
+
+def test_blocked_index_verify_and_rebuild(temp_db):
+    """Test that verify detects a stale index and rebuild repairs it."""
+    db, _ = temp_db
+    parent_id = db.create_task(
+        title="Parent",
+        task_type="abstract",
+        task_instruction="Do something",
+        verification_instruction="Check it works",
+        agent_id="test-agent"
+    )
+    child_id = db.create_task(
+        title="Child",
+        task_type="concrete",
+        task_instruction="Do something",
+        verification_instruction="Check it works",
+        agent_id="test-agent"
+    )
+    db.create_relationship(parent_id, child_id, "subtask", "test-agent")
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE tasks SET task_status = 'blocked' WHERE id = ?", (child_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    
+    result = db.verify_blocked_index()
+    assert result == {"consistent": True, "blocked_ancestors": 1, "missing": [], "unexpected": []}
+    
+    # Corrupt the in-memory index while keeping its feed position
+    db._blocked_index._parents = {}
+    db._blocked_index._blocked = set()
+    db._blocked_index._ancestors = frozenset()
+    result = db.verify_blocked_index()
+    assert result["consistent"] is False
+    assert result["missing"] == [parent_id]
+    
+    metrics = db.rebuild_blocked_index()
+    assert metrics["blocked_ancestors"] == 1
+    assert db.verify_blocked_index()["consistent"] is True
+
+
+def test_blocked_filters_join_staged_ancestors(temp_db):
+    """Test that SQL filters on blocked ancestors scale past the variable limit and restage only on change."""
+    db, _ = temp_db
+    conn = db._get_connection()
+    try:
+        # A chain of 1200 epics over one blocked concrete task
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO tasks (title, task_type, task_instruction, verification_instruction)
+            VALUES (?, 'epic', 'Do something', 'Check it works')
+        """, [(f"Epic {i}",) for i in range(1200)])
+        cursor.execute("""
+            INSERT INTO tasks (title, task_type, task_instruction, verification_instruction, task_status)
+            VALUES ('Leaf', 'concrete', 'Do something', 'Check it works', 'blocked')
+        """)
+        cursor.execute("SELECT id FROM tasks ORDER BY id")
+        ids = [row["id"] for row in cursor.fetchall()]
+        cursor.executemany("""
+            INSERT INTO task_relationships (parent_task_id, child_task_id, relationship_type)
+            VALUES (?, ?, 'subtask')
+        """, list(zip(ids, ids[1:])))
+        conn.commit()
+    finally:
+        db.adapter.close(conn)
+    free_id = db.create_task(
+        title="Free epic",
+        task_type="epic",
+        task_instruction="Do something",
+        verification_instruction="Check it works",
+        agent_id="test-agent"
+    )
+
+    blocked = db.query_tasks(task_status="blocked", limit=1000)
+    assert len(blocked) == 1000
+    assert all(task["task_status"] == "blocked" for task in blocked)
+    assert [task["id"] for task in db.get_available_tasks_for_agent("breakdown", limit=5)] == [free_id]
+    assert db.claim_next_task("breakdown", "agent-1")["id"] == free_id
+    assert db.claim_next_task("breakdown", "agent-2") is None
+
+    conn = db._get_connection()
+    try:
+        db._stage_blocked_ancestors(conn)
+        stagings = db._blocked_index.get_metrics()["stagings"]
+        db._stage_blocked_ancestors(conn)
+        assert db._blocked_index.get_metrics()["stagings"] == stagings
+
+        conn.execute("UPDATE tasks SET task_status = 'available' WHERE id = ?", (ids[-1],))
+        conn.commit()
+        db._stage_blocked_ancestors(conn)
+        assert db._blocked_index.get_metrics()["stagings"] == stagings + 1
+        assert conn.execute("SELECT COUNT(*) FROM blocked_ancestor_ids").fetchone()[0] == 0
+    finally:
+        db.adapter.close(conn)
+
+
 def test_get_activity_feed(temp_db):
     """Test getting activity feed for a task."""
     db, _ = temp_db
@@ -2629,6 +2997,88 @@ def test_update_api_key_last_used(temp_db):
     assert key_info["last_used_at"] is not None
 
 
+def test_authenticate_api_key_cached_until_revoked(temp_db):
+    """Test that authentication lookups are cached and revoking a key drops the entry."""
+    db, _ = temp_db
+    org_id = db.create_organization("Test Org")
+    project_id = db.create_project("Test Project", "/test/path", organization_id=org_id)
+    key_id, full_key = db.create_api_key(project_id, "Test Key")
+    key_hash = db._hash_api_key(full_key)
+    
+    key_info = db.authenticate_api_key(key_hash)
+    assert key_info["id"] == key_id
+    assert key_info["enabled"] == 1
+    assert key_info["is_admin"] is False
+    
+    # Second lookup is served from memory
+    with patch.object(db, "_get_connection", side_effect=AssertionError("cache miss")):
+        assert db.authenticate_api_key(key_hash)["id"] == key_id
+    assert db._api_key_cache.get_metrics()["hits"] == 1
+    
+    db.revoke_api_key(key_id)
+    assert db.authenticate_api_key(key_hash)["enabled"] == 0
+    
+    # Unknown keys are not cached
+    assert db.authenticate_api_key(db._hash_api_key("unknown")) is None
+    assert db._api_key_cache.get_metrics()["entries"] == 1
+
+
+def test_record_api_key_use_batches_writes(temp_db):
+    """Test that API key usage is buffered and written in one batch."""
+    db, _ = temp_db
+    org_id = db.create_organization("Test Org")
+    project_id = db.create_project("Test Project", "/test/path", organization_id=org_id)
+    key1_id, key1 = db.create_api_key(project_id, "Key 1")
+    key2_id, key2 = db.create_api_key(project_id, "Key 2")
+    db._api_key_usage.flush_interval = 3600
+    
+    for _ in range(5):
+        db.record_api_key_use(key1_id)
+    db.record_api_key_use(key2_id)
+    assert len(db._api_key_usage) == 2
+    
+    # Reads flush pending usage first
+    keys = db.list_api_keys(project_id)
+    assert all(key["last_used_at"] is not None for key in keys)
+    assert len(db._api_key_usage) == 0
+    assert db.flush_api_key_usage() == 0
+
+
+def test_session_cache_invalidated_on_expire(temp_db):
+    """Test that session lookups are cached and expiring a session drops the entry."""
+    db, _ = temp_db
+    user_id = db.create_user("alice", "alice@example.com", "password123")
+    token, _ = db.create_session(user_id)
+    
+    session = db.get_session_by_token(token)
+    assert session["user_id"] == user_id
+    
+    # Second lookup is served from memory
+    with patch.object(db, "_get_connection", side_effect=AssertionError("cache miss")):
+        assert db.get_session_by_token(token)["user_id"] == user_id
+    assert db._session_cache.get_metrics()["hits"] == 1
+    
+    assert db.expire_session(token) is True
+    assert db.get_session_by_token(token) is None
+
+
+def test_clean_expired_sessions_in_batches(temp_db):
+    """Test that expired sessions are deleted in bounded batches."""
+    db, _ = temp_db
+    user_id = db.create_user("bob", "bob@example.com", "password123")
+    for _ in range(5):
+        db.create_session(user_id, expires_hours=-48)
+    active_token, _ = db.create_session(user_id)
+    
+    with patch.object(db, "_write_transaction", wraps=db._write_transaction) as write_transaction:
+        assert db.clean_expired_sessions(batch_size=2) == 5
+    # Batches of 2, 2 and 1
+    assert write_transaction.call_count == 3
+    
+    assert db.get_session_by_token(active_token) is not None
+    assert db.clean_expired_sessions(batch_size=2) == 0
+
+
 def test_api_key_different_projects(temp_db):
     """Test that API keys are scoped to projects."""
     db, _ = temp_db
@@ -3400,6 +3850,35 @@ def test_unlock_stale_tasks(temp_db):
     assert task["assigned_agent"] is None
 
 
+def test_stale_check_agrees_with_isoformat_updated_at(temp_db):
+    """Test isoformat() updated_at values are stored in CURRENT_TIMESTAMP form, so the stale cutoff sees them."""
+    from datetime import datetime, timedelta
+    
+    db, _ = temp_db
+    if db.db_type != "sqlite":
+        pytest.skip("updated_at is a TIMESTAMP column on PostgreSQL")
+    
+    task_id = db.create_task(
+        title="Stale ISO Task",
+        task_type="concrete",
+        task_instruction="Test",
+        verification_instruction="Verify",
+        agent_id="test-agent"
+    )
+    db.lock_task(task_id, "agent-1")
+    # Same calendar day as the cutoff: as raw text the 'T' form sorts after it
+    old_time = datetime.utcnow() - timedelta(hours=1, minutes=1)
+    with db._write_transaction() as conn:
+        conn.cursor().execute(
+            "UPDATE tasks SET updated_at = ? WHERE id = ?",
+            (old_time.isoformat() + "+00:00", task_id)
+        )
+    
+    assert db.get_task(task_id)["updated_at"] == old_time.strftime("%Y-%m-%d %H:%M:%S")
+    assert [task["id"] for task in db.get_stale_tasks(hours=1)] == [task_id]
+    assert db.unlock_stale_tasks(hours=1) == 1
+
+
 def test_record_agent_experience(temp_db):
     """Test recording agent experience for a completed task."""
     db, _ = temp_db
@@ -3557,3 +4036,719 @@ def test_get_agent_learning_stats(temp_db):
     assert stats["success_rate"] == pytest.approx(2.0 / 3.0)
     # avg_execution_time is rounded to 2 decimal places in the function
     assert stats["avg_execution_time"] == pytest.approx((1.0 + 2.0 + 0.5) / 3.0, abs=0.01)
+
+
+def test_task_statistics_single_grouped_pass(temp_db):
+    """Test that analytics are derived from one grouped query and can be cached."""
+    db, _ = temp_db
+    task_ids = []
+    for i, task_type in enumerate(["concrete", "concrete", "abstract", "epic"]):
+        task_ids.append(db.create_task(
+            title=f"Task {i}",
+            task_type=task_type,
+            task_instruction="Do it",
+            verification_instruction="Verify it",
+            agent_id="agent-1"
+        ))
+    db.lock_task(task_ids[0], "agent-1")
+    db.complete_task(task_ids[0], "agent-1")
+    db.lock_task(task_ids[2], "agent-1")
+    
+    with patch.object(db, "_execute_with_logging", wraps=db._execute_with_logging) as execute:
+        stats = db.get_task_statistics()
+    assert execute.call_count == 1
+    assert stats["total"] == 4
+    assert stats["by_status"] == {"available": 2, "in_progress": 1, "complete": 1, "blocked": 0, "cancelled": 0}
+    assert stats["by_type"] == {"concrete": 2, "abstract": 1, "epic": 1}
+    assert stats["completion_rate"] == 25.0
+    
+    rates = db.get_completion_rates(task_type="concrete")
+    assert rates["total_tasks"] == 2
+    assert rates["completed_tasks"] == 1
+    assert rates["tasks_by_type"] == {"concrete": {"total": 2, "completed": 1, "completion_percentage": 50.0}}
+    
+    # With a TTL, repeated date-filtered polls with the same filters reuse the grouped rows
+    db._aggregate_cache.ttl = 60
+    db.get_task_statistics(start_date="2000-01-01")
+    with patch.object(db, "_execute_with_logging", side_effect=AssertionError("cache miss")):
+        assert db.get_task_statistics(start_date="2000-01-01")["total"] == 4
+
+
+def test_task_counters_follow_writes_and_reconcile(temp_db):
+    """Test that task_counters tracks every write path and can be rebuilt."""
+    db, _ = temp_db
+    assert db._task_counters
+    org_id = db.create_organization("Counters Org")
+    project_id = db.create_project("counters", "/tmp/counters", organization_id=org_id)
+    task_ids = [
+        db.create_task(
+            title=f"Task {i}",
+            task_type="concrete",
+            task_instruction="Do it",
+            verification_instruction="Verify it",
+            agent_id="agent-1",
+            project_id=project_id if i < 2 else None,
+            priority="high" if i == 0 else None
+        )
+        for i in range(4)
+    ]
+    db.lock_task(task_ids[0], "agent-1")
+    db.complete_task(task_ids[0], "agent-1")
+    db.bulk_update_status(task_ids[1:3], "blocked", "agent-1")
+    db.bulk_delete_tasks([task_ids[3]])
+    
+    # Statistics come from the rollup, not a scan of tasks
+    with patch.object(db, "_execute_with_logging", wraps=db._execute_with_logging) as execute:
+        stats = db.get_task_statistics()
+    assert "task_counters" in execute.call_args[0][1]
+    assert stats["total"] == 3
+    assert stats["by_status"]["complete"] == 1
+    assert stats["by_status"]["blocked"] == 2
+    assert stats["by_project"] == {project_id: 2, None: 1}
+    assert db.get_completion_rates(project_id=project_id)["completed_tasks"] == 1
+    assert db.get_system_status()["tasks"] == {"total": 3, "available": 0, "in_progress": 0, "complete": 1}
+    
+    # Drift is repaired by reconciling
+    conn = db._get_connection()
+    conn.execute("UPDATE task_counters SET task_count = task_count + 5")
+    conn.commit()
+    db.adapter.close(conn)
+    assert db.get_task_statistics()["total"] != 3
+    result = db.reconcile_task_counters()
+    assert result["total"] == 3
+    assert result["corrected"] > 0
+    assert db.get_task_statistics() == stats
+    assert db.reconcile_task_counters()["corrected"] == 0
+
+
+def test_query_tasks_keyset_pagination(temp_db):
+    """Test that cursor pages cover every task exactly once, including created_at ties."""
+    db, _ = temp_db
+    task_ids = [
+        db.create_task(
+            title=f"Task {i}",
+            task_type="concrete",
+            task_instruction="Do it",
+            verification_instruction="Verify it",
+            agent_id="agent-1",
+            priority=["low", "medium", "high", "critical"][i % 4]
+        )
+        for i in range(7)
+    ]
+    # Tasks created in the same second tie on created_at and are ordered by id
+    for order_by in (None, "created_at_asc", "priority", "priority_asc"):
+        expected = [task["id"] for task in db.query_tasks(order_by=order_by, limit=100)]
+        assert sorted(expected) == sorted(task_ids)
+        seen = []
+        cursor = None
+        while True:
+            page = db.query_tasks_page(order_by=order_by, limit=3, after=cursor)
+            seen.extend(task["id"] for task in page["tasks"])
+            cursor = page["next_cursor"]
+            assert page["has_more"] == (cursor is not None)
+            if not cursor:
+                break
+        assert seen == expected, order_by
+    
+    first = db.query_tasks_page(limit=3)
+    with pytest.raises(ValueError):
+        db.query_tasks_page(order_by="priority", after=first["next_cursor"])
+    with pytest.raises(ValueError):
+        db.query_tasks_page(after="not-a-cursor")
+    
+    history = db.get_change_history_page(limit=4)
+    rest = db.get_change_history(limit=100, after=history["next_cursor"])
+    assert [h["id"] for h in history["history"] + rest] == [h["id"] for h in db.get_change_history(limit=100)]
+
+
+def test_export_tasks_streams_batched_chunks(temp_db):
+    """Test that exports read relationships and tags per chunk, not per task."""
+    import csv
+    import io
+    import json
+    from todorama.services.export_service import ExportService
+    
+    db, _ = temp_db
+    task_ids = [
+        db.create_task(
+            title=f"Task {i}",
+            task_type="concrete",
+            task_instruction="Do it",
+            verification_instruction="Verify it",
+            agent_id="agent-1"
+        )
+        for i in range(5)
+    ]
+    db.create_relationship(task_ids[0], task_ids[4], "subtask", "agent-1")
+    tag_id = db.create_tag("export")
+    db.assign_tag_to_task(task_ids[1], tag_id)
+    
+    with patch.object(db, "_execute_with_logging", wraps=db._execute_with_logging) as execute:
+        chunks = list(db.iter_export_tasks(chunk_size=2))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    # One task query plus one relationship and one tag query per chunk
+    assert execute.call_count == 9
+    
+    tasks = {task["id"]: task for chunk in chunks for task in chunk}
+    assert [t["id"] for c in chunks for t in c] == [t["id"] for t in db.query_tasks(limit=100)]
+    assert tasks[task_ids[0]]["relationships"] == [{
+        "type": "subtask", "direction": "parent",
+        "related_task_id": task_ids[4], "related_task_title": "Task 4"
+    }]
+    assert tasks[task_ids[4]]["relationships"][0]["direction"] == "child"
+    assert tasks[task_ids[1]]["tags"] == [{"id": tag_id, "name": "export"}]
+    assert len(db.export_tasks(limit=3)) == 3
+    
+    service = ExportService(db)
+    assert [t["id"] for t in json.loads("".join(service.stream_tasks("json")))["tasks"]] == list(tasks)
+    lines = "".join(service.stream_tasks("ndjson", limit=4)).splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(tasks)[:4]
+    rows = list(csv.DictReader(io.StringIO("".join(service.stream_tasks("csv")))))
+    assert len(rows) == 5
+    assert json.loads(rows[list(tasks).index(task_ids[1])]["tags"]) == [{"id": tag_id, "name": "export"}]
+    with pytest.raises(ValueError):
+        service.stream_tasks("xml")
+
+
+def test_bulk_create_tasks_and_relationships(temp_db):
+    """Test that bulk-created tasks match create_task() and relationships are batched."""
+    from datetime import datetime
+    
+    db, _ = temp_db
+    org_id = db.create_organization("Import Org")
+    project_id = db.create_project("import", "/tmp/import", organization_id=org_id)
+    single_id = db.create_task("Single", "concrete", "Do it", "Verify it", "agent-1")
+    db.bulk_delete_tasks([single_id])
+    
+    task_ids = db.bulk_create_tasks([
+        {"title": "Parent", "task_type": "abstract", "task_instruction": "Do it",
+         "verification_instruction": "Verify it", "project_id": project_id, "priority": "high"},
+        {"title": "Child", "task_type": "concrete", "task_instruction": "Do it",
+         "verification_instruction": "Verify it", "notes": "imported",
+         "due_date": datetime(2030, 1, 1)},
+    ], "agent-1")
+    # IDs are never reused, even after the highest task is deleted
+    assert task_ids[0] > single_id
+    assert task_ids[1] == task_ids[0] + 1
+    
+    parent = db.get_task(task_ids[0])
+    assert parent["title"] == "Parent"
+    assert parent["priority"] == "high"
+    assert parent["organization_id"] == org_id
+    child = db.get_task(task_ids[1])
+    assert child["priority"] == "medium"
+    assert child["due_date"].startswith("2030-01-01")
+    assert db.get_task_titles(project_id) == {"Parent"}
+    assert {"Parent", "Child"} <= db.get_task_titles()
+    assert [h["change_type"] for h in db.get_change_history(task_id=task_ids[1])] == ["created"]
+    assert db.get_task_versions(task_ids[1])[0]["version_number"] == 1
+    
+    with pytest.raises(ValueError):
+        db.bulk_create_tasks([{"title": "Bad", "task_type": "concrete", "task_instruction": "x",
+                               "verification_instruction": "y", "priority": "urgent"}], "agent-1")
+    
+    relationships = [(task_ids[0], task_ids[1], "subtask"), (task_ids[1], task_ids[0], "blocked_by")]
+    assert db.bulk_create_relationships(relationships + relationships[:1], "agent-1") == 2
+    assert db.bulk_create_relationships(relationships, "agent-1") == 0
+    assert len(db.get_related_tasks(task_ids[0])) == 2
+    assert db.get_task(task_ids[1])["task_status"] == "blocked"
+
+
+def test_bulk_operations_are_set_based(temp_db):
+    """Test bulk operations report per-task failures and use a fixed number of statements."""
+    db, _ = temp_db
+    grandparent = db.create_task("Epic", "epic", "Do it", "Verify it", "agent-1")
+    parent = db.create_task("Parent", "abstract", "Do it", "Verify it", "agent-1")
+    db.create_relationship(grandparent, parent, "subtask", "agent-1")
+    children = [db.create_task(f"Child {i}", "concrete", "Do it", "Verify it", "agent-1") for i in range(20)]
+    for child in children:
+        db.create_relationship(parent, child, "subtask", "agent-1")
+    missing = children[-1] + 1000
+    
+    # Assign: already-assigned and missing tasks are reported, the rest locked
+    db.lock_task(children[0], "agent-2")
+    result = db.bulk_assign_tasks(children + [missing, children[1]], "agent-1")
+    assert result["assigned"] == 19
+    assert result["failed_task_ids"] == [children[0], missing]
+    with pytest.raises(ValueError, match="not available"):
+        db.bulk_assign_tasks([children[0]], "agent-1", require_all=True)
+    
+    # require_all rolls back the whole batch
+    with pytest.raises(ValueError, match="not found"):
+        db.bulk_complete_tasks(children + [missing], "agent-1", require_all=True)
+    assert db.get_task(children[0])["task_status"] == "in_progress"
+    
+    # Statement count does not grow with the number of tasks
+    executed = []
+    original = db._execute_with_logging
+    def counting(cursor, query, params=None):
+        executed.append(query)
+        return original(cursor, query, params)
+    with patch.object(db._bulk_operations, "_execute_with_logging", side_effect=counting):
+        result = db.bulk_complete_tasks(children + [missing], "agent-1", actual_hours=2.0)
+    assert result["completed"] == 20
+    assert result["failed_task_ids"] == [missing]
+    # load + update, then select + update for the parent and grandparent levels
+    # and a final select that finds no more parents
+    assert len(executed) == 2 + 2 * 2 + 1
+    assert db.get_task(children[0])["actual_hours"] == 2.0
+    assert db.get_task(parent)["task_status"] == "complete"
+    assert db.get_task(grandparent)["task_status"] == "complete"
+    history = db.get_change_history(task_id=parent)
+    assert history[0]["notes"] == "Auto-completed: all subtasks are complete"
+    
+    result = db.bulk_update_status(children[:2], "in_progress", "agent-1")
+    assert result["updated"] == 2
+    result = db.bulk_unlock_tasks([children[0], children[5], missing], "agent-1")
+    assert result["unlocked_task_ids"] == [children[0]]
+    assert result["failed_task_ids"] == [
+        {"task_id": children[5], "error": "Task not in_progress"},
+        {"task_id": missing, "error": "Task not found"},
+    ]
+    
+    result = db.bulk_delete_tasks(children + [missing])
+    assert result["deleted"] == 20
+    assert result["failed_task_ids"] == [missing]
+    assert db.get_task(children[0]) is None
+
+
+def test_unlock_stale_tasks_in_batches(temp_db):
+    """Test the stale task reaper unlocks in bounded batches with history for each task."""
+    import json
+    
+    db, _ = temp_db
+    task_ids = [db.create_task(f"Stale {i}", "concrete", "Do it", "Verify it", "agent-1") for i in range(5)]
+    fresh_id = db.create_task("Fresh", "concrete", "Do it", "Verify it", "agent-1")
+    for task_id in task_ids + [fresh_id]:
+        db.lock_task(task_id, f"worker-{task_id}")
+    conn = db._get_connection()
+    try:
+        placeholders = ",".join("?" for _ in task_ids)
+        conn.execute(
+            f"UPDATE tasks SET updated_at = datetime('now', '-3 hours') WHERE id IN ({placeholders})",
+            task_ids
+        )
+        conn.commit()
+    finally:
+        db.adapter.close(conn)
+    
+    transactions = []
+    original = db._write_transaction
+    def counting():
+        transactions.append(1)
+        return original()
+    with patch.object(db, "_write_transaction", side_effect=counting):
+        assert db.unlock_stale_tasks(hours=2, system_agent_id="reaper", batch_size=2) == 5
+    # Batches of 2, 2 and 1
+    assert len(transactions) == 3
+    
+    assert db.get_task(fresh_id)["task_status"] == "in_progress"
+    for task_id in task_ids:
+        task = db.get_task(task_id)
+        assert task["task_status"] == "available"
+        assert task["assigned_agent"] is None
+        history = db.get_change_history(task_id=task_id)
+        finding = next(h for h in history if h["change_type"] == "finding")
+        assert f"worker-{task_id}" in finding["notes"]
+        assert json.loads(finding["new_value"])["timeout_hours"] == 2
+        assert any(h["change_type"] == "unlocked" and h["agent_id"] == "reaper" for h in history)
+    
+    assert db.unlock_stale_tasks(hours=2) == 0
+
+
+def test_get_task_events_reads_lifecycle_changes(temp_db):
+    """Test task lifecycle events are read from change_history in ID order."""
+    db, _ = temp_db
+    start = db.get_latest_task_event_id()
+    
+    task_id = db.create_task("Event task", "concrete", "Do it", "Verify", "agent")
+    db.lock_task(task_id, "agent")
+    db.add_task_update(task_id, "agent", "Working", "progress")
+    db.unlock_task(task_id, "agent")
+    db.bulk_update_status([task_id], "blocked", "agent")
+    db.bulk_update_status([task_id], "available", "agent")
+    db.lock_task(task_id, "agent")
+    db.complete_task(task_id, "agent")
+    
+    events = db.get_task_events(after_id=start)
+    assert [e["event"] for e in events] == [
+        "task.created", "task.unlocked", "task.available", "task.completed"
+    ]
+    assert all(e["task_id"] == task_id and e["task_type"] == "concrete" for e in events)
+    assert [e["id"] for e in events] == sorted(e["id"] for e in events)
+    assert db.get_latest_task_event_id() >= events[-1]["id"]
+    
+    # Resuming after an event returns only later ones
+    assert db.get_task_events(after_id=events[1]["id"], limit=1) == [events[2]]
+    
+    # Unblocking through the REST update records the same status change
+    from todorama.api.entities.task_entity import TaskEntity
+    db.bulk_update_status([task_id], "blocked", "agent")
+    after = db.get_latest_task_event_id()
+    TaskEntity(db, {"agent_id": "api-agent"}).update(task_id, {"task_status": "available"})
+    assert [(e["event"], e["agent_id"]) for e in db.get_task_events(after_id=after)] == [
+        ("task.available", "api-agent")
+    ]
+    assert db.get_change_history_ids(after_id=after) == [db.get_latest_task_event_id()]
+
+
+def test_webhook_subscription_index_and_batched_logs(temp_db):
+    """Test webhook lookups are cached until a webhook changes, and deliveries are logged in batches."""
+    db, _ = temp_db
+    org_id = db.create_organization("Webhook Org")
+    project_id = db.create_project("Webhook project", "/tmp/webhook-project", organization_id=org_id)
+    webhook_id = db.create_webhook(project_id, "https://example.com/hook", ["task.created"])
+    
+    webhooks = db.get_webhooks_for_event(project_id, "task.created")
+    assert [w["id"] for w in webhooks] == [webhook_id]
+    assert webhooks[0]["events"] == ["task.created"]
+    assert db.get_webhooks_for_event(project_id + 1, "task.created") == []
+    assert db.get_webhooks_for_event(None, "task.completed") == []
+    
+    # Served from the index: a webhook inserted behind its back is not seen...
+    with db._write_transaction() as conn:
+        conn.cursor().execute(
+            "INSERT INTO webhooks (project_id, url, events) VALUES (?, ?, ?)",
+            (project_id, "https://example.com/other", '["task.created"]')
+        )
+    assert len(db.get_webhooks_for_event(project_id, "task.created")) == 1
+    # ...until create_webhook / delete_webhook invalidate it
+    db.delete_webhook(webhook_id)
+    assert [w["url"] for w in db.get_webhooks_for_event(None, "task.created")] == ["https://example.com/other"]
+    
+    other_id = db.get_webhooks_for_event(None, "task.created")[0]["id"]
+    db.record_webhook_deliveries([
+        {"webhook_id": other_id, "event_type": "task.created", "payload": "{}", "status": "failed",
+         "response_body": "Request timeout"},
+        {"webhook_id": other_id, "event_type": "task.created", "payload": "{}", "status": "success",
+         "response_code": 200, "attempt_number": 2},
+    ])
+    conn = db._get_connection()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT status, response_code, attempt_number, delivered_at FROM webhook_deliveries "
+            "WHERE webhook_id = ? ORDER BY id", (other_id,)
+        )
+        rows = [dict(row) for row in cursor.fetchall()]
+    finally:
+        db.adapter.close(conn)
+    assert [(r["status"], r["response_code"], r["attempt_number"]) for r in rows] == [
+        ("failed", None, 1), ("success", 200, 2)
+    ]
+    assert rows[0]["delivered_at"] is None and rows[1]["delivered_at"] is not None
+
+
+def test_webhook_outbox_is_taken_once(temp_db):
+    """Test undelivered webhooks saved to the outbox are returned oldest first and removed."""
+    db, _ = temp_db
+    org_id = db.create_organization("Outbox Org")
+    project_id = db.create_project("Outbox project", "/tmp/outbox-project", organization_id=org_id)
+    webhook_id = db.create_webhook(project_id, "https://example.com/hook", ["task.created"])
+    
+    db.save_webhook_outbox([
+        {"webhook_id": webhook_id, "event_type": "task.created", "payload": '{"n": 1}'},
+        {"webhook_id": webhook_id, "event_type": "task.created", "payload": '{"n": 2}', "attempt_number": 3},
+    ])
+    rows = db.take_webhook_outbox()
+    assert [(r["payload"], r["attempt_number"]) for r in rows] == [('{"n": 1}', 1), ('{"n": 2}', 3)]
+    assert db.take_webhook_outbox() == []
+
+
+def test_get_tasks_reads_blocked_overlay_in_one_query(temp_db):
+    """Test get_tasks returns several tasks with the blocked-subtask overlay on one connection."""
+    db, _ = temp_db
+    org_id = db.create_organization("Batch Org")
+    project_id = db.create_project("batch", "/tmp/batch", organization_id=org_id)
+    epic_id = db.create_task("Epic", "epic", "Do it", "Verify", "agent", project_id=project_id)
+    story_ids = [
+        db.create_task(f"Story {n}", "abstract", "Do it", "Verify", "agent", project_id=project_id)
+        for n in range(3)
+    ]
+    for story_id in story_ids:
+        db.create_relationship(epic_id, story_id, "subtask", "agent")
+    leaf_id = db.create_task("Leaf", "concrete", "Do it", "Verify", "agent", project_id=project_id)
+    db.create_relationship(story_ids[0], leaf_id, "subtask", "agent")
+    db.bulk_update_status([leaf_id], "blocked", "agent")
+    
+    connections = []
+    get_connection = db._get_connection
+    db._get_connection = lambda: connections.append(1) or get_connection()
+    tasks = db.get_tasks([epic_id, leaf_id, epic_id, 999999] + story_ids)
+    db._get_connection = get_connection
+    assert len(connections) == 1
+    
+    assert set(tasks) == {epic_id, leaf_id, *story_ids}
+    assert [tasks[i]["task_status"] for i in story_ids] == ["blocked", "available", "available"]
+    assert tasks[epic_id]["task_status"] == "blocked"
+    assert tasks[leaf_id]["task_status"] == "blocked"
+    assert "has_blocked_subtask" not in tasks[epic_id]
+    assert db.get_task(epic_id) == tasks[epic_id]
+    
+    assert set(db.get_tasks(story_ids, organization_id=org_id)) == set(story_ids)
+    assert db.get_tasks(story_ids, organization_id=org_id + 1) == {}
+    assert db.get_task(epic_id, organization_id=org_id + 1) is None
+    assert db.get_tasks([]) == {}
+
+
+def test_get_task_context_loads_everything_on_one_connection(temp_db):
+    """Test get_task_context reads task, ancestry, project, updates and history in one transaction."""
+    db, _ = temp_db
+    org_id = db.create_organization("Context Org")
+    project_id = db.create_project("context", "/tmp/context", organization_id=org_id)
+    epic_id = db.create_task("Epic", "epic", "Do it", "Verify", "agent", project_id=project_id)
+    story_id = db.create_task("Story", "abstract", "Do it", "Verify", "agent", project_id=project_id)
+    task_id = db.create_task("Task", "concrete", "Do it", "Verify", "agent", project_id=project_id)
+    blocker_id = db.create_task("Blocker", "concrete", "Do it", "Verify", "agent", project_id=project_id)
+    db.create_relationship(epic_id, story_id, "subtask", "agent")
+    db.create_relationship(story_id, task_id, "subtask", "agent")
+    db.create_relationship(blocker_id, task_id, "blocked_by", "agent")
+    db.add_task_update(task_id, "agent", "Halfway there", "progress")
+    
+    connections = []
+    get_connection = db._get_connection
+    db._get_connection = lambda: connections.append(1) or get_connection()
+    context = db.get_task_context(task_id)
+    db._get_connection = get_connection
+    assert len(connections) == 1
+    
+    assert context["task"]["id"] == task_id
+    assert context["project"]["id"] == project_id
+    # Direct parents through any relationship, then the subtask hierarchy upward
+    assert [t["id"] for t in context["ancestry"]] == sorted([story_id, blocker_id]) + [epic_id]
+    assert [u["notes"] for u in context["updates"]] == ["Halfway there"]
+    assert context["change_history"][0]["change_type"] == "progress"
+    
+    # Blocked-subtask overlay applies to the ancestry
+    db.bulk_update_status([task_id], "blocked", "agent")
+    statuses = {t["id"]: t["task_status"] for t in db.get_task_context(task_id)["ancestry"]}
+    assert statuses[story_id] == "blocked" and statuses[epic_id] == "blocked"
+    
+    assert db.get_task_context(task_id, organization_id=org_id + 1) is None
+    assert db.get_task_context(999999) is None
+
+
+def test_task_context_cache_is_invalidated_by_task_writes(temp_db):
+    """Test cached task contexts are reused until the task itself changes."""
+    from todorama.storage.task_context import TaskContextCache
+    db, _ = temp_db
+    db._task_context_cache = TaskContextCache(ttl=60)
+    task_id = db.create_task("Cached", "concrete", "Do it", "Verify", "agent")
+    
+    first = db.get_task_context(task_id)
+    first["task"]["title"] = "Mutated by caller"
+    executed = []
+    execute = db._execute_with_logging
+    db._execute_with_logging = lambda cursor, query, params=None: executed.append(query) or execute(cursor, query, params)
+    second = db.get_task_context(task_id)
+    db._execute_with_logging = execute
+    # Served after the lineage query and the blocked index feed check, and
+    # callers cannot modify the cached copy
+    assert len(executed) == 2
+    assert second["task"]["title"] == "Cached"
+    
+    db.add_task_update(task_id, "agent", "New note", "note")
+    assert [u["notes"] for u in db.get_task_context(task_id)["updates"]] == ["New note"]
+    db.lock_task(task_id, "agent")
+    assert db.get_task_context(task_id)["task"]["task_status"] == "in_progress"
+
+
+def test_task_context_cache_follows_lineage_and_subtree(temp_db):
+    """Test cached task contexts are dropped when an ancestor or a subtask changes."""
+    from todorama.storage.task_context import TaskContextCache
+    db, _ = temp_db
+    db._task_context_cache = TaskContextCache(ttl=60)
+    epic_id = db.create_task("Epic", "epic", "Do it", "Verify", "agent")
+    story_id = db.create_task("Story", "abstract", "Do it", "Verify", "agent")
+    task_id = db.create_task("Task", "concrete", "Do it", "Verify", "agent")
+    db.create_relationship(epic_id, story_id, "subtask", "agent")
+    db.create_relationship(story_id, task_id, "subtask", "agent")
+    
+    assert [t["title"] for t in db.get_task_context(story_id)["ancestry"]] == ["Epic"]
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE tasks SET title = 'Renamed epic' WHERE id = ?", (epic_id,))
+        conn.commit()
+    finally:
+        db.adapter.close(conn)
+    assert [t["title"] for t in db.get_task_context(story_id)["ancestry"]] == ["Renamed epic"]
+    
+    # A subtask becoming blocked shows on the cached ancestor at once
+    assert db.get_task_context(story_id)["task"]["task_status"] == "available"
+    db.bulk_update_status([task_id], "blocked", "agent")
+    context = db.get_task_context(story_id)
+    assert context["task"]["task_status"] == "blocked"
+    assert context["ancestry"][0]["task_status"] == "blocked"
+    
+    # So does a new parent
+    other_id = db.create_task("Other epic", "epic", "Do it", "Verify", "agent")
+    db.create_relationship(other_id, story_id, "subtask", "agent")
+    assert {t["id"] for t in db.get_task_context(story_id)["ancestry"]} == {epic_id, other_id}
+
+
+def test_reserve_task_locks_and_reads_stale_finding_in_one_transaction(temp_db):
+    """Test reserve_task locks, returns the locked row and the stale finding on one connection."""
+    db, _ = temp_db
+    task_id = db.create_task("Reserve me", "concrete", "Do it", "Verify", "agent")
+    db.add_task_update(task_id, "reaper", "Task unlocked due to timeout (stale)", "finding")
+    
+    connections = []
+    get_connection = db._get_connection
+    db._get_connection = lambda: connections.append(1) or get_connection()
+    reservation = db.reserve_task(task_id, "agent-1")
+    db._get_connection = get_connection
+    assert len(connections) == 1
+    
+    assert reservation["reserved"] is True
+    assert reservation["task"]["task_status"] == "in_progress"
+    assert reservation["task"]["assigned_agent"] == "agent-1"
+    assert reservation["stale_finding"]["agent_id"] == "reaper"
+    history = db.get_change_history(task_id=task_id)
+    assert history[0]["change_type"] == "locked" and history[0]["old_value"] == "available"
+    
+    # Already locked: the current row is returned for the error message
+    again = db.reserve_task(task_id, "agent-2")
+    assert again["reserved"] is False
+    assert again["task"]["assigned_agent"] == "agent-1"
+    
+    # Complete but unverified tasks can be reserved for verification
+    db.complete_task(task_id, "agent-1")
+    verify = db.reserve_task(task_id, "verifier")
+    assert verify["reserved"] is True and verify["stale_finding"]["agent_id"] == "reaper"
+    
+    # A task with a blocked subtask is not reserved and reports as blocked
+    parent_id = db.create_task("Parent", "abstract", "Do it", "Verify", "agent")
+    child_id = db.create_task("Child", "concrete", "Do it", "Verify", "agent")
+    db.create_relationship(parent_id, child_id, "subtask", "agent")
+    db.bulk_update_status([child_id], "blocked", "agent")
+    blocked = db.reserve_task(parent_id, "agent-1")
+    assert blocked["reserved"] is False and blocked["task"]["task_status"] == "blocked"
+    assert db.get_task(parent_id)["assigned_agent"] is None
+    
+    assert db.reserve_task(999999, "agent-1") == {"reserved": False, "task": None, "stale_finding": None}
+
+
+def test_search_index_follows_writes_and_returns_highlights(temp_db):
+    """Test the FTS5 index is kept current by triggers and results carry highlights and snippets."""
+    db, _ = temp_db
+    task_id = db.create_task(
+        title="Rotate signing keys",
+        task_type="concrete",
+        task_instruction="Rotate the webhook signing keys before the audit",
+        verification_instruction="Verify",
+        agent_id="test-agent"
+    )
+    
+    result = db.search_tasks("signing")[0]
+    assert result["id"] == task_id
+    assert result["highlighted_title"] == "Rotate <mark>signing</mark> keys"
+    assert "<mark>signing</mark>" in result["snippet"]
+    
+    # Phrases match in order; bare words and "phrase"* match as prefixes
+    assert [r["id"] for r in db.search_tasks('"signing keys"')] == [task_id]
+    assert db.search_tasks('"keys signing"') == []
+    assert [r["id"] for r in db.search_tasks('"webhook sign"*')] == [task_id]
+    assert db.search_tasks('"webhook sign"') == []
+    assert db.search_tasks("@@") == []
+    
+    # Updates and deletes reach the index, so an empty result is trusted (no LIKE scan)
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE tasks SET title = 'Renew certificates', task_instruction = 'Renew' WHERE id = ?", (task_id,))
+        conn.commit()
+    finally:
+        db.adapter.close(conn)
+    assert db.search_tasks("signing") == []
+    assert [r["id"] for r in db.search_tasks("certificates")] == [task_id]
+    db.bulk_delete_tasks([task_id])
+    assert db.search_tasks("certificates") == []
+    
+    assert db.optimize_search_index(rebuild=True)["actions"] == ["rebuild", "optimize"]
+
+
+def test_in_memory_search_index_follows_feed_and_restores_snapshot(temp_db):
+    """Test the in-memory index ranks with BM25, applies the write feed and restarts from its snapshot."""
+    db, db_path = temp_db
+    from todorama.storage.memory_search import InMemorySearchIndex, install_search_feed
+    with db._write_transaction() as conn:
+        assert install_search_feed(conn.cursor(), db.db_type, execute=db._execute_with_logging)
+    snapshot_path = f"{db_path}.search-index"
+    db._memory_search = InMemorySearchIndex(snapshot_path)
+    
+    api_id = db.create_task("API endpoint", "concrete", "Create API endpoint for the API gateway", "Verify", "agent")
+    docs_id = db.create_task("Write docs", "concrete", "Document the API", "Verify", "agent")
+    db.create_task("Database schema", "concrete", "Design tables", "Verify", "agent")
+    
+    results = db.search_tasks("api")
+    assert [r["id"] for r in results] == [api_id, docs_id]
+    assert results[0]["highlighted_title"] == "<mark>API</mark> endpoint"
+    assert "<mark>API</mark>" in results[1]["snippet"]
+    assert [r["id"] for r in db.search_tasks("doc api")] == [docs_id]
+    assert [t["id"] for t in db.query_tasks(search="endpoint")] == [api_id]
+    # The first refresh built the index and saved a snapshot
+    assert os.path.exists(snapshot_path)
+    
+    # Writes from any path reach the index through the feed
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE tasks SET title = 'Gateway limits', task_instruction = 'Rate limit' WHERE id = ?", (api_id,))
+        conn.commit()
+    finally:
+        db.adapter.close(conn)
+    assert [r["id"] for r in db.search_tasks("api")] == [docs_id]
+    assert [r["id"] for r in db.search_tasks("gateway")] == [api_id]
+    
+    # A restart loads the snapshot and replays only writes made since
+    assert db.save_search_snapshot()
+    db.bulk_delete_tasks([docs_id])
+    restarted = InMemorySearchIndex(snapshot_path)
+    conn = db._get_connection()
+    try:
+        assert restarted._load_snapshot(conn.cursor()) and restarted.size == 3
+    finally:
+        db.adapter.close(conn)
+    db._memory_search = InMemorySearchIndex(snapshot_path)
+    assert db.search_tasks("api") == []
+    assert [r["id"] for r in db.search_tasks("gate")] == [api_id]
+    assert db._memory_search.size == 2
+
+
+def test_in_memory_search_snapshot_is_rebuilt_for_another_database(temp_db):
+    """Test a snapshot is ignored when its epoch or feed position does not match the database."""
+    db, db_path = temp_db
+    from todorama.storage.memory_search import InMemorySearchIndex, install_search_feed
+    with db._write_transaction() as conn:
+        assert install_search_feed(conn.cursor(), db.db_type, execute=db._execute_with_logging)
+    snapshot_path = f"{db_path}.search-index"
+    db._memory_search = InMemorySearchIndex(snapshot_path)
+    task_id = db.create_task("Rotate certificates", "concrete", "Renew TLS", "Verify", "agent")
+    assert [r["id"] for r in db.search_tasks("certificates")] == [task_id]
+    assert db.save_search_snapshot()
+    
+    def load_snapshot():
+        conn = db._get_connection()
+        try:
+            return InMemorySearchIndex(snapshot_path)._load_snapshot(conn.cursor())
+        finally:
+            db.adapter.close(conn)
+    
+    assert load_snapshot()
+    
+    # The feed ends before the snapshot's position, as in a restored backup
+    with db._write_transaction() as conn:
+        conn.execute("DELETE FROM task_search_feed")
+    assert not load_snapshot()
+    
+    # Same position, but another database's epoch
+    with db._write_transaction() as conn:
+        conn.execute("INSERT INTO task_search_feed (task_id) VALUES (?)", (task_id,))
+        conn.execute("UPDATE task_search_feed_state SET epoch = 'other'")
+    assert not load_snapshot()
+    
+    # The restart rebuilds from the tables instead of trusting the snapshot
+    with db._write_transaction() as conn:
+        conn.execute("UPDATE tasks SET title = 'Rotate keys' WHERE id = ?", (task_id,))
+    db._memory_search = InMemorySearchIndex(snapshot_path)
+    assert db.search_tasks("certificates") == []
+    assert [r["id"] for r in db.search_tasks("keys")] == [task_id]
+    assert load_snapshot()
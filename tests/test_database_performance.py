@@ -355,4 +355,197 @@ def test_relationship_query_performance(perf_db):
     
     # Should be fast with composite index
     assert duration < 0.05, f"Relationship query took {duration:.4f}s, expected < 0.05s"
-    assert len(children) == 50
\ No newline at end of file
+    assert len(children) == 50
+
+def run_reserve_complete_benchmark(db, agents=50, tasks_per_agent=4):
+    """
+    Run concurrent agents that reserve and complete tasks until none are left.
+    
+    Args:
+        db: Database instance
+        agents: Number of concurrent agent threads
+        tasks_per_agent: Tasks created per agent
+        
+    Returns:
+        Tuple of (distinct tasks completed, error count, tasks per second)
+    """
+    import threading
+    
+    task_ids = [
+        db.create_task(
+            title=f"Bench Task {i}",
+            task_type="concrete",
+            task_instruction="Do it",
+            verification_instruction="Verify",
+            agent_id="bench-setup"
+        )
+        for i in range(agents * tasks_per_agent)
+    ]
+    completed = set()
+    errors = []
+    claimed = set()
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(agents)
+    
+    def agent(agent_index):
+        agent_id = f"bench-agent-{agent_index}"
+        start_barrier.wait()
+        # Every agent walks the same task list, so agents race for the same rows
+        for task_id in task_ids:
+            if task_id in claimed:
+                continue
+            try:
+                if db.lock_task(task_id, agent_id):
+                    # Completed-but-unverified tasks are lockable again, so mark
+                    # the claim before completing to count each task once
+                    with lock:
+                        claimed.add(task_id)
+                    db.complete_task(task_id, agent_id)
+                    with lock:
+                        completed.add(task_id)
+            except sqlite3.OperationalError as e:
+                with lock:
+                    errors.append(str(e))
+    
+    threads = [threading.Thread(target=agent, args=(i,)) for i in range(agents)]
+    start_time = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = time.time() - start_time
+    
+    return len(completed), len(errors), len(completed) / duration if duration else 0.0
+
+
+@pytest.mark.performance
+@pytest.mark.slow
+def test_reserve_complete_throughput_50_agents(monkeypatch):
+    """
+    Benchmark reserve/complete throughput for 50 concurrent agents with the
+    legacy SQLite settings (rollback journal, connect per call, no writer queue)
+    and with the tuned profile (WAL, pooled connections, single-writer queue).
+    """
+    from todorama import database as database_module
+    from todorama.db_adapter import SQLiteAdapter
+    
+    profiles = {
+        "before": dict(
+            journal_mode="delete", synchronous="full", mmap_size=0, cache_size=-2000,
+            busy_timeout=5000, write_queue_enabled=False, pool_enabled=False
+        ),
+        "after": dict(),  # SQLiteAdapter defaults are the tuned profile
+    }
+    results = {}
+    for name, options in profiles.items():
+        temp_dir = tempfile.mkdtemp()
+        try:
+            monkeypatch.setattr(
+                database_module, "get_database_adapter",
+                lambda path, options=options: SQLiteAdapter(path, **options)
+            )
+            db = TodoDatabase(os.path.join(temp_dir, f"bench_{name}.db"))
+            results[name] = run_reserve_complete_benchmark(db)
+            db.adapter.dispose()
+        finally:
+            shutil.rmtree(temp_dir)
+    
+    completed, errors, _ = results["after"]
+    assert errors == 0, f"Tuned profile should not surface 'database is locked' errors: {results}"
+    assert completed == 50 * 4, f"Every task should be reserved and completed once: {results}"
+
+
+def _postgresql_bench_db():
+    """Create a throwaway PostgreSQL database, or skip if PostgreSQL is not reachable."""
+    try:
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+    except ImportError:
+        pytest.skip("psycopg2 not installed")
+    conn_string = os.getenv(
+        "POSTGRESQL_TEST_CONN",
+        "host=localhost port=5432 dbname=postgres user=postgres password=postgres"
+    )
+    try:
+        conn = psycopg2.connect(conn_string)
+    except Exception:
+        pytest.skip("PostgreSQL not available")
+    db_name = f"bench_reserve_{os.getpid()}"
+    conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+    cursor = conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
+    cursor.execute(f"CREATE DATABASE {db_name}")
+    
+    def drop():
+        cursor.execute(f"DROP DATABASE IF EXISTS {db_name}")
+        conn.close()
+    
+    return conn_string.replace("dbname=postgres", f"dbname={db_name}"), drop
+
+
+def run_reserve_benchmark(db, tasks=200):
+    """
+    Reserve tasks one by one through the legacy call sequence and through reserve_task().
+    
+    Args:
+        db: Database instance
+        tasks: Tasks reserved per path
+        
+    Returns:
+        Dictionary of path -> reservations per second
+    """
+    task_ids = [
+        db.create_task(
+            title=f"Reserve Bench {i}",
+            task_type="concrete",
+            task_instruction="Do it",
+            verification_instruction="Verify",
+            agent_id="bench-setup"
+        )
+        for i in range(2 * tasks)
+    ]
+    
+    def legacy(task_id):
+        # get_task pre-check, lock, stale-finding lookup, refresh
+        assert db.get_task(task_id)["task_status"] == "available"
+        assert db.lock_task(task_id, "bench-agent")
+        db.get_task_updates(task_id, limit=10)
+        return db.get_task(task_id)
+    
+    def single(task_id):
+        return db.reserve_task(task_id, "bench-agent")["task"]
+    
+    rates = {}
+    for name, reserve, batch in (("legacy", legacy, task_ids[:tasks]), ("reserve_task", single, task_ids[tasks:])):
+        start_time = time.perf_counter()
+        for task_id in batch:
+            assert reserve(task_id)["task_status"] == "in_progress"
+        rates[name] = len(batch) / (time.perf_counter() - start_time)
+    return rates
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("backend", ["sqlite", "postgresql"])
+def test_reserve_task_rate(backend, monkeypatch):
+    """Benchmark single-task reservations per second: legacy call sequence vs reserve_task()."""
+    if backend == "postgresql":
+        conn_string, cleanup = _postgresql_bench_db()
+        monkeypatch.setenv("DB_TYPE", "postgresql")
+        db = TodoDatabase(conn_string)
+    else:
+        temp_dir = tempfile.mkdtemp()
+        cleanup = lambda: shutil.rmtree(temp_dir)
+        db = TodoDatabase(os.path.join(temp_dir, "bench_reserve.db"))
+    try:
+        rates = run_reserve_benchmark(db)
+        db.adapter.dispose()
+    finally:
+        cleanup()
+    
+    if backend == "postgresql":
+        # Each statement is a network round trip, so fewer statements must win
+        assert rates["reserve_task"] > rates["legacy"], f"reservations/s: {rates}"
+    else:
+        # In-process SQLite has no round trips to save; only guard against a regression
+        assert rates["reserve_task"] > 50, f"reservations/s: {rates}"
+        assert rates["reserve_task"] > rates["legacy"] / 4, f"reservations/s: {rates}"
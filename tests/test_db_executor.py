@@ -0,0 +1,107 @@
+"""
+Tests for running blocking database calls off the event loop.
+"""
+import asyncio
+import contextvars
+import threading
+import time
+
+import pytest
+
+from todorama.db_executor import AsyncTodoDatabase, DatabaseExecutor
+from todorama.exceptions import DatabaseTimeoutError, to_http_exception
+
+
+class FakeDatabase:
+    """Synchronous stand-in for TodoDatabase that records the calling thread."""
+
+    db_type = "sqlite"
+
+    def get_task(self, task_id):
+        return {"id": task_id, "thread": threading.current_thread().name}
+
+    def get_bottlenecks(self):
+        return {"thread": threading.current_thread().name}
+
+
+@pytest.fixture
+def executor():
+    executor = DatabaseExecutor(max_workers=4, analytics_workers=1, timeout=1.0, analytics_timeout=1.0)
+    yield executor
+    executor.shutdown()
+
+
+def test_slow_analytics_call_does_not_block_event_loop(executor):
+    """A slow report runs on its own lane while the loop keeps serving other calls."""
+    async def scenario():
+        slow = asyncio.ensure_future(executor.run_analytics(time.sleep, 0.5))
+        ticks = 0
+        started = time.monotonic()
+        fast_latencies = []
+        while not slow.done():
+            call_started = time.monotonic()
+            await executor.run(lambda: None)
+            fast_latencies.append(time.monotonic() - call_started)
+            ticks += 1
+            await asyncio.sleep(0.01)
+        await slow
+        return ticks, max(fast_latencies), time.monotonic() - started
+
+    ticks, slowest_fast_call, elapsed = asyncio.run(scenario())
+    assert elapsed >= 0.5
+    assert ticks > 10
+    assert slowest_fast_call < 0.2
+
+
+def test_analytics_lane_is_bounded(executor):
+    """Queued reports wait for the analytics worker instead of taking default threads."""
+    async def scenario():
+        reports = [asyncio.ensure_future(executor.run_analytics(time.sleep, 0.2)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        await executor.run(lambda: None)
+        fast = time.monotonic() - started
+        await asyncio.gather(*reports)
+        return fast
+
+    assert asyncio.run(scenario()) < 0.1
+
+
+def test_call_timeout_raises_database_timeout_error():
+    """A call exceeding its timeout raises DatabaseTimeoutError, mapped to 503."""
+    executor = DatabaseExecutor(max_workers=1, analytics_workers=1, timeout=0.05)
+    try:
+        with pytest.raises(DatabaseTimeoutError) as exc_info:
+            asyncio.run(executor.run(time.sleep, 0.3))
+    finally:
+        executor.shutdown(wait=True)
+    assert exc_info.value.context["timeout_seconds"] == 0.05
+    assert to_http_exception(exc_info.value).status_code == 503
+
+
+def test_context_and_arguments_reach_the_worker(executor):
+    """contextvars are copied into the worker; keyword arguments pass through unchanged."""
+    request_id = contextvars.ContextVar("request_id", default=None)
+
+    def call(func, timeout=None):
+        return request_id.get(), func, timeout
+
+    async def scenario():
+        request_id.set("req-1")
+        return await executor.run(call, func="f", timeout=5)
+
+    assert asyncio.run(scenario()) == ("req-1", "f", 5)
+
+
+def test_async_facade_routes_analytics_methods(executor):
+    """AsyncTodoDatabase runs analytics methods on the analytics lane and others on the default lane."""
+    adb = AsyncTodoDatabase(FakeDatabase(), executor)
+
+    async def scenario():
+        return await adb.get_task(7), await adb.get_bottlenecks()
+
+    task, bottlenecks = asyncio.run(scenario())
+    assert task["id"] == 7
+    assert task["thread"].startswith("todorama-db_")
+    assert bottlenecks["thread"].startswith("todorama-db-analytics")
+    assert adb.db_type == "sqlite"
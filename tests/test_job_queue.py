@@ -6,13 +6,14 @@ import time
 import json
 from unittest.mock import Mock, patch, MagicMock
 from typing import Dict, Any
+from datetime import datetime, timedelta
 
 # Import job queue components
 import sys
 import os
 # Package is now at top level, no sys.path.insert needed
 
-from job_queue import (
+from todorama.job_queue import (
     JobQueue, JobStatus, JobType, JobPriority,
     JobError, RetryableJobError, NonRetryableJobError
 )
@@ -43,10 +44,7 @@ class TestJobQueue:
     @pytest.fixture
     def job_queue(self, redis_mock):
         """Create job queue instance with mocked Redis."""
-        with patch('job_queue.redis.Redis', return_value=redis_mock):
-            queue = JobQueue(redis_url='redis://localhost:6379')
-            queue.redis = redis_mock
-            return queue
+        return JobQueue(redis_client=redis_mock)
     
     def test_submit_job(self, job_queue, redis_mock):
         """Test submitting a job to the queue."""
@@ -64,9 +62,12 @@ class TestJobQueue:
         assert job_id is not None
         assert len(job_id) > 0
         
-        # Verify Redis was called to enqueue job
-        redis_mock.lpush.assert_called_once()
-        redis_mock.hset.assert_called()  # Job metadata stored
+        # Verify job metadata, data and queue entry are written in one pipeline
+        pipe = redis_mock.pipeline.return_value
+        pipe.hset.assert_called_once()
+        pipe.setex.assert_called_once()
+        pipe.zadd.assert_called_once()
+        pipe.execute.assert_called_once()
         
     def test_get_job_status(self, job_queue, redis_mock):
         """Test retrieving job status."""
@@ -92,25 +93,22 @@ class TestJobQueue:
         
     def test_job_processing(self, job_queue, redis_mock):
         """Test processing jobs from the queue."""
-        # Mock job in queue
+        # Mock job returned by the dequeue script
         job_data = {
             "job_id": "test-job-123",
             "job_type": JobType.BACKUP.value,
             "parameters": {"project_id": 1},
             "priority": JobPriority.MEDIUM.value
         }
-        redis_mock.rpop.return_value = json.dumps(job_data).encode()
+        job_queue._dequeue_script = Mock(return_value=[json.dumps(job_data).encode()])
         
-        # Mock job status
-        redis_mock.hgetall.return_value = {
-            b"status": JobStatus.PENDING.value.encode(),
-            b"job_type": JobType.BACKUP.value.encode()
-        }
-        
-        job = job_queue.get_next_job()
+        job = job_queue.get_next_job(JobType.BACKUP)
         
         assert job is not None
         assert job["job_id"] == "test-job-123"
+        # One atomic script call: ready queue, delayed queue and wake-up list of the job type
+        kwargs = job_queue._dequeue_script.call_args.kwargs
+        assert kwargs["keys"] == ["job:ready:backup", "job:delayed:backup", "job:wakeup:backup"]
         
     def test_job_retry_on_error(self, job_queue, redis_mock):
         """Test job retry mechanism on retryable errors."""
@@ -119,8 +117,10 @@ class TestJobQueue:
         # Initially fail, then succeed
         job_queue.record_job_error(job_id, RetryableJobError("Temporary error"))
         
-        # Verify job is requeued with retry
-        redis_mock.lpush.assert_called()
+        # Verify job is requeued with retry and waiting workers are woken
+        pipe = redis_mock.pipeline.return_value
+        pipe.zadd.assert_called_once()
+        pipe.lpush.assert_called_once()
         redis_mock.hset.assert_called()  # Update retry count
         
     def test_job_failure_on_non_retryable_error(self, job_queue, redis_mock):
@@ -129,10 +129,11 @@ class TestJobQueue:
         
         job_queue.record_job_error(job_id, NonRetryableJobError("Permanent error"))
         
-        # Verify job status is set to failed
+        # Verify job status is set to failed and the job is not requeued
         calls = redis_mock.hset.call_args_list
-        status_updates = [call for call in calls if len(call[0]) > 0 and b"status" in str(call[0][0])]
-        assert len(status_updates) > 0
+        status_updates = [call.args[2] for call in calls if call.args[1:2] == ("status",)]
+        assert status_updates == [JobStatus.FAILED.value]
+        redis_mock.zadd.assert_not_called()
         
     def test_job_completion(self, job_queue, redis_mock):
         """Test marking a job as complete."""
@@ -153,7 +154,7 @@ class TestJobQueue:
         # Mock job that's been processing too long
         status_data = {
             "status": JobStatus.PROCESSING.value,
-            "started_at": str(time.time() - 3600)  # 1 hour ago
+            "started_at": (datetime.utcnow() - timedelta(hours=1)).isoformat()  # 1 hour ago
         }
         redis_mock.hgetall.return_value = {
             k.encode(): v.encode() if isinstance(v, str) else str(v).encode()
@@ -172,9 +173,118 @@ class TestJobQueue:
         job_queue.submit_job(JobType.BACKUP, {}, JobPriority.HIGH)
         job_queue.submit_job(JobType.BACKUP, {}, JobPriority.MEDIUM)
         
-        # Verify high priority jobs are retrieved first
+        # Ready queue scores order jobs by priority first
         # (Redis sorted sets should handle this)
-        redis_mock.zrange.assert_called()  # Priority queue uses sorted sets
+        zadds = redis_mock.pipeline.return_value.zadd.call_args_list
+        scores = [list(call.args[1].values())[0] for call in zadds]
+        assert scores[1] < scores[2] < scores[0]
+
+
+class TestAtomicDequeue:
+    """Test the Lua dequeue against an in-process Redis stand-in."""
+    
+    @pytest.fixture
+    def queue(self):
+        """Create job queue on fakeredis (with Lua support)."""
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        return JobQueue(redis_client=fakeredis.FakeRedis())
+    
+    def test_priority_across_types(self, queue):
+        """Jobs come out best priority first across types, and only of requested types."""
+        low = queue.submit_job(JobType.BACKUP, {}, JobPriority.LOW)
+        high = queue.submit_job(JobType.WEBHOOK, {}, JobPriority.HIGH)
+        
+        assert queue.get_next_job(JobType.CLEANUP) is None
+        job = queue.get_next_job()
+        assert job["job_id"] == high
+        assert queue.get_job_status(high)["status"] == JobStatus.PROCESSING.value
+        assert queue.get_next_job([JobType.BACKUP])["job_id"] == low
+        assert queue.get_next_job() is None
+    
+    def test_delayed_job_does_not_block_ready_jobs(self, queue):
+        """A delayed job waits in its own set and is promoted once due."""
+        delayed = queue.submit_job(JobType.BACKUP, {}, JobPriority.CRITICAL, delay=60)
+        ready = queue.submit_job(JobType.BACKUP, {}, JobPriority.LOW)
+        
+        assert queue.get_next_job()["job_id"] == ready
+        assert queue.get_next_job() is None
+        
+        queue.redis.zadd(queue._delayed_key("backup"), {delayed: time.time() - 1})
+        assert queue.get_next_job()["job_id"] == delayed
+    
+    def test_batch_dequeue_skips_cancelled_jobs(self, queue):
+        """get_next_jobs(n) claims up to n pending jobs in one call."""
+        job_ids = [queue.submit_job(JobType.CLEANUP, {"i": i}) for i in range(5)]
+        queue.cancel_job(job_ids[0])
+        
+        jobs = queue.get_next_jobs(3)
+        assert [job["parameters"]["i"] for job in jobs] == [1, 2, 3]
+        assert [job["parameters"]["i"] for job in queue.get_next_jobs(3)] == [4]
+    
+    def test_concurrent_workers_never_share_a_job(self, queue):
+        """Each job is handed to exactly one worker."""
+        import threading
+        
+        job_ids = {queue.submit_job(JobType.NOTIFICATION, {}) for _ in range(40)}
+        taken = []
+        lock = threading.Lock()
+        
+        def worker():
+            while True:
+                job = queue.get_next_job()
+                if job is None:
+                    return
+                with lock:
+                    taken.append(job["job_id"])
+        
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(taken) == sorted(job_ids)
+    
+    def test_blocking_wait(self, queue):
+        """get_next_job(timeout=...) returns as soon as a job is submitted."""
+        import threading
+        
+        threading.Timer(0.2, lambda: queue.submit_job(JobType.NOTIFICATION, {})).start()
+        started = time.monotonic()
+        job = queue.get_next_job(JobType.NOTIFICATION, timeout=5)
+        assert job is not None
+        assert time.monotonic() - started < 2
+        
+        started = time.monotonic()
+        assert queue.get_next_job(timeout=0.2) is None
+        assert time.monotonic() - started >= 0.2
+    
+    def test_wakeup_tokens_track_ready_jobs(self, queue):
+        """Queued and promoted jobs push a wake-up token; claiming the last job clears them."""
+        wakeup_key = queue._wakeup_key("backup")
+        ready = queue.submit_job(JobType.BACKUP, {})
+        delayed = queue.submit_job(JobType.BACKUP, {}, delay=60)
+        assert queue.redis.llen(wakeup_key) == 1
+        
+        queue.redis.zadd(queue._delayed_key("backup"), {delayed: time.time() - 1})
+        first = queue.get_next_job()["job_id"]
+        # The other job is still queued, so a waiting worker must be woken for it
+        assert queue.redis.llen(wakeup_key) == 2
+        assert queue.redis.zcard(queue._ready_key("backup")) == 1
+        
+        second = queue.get_next_job(JobType.BACKUP, timeout=1)["job_id"]
+        assert {first, second} == {ready, delayed}
+        assert not queue.redis.exists(wakeup_key)
+    
+    def test_retry_requeues_job(self, queue):
+        """A retryable error puts the job back on its ready queue."""
+        job_id = queue.submit_job(JobType.WEBHOOK, {})
+        queue.get_next_job()
+        queue.record_job_error(job_id, RetryableJobError("Temporary error"))
+        
+        job = queue.get_next_job(JobType.WEBHOOK)
+        assert job["job_id"] == job_id
+        assert queue.get_job_status(job_id)["retry_count"] == "1"
 
 
 class TestJobProcessors:
@@ -183,15 +293,13 @@ class TestJobProcessors:
     @pytest.fixture
     def job_queue(self):
         """Create job queue for processor tests."""
-        with patch('job_queue.redis.Redis'):
-            queue = JobQueue(redis_url='redis://localhost:6379')
-            queue.redis = MagicMock()
-            return queue
+        return JobQueue(redis_client=MagicMock())
     
-    def test_backup_job_processor(self, job_queue):
+    def test_backup_job_processor(self, job_queue, tmp_path, monkeypatch):
         """Test backup job processor."""
-        from job_queue import BackupJobProcessor
+        from todorama.job_queue import BackupJobProcessor
         
+        monkeypatch.setenv("TODO_BACKUPS_DIR", str(tmp_path))
         processor = BackupJobProcessor(job_queue)
         job_data = {
             "job_id": "test-123",
@@ -199,7 +307,7 @@ class TestJobProcessors:
         }
         
         # Mock backup operation
-        with patch('backup.BackupManager.create_backup') as mock_backup:
+        with patch('todorama.backup.BackupManager.create_backup_archive') as mock_backup:
             mock_backup.return_value = "backup.db.gz"
             
             result = processor.process(job_data)
@@ -209,7 +317,7 @@ class TestJobProcessors:
             
     def test_webhook_job_processor(self, job_queue):
         """Test webhook delivery job processor."""
-        from job_queue import WebhookJobProcessor
+        from todorama.job_queue import WebhookJobProcessor
         
         processor = WebhookJobProcessor(job_queue)
         job_data = {
@@ -222,15 +330,17 @@ class TestJobProcessors:
         }
         
         # Mock webhook delivery
-        with patch('httpx.post') as mock_post:
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_post.return_value = mock_response
+        with patch('todorama.job_queue.HTTPClientAdapterFactory.create_client') as mock_create:
+            mock_client = mock_create.return_value.__enter__.return_value
+            mock_client.post.return_value.status_code = 200
             
             result = processor.process(job_data)
             
             assert result is not None
-            mock_post.assert_called_once()
+            assert result["status_code"] == 200
+            mock_client.post.assert_called_once()
+            headers = mock_client.post.call_args.kwargs["headers"]
+            assert headers["X-Webhook-Signature"].startswith("sha256=")
 
 
 class TestJobQueueIntegration:
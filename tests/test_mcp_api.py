@@ -197,6 +197,39 @@ def test_mcp_reserve_task(auth_client):
     assert result2["success"] is False
 
 
+def test_mcp_claim_next_task(auth_client):
+    """Test MCP claim next task."""
+    create_response = auth_client.post("/mcp/create_task", json={
+        "title": "Claim Test",
+        "task_type": "concrete",
+        "task_instruction": "Test",
+        "verification_instruction": "Verify",
+        "agent_id": "test-agent"
+    })
+    task_id = create_response.json()["task_id"]
+    
+    claim_response = auth_client.post("/mcp/claim_next_task", json={
+        "agent_type": "implementation",
+        "agent_id": "agent-1"
+    })
+    assert claim_response.status_code == 200
+    result = claim_response.json()
+    assert result["success"] is True
+    assert result["task"]["id"] == task_id
+    assert result["task"]["task_status"] == "in_progress"
+    assert result["task"]["assigned_agent"] == "agent-1"
+    
+    # Nothing left to claim
+    claim_response2 = auth_client.post("/mcp/claim_next_task", json={
+        "agent_type": "implementation",
+        "agent_id": "agent-2"
+    })
+    assert claim_response2.status_code == 200
+    result2 = claim_response2.json()
+    assert result2["success"] is False
+    assert "No available tasks" in result2["error"]
+
+
 def test_mcp_complete_task_with_followup(auth_client):
     """Test MCP complete task with followup."""
     # Create and reserve task using MCP endpoint
@@ -297,6 +330,153 @@ def test_mcp_create_task_with_due_date(auth_client):
     assert task["due_date"] == due_date or task["due_date"].startswith(due_date[:10])  # Allow for timezone differences
 
 
+def test_mcp_jsonrpc_batch(auth_client):
+    """Test JSON-RPC batch: responses in order, reads see earlier writes, notifications get no response."""
+    import json
+    
+    create_response = auth_client.post("/mcp/create_task", json={
+        "title": "Batch Task",
+        "task_type": "concrete",
+        "task_instruction": "Do it",
+        "verification_instruction": "Verify it",
+        "agent_id": "test-agent"
+    })
+    task_id = create_response.json()["task_id"]
+    
+    def call(request_id, name, arguments):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call",
+                "params": {"name": name, "arguments": arguments}}
+    
+    response = auth_client.post("/mcp", json=[
+        call(1, "reserve_task", {"task_id": task_id, "agent_id": "batch-agent"}),
+        call(2, "get_task_context", {"task_id": task_id}),
+        {"jsonrpc": "2.0", "method": "tools/list"},
+        42,
+        call(3, "complete_task", {"task_id": task_id, "agent_id": "batch-agent"}),
+        call(4, "get_task_context", {"task_id": task_id}),
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["id"] for r in results] == [1, 2, None, 3, 4]
+    assert results[2]["error"]["code"] == -32600
+    
+    context = json.loads(results[1]["result"]["content"][0]["text"])
+    assert context["task"]["task_status"] == "in_progress"
+    context = json.loads(results[4]["result"]["content"][0]["text"])
+    assert context["task"]["task_status"] == "complete"
+    
+    # Only notifications: no response body
+    response = auth_client.post("/mcp", json=[{"jsonrpc": "2.0", "method": "tools/list"}])
+    assert response.status_code == 204
+    
+    # Empty batch is a single Invalid Request error
+    response = auth_client.post("/mcp", json=[])
+    assert response.json()["error"]["code"] == -32600
+
+
+def test_jsonrpc_batch_call_errors_stay_in_their_response():
+    """Test an exception from one batch call becomes its error response; the other calls still answer."""
+    import asyncio
+    from todorama.exceptions import DatabaseTimeoutError
+    from todorama.mcp.request_handlers import handle_jsonrpc_batch
+    
+    async def run(func, request):
+        if request["id"] == 2:
+            raise DatabaseTimeoutError("get_task_context timed out")
+        if request["id"] == 3:
+            raise RuntimeError("boom")
+        return {"jsonrpc": "2.0", "id": request["id"], "result": {}}
+    
+    def call(request_id, name):
+        return {"jsonrpc": "2.0", "id": request_id, "method": "tools/call", "params": {"name": name}}
+    
+    results = asyncio.run(handle_jsonrpc_batch([
+        call(1, "reserve_task"),
+        call(2, "get_task_context"),
+        call(3, "complete_task"),
+        call(4, "get_task_context"),
+    ], run=run))
+    assert [r["id"] for r in results] == [1, 2, 3, 4]
+    assert results[0]["result"] == {} and results[3]["result"] == {}
+    assert results[1]["error"]["code"] == -32603
+    assert results[1]["error"]["data"]["error_type"] == "DatabaseTimeoutError"
+    assert results[2]["error"]["code"] == -32603
+    assert results[2]["error"]["message"] == "Internal error: boom"
+
+
+def test_plan_jsonrpc_batch_groups_consecutive_reads():
+    """Test consecutive read-only calls share a step and writes run alone."""
+    from todorama.mcp.request_handlers import plan_jsonrpc_batch
+    
+    def call(name):
+        return {"method": "tools/call", "params": {"name": name}}
+    
+    requests = [
+        {"method": "tools/list"},
+        call("get_task_context"),
+        call("add_task_update"),
+        call("complete_task"),
+        call("query_tasks"),
+        call("search_tasks"),
+    ]
+    assert plan_jsonrpc_batch(requests) == [[0, 1], [2], [3], [4, 5]]
+
+
+def test_mcp_tools_catalog_etag(auth_client):
+    """Test tools/list is served from the precomputed catalog with an ETag."""
+    import json
+    
+    response = auth_client.get("/mcp/tools")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    catalog = response.json()
+    assert catalog["_meta"]["catalogVersion"] in etag
+    
+    # JSON-RPC tools/list returns the same catalog
+    rpc = auth_client.post("/mcp", json={"jsonrpc": "2.0", "id": "t1", "method": "tools/list"}).json()
+    assert rpc["id"] == "t1"
+    assert rpc["result"] == catalog
+    
+    # A client holding the current version skips the download
+    response = auth_client.get("/mcp/tools", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    response = auth_client.get("/mcp/functions", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    # Compact variant: same tools and required arrays, shorter descriptions
+    compact = auth_client.get("/mcp/tools", params={"compact": "true"})
+    assert compact.headers["ETag"] != etag
+    assert len(compact.content) < len(json.dumps(catalog))
+    compact_tools = compact.json()["tools"]
+    assert [t["name"] for t in compact_tools] == [t["name"] for t in catalog["tools"]]
+    assert [t["inputSchema"]["required"] for t in compact_tools] == \
+        [t["inputSchema"]["required"] for t in catalog["tools"]]
+
+
+def test_tools_catalog_is_precomputed():
+    """Test the catalog matches MCP_FUNCTIONS and is not rebuilt per call."""
+    from todorama.mcp.catalog import TOOLS, COMPACT_TOOLS, tools_list_result
+    from todorama.mcp.functions import MCP_FUNCTIONS
+    from todorama.mcp.request_handlers import handle_jsonrpc_request
+    
+    assert [t["name"] for t in TOOLS] == [f["name"] for f in MCP_FUNCTIONS]
+    reserve = next(t for t in TOOLS if t["name"] == "reserve_task")
+    assert reserve["inputSchema"]["required"] == ["task_id", "agent_id"]
+    
+    compact = next(t for t in COMPACT_TOOLS if t["name"] == "reserve_task")
+    assert "\n" not in compact["description"]
+    assert "example" not in compact["inputSchema"]["properties"]["task_id"]
+    
+    first = handle_jsonrpc_request({"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+    second = handle_jsonrpc_request({"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+    assert first["result"] is second["result"] is tools_list_result()
+    compact_result = handle_jsonrpc_request(
+        {"jsonrpc": "2.0", "id": 3, "method": "tools/list", "params": {"compact": True}}
+    )
+    assert compact_result["result"]["tools"] is COMPACT_TOOLS
+
+
 def test_mcp_post_tools_call_create_task_with_due_date(auth_client):
     """Test MCP tools/call for create_task with due_date - CRITICAL for MCP integration."""
     from datetime import datetime, timedelta
@@ -478,6 +658,13 @@ def test_mcp_sse_endpoint_connectivity(auth_client):
     # CRITICAL: The SSE endpoint has an infinite keep-alive loop, so we must limit reading
     import threading
     import time
+    from unittest.mock import patch
+    
+    class FiniteEventStream:
+        """TestClient buffers whole responses, so end the event stream after one event."""
+        async def events(self, **filters):
+            yield None
+            yield {"id": 7, "event": "task.created", "task_id": 1, "task_type": "concrete"}
     
     content_parts = []
     read_complete = threading.Event()
@@ -508,12 +695,13 @@ def test_mcp_sse_endpoint_connectivity(auth_client):
     
     # Start reading in a separate thread
     thread = threading.Thread(target=read_stream, daemon=True)
-    thread.start()
-    
-    # Wait for completion with timeout (10 seconds max)
-    if not read_complete.wait(timeout=10.0):
-        # Timeout - the test is hanging
-        raise TimeoutError("SSE endpoint test timed out after 10 seconds - endpoint may be hanging")
+    with patch("todorama.task_events.get_task_event_stream", return_value=FiniteEventStream()):
+        thread.start()
+        
+        # Wait for completion with timeout (10 seconds max)
+        if not read_complete.wait(timeout=10.0):
+            # Timeout - the test is hanging
+            raise TimeoutError("SSE endpoint test timed out after 10 seconds - endpoint may be hanging")
     
     # Check for exceptions
     if exception_occurred[0]:
@@ -527,6 +715,11 @@ def test_mcp_sse_endpoint_connectivity(auth_client):
     assert "event: message" in content or "jsonrpc" in content or "data:" in content
     # Check for protocol version or tools list
     assert "2.0" in content or "protocolVersion" in content or "tools" in content or "todo-mcp-service" in content
+    
+    # Heartbeats and task events follow the function list
+    assert ": keep-alive" in content
+    assert "id: 7" in content
+    assert "notifications/task_event" in content
 
 
 def test_mcp_post_initialize(auth_client):
@@ -18,6 +18,7 @@ from todorama.services.import_service import ImportService
 def mock_db():
     """Create a mock database."""
     db = MagicMock()
+    db.get_task_titles.return_value = set()  # No existing tasks
     return db
 
 
@@ -47,8 +48,7 @@ class TestImportJSON:
                 "verification_instruction": "Verify it too"
             }
         ]
-        mock_db.query_tasks.return_value = []  # No duplicates
-        mock_db.create_task.side_effect = [1, 2]  # Return task IDs
+        mock_db.bulk_create_tasks.return_value = [1, 2]  # Return task IDs
         
         # Execute
         result = import_service.import_json(
@@ -65,7 +65,10 @@ class TestImportJSON:
         assert result["task_ids"] == [1, 2]
         assert len(result["errors"]) == 0
         assert len(result["skipped_tasks"]) == 0
-        assert mock_db.create_task.call_count == 2
+        # Both tasks are created in one batch
+        assert mock_db.bulk_create_tasks.call_count == 1
+        assert [t["title"] for t in mock_db.bulk_create_tasks.call_args[0][0]] == ["Task 1", "Task 2"]
+        assert mock_db.create_task.call_count == 0
     
     def test_import_json_with_duplicates_skip(self, import_service, mock_db):
         """Test JSON import with duplicate skipping."""
@@ -84,8 +87,7 @@ class TestImportJSON:
                 "verification_instruction": "Verify it"
             }
         ]
-        mock_db.query_tasks.return_value = []  # No existing duplicates
-        mock_db.create_task.return_value = 1
+        mock_db.bulk_create_tasks.return_value = [1]
         
         # Execute
         result = import_service.import_json(
@@ -101,7 +103,7 @@ class TestImportJSON:
         assert result["created"] == 1
         assert len(result["skipped_tasks"]) == 1
         assert result["skipped_tasks"][0]["reason"] == "duplicate in batch"
-        assert mock_db.create_task.call_count == 1
+        assert len(mock_db.bulk_create_tasks.call_args[0][0]) == 1
     
     def test_import_json_with_existing_duplicate(self, import_service, mock_db):
         """Test JSON import skipping existing duplicate."""
@@ -114,10 +116,8 @@ class TestImportJSON:
                 "verification_instruction": "Verify it"
             }
         ]
-        # Return existing task with same title
-        mock_db.query_tasks.return_value = [
-            {"id": 99, "title": "Existing Task", "task_type": "concrete"}
-        ]
+        # Existing task with same title
+        mock_db.get_task_titles.return_value = {"Existing Task"}
         
         # Execute
         result = import_service.import_json(
@@ -132,7 +132,8 @@ class TestImportJSON:
         assert result["imported_count"] == 0
         assert len(result["skipped_tasks"]) == 1
         assert result["skipped_tasks"][0]["reason"] == "duplicate"
-        assert mock_db.create_task.call_count == 0
+        mock_db.get_task_titles.assert_called_once_with(None)
+        assert mock_db.bulk_create_tasks.call_count == 0
     
     def test_import_json_with_relationships(self, import_service, mock_db):
         """Test JSON import with parent-child relationships."""
@@ -155,8 +156,7 @@ class TestImportJSON:
                 "relationship_type": "subtask"
             }
         ]
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.side_effect = [1, 2]  # Parent=1, Child=2
+        mock_db.bulk_create_tasks.return_value = [1, 2]  # Parent=1, Child=2
         
         # Execute
         result = import_service.import_json(
@@ -169,14 +169,52 @@ class TestImportJSON:
         # Verify
         assert result["success"] is True
         assert result["imported_count"] == 2
-        assert mock_db.create_task.call_count == 2
-        # Verify relationship was created
-        mock_db.create_relationship.assert_called_once_with(
-            parent_task_id=1,
-            child_task_id=2,
-            relationship_type="subtask",
-            agent_id="test-agent"
+        # Verify relationship was created in a batch
+        mock_db.bulk_create_relationships.assert_called_once_with([(1, 2, "subtask")], "test-agent")
+        assert mock_db.create_relationship.call_count == 0
+    
+    def test_import_json_skips_circular_relationships(self, import_service, mock_db):
+        """Test that blocking relationships are validated in one batch and cycles are reported."""
+        # Setup
+        tasks = [
+            {
+                "title": "Task A",
+                "task_type": "concrete",
+                "task_instruction": "A instruction",
+                "verification_instruction": "Verify A",
+                "import_id": "a",
+                "parent_import_id": "b",
+                "relationship_type": "blocked_by"
+            },
+            {
+                "title": "Task B",
+                "task_type": "concrete",
+                "task_instruction": "B instruction",
+                "verification_instruction": "Verify B",
+                "import_id": "b",
+                "parent_import_id": "a",
+                "relationship_type": "blocked_by"
+            }
+        ]
+        mock_db.bulk_create_tasks.return_value = [1, 2]  # A=1, B=2
+        mock_db.check_circular_dependencies.return_value = [None, [1, 2, 1]]
+        
+        # Execute
+        result = import_service.import_json(
+            tasks=tasks,
+            agent_id="test-agent",
+            project_id=None,
+            handle_duplicates="error"
         )
+        
+        # Verify
+        mock_db.check_circular_dependencies.assert_called_once_with([
+            (2, 1, "blocked_by"),
+            (1, 2, "blocked_by")
+        ])
+        mock_db.bulk_create_relationships.assert_called_once_with([(2, 1, "blocked_by")], "test-agent")
+        assert result["error_count"] == 1
+        assert "1 -> 2 -> 1" in result["errors"][0]["error"]
     
     def test_import_json_with_due_date(self, import_service, mock_db):
         """Test JSON import with due date parsing."""
@@ -190,8 +228,7 @@ class TestImportJSON:
                 "due_date": "2024-12-31T23:59:59Z"
             }
         ]
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.return_value = 1
+        mock_db.bulk_create_tasks.return_value = [1]
         
         # Execute
         result = import_service.import_json(
@@ -205,9 +242,9 @@ class TestImportJSON:
         assert result["success"] is True
         assert result["imported_count"] == 1
         # Verify due_date was parsed correctly
-        call_args = mock_db.create_task.call_args
-        assert call_args[1]["due_date"] is not None
-        assert isinstance(call_args[1]["due_date"], datetime)
+        created = mock_db.bulk_create_tasks.call_args[0][0][0]
+        assert created["due_date"] is not None
+        assert isinstance(created["due_date"], datetime)
     
     def test_import_json_with_errors(self, import_service, mock_db):
         """Test JSON import handling errors gracefully."""
@@ -224,8 +261,7 @@ class TestImportJSON:
                 # Missing required fields
             }
         ]
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.side_effect = [1, Exception("Missing required field")]
+        mock_db.bulk_create_tasks.return_value = [1]
         
         # Execute
         result = import_service.import_json(
@@ -251,8 +287,7 @@ class TestImportCSV:
         csv_content = """title,task_type,task_instruction,verification_instruction
 Task 1,concrete,Do something,Verify it
 Task 2,concrete,Do something else,Verify it too"""
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.side_effect = [1, 2]
+        mock_db.bulk_create_tasks.return_value = [1, 2]
         
         # Execute
         result = import_service.import_csv(
@@ -269,7 +304,7 @@ Task 2,concrete,Do something else,Verify it too"""
         assert result["created"] == 2
         assert result["task_ids"] == [1, 2]
         assert len(result["errors"]) == 0
-        assert mock_db.create_task.call_count == 2
+        assert len(mock_db.bulk_create_tasks.call_args[0][0]) == 2
     
     def test_import_csv_with_field_mapping(self, import_service, mock_db):
         """Test CSV import with field mapping."""
@@ -282,8 +317,7 @@ Task 1,concrete,Do something,Verify it"""
             "task_instruction": "Instruction",
             "verification_instruction": "Verification"
         }
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.return_value = 1
+        mock_db.bulk_create_tasks.return_value = [1]
         
         # Execute
         result = import_service.import_csv(
@@ -298,10 +332,10 @@ Task 1,concrete,Do something,Verify it"""
         assert result["success"] is True
         assert result["imported_count"] == 1
         # Verify correct fields were used
-        call_args = mock_db.create_task.call_args
-        assert call_args[1]["title"] == "Task 1"
-        assert call_args[1]["task_type"] == "concrete"
-        assert call_args[1]["task_instruction"] == "Do something"
+        created = mock_db.bulk_create_tasks.call_args[0][0][0]
+        assert created["title"] == "Task 1"
+        assert created["task_type"] == "concrete"
+        assert created["task_instruction"] == "Do something"
     
     def test_import_csv_missing_required_fields(self, import_service, mock_db):
         """Test CSV import with missing required fields."""
@@ -325,17 +359,15 @@ Task 1,concrete"""
         assert result["error_count"] == 1
         assert len(result["errors"]) == 1
         assert "Missing required field" in result["errors"][0]["error"]
-        assert mock_db.create_task.call_count == 0
+        assert mock_db.bulk_create_tasks.call_count == 0
     
     def test_import_csv_with_duplicates_skip(self, import_service, mock_db):
         """Test CSV import skipping duplicates."""
         # Setup
         csv_content = """title,task_type,task_instruction,verification_instruction
 Existing Task,concrete,Do something,Verify it"""
-        # Return existing task
-        mock_db.query_tasks.return_value = [
-            {"id": 99, "title": "Existing Task", "task_type": "concrete"}
-        ]
+        # Existing task with same title
+        mock_db.get_task_titles.return_value = {"Existing Task"}
         
         # Execute
         result = import_service.import_csv(
@@ -351,15 +383,14 @@ Existing Task,concrete,Do something,Verify it"""
         assert result["imported_count"] == 0
         assert len(result["skipped_tasks"]) == 1
         assert result["skipped_tasks"][0]["reason"] == "duplicate"
-        assert mock_db.create_task.call_count == 0
+        assert mock_db.bulk_create_tasks.call_count == 0
     
     def test_import_csv_with_optional_fields(self, import_service, mock_db):
         """Test CSV import with optional fields (project_id, estimated_hours, due_date)."""
         # Setup
         csv_content = """title,task_type,task_instruction,verification_instruction,project_id,estimated_hours,due_date,priority,notes
 Task 1,concrete,Do something,Verify it,1,2.5,2024-12-31T23:59:59,high,Test notes"""
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.return_value = 1
+        mock_db.bulk_create_tasks.return_value = [1]
         
         # Execute
         result = import_service.import_csv(
@@ -373,20 +404,19 @@ Task 1,concrete,Do something,Verify it,1,2.5,2024-12-31T23:59:59,high,Test notes
         # Verify
         assert result["success"] is True
         assert result["imported_count"] == 1
-        call_args = mock_db.create_task.call_args
-        assert call_args[1]["project_id"] == 1
-        assert call_args[1]["estimated_hours"] == 2.5
-        assert call_args[1]["priority"] == "high"
-        assert call_args[1]["notes"] == "Test notes"
-        assert call_args[1]["due_date"] is not None
+        created = mock_db.bulk_create_tasks.call_args[0][0][0]
+        assert created["project_id"] == 1
+        assert created["estimated_hours"] == 2.5
+        assert created["priority"] == "high"
+        assert created["notes"] == "Test notes"
+        assert created["due_date"] is not None
     
     def test_import_csv_invalid_due_date(self, import_service, mock_db):
         """Test CSV import with invalid due date (should skip parsing, not fail)."""
         # Setup
         csv_content = """title,task_type,task_instruction,verification_instruction,due_date
 Task 1,concrete,Do something,Verify it,invalid-date"""
-        mock_db.query_tasks.return_value = []
-        mock_db.create_task.return_value = 1
+        mock_db.bulk_create_tasks.return_value = [1]
         
         # Execute
         result = import_service.import_csv(
@@ -401,15 +431,16 @@ Task 1,concrete,Do something,Verify it,invalid-date"""
         assert result["success"] is True
         assert result["imported_count"] == 1
         # Invalid due_date should be None, not cause an error
-        call_args = mock_db.create_task.call_args
-        assert call_args[1]["due_date"] is None
+        created = mock_db.bulk_create_tasks.call_args[0][0][0]
+        assert created["due_date"] is None
     
     def test_import_csv_with_errors(self, import_service, mock_db):
         """Test CSV import handling errors gracefully."""
         # Setup
         csv_content = """title,task_type,task_instruction,verification_instruction
 Task 1,concrete,Do something,Verify it"""
-        mock_db.query_tasks.return_value = []
+        # The batch fails, then the row fails again on its own
+        mock_db.bulk_create_tasks.side_effect = Exception("Database error")
         mock_db.create_task.side_effect = Exception("Database error")
         
         # Execute
@@ -426,3 +457,67 @@ Task 1,concrete,Do something,Verify it"""
         assert result["imported_count"] == 0
         assert result["error_count"] == 1
         assert len(result["errors"]) == 1
+    
+    def test_import_csv_duplicate_rows_skip(self, import_service, mock_db):
+        """Test that a repeated row is skipped as a duplicate of the row queued before it."""
+        csv_content = """title,task_type,task_instruction,verification_instruction
+Task 1,concrete,Do something,Verify it
+Task 1,concrete,Do something,Verify it"""
+        mock_db.bulk_create_tasks.return_value = [1]
+        
+        result = import_service.import_csv(
+            csv_content=csv_content,
+            agent_id="test-agent",
+            handle_duplicates="skip"
+        )
+        
+        assert result["task_ids"] == [1]
+        assert result["skipped_tasks"] == [{"title": "Task 1", "reason": "duplicate"}]
+        # Existing titles are loaded once, not searched per row
+        assert mock_db.get_task_titles.call_count == 1
+        assert mock_db.query_tasks.call_count == 0
+
+
+class TestImportBatching:
+    """Tests for chunked task creation."""
+    
+    def test_import_json_chunks_and_reports_progress(self, import_service, mock_db):
+        """Test that large imports are written one chunk per transaction with progress."""
+        tasks = [
+            {
+                "title": f"Task {i}",
+                "task_type": "concrete",
+                "task_instruction": "Do something",
+                "verification_instruction": "Verify it"
+            }
+            for i in range(5)
+        ]
+        mock_db.bulk_create_tasks.side_effect = lambda chunk, agent_id: [int(t["title"].split()[1]) + 1 for t in chunk]
+        progress = Mock()
+        
+        with patch("todorama.services.import_service.IMPORT_CHUNK_SIZE", 2):
+            result = import_service.import_json(tasks=tasks, agent_id="test-agent", progress=progress)
+        
+        assert result["task_ids"] == [1, 2, 3, 4, 5]
+        assert [len(c[0][0]) for c in mock_db.bulk_create_tasks.call_args_list] == [2, 2, 1]
+        assert [c[0] for c in progress.call_args_list] == [(2, 5), (4, 5), (5, 5)]
+    
+    def test_import_json_failed_chunk_retries_row_by_row(self, import_service, mock_db):
+        """Test that a failed chunk is retried per row so only bad rows are reported."""
+        tasks = [
+            {
+                "title": f"Task {i}",
+                "task_type": "concrete",
+                "task_instruction": "Do something",
+                "verification_instruction": "Verify it",
+                "priority": "urgent" if i == 1 else None
+            }
+            for i in range(3)
+        ]
+        mock_db.bulk_create_tasks.side_effect = ValueError("Invalid priority: urgent")
+        mock_db.create_task.side_effect = [10, ValueError("Invalid priority: urgent"), 12]
+        
+        result = import_service.import_json(tasks=tasks, agent_id="test-agent")
+        
+        assert result["task_ids"] == [10, 12]
+        assert result["errors"] == [{"task": "Task 1", "error": "Invalid priority: urgent"}]
@@ -54,7 +54,7 @@ class TestCreateProject:
         }
         
         # Execute
-        with patch('todorama.services.project_service.notify_webhooks', new_callable=AsyncMock), \
+        with patch('todorama.services.project_service.notify_webhooks'), \
              patch('todorama.services.project_service.send_task_notification', new_callable=AsyncMock):
             result = project_service.create_project(project_data)
         
@@ -0,0 +1,166 @@
+"""
+Tests for server-push task events on the MCP SSE channel.
+"""
+import asyncio
+
+from todorama.task_events import TaskEventStream, event_matches
+
+
+class FakeEventDatabase:
+    """Stand-in for TodoDatabase serving events from a list, counting polls."""
+
+    def __init__(self):
+        self.events = []
+        self.polls = 0
+        # IDs of events written by transactions that have not committed yet
+        self.uncommitted = set()
+
+    def add(self, event, task_type="concrete", project_id=1):
+        event_id = len(self.events) + 1
+        self.events.append({
+            "id": event_id, "event": event, "task_id": event_id,
+            "task_type": task_type, "project_id": project_id, "organization_id": None
+        })
+        return event_id
+
+    def get_latest_task_event_id(self):
+        return self.events[-1]["id"] if self.events else 0
+
+    def get_task_events(self, after_id=0, limit=500):
+        self.polls += 1
+        return [e for e in self.events if e["id"] > after_id and e["id"] not in self.uncommitted][:limit]
+
+    def get_change_history_ids(self, after_id=0, limit=500):
+        return [e["id"] for e in self.get_task_events(after_id, limit)]
+
+
+async def _run(func, *args):
+    return func(*args)
+
+
+def _stream(db, **kwargs):
+    return TaskEventStream(lambda: db, run=_run, poll_interval=0.01, **kwargs)
+
+
+async def _collect(events, count):
+    received = []
+    async for event in events:
+        if event is not None:
+            received.append(event)
+        if len(received) == count:
+            break
+    return received
+
+
+def test_event_matches_filters():
+    """Agent type maps to claimable task types; project and organization must match."""
+    event = {"task_type": "epic", "project_id": 2, "organization_id": 5}
+    assert event_matches(event)
+    assert event_matches(event, project_id=2, agent_type="breakdown", organization_id=5)
+    assert not event_matches(event, agent_type="implementation")
+    assert not event_matches(event, project_id=3)
+    assert not event_matches(event, organization_id=6)
+
+
+def test_subscribers_share_one_poller():
+    """New events fan out to every subscriber, each filtered, from a single poll loop."""
+    db = FakeEventDatabase()
+    db.add("task.created")
+    stream = _stream(db)
+
+    async def scenario():
+        everything = asyncio.ensure_future(_collect(stream.events(), 3))
+        breakdown = asyncio.ensure_future(_collect(stream.events(agent_type="breakdown"), 1))
+        await asyncio.sleep(0.05)
+        db.add("task.created", task_type="concrete")
+        db.add("task.available", task_type="epic")
+        db.add("task.completed", task_type="concrete")
+        return await asyncio.wait_for(asyncio.gather(everything, breakdown), 2)
+
+    everything, breakdown = asyncio.run(scenario())
+    assert [e["id"] for e in everything] == [2, 3, 4]
+    assert [e["event"] for e in breakdown] == ["task.available"]
+    assert stream._subscriptions == set()
+
+
+def test_last_event_id_replays_missed_events():
+    """A reconnecting client gets the events after Last-Event-ID, then live ones, without duplicates."""
+    db = FakeEventDatabase()
+    for _ in range(5):
+        db.add("task.created")
+    stream = _stream(db, batch_size=2)
+
+    async def scenario():
+        resumed = asyncio.ensure_future(_collect(stream.events(last_event_id=2), 4))
+        await asyncio.sleep(0.05)
+        db.add("task.unlocked")
+        return await asyncio.wait_for(resumed, 2)
+
+    assert [e["id"] for e in asyncio.run(scenario())] == [3, 4, 5, 6]
+
+
+def test_heartbeat_and_close():
+    """Idle streams yield None as a heartbeat; close() ends open streams."""
+    stream = _stream(FakeEventDatabase(), heartbeat_interval=0.02)
+
+    async def scenario():
+        events = stream.events()
+        assert await events.__anext__() is None
+        stream.close()
+        return [event async for event in events]
+
+    assert asyncio.run(scenario()) == []
+
+
+def test_slow_subscriber_is_disconnected():
+    """A subscriber with too many undelivered events is dropped instead of buffering forever."""
+    db = FakeEventDatabase()
+    stream = _stream(db, max_pending=2)
+
+    async def scenario():
+        events = stream.events()
+        first = asyncio.ensure_future(events.__anext__())
+        await asyncio.sleep(0.05)
+        for _ in range(5):
+            db.add("task.created")
+        await first
+        await asyncio.sleep(0.05)
+        return [event async for event in events]
+
+    assert len(asyncio.run(scenario())) < 4
+    assert stream._subscriptions == set()
+
+
+def test_events_wait_for_lower_ids_committed_late():
+    """Events above a missing ID are held until it commits, so they arrive in ID order."""
+    db = FakeEventDatabase()
+    stream = _stream(db, gap_timeout=5)
+
+    async def scenario():
+        received = asyncio.ensure_future(_collect(stream.events(), 3))
+        await asyncio.sleep(0.05)
+        db.add("task.created")
+        db.uncommitted.add(db.add("task.unlocked"))
+        db.add("task.completed")
+        await asyncio.sleep(0.1)
+        assert stream._last_id == 1
+        db.uncommitted.clear()
+        return await asyncio.wait_for(received, 2)
+
+    assert [e["id"] for e in asyncio.run(scenario())] == [1, 2, 3]
+
+
+def test_events_skip_ids_missing_longer_than_gap_timeout():
+    """An ID that never commits (a rolled-back insert) holds events back for gap_timeout only."""
+    db = FakeEventDatabase()
+    stream = _stream(db, gap_timeout=0.1)
+
+    async def scenario():
+        received = asyncio.ensure_future(_collect(stream.events(), 2))
+        await asyncio.sleep(0.05)
+        db.add("task.created")
+        db.uncommitted.add(db.add("task.unlocked"))
+        db.add("task.completed")
+        return await asyncio.wait_for(received, 2)
+
+    assert [e["id"] for e in asyncio.run(scenario())] == [1, 3]
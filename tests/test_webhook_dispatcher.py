@@ -0,0 +1,179 @@
+"""
+Tests for the batched webhook delivery pipeline.
+"""
+import asyncio
+import json
+import threading
+import time
+
+from todorama.webhooks import WebhookDispatcher
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.text = ""
+
+
+class FakeClient:
+    """Shared async client that records requests and concurrency per URL."""
+
+    def __init__(self, status_for=None, delay=0.0):
+        self.status_for = status_for or (lambda url: 200)
+        self.delay = delay
+        self.requests = []
+        self.active = {}
+        self.max_active = {}
+        self.closed = False
+
+    async def post(self, url, content=None, headers=None, timeout=None):
+        self.requests.append((url, json.loads(content), headers))
+        self.active[url] = self.active.get(url, 0) + 1
+        self.max_active[url] = max(self.max_active.get(url, 0), self.active[url])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active[url] -= 1
+        return FakeResponse(self.status_for(url))
+
+    async def aclose(self):
+        self.closed = True
+
+
+class FakeWebhookDatabase:
+    """Stand-in for TodoDatabase recording delivery logs and the outbox."""
+
+    def __init__(self, webhooks=()):
+        self.webhooks = {w["id"]: w for w in webhooks}
+        self.outbox = []
+        self.log_batches = []
+        self.lock = threading.Lock()
+
+    def record_webhook_deliveries(self, rows):
+        with self.lock:
+            self.log_batches.append(list(rows))
+
+    def save_webhook_outbox(self, rows):
+        with self.lock:
+            self.outbox.extend(rows)
+
+    def take_webhook_outbox(self):
+        with self.lock:
+            rows, self.outbox = self.outbox, []
+        return rows
+
+    def get_webhook(self, webhook_id):
+        return self.webhooks.get(webhook_id)
+
+    @property
+    def logged(self):
+        with self.lock:
+            return [row for batch in self.log_batches for row in batch]
+
+
+def _webhook(webhook_id, url="https://example.com/hook", retry_count=3):
+    return {"id": webhook_id, "url": url, "secret": "s3cret", "retry_count": retry_count,
+            "timeout_seconds": 5, "enabled": True}
+
+
+def _dispatcher(db, client, **kwargs):
+    kwargs.setdefault("log_flush_interval", 0.01)
+    kwargs.setdefault("retry_delay", 0.01)
+    return WebhookDispatcher(db, client_factory=lambda: client, **kwargs)
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_deliveries_share_one_client_and_log_in_batches():
+    """Deliveries are signed, sent on the shared client and logged with batched inserts."""
+    db = FakeWebhookDatabase()
+    client = FakeClient()
+    dispatcher = _dispatcher(db, client, log_batch_size=1000)
+    dispatcher.start()
+    for n in range(20):
+        dispatcher.enqueue(db, _webhook(1), "task.created", {"n": n})
+    _wait_for(lambda: len(db.logged) == 20)
+    dispatcher.stop()
+
+    assert sorted(body["n"] for _, body, _ in client.requests) == list(range(20))
+    assert client.requests[0][2]["X-Webhook-Signature"].startswith("sha256=")
+    assert len(db.log_batches) < 20
+    assert all(row["status"] == "success" for row in db.logged)
+    assert client.closed
+    assert db.outbox == []
+
+
+def test_endpoint_concurrency_is_limited():
+    """A single endpoint never has more deliveries in flight than its limit."""
+    db = FakeWebhookDatabase()
+    client = FakeClient(delay=0.02)
+    dispatcher = _dispatcher(db, client, endpoint_concurrency=2)
+    dispatcher.start()
+    for n in range(8):
+        dispatcher.enqueue(db, _webhook(1, url="https://slow.example.com"), "task.created", {"n": n})
+        dispatcher.enqueue(db, _webhook(2, url="https://fast.example.com"), "task.created", {"n": n})
+    _wait_for(lambda: len(db.logged) == 16)
+    dispatcher.stop()
+
+    assert client.max_active["https://slow.example.com"] == 2
+    assert client.max_active["https://fast.example.com"] == 2
+
+
+def test_failures_retry_then_open_circuit():
+    """Failed deliveries are retried with backoff; repeated failures hold the endpoint back."""
+    db = FakeWebhookDatabase()
+    client = FakeClient(status_for=lambda url: 500)
+    dispatcher = _dispatcher(db, client, breaker_threshold=2, breaker_cooldown=60)
+    dispatcher.start()
+    dispatcher.enqueue(db, _webhook(1, retry_count=5), "task.created", {"n": 1})
+    _wait_for(lambda: len(db.logged) == 2)
+    time.sleep(0.1)
+    # The circuit opened after two failures, so no further attempts are made
+    assert len(client.requests) == 2
+    dispatcher.stop()
+
+    assert [row["attempt_number"] for row in db.logged] == [1, 2]
+    assert all(row["status"] == "failed" for row in db.logged)
+    # The held-back retry is saved with its attempt number
+    assert db.outbox == [{"webhook_id": 1, "event_type": "task.created",
+                          "payload": json.dumps({"n": 1}), "attempt_number": 3}]
+
+
+def test_shutdown_saves_undelivered_and_restart_replays_them():
+    """Queued deliveries left at shutdown go to the outbox and are sent on the next start."""
+    db = FakeWebhookDatabase(webhooks=[_webhook(1)])
+    slow = FakeClient(delay=10)
+    dispatcher = _dispatcher(db, slow, max_concurrency=1)
+    dispatcher.start()
+    for n in range(3):
+        dispatcher.enqueue(db, _webhook(1), "task.created", {"n": n})
+    _wait_for(lambda: len(slow.requests) == 1)
+    dispatcher.stop(grace_period=0.05)
+    assert sorted(json.loads(row["payload"])["n"] for row in db.outbox) == [0, 1, 2]
+
+    # Enqueueing after stop goes straight to the outbox
+    dispatcher.enqueue(db, _webhook(1), "task.created", {"n": 3})
+    assert len(db.outbox) == 4
+
+    client = FakeClient()
+    restarted = _dispatcher(db, client)
+    restarted.start()
+    _wait_for(lambda: len(db.logged) == 4)
+    restarted.stop()
+    assert sorted(body["n"] for _, body, _ in client.requests) == [0, 1, 2, 3]
+    assert db.outbox == []
+
+
+def test_full_queue_spills_to_outbox():
+    """When the in-memory queue is full, deliveries are saved instead of dropped."""
+    db = FakeWebhookDatabase()
+    dispatcher = _dispatcher(db, FakeClient(), queue_size=0)
+    dispatcher.start()
+    dispatcher.enqueue(db, _webhook(1), "task.created", {"n": 1})
+    dispatcher.stop()
+    assert [row["payload"] for row in db.outbox] == [json.dumps({"n": 1})]
@@ -185,6 +185,18 @@ def main():
     except ImportError as e:
         logger.warning(f"VerifyCommand could not be imported: {e}")
     
+    try:
+        from todorama.commands.counters import ReconcileCountersCommand
+        register_command(ReconcileCountersCommand)
+    except ImportError as e:
+        logger.warning(f"ReconcileCountersCommand could not be imported: {e}")
+    
+    try:
+        from todorama.commands.search_index import SearchIndexCommand
+        register_command(SearchIndexCommand)
+    except ImportError as e:
+        logger.warning(f"SearchIndexCommand could not be imported: {e}")
+    
     # Create subparsers for each command
     for name, cmd_class in _COMMANDS.items():
         subparser = subparsers.add_parser(
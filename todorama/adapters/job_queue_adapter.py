@@ -8,7 +8,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 try:
-    from job_queue import JobQueue, JobType, JobPriority, JobStatus
+    from todorama.job_queue import JobQueue, JobType, JobPriority, JobStatus
     JOB_QUEUE_AVAILABLE = True
 except ImportError:
     JOB_QUEUE_AVAILABLE = False
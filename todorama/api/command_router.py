@@ -10,8 +10,9 @@ from todorama.api.entities.task_entity import TaskEntity
 from todorama.api.entities.project_entity import ProjectEntity
 from todorama.api.entities.backup_entity import BackupEntity
 from todorama.auth.dependencies import verify_api_key, optional_api_key
-from todorama.dependencies.services import get_db, get_backup_manager
+from todorama.dependencies.services import get_db, get_backup_manager, run_db
 from todorama.api.response_strategy import response_context
+from todorama.exceptions import DatabaseTimeoutError, to_http_exception
 
 logger = logging.getLogger(__name__)
 
@@ -98,7 +99,7 @@ async def entity_export(
                 params[key] = value
         
         # Call export method with format and filters
-        result = action_method(format=format, filters=params)
+        result = await run_db(action_method, format=format, filters=params)
         
         # If result is already a Response object, return it directly
         if isinstance(result, Response):
@@ -108,6 +109,8 @@ async def entity_export(
         
     except HTTPException as e:
         return response_context.render_from_exception(e)
+    except DatabaseTimeoutError as e:
+        return response_context.render_from_exception(to_http_exception(e))
     except Exception as e:
         logger.error(f"Error in entity export {entity_name}.export/{format}: {e}", exc_info=True)
         return response_context.render_server_error(f"Internal server error: {str(e)}")
@@ -291,7 +294,7 @@ async def entity_command(
                 if task_id:
                     # Call update method with task_id and body
                     if hasattr(entity, "update"):
-                        result = entity.update(task_id=task_id, update_data=body)
+                        result = await run_db(entity.update, task_id=task_id, update_data=body)
                     else:
                         raise HTTPException(
                             status_code=405,
@@ -306,13 +309,13 @@ async def entity_command(
                 # For import, call the specific import method (import_json or import_csv)
                 import_method_name = f"import_{sub_path}"
                 import_method = getattr(entity, import_method_name)
-                result = import_method(format=sub_path, **body)
+                result = await run_db(import_method, format=sub_path, **body)
             elif actual_action == "bulk" and sub_path:
                 # For bulk operations, pass the sub-action and body
                 # Convert sub_path like "complete" to method call
                 bulk_method_name = f"bulk_{sub_path.replace('-', '_')}"
                 bulk_method = getattr(entity, bulk_method_name)
-                result = bulk_method(**body)
+                result = await run_db(bulk_method, **body)
             elif action_method:
                 # If we have a path parameter (like task_id from /api/Task/1/relationships)
                 # pass it as the first argument to the method
@@ -323,14 +326,14 @@ async def entity_command(
                     params = list(sig.parameters.keys())
                     if params and params[0] not in ['self', 'kwargs']:
                         # Method expects a positional parameter, pass path_param
-                        result = action_method(path_param, **body)
+                        result = await run_db(action_method, path_param, **body)
                     else:
                         # Method expects it in kwargs, add to body
                         body['task_id'] = path_param
-                        result = action_method(**body)
+                        result = await run_db(action_method, **body)
                 else:
                     # Call method with body as kwargs
-                    result = action_method(**body)
+                    result = await run_db(action_method, **body)
             else:
                 raise HTTPException(
                     status_code=404,
@@ -362,12 +365,12 @@ async def entity_command(
                 method_params = list(sig.parameters.keys())
                 if method_params and method_params[0] not in ['self', 'kwargs']:
                     # Method expects a positional parameter, pass path_param
-                    result = action_method(path_param)
+                    result = await run_db(action_method, path_param)
                     return response_context.render_success(result)
                 else:
                     # Method expects it in query params, add it
                     params['task_id'] = path_param
-                    result = action_method(**params)
+                    result = await run_db(action_method, **params)
                     return response_context.render_success(result)
             
             # For GET, pass params as filters or direct args
@@ -376,27 +379,27 @@ async def entity_command(
             if actual_action == "list":
                 if entity_name == "Backup":
                     # BackupEntity.list() doesn't accept any parameters
-                    result = action_method()
+                    result = await run_db(action_method)
                 else:
-                    result = action_method(filters=params)
+                    result = await run_db(action_method, filters=params)
             elif actual_action == "search":
                 # Accept both 'q' and 'query' parameters for search
                 query = params.get("q") or params.get("query", "")
-                result = action_method(query=query, limit=int(params.get("limit", 100)))
+                result = await run_db(action_method, query=query, limit=int(params.get("limit", 100)))
             elif actual_action == "export" and sub_path:
                 # For export, pass format and filters
-                result = action_method(format=sub_path, filters=params)
+                result = await run_db(action_method, format=sub_path, filters=params)
             elif actual_action == "overdue":
-                result = action_method(filters=params)
+                result = await run_db(action_method, filters=params)
             elif actual_action == "approaching-deadline" or actual_action == "approaching_deadline":
                 # Handle both formats
-                result = action_method(days_ahead=int(params.get("days_ahead", 3)), filters=params)
+                result = await run_db(action_method, days_ahead=int(params.get("days_ahead", 3)), filters=params)
             elif actual_action == "get_stale":
                 # Handle get_stale with hours parameter
-                result = action_method(hours=params.get("hours"))
+                result = await run_db(action_method, hours=params.get("hours"))
             else:
                 # For other GET actions, pass params as kwargs
-                result = action_method(**params)
+                result = await run_db(action_method, **params)
         
         # Determine response strategy based on action type
         # Create actions return 201, others return 200
@@ -417,6 +420,8 @@ async def entity_command(
     except HTTPException as e:
         # Use response strategy for HTTP exceptions
         return response_context.render_from_exception(e)
+    except DatabaseTimeoutError as e:
+        return response_context.render_from_exception(to_http_exception(e))
     except Exception as e:
         logger.error(f"Error in entity command {entity_name}.{action}: {e}", exc_info=True)
         return response_context.render_server_error(f"Internal server error: {str(e)}")
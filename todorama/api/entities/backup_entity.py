@@ -83,6 +83,10 @@ class BackupEntity(BaseEntity):
             if not success:
                 raise ValueError("Restore operation failed")
             
+            # Pooled connections may still point at the replaced database file
+            if self.db is not None and hasattr(self.db, "adapter"):
+                self.db.adapter.dispose()
+            
             return {
                 "success": True,
                 "message": "Backup restored successfully"
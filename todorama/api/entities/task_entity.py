@@ -21,6 +21,7 @@ HTTPException = http_adapter.HTTPException
 from todorama.models.task_models import TaskCreate, TaskUpdate, TaskResponse
 from todorama.services.task_service import TaskService
 from todorama.services.import_service import ImportService
+from todorama.services.export_service import ExportService, EXPORT_FORMATS
 
 
 class TaskEntity(BaseEntity):
@@ -29,8 +30,9 @@ class TaskEntity(BaseEntity):
     def __init__(self, db, auth_info: Optional[Dict[str, Any]] = None):
         """Initialize task entity."""
         super().__init__(db, auth_info)
-        self.service = TaskService(db)
+        self.service = TaskService(db=db)
         self.import_service = ImportService(db)
+        self.export_service = ExportService(db)
     
     def create(self, **kwargs) -> Dict[str, Any]:
         """
@@ -318,11 +320,23 @@ class TaskEntity(BaseEntity):
                     params.append(task_update.priority)
                 
                 if updates:
+                    # Stored status (get_task reports a blocked subtask as blocked)
+                    cursor.execute("SELECT task_status FROM tasks WHERE id = ?", (task_id,))
+                    old_status = cursor.fetchone()["task_status"]
+                    
                     updates.append("updated_at = CURRENT_TIMESTAMP")
                     params.append(task_id)
                     
                     query = f"UPDATE tasks SET {', '.join(updates)} WHERE id = ?"
                     cursor.execute(query, params)
+                    
+                    # Same history row as bulk_update_status; blocked -> available is a task.available event
+                    if task_update.task_status is not None and task_update.task_status != old_status:
+                        agent_id = update_data.get("agent_id") or self.auth_info.get("agent_id") or "system"
+                        cursor.execute("""
+                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                            VALUES (?, ?, 'status_changed', 'task_status', ?, ?)
+                        """, (task_id, agent_id, old_status, task_update.task_status))
                     conn.commit()
                 
                 # Get updated task
@@ -446,54 +460,50 @@ class TaskEntity(BaseEntity):
     
     def export(self, format: str = "json", filters: Optional[Dict[str, Any]] = None) -> Any:
         """
-        Export tasks in specified format.
+        Export tasks in specified format, streamed without a size cap.
         
-        GET /api/Task/export/json or /api/Task/export/csv
-        Query params: project_id, task_status, start_date, end_date, etc.
+        GET /api/Task/export/json, /api/Task/export/ndjson or /api/Task/export/csv
+        Query params: project_id, task_type, task_status, start_date, end_date, limit
         """
         try:
-            from fastapi.responses import Response
+            from fastapi.responses import StreamingResponse
             filters = filters or {}
-            # Get tasks with filters
-            tasks = self.db.query_tasks(
-                task_type=filters.get("task_type"),
-                task_status=filters.get("task_status"),
-                project_id=filters.get("project_id"),
-                limit=filters.get("limit", 10000)
-            )
-            
-            if format == "json":
-                import json
-                # Return as dict with "tasks" key to match API expectations
-                tasks_data = {"tasks": [dict(task) for task in tasks]}
-                content = json.dumps(tasks_data, indent=2)
-                return Response(
-                    content=content,
-                    media_type="application/json",
-                    headers={"Content-Disposition": "attachment; filename=tasks.json"}
-                )
-            elif format == "csv":
-                import csv
-                import io
-                output = io.StringIO()
-                if tasks:
-                    writer = csv.DictWriter(output, fieldnames=dict(tasks[0]).keys())
-                    writer.writeheader()
-                    for task in tasks:
-                        writer.writerow(dict(task))
-                content = output.getvalue()
-                return Response(
-                    content=content,
-                    media_type="text/csv",
-                    headers={"Content-Disposition": "attachment; filename=tasks.csv"}
-                )
-            else:
+            if format not in EXPORT_FORMATS:
                 raise ValidationError(
                     message=f"Unsupported format: {format}",
                     field="format",
                     value=format
                 )
-        except (HTTPException, TaskNotFoundError, ValidationError, DuplicateError):
+            for field in ("start_date", "end_date"):
+                value = filters.get(field)
+                if value:
+                    try:
+                        datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+                    except ValueError:
+                        raise ValidationError(
+                            message=f"Invalid {field} format '{value}'. Must be ISO 8601 format.",
+                            field=field,
+                            value=value
+                        )
+            
+            content = self.export_service.stream_tasks(
+                format,
+                task_type=filters.get("task_type"),
+                task_status=filters.get("task_status"),
+                project_id=filters.get("project_id"),
+                start_date=filters.get("start_date"),
+                end_date=filters.get("end_date"),
+                limit=filters.get("limit")
+            )
+            media_type, filename = EXPORT_FORMATS[format]
+            return StreamingResponse(
+                content=content,
+                media_type=media_type,
+                headers={"Content-Disposition": f"attachment; filename={filename}"}
+            )
+        except ValidationError as e:
+            raise to_http_exception(e)
+        except (HTTPException, TaskNotFoundError, DuplicateError):
             raise
         except Exception as e:
             self._handle_error(e, "Failed to export tasks")
@@ -5,7 +5,7 @@ from typing import List, Dict, Any, Optional
 import logging
 
 from todorama.adapters.http_framework import HTTPFrameworkAdapter
-from todorama.dependencies.services import get_db
+from todorama.dependencies.services import get_db, get_async_db
 from todorama.auth.dependencies import optional_api_key, get_current_organization
 
 # Initialize adapter
@@ -33,10 +33,10 @@ async def get_analytics_metrics(
     project_id: Optional[int] = Query(None, description="Filter by project ID")
 ) -> Dict[str, Any]:
     """Get analytics metrics including completion rates."""
-    db = get_db()
+    db = get_async_db()
     try:
-        completion_rates = db.get_completion_rates(project_id=project_id)
-        avg_time = db.get_average_time_to_complete(project_id=project_id)
+        completion_rates = await db.get_completion_rates(project_id=project_id)
+        avg_time = await db.get_average_time_to_complete(project_id=project_id)
         # Ensure average_hours is not None (convert to 0 if None)
         if avg_time and avg_time.get("average_hours") is None:
             avg_time["average_hours"] = 0.0
@@ -54,9 +54,9 @@ async def get_bottlenecks(
     project_id: Optional[int] = Query(None, description="Filter by project ID")
 ) -> Dict[str, Any]:
     """Get task bottlenecks."""
-    db = get_db()
+    db = get_async_db()
     try:
-        bottlenecks = db.get_bottlenecks()
+        bottlenecks = await db.get_bottlenecks()
         # Filter by project_id if provided (post-process since method doesn't support it)
         if project_id:
             for key in ["long_running_tasks", "blocking_tasks", "blocked_tasks"]:
@@ -77,9 +77,9 @@ async def get_agent_analytics(
     project_id: Optional[int] = Query(None, description="Filter by project ID")
 ) -> Dict[str, Any]:
     """Get agent comparison analytics."""
-    db = get_db()
+    db = get_async_db()
     try:
-        agent_data = db.get_agent_comparisons()
+        agent_data = await db.get_agent_comparisons()
         agents = agent_data.get("agents", [])
         # Filter by project_id if provided (post-process)
         if project_id:
@@ -98,10 +98,10 @@ async def get_visualization_data(
     end_date: Optional[str] = Query(None, description="End date (ISO format)")
 ) -> Dict[str, Any]:
     """Get visualization data for analytics."""
-    db = get_db()
+    db = get_async_db()
     try:
         # Get completion timeline data
-        tasks = db.query_tasks(limit=1000)
+        tasks = await db.query_tasks(limit=1000)
         if start_date or end_date:
             from datetime import datetime
             filtered_tasks = []
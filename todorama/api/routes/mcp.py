@@ -1,10 +1,12 @@
 """
 MCP (Model Context Protocol) API routes.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from todorama.adapters.http_framework import HTTPFrameworkAdapter
 from todorama.mcp_api import MCPTodoAPI
+from todorama.mcp import catalog
 from todorama.auth.dependencies import optional_api_key, get_current_organization
+from todorama.dependencies.services import run_db, run_db_analytics
 from todorama.exceptions import (
     TaskNotFoundError,
     ProjectNotFoundError,
@@ -18,6 +20,7 @@ Body = http_adapter.Body
 HTTPException = http_adapter.HTTPException
 Request = http_adapter.Request
 Depends = http_adapter.Depends
+Response = http_adapter.Response
 
 # Create router using adapter, expose underlying router for compatibility
 router_adapter = http_adapter.create_router(prefix="/mcp", tags=["mcp"])
@@ -40,7 +43,8 @@ async def mcp_create_task(
     due_date: Optional[str] = Body(None, embed=True)
 ):
     """MCP: Create a new task."""
-    result = MCPTodoAPI.create_task(
+    result = await run_db(
+        MCPTodoAPI.create_task,
         title, task_type, task_instruction, verification_instruction, agent_id,
         project_id=project_id, parent_task_id=parent_task_id, relationship_type=relationship_type,
         notes=notes, priority=priority, estimated_hours=estimated_hours, due_date=due_date
@@ -69,7 +73,7 @@ async def mcp_get_agent_performance(
     task_type: Optional[str] = Body(None, embed=True)
 ):
     """MCP: Get agent performance statistics."""
-    stats = MCPTodoAPI.get_agent_performance(agent_id, task_type)
+    stats = await run_db_analytics(MCPTodoAPI.get_agent_performance, agent_id, task_type)
     return stats
 
 
@@ -79,7 +83,7 @@ async def mcp_unlock_task(
     agent_id: str = Body(..., embed=True)
 ):
     """MCP: Unlock (release) a reserved task."""
-    result = MCPTodoAPI.unlock_task(task_id, agent_id)
+    result = await run_db(MCPTodoAPI.unlock_task, task_id, agent_id)
     return result
 
 
@@ -89,7 +93,7 @@ async def mcp_bulk_unlock_tasks(
     agent_id: str = Body(..., embed=True)
 ):
     """MCP: Unlock multiple tasks atomically."""
-    result = MCPTodoAPI.bulk_unlock_tasks(task_ids, agent_id)
+    result = await run_db(MCPTodoAPI.bulk_unlock_tasks, task_ids, agent_id)
     return result
 
 
@@ -103,10 +107,12 @@ async def mcp_query_tasks(
     tag_id: Optional[int] = Body(None, embed=True),
     tag_ids: Optional[List[int]] = Body(None, embed=True),
     order_by: Optional[str] = Body(None, embed=True),
-    limit: int = Body(100, embed=True)
+    limit: int = Body(100, embed=True),
+    cursor: Optional[str] = Body(None, embed=True)
 ):
-    """MCP: Query tasks by various criteria."""
-    tasks = MCPTodoAPI.query_tasks(
+    """MCP: Query tasks by various criteria, one keyset-paginated page at a time."""
+    return await run_db(
+        MCPTodoAPI.query_tasks_page,
         project_id=project_id,
         task_type=task_type,
         task_status=task_status,
@@ -115,9 +121,9 @@ async def mcp_query_tasks(
         tag_id=tag_id,
         tag_ids=tag_ids,
         order_by=order_by,
-        limit=limit
+        limit=limit,
+        cursor=cursor
     )
-    return {"tasks": tasks}
 
 
 @router.post("/get_task_summary")
@@ -130,7 +136,8 @@ async def mcp_get_task_summary(
     limit: int = Body(100, embed=True)
 ):
     """MCP: Get lightweight task summaries (essential fields only)."""
-    result = MCPTodoAPI.get_task_summary(
+    result = await run_db(
+        MCPTodoAPI.get_task_summary,
         project_id=project_id,
         task_type=task_type,
         task_status=task_status,
@@ -150,7 +157,7 @@ async def mcp_add_task_update(
     metadata: Optional[Dict[str, Any]] = Body(None, embed=True)
 ):
     """MCP: Add a task update (progress, note, blocker, question, finding)."""
-    result = MCPTodoAPI.add_task_update(task_id, agent_id, content, update_type, metadata)
+    result = await run_db(MCPTodoAPI.add_task_update, task_id, agent_id, content, update_type, metadata)
     return result
 
 
@@ -159,7 +166,7 @@ async def mcp_get_task_context(
     task_id: int = Body(..., embed=True)
 ):
     """MCP: Get full context for a task (project, ancestry, updates)."""
-    result = MCPTodoAPI.get_task_context(task_id)
+    result = await run_db(MCPTodoAPI.get_task_context, task_id)
     return result
 
 
@@ -169,7 +176,7 @@ async def mcp_search_tasks(
     limit: int = Body(100, embed=True)
 ):
     """MCP: Search tasks using full-text search."""
-    tasks = MCPTodoAPI.search_tasks(query, limit)
+    tasks = await run_db(MCPTodoAPI.search_tasks, query, limit)
     return {"tasks": tasks}
 
 
@@ -179,7 +186,7 @@ async def mcp_link_github_issue(
     github_url: str = Body(..., embed=True)
 ):
     """MCP: Link a GitHub issue to a task."""
-    result = MCPTodoAPI.link_github_issue(task_id, github_url)
+    result = await run_db(MCPTodoAPI.link_github_issue, task_id, github_url)
     return result
 
 
@@ -189,7 +196,7 @@ async def mcp_link_github_pr(
     github_url: str = Body(..., embed=True)
 ):
     """MCP: Link a GitHub pull request to a task."""
-    result = MCPTodoAPI.link_github_pr(task_id, github_url)
+    result = await run_db(MCPTodoAPI.link_github_pr, task_id, github_url)
     return result
 
 
@@ -198,7 +205,7 @@ async def mcp_get_github_links(
     task_id: int = Body(..., embed=True)
 ):
     """MCP: Get GitHub issue and PR links for a task."""
-    result = MCPTodoAPI.get_github_links(task_id)
+    result = await run_db(MCPTodoAPI.get_github_links, task_id)
     return result
 
 
@@ -211,7 +218,7 @@ async def mcp_create_comment(
     mentions: Optional[List[str]] = Body(None, embed=True)
 ):
     """MCP: Create a comment on a task."""
-    result = MCPTodoAPI.create_comment(task_id, agent_id, content, parent_comment_id, mentions)
+    result = await run_db(MCPTodoAPI.create_comment, task_id, agent_id, content, parent_comment_id, mentions)
     return result
 
 
@@ -221,7 +228,7 @@ async def mcp_get_task_comments(
     limit: int = Body(100, embed=True)
 ):
     """MCP: Get all top-level comments for a task."""
-    result = MCPTodoAPI.get_task_comments(task_id, limit)
+    result = await run_db(MCPTodoAPI.get_task_comments, task_id, limit)
     return result
 
 
@@ -230,7 +237,7 @@ async def mcp_get_comment_thread(
     comment_id: int = Body(..., embed=True)
 ):
     """MCP: Get a complete comment thread."""
-    result = MCPTodoAPI.get_comment_thread(comment_id)
+    result = await run_db(MCPTodoAPI.get_comment_thread, comment_id)
     return result
 
 
@@ -241,7 +248,7 @@ async def mcp_update_comment(
     content: str = Body(..., embed=True)
 ):
     """MCP: Update a comment."""
-    result = MCPTodoAPI.update_comment(comment_id, agent_id, content)
+    result = await run_db(MCPTodoAPI.update_comment, comment_id, agent_id, content)
     return result
 
 
@@ -251,7 +258,7 @@ async def mcp_delete_comment(
     agent_id: str = Body(..., embed=True)
 ):
     """MCP: Delete a comment."""
-    result = MCPTodoAPI.delete_comment(comment_id, agent_id)
+    result = await run_db(MCPTodoAPI.delete_comment, comment_id, agent_id)
     return result
 
 
@@ -261,7 +268,7 @@ async def mcp_get_tasks_approaching_deadline(
     limit: int = Body(100, embed=True)
 ):
     """MCP: Get tasks with due dates approaching."""
-    result = MCPTodoAPI.get_tasks_approaching_deadline(days_ahead, limit)
+    result = await run_db(MCPTodoAPI.get_tasks_approaching_deadline, days_ahead, limit)
     return result
 
 
@@ -270,14 +277,14 @@ async def mcp_create_tag(
     name: str = Body(..., embed=True)
 ):
     """MCP: Create a new tag."""
-    result = MCPTodoAPI.create_tag(name)
+    result = await run_db(MCPTodoAPI.create_tag, name)
     return result
 
 
 @router.post("/list_tags")
 async def mcp_list_tags():
     """MCP: List all available tags."""
-    result = MCPTodoAPI.list_tags()
+    result = await run_db(MCPTodoAPI.list_tags)
     return result
 
 
@@ -287,7 +294,7 @@ async def mcp_assign_tag_to_task(
     tag_id: int = Body(..., embed=True)
 ):
     """MCP: Assign a tag to a task."""
-    result = MCPTodoAPI.assign_tag_to_task(task_id, tag_id)
+    result = await run_db(MCPTodoAPI.assign_tag_to_task, task_id, tag_id)
     return result
 
 
@@ -297,7 +304,7 @@ async def mcp_remove_tag_from_task(
     tag_id: int = Body(..., embed=True)
 ):
     """MCP: Remove a tag from a task."""
-    result = MCPTodoAPI.remove_tag_from_task(task_id, tag_id)
+    result = await run_db(MCPTodoAPI.remove_tag_from_task, task_id, tag_id)
     return result
 
 
@@ -306,7 +313,7 @@ async def mcp_get_task_tags(
     task_id: int = Body(..., embed=True)
 ):
     """MCP: Get all tags assigned to a task."""
-    result = MCPTodoAPI.get_task_tags(task_id)
+    result = await run_db(MCPTodoAPI.get_task_tags, task_id)
     return result
 
 
@@ -322,7 +329,8 @@ async def mcp_create_template(
     notes: Optional[str] = Body(None, embed=True)
 ):
     """MCP: Create a reusable task template."""
-    result = MCPTodoAPI.create_template(
+    result = await run_db(
+        MCPTodoAPI.create_template,
         name, task_type, task_instruction, verification_instruction,
         description=description, priority=priority, estimated_hours=estimated_hours, notes=notes
     )
@@ -334,7 +342,7 @@ async def mcp_list_templates(
     task_type: Optional[str] = Body(None, embed=True)
 ):
     """MCP: List all available task templates."""
-    result = MCPTodoAPI.list_templates(task_type)
+    result = await run_db(MCPTodoAPI.list_templates, task_type)
     return result
 
 
@@ -343,7 +351,7 @@ async def mcp_get_template(
     template_id: int = Body(..., embed=True)
 ):
     """MCP: Get detailed information about a specific template."""
-    result = MCPTodoAPI.get_template(template_id)
+    result = await run_db(MCPTodoAPI.get_template, template_id)
     return result
 
 
@@ -359,7 +367,8 @@ async def mcp_create_task_from_template(
     due_date: Optional[str] = Body(None, embed=True)
 ):
     """MCP: Create a new task using a template."""
-    result = MCPTodoAPI.create_task_from_template(
+    result = await run_db(
+        MCPTodoAPI.create_task_from_template,
         template_id, agent_id,
         title=title, project_id=project_id, notes=notes,
         priority=priority, estimated_hours=estimated_hours, due_date=due_date
@@ -367,45 +376,138 @@ async def mcp_create_task_from_template(
     return result
 
 
+def _catalog_response(request: Request, content: bytes, etag: str) -> Any:
+    """Serve precomputed catalog bytes, or 304 if the client already has this version."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if catalog.etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+
+def _is_tools_list(request: Union[Dict[str, Any], List[Any]]) -> bool:
+    return isinstance(request, dict) and request.get("method") == "tools/list" and "id" in request
+
+
+def _tools_list_json(request: Dict[str, Any]) -> bytes:
+    params = request.get("params") or {}
+    return catalog.tools_list_response_json(
+        request["id"], request.get("jsonrpc", "2.0"), compact=bool(params.get("compact"))
+    )
+
+
 @router.get("/functions")
-async def mcp_functions():
+async def mcp_functions(request: Request):
     """List all available MCP functions."""
-    from todorama.mcp_api import MCP_FUNCTIONS
-    return {"functions": MCP_FUNCTIONS}
+    return _catalog_response(request, catalog.FUNCTIONS_JSON, catalog.CATALOG_ETAG)
+
+
+@router.get("/tools")
+async def mcp_tools(request: Request, compact: bool = False):
+    """MCP tools/list result (tools and catalogVersion); compact=true drops long descriptions."""
+    return _catalog_response(
+        request, catalog.tools_list_result_json(compact), catalog.catalog_etag(compact)
+    )
+
+
+async def _handle_jsonrpc(request: Union[Dict[str, Any], List[Any]]) -> Any:
+    """Handle a single JSON-RPC request object or a batch array."""
+    from todorama.mcp_api import handle_jsonrpc_request, handle_jsonrpc_batch
+    if isinstance(request, list):
+        return await handle_jsonrpc_batch(request, run=run_db)
+    return await run_db(handle_jsonrpc_request, request)
 
 
 @router.post("")
-async def mcp_jsonrpc(request: dict = Body(...)):
-    """Generic JSON-RPC 2.0 endpoint for MCP."""
-    from todorama.mcp_api import handle_jsonrpc_request
-    result = handle_jsonrpc_request(request)
+async def mcp_jsonrpc(request: Union[Dict[str, Any], List[Any]] = Body(...)):
+    """Generic JSON-RPC 2.0 endpoint for MCP (single request or batch array)."""
+    if _is_tools_list(request):
+        return Response(content=_tools_list_json(request), media_type="application/json")
+    result = await _handle_jsonrpc(request)
+    if result == []:
+        # A batch of notifications gets no response body
+        return Response(status_code=204)
     return result
 
 
 @router.post("/sse")
-async def mcp_sse_post(request: dict = Body(...)):
-    """Server-Sent Events endpoint for MCP (POST)."""
-    from todorama.mcp_api import handle_jsonrpc_request
+async def mcp_sse_post(request: Union[Dict[str, Any], List[Any]] = Body(...)):
+    """Server-Sent Events endpoint for MCP (POST, single request or batch array)."""
     from todorama.adapters.http_framework import HTTPFrameworkAdapter
     http_adapter = HTTPFrameworkAdapter()
     StreamingResponse = http_adapter.StreamingResponse
     # POST requests with JSON-RPC should return SSE format for Cursor's SSE client
-    result = handle_jsonrpc_request(request)
+    if _is_tools_list(request):
+        sse_result = b"data: " + _tools_list_json(request) + b"\n\n"
+        return Response(content=sse_result, media_type="text/event-stream")
+    result = await _handle_jsonrpc(request)
+    if result == []:
+        return Response(status_code=204)
     import json
     sse_result = f"data: {json.dumps(result)}\n\n"
     return StreamingResponse(content=sse_result, media_type="text/event-stream")
 
 
+def _task_event_frame(event: Dict[str, Any]) -> str:
+    """Format a task event as an SSE frame carrying a JSON-RPC notification."""
+    import json
+    message = {"jsonrpc": "2.0", "method": "notifications/task_event", "params": event}
+    return f"id: {event['id']}\ndata: {json.dumps(message, default=str)}\n\n"
+
+
 @router.get("/sse")
-async def mcp_sse_get():
-    """Server-Sent Events endpoint for MCP (GET)."""
+async def mcp_sse_get(
+    request: Request,
+    project_id: Optional[int] = None,
+    agent_type: Optional[str] = None,
+    last_event_id: Optional[int] = None,
+    auth: Optional[Dict[str, Any]] = Depends(optional_api_key)
+):
+    """
+    Server-Sent Events endpoint for MCP (GET).
+    
+    Sends the list of available functions, then keeps the connection open and
+    pushes task lifecycle events (created, unlocked, completed, blocked ->
+    available) filtered by project_id and agent_type, with heartbeats while
+    idle. Reconnect with the Last-Event-ID header (or last_event_id) to
+    receive the events missed in between.
+    """
     from todorama.mcp_api import handle_sse_request
+    from todorama.task_events import AGENT_TASK_TYPES, get_task_event_stream
     from todorama.adapters.http_framework import HTTPFrameworkAdapter
     http_adapter = HTTPFrameworkAdapter()
     StreamingResponse = http_adapter.StreamingResponse
-    # GET endpoint with no params returns list of available functions
-    result = handle_sse_request({"method": "list_functions"})
-    return StreamingResponse(content=result, media_type="text/event-stream")
+    
+    if agent_type is not None and agent_type not in AGENT_TASK_TYPES:
+        raise ValidationError(message=f"Invalid agent_type: {agent_type}")
+    header_event_id = request.headers.get("last-event-id")
+    if header_event_id:
+        try:
+            last_event_id = int(header_event_id)
+        except ValueError:
+            raise ValidationError(message=f"Invalid Last-Event-ID: {header_event_id}")
+    
+    organization_id = None
+    if auth:
+        from todorama.dependencies.services import get_db
+        organization_id = await get_current_organization(request, auth, get_db())
+    
+    async def stream():
+        # First frame: list of available functions
+        yield handle_sse_request({})
+        events = get_task_event_stream().events(
+            last_event_id=last_event_id,
+            project_id=project_id,
+            agent_type=agent_type,
+            organization_id=organization_id
+        )
+        async for event in events:
+            yield ": keep-alive\n\n" if event is None else _task_event_frame(event)
+    
+    return StreamingResponse(
+        content=stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 @router.post("/list_available_tasks")
@@ -427,7 +529,7 @@ async def mcp_list_available_tasks(
         if org_id:
             organization_id = org_id
     
-    tasks = MCPTodoAPI.list_available_tasks(agent_type, project_id, limit, organization_id=organization_id)
+    tasks = await run_db(MCPTodoAPI.list_available_tasks, agent_type, project_id, limit, organization_id=organization_id)
     return {"tasks": tasks}
 
 
@@ -437,7 +539,29 @@ async def mcp_reserve_task(
     agent_id: str = Body(..., embed=True)
 ):
     """MCP: Reserve (lock) a task for an agent."""
-    result = MCPTodoAPI.reserve_task(task_id, agent_id)
+    result = await run_db(MCPTodoAPI.reserve_task, task_id, agent_id)
+    return result
+
+
+@router.post("/claim_next_task")
+async def mcp_claim_next_task(
+    request: Request,
+    agent_type: str = Body(..., embed=True),
+    agent_id: str = Body(..., embed=True),
+    project_id: Optional[int] = Body(None, embed=True),
+    auth: Optional[Dict[str, Any]] = Depends(optional_api_key)
+):
+    """MCP: Pick and reserve the next available task atomically. Filters by organization if authenticated."""
+    from todorama.dependencies.services import get_db
+    
+    organization_id = None
+    if auth:
+        db = get_db()
+        org_id = await get_current_organization(request, auth, db)
+        if org_id:
+            organization_id = org_id
+    
+    result = await run_db(MCPTodoAPI.claim_next_task, agent_type, agent_id, project_id, organization_id=organization_id)
     return result
 
 
@@ -453,7 +577,8 @@ async def mcp_complete_task(
     followup_verification: Optional[str] = Body(None, embed=True)
 ):
     """MCP: Mark a task as complete."""
-    result = MCPTodoAPI.complete_task(
+    result = await run_db(
+        MCPTodoAPI.complete_task,
         task_id, agent_id,
         notes=notes, actual_hours=actual_hours,
         followup_title=followup_title, followup_task_type=followup_task_type,
@@ -468,14 +593,14 @@ async def mcp_verify_task(
     agent_id: str = Body(..., embed=True)
 ):
     """MCP: Mark a task as verified."""
-    result = MCPTodoAPI.verify_task(task_id, agent_id)
+    result = await run_db(MCPTodoAPI.verify_task, task_id, agent_id)
     return result
 
 
 @router.post("/list_projects")
 async def mcp_list_projects():
     """MCP: List all available projects."""
-    result = MCPTodoAPI.list_projects()
+    result = await run_db(MCPTodoAPI.list_projects)
     return result
 
 
@@ -484,7 +609,7 @@ async def mcp_get_project(
     project_id: int = Body(..., embed=True)
 ):
     """MCP: Get project details by ID."""
-    result = MCPTodoAPI.get_project(project_id)
+    result = await run_db(MCPTodoAPI.get_project, project_id)
     return result
 
 
@@ -493,7 +618,7 @@ async def mcp_get_project_by_name(
     name: str = Body(..., embed=True)
 ):
     """MCP: Get project by name."""
-    result = MCPTodoAPI.get_project_by_name(name)
+    result = await run_db(MCPTodoAPI.get_project_by_name, name)
     return result
 
 
@@ -505,6 +630,6 @@ async def mcp_create_project(
     description: Optional[str] = Body(None, embed=True)
 ):
     """MCP: Create a new project."""
-    result = MCPTodoAPI.create_project(name, local_path, origin_url, description)
+    result = await run_db(MCPTodoAPI.create_project, name, local_path, origin_url, description)
     return result
 
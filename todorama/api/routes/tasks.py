@@ -6,8 +6,8 @@ import json
 import logging
 
 from todorama.adapters.http_framework import HTTPFrameworkAdapter
-from todorama.models.task_models import TaskResponse
-from todorama.dependencies.services import get_db
+from todorama.models.task_models import TaskResponse, TaskSearchResult
+from todorama.dependencies.services import get_db, run_db
 from todorama.services.task_service import TaskService
 from todorama.auth.permissions import TASK_CREATE
 
@@ -18,6 +18,7 @@ Query = http_adapter.Query
 Body = http_adapter.Body
 HTTPException = http_adapter.HTTPException
 Request = http_adapter.Request
+Response = http_adapter.Response
 
 # Create router using adapter, expose underlying router for compatibility
 router_adapter = http_adapter.create_router(prefix="/tasks", tags=["tasks"])
@@ -54,16 +55,16 @@ async def create_task(request: Request) -> TaskResponse:
     # Verify the key using the database
     db = get_db()
     key_hash = db._hash_api_key(api_key)
-    key_info = db.get_api_key_by_hash(key_hash)
+    key_info = await run_db(db.authenticate_api_key, key_hash)
     
     if not key_info or key_info["enabled"] != 1:
         raise HTTPException(status_code=401, detail="Invalid or revoked API key")
     
-    # Update last used timestamp
-    db.update_api_key_last_used(key_info["id"])
+    # Record last used timestamp (written in batches)
+    db.record_api_key_use(key_info["id"])
     
     # Create auth dict
-    is_admin = db.is_api_key_admin(key_info["id"])
+    is_admin = key_info["is_admin"]
     auth = {
         "key_id": key_info["id"],
         "project_id": key_info["project_id"],
@@ -73,7 +74,7 @@ async def create_task(request: Request) -> TaskResponse:
     # Check permission: TASK_CREATE required (admin bypasses)
     if not is_admin:
         # For API key auth, we need to check permissions via project's organization
-        project = db.get_project(key_info["project_id"])
+        project = await run_db(db.get_project, key_info["project_id"])
         if project and project.get("organization_id"):
             # Get API key's user (if it has one) or check via project context
             # For now, if not admin, require organization context
@@ -94,7 +95,7 @@ async def create_task(request: Request) -> TaskResponse:
     entity = TaskEntity(db, auth_info=auth)
     
     try:
-        task_data = entity.create(**body)
+        task_data = await run_db(entity.create, **body)
         return TaskResponse(**task_data)
     except HTTPException:
         raise
@@ -107,6 +108,7 @@ async def create_task(request: Request) -> TaskResponse:
 # FastAPI matches routes in order, so specific routes must come before parameterized routes
 @router.get("", response_model=List[TaskResponse])
 async def query_tasks(
+    response: Response,
     task_type: Optional[str] = Query(None, description="Filter by task type"),
     task_status: Optional[str] = Query(None, description="Filter by task status"),
     assigned_agent: Optional[str] = Query(None, description="Filter by assigned agent"),
@@ -114,8 +116,9 @@ async def query_tasks(
     priority: Optional[str] = Query(None, description="Filter by priority"),
     tag_id: Optional[int] = Query(None, description="Filter by tag ID (single tag)", gt=0),
     tag_ids: Optional[str] = Query(None, description="Filter by multiple tag IDs (comma-separated)"),
-    order_by: Optional[str] = Query(None, description="Order by: priority, priority_asc, or created_at (default)"),
+    order_by: Optional[str] = Query(None, description="Order by: priority, priority_asc, created_at_asc, or created_at (default, newest first)"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page, to fetch the next page"),
     # Advanced filtering: date ranges
     created_after: Optional[str] = Query(None, description="Filter by created_at >= date (ISO format)"),
     created_before: Optional[str] = Query(None, description="Filter by created_at <= date (ISO format)"),
@@ -126,7 +129,13 @@ async def query_tasks(
     # Advanced filtering: text search
     search: Optional[str] = Query(None, description="Search in title and task_instruction (case-insensitive)")
 ) -> List[TaskResponse]:
-    """Query tasks with filters including advanced date range and text search."""
+    """
+    Query tasks with filters including advanced date range and text search.
+    
+    Results are keyset-paginated. When more results exist, the X-Next-Cursor
+    response header holds the cursor for the next page; pass it back as
+    ?cursor= with the same filters and order_by.
+    """
     if task_type and task_type not in ["concrete", "abstract", "epic"]:
         raise HTTPException(
             status_code=400,
@@ -142,10 +151,10 @@ async def query_tasks(
             status_code=400,
             detail=f"Invalid priority '{priority}'. Must be one of: low, medium, high, critical"
         )
-    if order_by and order_by not in ["priority", "priority_asc"]:
+    if order_by and order_by not in ["priority", "priority_asc", "created_at_asc"]:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid order_by '{order_by}'. Must be one of: priority, priority_asc"
+            detail=f"Invalid order_by '{order_by}'. Must be one of: priority, priority_asc, created_at_asc"
         )
     
     # Parse tag_ids if provided
@@ -202,37 +211,44 @@ async def query_tasks(
                 )
     
     service = TaskService(get_db())
-    tasks = service.query_tasks(
-        task_type=task_type,
-        task_status=task_status,
-        assigned_agent=assigned_agent,
-        project_id=project_id,
-        priority=priority,
-        tag_id=tag_id,
-        tag_ids=tag_ids_list,
-        order_by=order_by,
-        limit=limit,
-        created_after=date_filters.get("created_after"),
-        created_before=date_filters.get("created_before"),
-        updated_after=date_filters.get("updated_after"),
-        updated_before=date_filters.get("updated_before"),
-        completed_after=date_filters.get("completed_after"),
-        completed_before=date_filters.get("completed_before"),
-        search=search
-    )
-    return [TaskResponse(**task) for task in tasks]
+    try:
+        page = await run_db(
+            service.query_tasks_page,
+            task_type=task_type,
+            task_status=task_status,
+            assigned_agent=assigned_agent,
+            project_id=project_id,
+            priority=priority,
+            tag_id=tag_id,
+            tag_ids=tag_ids_list,
+            order_by=order_by,
+            limit=limit,
+            created_after=date_filters.get("created_after"),
+            created_before=date_filters.get("created_before"),
+            updated_after=date_filters.get("updated_after"),
+            updated_before=date_filters.get("updated_before"),
+            completed_after=date_filters.get("completed_after"),
+            completed_before=date_filters.get("completed_before"),
+            search=search,
+            after=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if page["next_cursor"]:
+        response.headers["X-Next-Cursor"] = page["next_cursor"]
+    return [TaskResponse(**task) for task in page["tasks"]]
 
 
-@router.get("/search", response_model=List[TaskResponse])
+@router.get("/search", response_model=List[TaskSearchResult])
 async def search_tasks(
-    q: str = Query(..., description="Search query"),
+    q: str = Query(..., description='Search query: words match as prefixes, "quoted text" as a phrase'),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results")
-) -> List[TaskResponse]:
+) -> List[TaskSearchResult]:
     """Search tasks using full-text search across titles, instructions, and notes."""
     service = TaskService(get_db())
     try:
-        tasks = service.search_tasks(q, limit=limit)
-        return [TaskResponse(**task) for task in tasks]
+        tasks = await run_db(service.search_tasks, q, limit=limit)
+        return [TaskSearchResult(**task) for task in tasks]
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -245,11 +261,15 @@ async def get_activity_feed(
     agent_id: Optional[str] = Query(None, description="Filter by agent ID"),
     start_date: Optional[str] = Query(None, description="Filter by start date (ISO format)"),
     end_date: Optional[str] = Query(None, description="Filter by end date (ISO format)"),
-    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of results")
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page, to fetch the next page")
 ):
     """
     Get activity feed showing all task updates, completions, and relationship changes
     in chronological order. Supports filtering by task, agent, or date range.
+    
+    Results are keyset-paginated: pass next_cursor back as ?cursor= with the
+    same filters to get the next page.
     """
     from datetime import datetime
     
@@ -280,16 +300,21 @@ async def get_activity_feed(
     
     try:
         service = TaskService(get_db())
-        feed = service.get_activity_feed(
+        page = await run_db(
+            service.get_activity_feed_page,
             task_id=task_id,
             agent_id=agent_id,
             start_date=start_date,
             end_date=end_date,
-            limit=limit
+            limit=limit,
+            after=cursor
         )
+        feed = page["feed"]
         return {
             "feed": feed,
             "count": len(feed),
+            "next_cursor": page["next_cursor"],
+            "has_more": page["has_more"],
             "filters": {
                 "task_id": task_id,
                 "agent_id": agent_id,
@@ -298,6 +323,8 @@ async def get_activity_feed(
                 "limit": limit
             }
         }
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to get activity feed: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to retrieve activity feed")
@@ -307,7 +334,7 @@ async def get_activity_feed(
 async def get_overdue_tasks(limit: int = Query(100, ge=1, le=1000, description="Maximum number of results")):
     """Get tasks that are overdue (past due date and not complete)."""
     service = TaskService(get_db())
-    overdue = service.get_overdue_tasks(limit=limit)
+    overdue = await run_db(service.get_overdue_tasks, limit=limit)
     return {"tasks": [TaskResponse(**task) for task in overdue]}
 
 
@@ -318,7 +345,7 @@ async def get_tasks_approaching_deadline(
 ):
     """Get tasks that are approaching their deadline."""
     service = TaskService(get_db())
-    approaching = service.get_tasks_approaching_deadline(days_ahead=days_ahead, limit=limit)
+    approaching = await run_db(service.get_tasks_approaching_deadline, days_ahead=days_ahead, limit=limit)
     return {"tasks": [TaskResponse(**task) for task in approaching]}
 
 
@@ -326,7 +353,7 @@ async def get_tasks_approaching_deadline(
 async def get_task(task_id: int = Path(..., gt=0)) -> TaskResponse:
     """Get a task by ID."""
     service = TaskService(get_db())
-    task = service.get_task(task_id)
+    task = await run_db(service.get_task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     return TaskResponse(**task)
@@ -337,7 +364,7 @@ async def get_task_relationships(task_id: int = Path(..., gt=0)):
     """Get relationships for a task."""
     service = TaskService(get_db())
     try:
-        relationships = service.get_task_relationships(task_id)
+        relationships = await run_db(service.get_task_relationships, task_id)
         return {"relationships": relationships}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -0,0 +1,173 @@
+"""
+In-memory read-through cache for API key authentication.
+
+Authenticating a request used to cost three database round trips: look up the
+key by hash, write last_used_at, and read is_admin. APIKeyCache keeps the
+result of one combined lookup for a short TTL, keyed by key hash, so repeat
+requests with the same key are answered from memory. Entries are dropped
+explicitly when a key is revoked or rotated, and unknown keys are never cached.
+
+APIKeyUsageBuffer coalesces last_used_at writes: each request only records a
+timestamp in memory, and the pending timestamps are written with one batched
+UPDATE once the flush interval has elapsed.
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class APIKeyCache:
+    """Thread-safe TTL cache of authenticated API key information."""
+
+    def __init__(self, ttl: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid (0 or less disables caching)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # key_hash -> (expires_at, key_info)
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # key_id -> key_hash, for invalidation by ID
+        self._hashes_by_id: Dict[int, str] = {}
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are cached at all."""
+        return self.ttl > 0
+
+    def get(self, key_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get cached key information.
+
+        Args:
+            key_hash: Hashed API key
+
+        Returns:
+            Copy of the cached key information, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key_hash)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            expires_at, key_info = entry
+            if expires_at <= time.monotonic():
+                self._remove(key_hash)
+                self._metrics["expired"] += 1
+                self._metrics["misses"] += 1
+                return None
+            self._metrics["hits"] += 1
+            return dict(key_info)
+
+    def put(self, key_hash: str, key_info: Dict[str, Any]) -> None:
+        """
+        Cache key information.
+
+        Args:
+            key_hash: Hashed API key
+            key_info: Key information (must include 'id')
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key_hash] = (time.monotonic() + self.ttl, dict(key_info))
+            self._hashes_by_id[key_info["id"]] = key_hash
+
+    def invalidate(self, key_id: Optional[int] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            key_id: API key ID to drop, or None to clear the whole cache
+        """
+        with self._lock:
+            self._metrics["invalidations"] += 1
+            if key_id is None:
+                self._entries.clear()
+                self._hashes_by_id.clear()
+                return
+            key_hash = self._hashes_by_id.get(key_id)
+            if key_hash is not None:
+                self._remove(key_hash)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._entries)
+            return metrics
+
+    def _remove(self, key_hash: str) -> None:
+        """Remove an entry and its reverse mapping (caller holds the lock)."""
+        _, key_info = self._entries.pop(key_hash, (None, None))
+        if key_info is not None and self._hashes_by_id.get(key_info["id"]) == key_hash:
+            del self._hashes_by_id[key_info["id"]]
+
+
+class APIKeyUsageBuffer:
+    """Thread-safe buffer of pending last_used_at timestamps per API key."""
+
+    def __init__(self, flush_interval: float = 30.0):
+        """
+        Initialize the buffer.
+
+        Args:
+            flush_interval: Seconds between batched writes (0 or less flushes on every use)
+        """
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: Dict[int, str] = {}
+        self._last_flush = time.monotonic()
+
+    def record(self, key_id: int, used_at: str) -> bool:
+        """
+        Record that a key was used.
+
+        Args:
+            key_id: API key ID
+            used_at: Timestamp to store in last_used_at
+
+        Returns:
+            True if the flush interval has elapsed and the caller should flush
+        """
+        with self._lock:
+            self._pending[key_id] = used_at
+            return time.monotonic() - self._last_flush >= self.flush_interval
+
+    def drain(self) -> List[Tuple[str, int]]:
+        """
+        Take all pending timestamps and restart the flush interval.
+
+        Returns:
+            List of (used_at, key_id) tuples ready for an UPDATE ... WHERE id = ?
+        """
+        with self._lock:
+            pending = [(used_at, key_id) for key_id, used_at in self._pending.items()]
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+            return pending
+
+    def restore(self, pending: List[Tuple[str, int]]) -> None:
+        """
+        Put back timestamps from a failed flush, keeping newer ones recorded since.
+
+        Args:
+            pending: List of (used_at, key_id) tuples returned by drain()
+        """
+        with self._lock:
+            for used_at, key_id in pending:
+                if used_at > self._pending.get(key_id, ""):
+                    self._pending[key_id] = used_at
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
@@ -35,6 +35,9 @@ from todorama.models import RelationshipCreate
 
 # Import service container (handles all initialization)
 from todorama.dependencies.services import get_services
+from todorama.db_executor import shutdown_db_executor
+from todorama.task_events import shutdown_task_event_stream
+from todorama.webhooks import shutdown_webhook_dispatcher
 
 # Initialize HTTP framework adapter
 http_adapter = HTTPFrameworkAdapter()
@@ -154,6 +157,13 @@ async def lifespan(app):
     services.backup_scheduler.stop()
     if services.conversation_backup_scheduler:
         services.conversation_backup_scheduler.stop()
+    if getattr(services, "session_sweeper", None):
+        services.session_sweeper.stop()
+    if getattr(services, "stale_task_scheduler", None):
+        services.stale_task_scheduler.stop()
+    shutdown_webhook_dispatcher()
+    shutdown_task_event_stream()
+    shutdown_db_executor()
     
     # Stop NATS workers
     if nats_workers:
@@ -163,7 +173,19 @@ async def lifespan(app):
             logger.info("Stopped NATS workers")
         except Exception as e:
             logger.warning(f"Error stopping NATS workers: {e}", exc_info=True)
-    
+
+    # Write API key usage still buffered in memory
+    try:
+        services.db.flush_api_key_usage()
+    except Exception as e:
+        logger.warning(f"Error flushing API key usage: {e}", exc_info=True)
+
+    # Restart from a fresh in-memory search index snapshot
+    try:
+        services.db.save_search_snapshot()
+    except Exception as e:
+        logger.warning(f"Error saving search index snapshot: {e}", exc_info=True)
+
     logger.info("Shutdown complete")
 
 
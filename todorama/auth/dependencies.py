@@ -63,9 +63,9 @@ async def verify_api_key(
             detail="API key required. Provide X-API-Key header or Authorization: Bearer token."
         )
     
-    # Hash the key and look it up
+    # Hash the key and look it up (served from the auth cache when possible)
     key_hash = db._hash_api_key(api_key)
-    key_info = db.get_api_key_by_hash(key_hash)
+    key_info = db.authenticate_api_key(key_hash)
     
     if not key_info:
         raise HTTPException(
@@ -79,8 +79,8 @@ async def verify_api_key(
             detail="API key has been revoked"
         )
     
-    # Update last used timestamp
-    db.update_api_key_last_used(key_info["id"])
+    # Record last used timestamp (written in batches)
+    db.record_api_key_use(key_info["id"])
     
     # Extract organization_id from API key
     organization_id = key_info.get("organization_id")
@@ -90,8 +90,8 @@ async def verify_api_key(
     request.state.key_id = key_info["id"]
     request.state.organization_id = organization_id
     
-    # Get admin status
-    is_admin = db.is_api_key_admin(key_info["id"])
+    # Admin status is loaded with the key
+    is_admin = key_info["is_admin"]
     request.state.is_admin = is_admin
     
     return {
@@ -241,10 +241,10 @@ async def verify_user_auth(
     if api_key:
         # Hash the key and look it up
         key_hash = db._hash_api_key(api_key)
-        key_info = db.get_api_key_by_hash(key_hash)
+        key_info = db.authenticate_api_key(key_hash)
         
         if key_info and key_info["enabled"] == 1:
-            db.update_api_key_last_used(key_info["id"])
+            db.record_api_key_use(key_info["id"])
             request.state.project_id = key_info["project_id"]
             request.state.key_id = key_info["id"]
             organization_id = key_info.get("organization_id")
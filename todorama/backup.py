@@ -119,6 +119,18 @@ class BackupManager:
                     archive_path.unlink()
                 raise
     
+    def _copy_database(self, source_path: Path, target_path: Path) -> None:
+        """Copy one SQLite database into another using the SQLite backup API."""
+        source_conn = sqlite3.connect(str(source_path))
+        try:
+            target_conn = sqlite3.connect(str(target_path))
+            try:
+                source_conn.backup(target_conn)
+            finally:
+                target_conn.close()
+        finally:
+            source_conn.close()
+    
     def restore_from_backup(self, backup_path: str, force: bool = False) -> bool:
         """
         Restore database from a backup archive or snapshot.
@@ -167,11 +179,12 @@ class BackupManager:
             # Create backup of current database if it exists
             if self.db_path.exists():
                 old_backup = self.backups_dir / f"pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                shutil.copy2(self.db_path, old_backup)
+                self._copy_database(self.db_path, old_backup)
                 logger.info(f"Created backup of current database: {old_backup}")
             
-            # Restore database
-            shutil.copy2(source_path, self.db_path)
+            # Restore database through the backup API rather than copying the file,
+            # so pages still sitting in a WAL file are replaced as well
+            self._copy_database(source_path, self.db_path)
             
             # Clean up temp file if created
             if source_path != backup_path and source_path.exists():
@@ -0,0 +1,509 @@
+"""
+In-memory index of tasks that have a blocked subtask at any depth.
+
+A task counts as blocked when any task below it in the subtask hierarchy has
+task_status 'blocked'. Answering that by walking task_relationships upward costs
+one query per hierarchy level on every read. BlockedAncestorIndex keeps the
+subtask hierarchy (child -> parents) and the blocked task IDs in memory and
+materializes the set of blocked ancestors, so the answer is a set lookup.
+
+Writes reach the index through the blocked_index_feed table. Triggers add the
+task ID to it whenever a task enters or leaves status 'blocked' and whenever a
+subtask relationship to it as the child is added, removed or re-pointed. The
+feed holds one row per task and a sequence number that is bumped on every
+change. Each read fetches the feed rows past the last sequence it applied (an
+index range scan that is normally empty) and re-reads the status and parents of
+just those tasks, so writes from any code path or process are picked up without
+rescanning task_relationships.
+
+On PostgreSQL sequence numbers are assigned before commit, so a row can become
+visible after a higher one was applied. Feed rows record the writing
+transaction, and each read also re-applies rows from transactions that were
+still in flight at the previous read (txid_snapshot_xmin). Re-applying a row
+only re-reads the task's current state, so it is harmless.
+
+Point reads test membership in the set. Queries that filter on it in SQL join
+against a connection-local temporary table (stage()), which is rewritten only
+when the set changed since that connection last staged it, so the query text
+and parameter count do not grow with the number of blocked ancestors.
+"""
+import logging
+import threading
+import uuid
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Tasks whose status and parents are re-read per query
+FEED_BATCH_SIZE = 500
+
+_FEED_TABLES = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS blocked_index_feed (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL UNIQUE
+        )
+    """,
+    "postgresql": """
+        CREATE TABLE IF NOT EXISTS blocked_index_feed (
+            seq BIGSERIAL PRIMARY KEY,
+            task_id INTEGER NOT NULL UNIQUE,
+            xact BIGINT NOT NULL DEFAULT txid_current()
+        )
+    """,
+}
+
+# Connection-local copy of the ancestor set, tagged with the index version it holds
+STAGED_TABLE = "blocked_ancestor_ids"
+
+_STAGED_TABLES = (
+    f"CREATE TEMP TABLE IF NOT EXISTS {STAGED_TABLE} (id INTEGER PRIMARY KEY)",
+    f"CREATE TEMP TABLE IF NOT EXISTS {STAGED_TABLE}_version (version TEXT NOT NULL)",
+)
+
+_POSTGRESQL_FEED_INDEX = "CREATE INDEX IF NOT EXISTS idx_blocked_index_feed_xact ON blocked_index_feed(xact)"
+
+
+def _sqlite_feed(task_id: str) -> str:
+    return f"INSERT OR REPLACE INTO blocked_index_feed (task_id) VALUES ({task_id});"
+
+
+_SQLITE_FEED_TRIGGERS = {
+    "blocked_index_feed_task_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS blocked_index_feed_task_insert AFTER INSERT ON tasks
+        WHEN NEW.task_status = 'blocked'
+        BEGIN
+            {_sqlite_feed("NEW.id")}
+        END
+    """,
+    "blocked_index_feed_task_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS blocked_index_feed_task_delete AFTER DELETE ON tasks
+        WHEN OLD.task_status = 'blocked'
+        BEGIN
+            {_sqlite_feed("OLD.id")}
+        END
+    """,
+    "blocked_index_feed_task_status": f"""
+        CREATE TRIGGER IF NOT EXISTS blocked_index_feed_task_status AFTER UPDATE OF task_status ON tasks
+        WHEN (OLD.task_status = 'blocked') <> (NEW.task_status = 'blocked')
+        BEGIN
+            {_sqlite_feed("NEW.id")}
+        END
+    """,
+    "blocked_index_feed_relationship_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS blocked_index_feed_relationship_insert AFTER INSERT ON task_relationships
+        WHEN NEW.relationship_type = 'subtask'
+        BEGIN
+            {_sqlite_feed("NEW.child_task_id")}
+        END
+    """,
+    "blocked_index_feed_relationship_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS blocked_index_feed_relationship_delete AFTER DELETE ON task_relationships
+        WHEN OLD.relationship_type = 'subtask'
+        BEGIN
+            {_sqlite_feed("OLD.child_task_id")}
+        END
+    """,
+    "blocked_index_feed_relationship_update": f"""
+        CREATE TRIGGER IF NOT EXISTS blocked_index_feed_relationship_update AFTER UPDATE ON task_relationships
+        WHEN OLD.relationship_type = 'subtask' OR NEW.relationship_type = 'subtask'
+        BEGIN
+            {_sqlite_feed("OLD.child_task_id")}
+            {_sqlite_feed("NEW.child_task_id")}
+        END
+    """,
+}
+
+_POSTGRESQL_FEED_FUNCTION = """
+    CREATE OR REPLACE FUNCTION blocked_index_feed_add(changed_id INTEGER) RETURNS void AS $$
+    BEGIN
+        INSERT INTO blocked_index_feed (task_id) VALUES (changed_id)
+        ON CONFLICT (task_id)
+        DO UPDATE SET seq = nextval(pg_get_serial_sequence('blocked_index_feed', 'seq')),
+                      xact = txid_current();
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_POSTGRESQL_TASK_FUNCTION = """
+    CREATE OR REPLACE FUNCTION blocked_index_feed_task() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            PERFORM blocked_index_feed_add(OLD.id);
+        ELSE
+            PERFORM blocked_index_feed_add(NEW.id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_POSTGRESQL_RELATIONSHIP_FUNCTION = """
+    CREATE OR REPLACE FUNCTION blocked_index_feed_relationship() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.relationship_type = 'subtask' THEN
+            PERFORM blocked_index_feed_add(OLD.child_task_id);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.relationship_type = 'subtask' THEN
+            PERFORM blocked_index_feed_add(NEW.child_task_id);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_POSTGRESQL_FEED_TRIGGERS = {
+    "blocked_index_feed_task_insert": """
+        CREATE TRIGGER blocked_index_feed_task_insert AFTER INSERT ON tasks
+        FOR EACH ROW WHEN (NEW.task_status = 'blocked')
+        EXECUTE FUNCTION blocked_index_feed_task()
+    """,
+    "blocked_index_feed_task_delete": """
+        CREATE TRIGGER blocked_index_feed_task_delete AFTER DELETE ON tasks
+        FOR EACH ROW WHEN (OLD.task_status = 'blocked')
+        EXECUTE FUNCTION blocked_index_feed_task()
+    """,
+    "blocked_index_feed_task_status": """
+        CREATE TRIGGER blocked_index_feed_task_status AFTER UPDATE OF task_status ON tasks
+        FOR EACH ROW WHEN ((OLD.task_status = 'blocked') IS DISTINCT FROM (NEW.task_status = 'blocked'))
+        EXECUTE FUNCTION blocked_index_feed_task()
+    """,
+    "blocked_index_feed_relationship": """
+        CREATE TRIGGER blocked_index_feed_relationship AFTER INSERT OR UPDATE OR DELETE ON task_relationships
+        FOR EACH ROW EXECUTE FUNCTION blocked_index_feed_relationship()
+    """,
+}
+
+# Feed position and, on PostgreSQL, the oldest transaction still in flight
+_FEED_POSITION_QUERIES = {
+    "sqlite": "SELECT COALESCE(MAX(seq), 0) AS seq, 0 AS horizon FROM blocked_index_feed",
+    "postgresql": """
+        SELECT COALESCE(MAX(seq), 0) AS seq, txid_snapshot_xmin(txid_current_snapshot()) AS horizon
+        FROM blocked_index_feed
+    """,
+}
+
+_FEED_QUERIES = {
+    "sqlite": """
+        SELECT seq, task_id, 0 AS horizon FROM blocked_index_feed
+        WHERE seq > ? ORDER BY seq
+    """,
+    # The horizon comes from the same snapshot as the rows
+    "postgresql": """
+        SELECT f.seq, f.task_id, h.horizon
+        FROM (SELECT txid_snapshot_xmin(txid_current_snapshot()) AS horizon) h
+        LEFT JOIN blocked_index_feed f ON f.seq > ? OR f.xact >= ?
+        ORDER BY f.seq
+    """,
+}
+
+
+def _run(cursor: Any, query: str, params: tuple = (), execute: Optional[Callable] = None) -> None:
+    if execute is not None:
+        execute(cursor, query, params)
+    elif params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+
+def install_blocked_index_feed(cursor: Any, db_type: str, execute: Optional[Callable] = None) -> bool:
+    """
+    Create the blocked_index_feed table and the triggers that fill it.
+
+    An index loads the full hierarchy on its first read, so the feed needs no
+    seeding; rows written before the triggers existed are covered by that load.
+
+    Args:
+        cursor: Database cursor inside the schema transaction
+        db_type: 'sqlite' or 'postgresql'
+        execute: Optional function(cursor, query, params) used to run queries
+
+    Returns:
+        True if the feed is installed and maintained by triggers
+    """
+    _run(cursor, _FEED_TABLES[db_type], execute=execute)
+    if db_type == "postgresql":
+        _run(cursor, _POSTGRESQL_FEED_INDEX, execute=execute)
+        _run(cursor, "SELECT tgname AS name FROM pg_trigger WHERE tgname LIKE 'blocked_index_feed_%'", execute=execute)
+        existing = {row["name"] for row in cursor.fetchall()}
+        for function in (_POSTGRESQL_FEED_FUNCTION, _POSTGRESQL_TASK_FUNCTION, _POSTGRESQL_RELATIONSHIP_FUNCTION):
+            _run(cursor, function, execute=execute)
+        triggers = _POSTGRESQL_FEED_TRIGGERS
+    else:
+        _run(cursor, "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'blocked_index_feed_%'", execute=execute)
+        existing = {row["name"] for row in cursor.fetchall()}
+        triggers = _SQLITE_FEED_TRIGGERS
+    for name, ddl in triggers.items():
+        if name not in existing:
+            _run(cursor, ddl, execute=execute)
+    return True
+
+
+class BlockedAncestorIndex:
+    """Thread-safe in-process index answering "does task X have a blocked descendant"."""
+
+    def __init__(self, db_type: str = "sqlite"):
+        self._db_type = db_type
+        self._lock = threading.Lock()
+        self._feed_seq: Optional[int] = None
+        self._horizon = 0
+        self._parents: Dict[int, Set[int]] = {}
+        self._blocked: Set[int] = set()
+        self._ancestors: FrozenSet[int] = frozenset()
+        # Bumped whenever the ancestor set is recomputed; the token keeps
+        # versions of different index instances apart
+        self._token = uuid.uuid4().hex
+        self._generation = 0
+        self._metrics = {
+            "reads": 0,
+            "hierarchy_loads": 0,
+            "feed_entries": 0,
+            "ancestor_rebuilds": 0,
+            "stagings": 0,
+        }
+
+    def invalidate(self) -> None:
+        """Drop the cached hierarchy so the next read reloads it."""
+        with self._lock:
+            self._feed_seq = None
+            self._parents = {}
+            self._blocked = set()
+            self._ancestors = frozenset()
+
+    def blocked_ancestors(self, cursor, execute: Optional[Callable] = None) -> FrozenSet[int]:
+        """
+        Get the IDs of all tasks that have a blocked subtask at any depth.
+
+        Args:
+            cursor: Database cursor used to load the index or apply the feed
+            execute: Optional function(cursor, query, params) used to run queries
+
+        Returns:
+            Frozen set of task IDs with blocked descendants
+        """
+        with self._lock:
+            return self._read(cursor, execute)
+
+    def stage(self, cursor, execute: Optional[Callable] = None) -> str:
+        """
+        Copy the blocked ancestor set into a temporary table on the cursor's connection.
+
+        The table is rewritten only when the set changed since this connection
+        last staged it. The caller's transaction owns the rows: if it rolls
+        back, the version row goes with them and the next call stages again.
+
+        Args:
+            cursor: Database cursor of the connection that will run the query
+            execute: Optional function(cursor, query, params) used to run queries
+
+        Returns:
+            Name of the temporary table, with one id column
+        """
+        with self._lock:
+            ancestors = self._read(cursor, execute)
+            version = f"{self._token}:{self._generation}"
+        for ddl in _STAGED_TABLES:
+            _run(cursor, ddl, execute=execute)
+        _run(cursor, f"SELECT version FROM {STAGED_TABLE}_version", execute=execute)
+        row = cursor.fetchone()
+        if row is not None and row["version"] == version:
+            return STAGED_TABLE
+
+        _run(cursor, f"DELETE FROM {STAGED_TABLE}", execute=execute)
+        _run(cursor, f"DELETE FROM {STAGED_TABLE}_version", execute=execute)
+        ids = sorted(ancestors)
+        for start in range(0, len(ids), FEED_BATCH_SIZE):
+            batch = ids[start:start + FEED_BATCH_SIZE]
+            values = ",".join("(?)" for _ in batch)
+            _run(cursor, f"INSERT INTO {STAGED_TABLE} (id) VALUES {values}", tuple(batch), execute=execute)
+        _run(cursor, f"INSERT INTO {STAGED_TABLE}_version (version) VALUES (?)", (version,), execute=execute)
+        with self._lock:
+            self._metrics["stagings"] += 1
+        return STAGED_TABLE
+
+    def rebuild(self, cursor, execute: Optional[Callable] = None) -> FrozenSet[int]:
+        """
+        Rebuild the index from the relational tables.
+
+        Args:
+            cursor: Database cursor
+            execute: Optional function(cursor, query, params) used to run queries
+
+        Returns:
+            Frozen set of task IDs with blocked descendants
+        """
+        self.invalidate()
+        return self.blocked_ancestors(cursor, execute)
+
+    def verify(self, cursor, execute: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Compare the index with a level-by-level walk of task_relationships.
+
+        Args:
+            cursor: Database cursor
+            execute: Optional function(cursor, query, params) used to run queries
+
+        Returns:
+            Dictionary with consistent flag, the number of blocked ancestors,
+            and the task IDs missing from or unexpectedly present in the index
+        """
+        indexed = self.blocked_ancestors(cursor, execute)
+        actual = walk_blocked_ancestors(cursor)
+        return {
+            "consistent": indexed == actual,
+            "blocked_ancestors": len(actual),
+            "missing": sorted(actual - indexed),
+            "unexpected": sorted(indexed - actual),
+        }
+
+    def _read(self, cursor, execute: Optional[Callable]) -> FrozenSet[int]:
+        """Bring the index up to date with the feed; caller holds the lock."""
+        self._metrics["reads"] += 1
+        if self._feed_seq is None:
+            self._load(cursor, execute)
+        elif self._apply_feed(cursor, execute):
+            self._ancestors = self._compute_ancestors()
+            self._generation += 1
+            self._metrics["ancestor_rebuilds"] += 1
+        return self._ancestors
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["relationships"] = sum(len(parents) for parents in self._parents.values())
+            metrics["blocked_tasks"] = len(self._blocked)
+            metrics["blocked_ancestors"] = len(self._ancestors)
+            return metrics
+
+    def _load(self, cursor, execute: Optional[Callable]) -> None:
+        """Load the hierarchy and blocked tasks, remembering the feed position."""
+        # Read the feed position first: writes made during the load are re-applied
+        _run(cursor, _FEED_POSITION_QUERIES[self._db_type], execute=execute)
+        position = cursor.fetchone()
+        self._feed_seq, self._horizon = position["seq"], position["horizon"]
+
+        _run(cursor, """
+            SELECT parent_task_id, child_task_id
+            FROM task_relationships
+            WHERE relationship_type = 'subtask' AND parent_task_id IS NOT NULL
+        """, execute=execute)
+        parents: Dict[int, Set[int]] = {}
+        for row in cursor.fetchall():
+            parents.setdefault(row["child_task_id"], set()).add(row["parent_task_id"])
+        _run(cursor, "SELECT id FROM tasks WHERE task_status = 'blocked'", execute=execute)
+        self._blocked = {row["id"] for row in cursor.fetchall()}
+        self._parents = parents
+        self._ancestors = self._compute_ancestors()
+        self._generation += 1
+        self._metrics["hierarchy_loads"] += 1
+        self._metrics["ancestor_rebuilds"] += 1
+        logger.debug(f"Loaded subtask hierarchy for blocked index ({len(parents)} child tasks)")
+
+    def _apply_feed(self, cursor, execute: Optional[Callable]) -> bool:
+        """Re-read the tasks named by new feed rows; True if the index changed."""
+        params = (self._feed_seq,) if self._db_type == "sqlite" else (self._feed_seq, self._horizon)
+        _run(cursor, _FEED_QUERIES[self._db_type], params, execute=execute)
+        entries = cursor.fetchall()
+        if not entries:
+            return False
+        self._horizon = entries[0]["horizon"]
+        entries = [entry for entry in entries if entry["seq"] is not None]
+        if not entries:
+            return False
+        self._feed_seq = max(self._feed_seq, entries[-1]["seq"])
+        self._metrics["feed_entries"] += len(entries)
+
+        changed = False
+        task_ids = list(dict.fromkeys(entry["task_id"] for entry in entries))
+        for start in range(0, len(task_ids), FEED_BATCH_SIZE):
+            changed |= self._refresh_tasks(cursor, execute, task_ids[start:start + FEED_BATCH_SIZE])
+        return changed
+
+    def _refresh_tasks(self, cursor, execute: Optional[Callable], task_ids: List[int]) -> bool:
+        placeholders = ",".join("?" * len(task_ids))
+        _run(cursor, f"""
+            SELECT id FROM tasks WHERE id IN ({placeholders}) AND task_status = 'blocked'
+        """, tuple(task_ids), execute=execute)
+        blocked = {row["id"] for row in cursor.fetchall()}
+        _run(cursor, f"""
+            SELECT parent_task_id, child_task_id
+            FROM task_relationships
+            WHERE relationship_type = 'subtask' AND parent_task_id IS NOT NULL
+                AND child_task_id IN ({placeholders})
+        """, tuple(task_ids), execute=execute)
+        parents: Dict[int, Set[int]] = {}
+        for row in cursor.fetchall():
+            parents.setdefault(row["child_task_id"], set()).add(row["parent_task_id"])
+
+        changed = False
+        for task_id in task_ids:
+            if (task_id in blocked) != (task_id in self._blocked):
+                changed = True
+                if task_id in blocked:
+                    self._blocked.add(task_id)
+                else:
+                    self._blocked.discard(task_id)
+            task_parents = parents.get(task_id)
+            if task_parents != self._parents.get(task_id):
+                changed = True
+                if task_parents:
+                    self._parents[task_id] = task_parents
+                else:
+                    self._parents.pop(task_id, None)
+        return changed
+
+    def _compute_ancestors(self) -> FrozenSet[int]:
+        """Collect every ancestor of the blocked tasks (cycle-safe)."""
+        ancestors: Set[int] = set()
+        stack = [parent for task_id in self._blocked for parent in self._parents.get(task_id, ())]
+        while stack:
+            task_id = stack.pop()
+            if task_id in ancestors:
+                continue
+            ancestors.add(task_id)
+            stack.extend(self._parents.get(task_id, ()))
+        return frozenset(ancestors)
+
+
+def walk_blocked_ancestors(cursor, max_depth: int = 100) -> FrozenSet[int]:
+    """
+    Find tasks with blocked descendants by walking task_relationships upward.
+
+    Issues one query per hierarchy level. Used as the relational source of
+    truth when verifying BlockedAncestorIndex.
+
+    Args:
+        cursor: Database cursor
+        max_depth: Maximum number of levels to walk (safety limit)
+
+    Returns:
+        Frozen set of task IDs with blocked descendants
+    """
+    cursor.execute("""
+        SELECT DISTINCT tr.parent_task_id
+        FROM task_relationships tr
+        JOIN tasks t_child ON tr.child_task_id = t_child.id
+        WHERE tr.relationship_type = 'subtask'
+            AND t_child.task_status = 'blocked'
+            AND tr.parent_task_id IS NOT NULL
+    """)
+    ancestors = {row[0] for row in cursor.fetchall()}
+
+    current_level = set(ancestors)
+    depth = 0
+    while current_level and depth < max_depth:
+        placeholders = ",".join("?" * len(current_level))
+        cursor.execute(f"""
+            SELECT DISTINCT parent_task_id
+            FROM task_relationships
+            WHERE relationship_type = 'subtask'
+                AND child_task_id IN ({placeholders})
+                AND parent_task_id IS NOT NULL
+        """, list(current_level))
+        next_level = {row[0] for row in cursor.fetchall()} - ancestors
+        ancestors.update(next_level)
+        current_level = next_level
+        depth += 1
+    return frozenset(ancestors)
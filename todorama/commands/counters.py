@@ -0,0 +1,35 @@
+"""
+Reconcile counters command - Rebuild the task_counters analytics rollup.
+
+task_counters is maintained by triggers on the tasks table. This command
+rebuilds it from a full scan of tasks and reports how many counter rows
+were wrong.
+"""
+import json
+import logging
+from todorama.__main__ import Command
+
+logger = logging.getLogger(__name__)
+
+
+class ReconcileCountersCommand(Command):
+    """Command to rebuild the task_counters rollup from the tasks table."""
+    
+    @classmethod
+    def get_name(cls) -> str:
+        """Get the command name (used in CLI)."""
+        return "reconcile-counters"
+    
+    def run(self) -> int:
+        """Rebuild the counters and print the result."""
+        from todorama.database import TodoDatabase
+        
+        try:
+            db = TodoDatabase()
+            result = db.reconcile_task_counters()
+        except Exception as e:
+            logger.error(f"Failed to reconcile task counters: {e}", exc_info=True)
+            return 1
+        
+        print(json.dumps(result, indent=2))
+        return 0
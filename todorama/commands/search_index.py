@@ -0,0 +1,46 @@
+"""
+Search index command - Compact or rebuild the full-text search index.
+
+The index over task titles, instructions and notes is maintained by
+triggers on the tasks table. This command merges its segments and, with
+--rebuild, re-indexes every task first. With SEARCH_BACKEND=memory it
+writes the in-memory index snapshot instead.
+"""
+import argparse
+import json
+import logging
+from todorama.__main__ import Command
+
+logger = logging.getLogger(__name__)
+
+
+class SearchIndexCommand(Command):
+    """Command to optimize or rebuild the full-text search index."""
+    
+    @classmethod
+    def get_name(cls) -> str:
+        """Get the command name (used in CLI)."""
+        return "search-index"
+    
+    @classmethod
+    def add_arguments(cls, parser: argparse.ArgumentParser) -> None:
+        """Add search index command arguments."""
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Re-index every task before optimizing"
+        )
+    
+    def run(self) -> int:
+        """Optimize (and optionally rebuild) the index and print the result."""
+        from todorama.database import TodoDatabase
+        
+        try:
+            db = TodoDatabase()
+            result = db.optimize_search_index(rebuild=self.args.rebuild)
+        except Exception as e:
+            logger.error(f"Failed to optimize search index: {e}", exc_info=True)
+            return 1
+        
+        print(json.dumps(result, indent=2))
+        return 0
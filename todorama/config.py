@@ -70,11 +70,68 @@ class Settings(BaseSettings):
     # environment variable, container detection, and default paths
     database_path: str = ""  # Will be resolved by validator
 
-    db_pool_size: int = 5  # Connection pool size (for future PostgreSQL support)
+    db_pool_enabled: bool = True  # Reuse connections instead of connecting per call
+    db_pool_size: int = 5  # Idle PostgreSQL connections kept open
     db_max_overflow: int = 10  # Max overflow connections
-    db_pool_timeout: int = 30  # Connection timeout
+    db_pool_timeout: int = 30  # Seconds to wait for a free pooled connection
+    db_pool_recycle: int = 3600  # Max connection lifetime in seconds (0 disables)
+    db_pool_health_check_interval: int = 30  # Ping connections idle longer than this (seconds)
     sql_echo: bool = False  # SQL query logging
 
+    # Thread pools running database calls for async routes
+    db_executor_workers: int = 16  # Threads for short queries and writes
+    db_executor_analytics_workers: int = 2  # Threads for heavy analytics reports
+    db_call_timeout: float = 30.0  # Seconds a route waits for a database call (0 waits forever)
+    db_analytics_call_timeout: float = 120.0  # Seconds a route waits for an analytics call (0 waits forever)
+
+    # SQLite performance profile (applied to every new SQLite connection)
+    sqlite_journal_mode: str = "wal"  # WAL lets readers run while a write is in progress
+    sqlite_synchronous: str = "normal"  # NORMAL is safe under WAL and avoids an fsync per commit
+    sqlite_mmap_size: int = 268435456  # Bytes of the database file to memory-map (256 MiB)
+    sqlite_cache_size: int = -64000  # Page cache size (negative = KiB, so ~64 MiB)
+    sqlite_busy_timeout: int = 5000  # Milliseconds to wait on a locked database
+    sqlite_write_queue_enabled: bool = True  # Serialize in-process writers through one queue
+
+    # API key authentication
+    api_key_cache_ttl: float = 60.0  # Seconds a verified API key is served from memory (0 disables)
+    api_key_last_used_flush_interval: float = 30.0  # Seconds between batched last_used_at writes
+
+    # User sessions
+    session_cache_size: int = 10000  # Max sessions kept in the in-memory LRU cache
+    session_cache_ttl: float = 60.0  # Seconds a session is served from memory (0 disables)
+    session_sweep_interval: int = 300  # Seconds between expired-session sweeps (0 disables)
+    session_sweep_batch_size: int = 1000  # Expired sessions deleted per transaction
+
+    # Webhook delivery
+    webhook_index_ttl: float = 30.0  # Seconds to cache webhook subscriptions (0 disables)
+    webhook_queue_size: int = 10000  # Deliveries held in memory before spilling to the outbox table
+    webhook_max_concurrency: int = 64  # Deliveries in flight at once
+    webhook_endpoint_concurrency: int = 4  # Deliveries in flight per endpoint URL
+    webhook_breaker_threshold: int = 5  # Consecutive failures that open an endpoint's circuit
+    webhook_breaker_cooldown: float = 30.0  # Seconds an open circuit holds deliveries back
+    webhook_log_batch_size: int = 200  # Delivery log rows per insert
+    webhook_log_flush_interval: float = 1.0  # Seconds between delivery log flushes
+
+    # MCP SSE task events
+    task_events_poll_interval: float = 1.0  # Seconds between change_history polls while SSE clients are connected
+    task_events_heartbeat_interval: float = 15.0  # Seconds of silence before an SSE heartbeat comment
+    task_events_gap_timeout: float = 5.0  # PostgreSQL: seconds to wait for a missing change_history ID before skipping it
+
+    # Stale task reaper
+    stale_task_sweep_interval: int = 30  # Seconds between stale-task unlock passes (0 disables)
+    stale_task_sweep_batch_size: int = 500  # Stale tasks unlocked per transaction
+
+    # Analytics
+    analytics_cache_ttl: float = 0.0  # Seconds to reuse grouped task counts per filter (0 disables)
+
+    # Task search
+    search_backend: str = "fulltext"  # "fulltext" (FTS5/tsvector, LIKE if unavailable) or "memory" (in-process index)
+    search_snapshot_path: str = ""  # Snapshot file of the in-memory index (default: <database>.search-index on SQLite, none on PostgreSQL)
+
+    # Task context
+    task_context_cache_ttl: float = 0.0  # Seconds to reuse an unchanged task's assembled context (0 disables)
+    task_context_cache_size: int = 1000  # Max task contexts kept in memory
+
     # ============================================================================
     # Standardized Logging Configuration
     # ============================================================================
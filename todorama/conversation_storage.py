@@ -13,7 +13,8 @@ from typing import Optional, List, Dict, Any, Tuple, Union
 from datetime import datetime
 import logging
 
-from todorama.db_adapter import get_database_adapter
+from todorama.config import get_database_path
+from todorama.db_adapter import get_database_adapter, is_postgresql_dsn
 
 # Import managers
 from todorama.conversation_storage.schema import ConversationSchemaManager
@@ -38,27 +39,34 @@ class ConversationStorage:
         Initialize conversation storage.
         
         Args:
-            db_path: Database connection string (for PostgreSQL) or None to use environment variables.
+            db_path: PostgreSQL connection string or SQLite file path, or None to use
+                     environment variables (DB_TYPE, DB_* for PostgreSQL,
+                     CONVERSATIONS_DB_PATH for SQLite).
         """
-        # Determine database type - conversation storage requires PostgreSQL
-        db_type = os.getenv("DB_TYPE", "postgresql").lower()
-        
         if db_path is None:
-            db_host = os.getenv("DB_HOST", "localhost")
-            db_port = os.getenv("DB_PORT", "5432")
-            db_name = os.getenv("DB_NAME", "conversations")
-            db_user = os.getenv("DB_USER", "postgres")
-            db_password = os.getenv("DB_PASSWORD", "")
-            
-            if db_password:
-                self.db_path = f"host={db_host} port={db_port} dbname={db_name} user={db_user} password={db_password}"
+            db_type = os.getenv("DB_TYPE", "sqlite").lower()
+            if db_type == "postgresql":
+                db_host = os.getenv("DB_HOST", "localhost")
+                db_port = os.getenv("DB_PORT", "5432")
+                db_name = os.getenv("DB_NAME", "conversations")
+                db_user = os.getenv("DB_USER", "postgres")
+                db_password = os.getenv("DB_PASSWORD", "")
+                
+                if db_password:
+                    self.db_path = f"host={db_host} port={db_port} dbname={db_name} user={db_user} password={db_password}"
+                else:
+                    self.db_path = f"host={db_host} port={db_port} dbname={db_name} user={db_user}"
             else:
-                self.db_path = f"host={db_host} port={db_port} dbname={db_name} user={db_user}"
+                # Next to the task database
+                self.db_path = os.getenv("CONVERSATIONS_DB_PATH") or os.path.join(
+                    os.path.dirname(get_database_path()), "conversations.db"
+                )
         else:
             self.db_path = db_path
+            db_type = "postgresql" if is_postgresql_dsn(db_path) else "sqlite"
         
         self.db_type = db_type
-        self.adapter = get_database_adapter(self.db_path)
+        self.adapter = get_database_adapter(self.db_path, db_type=db_type)
         
         # LLM configuration for summarization
         self.llm_api_url = os.getenv("LLM_API_URL", "")
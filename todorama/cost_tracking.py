@@ -11,7 +11,7 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from enum import Enum
 
-from todorama.db_adapter import get_database_adapter
+from todorama.db_adapter import get_database_adapter, is_postgresql_dsn
 
 logger = logging.getLogger(__name__)
 
@@ -78,9 +78,10 @@ class CostTracker:
                 self.db_path = os.getenv("COST_DB_PATH", "/app/data/costs.db")
         else:
             self.db_path = db_path
+            db_type = "postgresql" if is_postgresql_dsn(db_path) else "sqlite"
         
         self.db_type = db_type
-        self.adapter = get_database_adapter(self.db_path)
+        self.adapter = get_database_adapter(self.db_path, db_type=db_type)
         self._init_schema()
     
     def _get_connection(self):
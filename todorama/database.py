@@ -8,7 +8,8 @@ import hashlib
 import secrets
 import time
 import threading
-from typing import Optional, List, Dict, Any, Tuple
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, FrozenSet, Set, Tuple, Iterator, Iterable
 from datetime import datetime
 from enum import Enum
 import logging
@@ -16,6 +17,25 @@ import logging
 from todorama.db_adapter import get_database_adapter, BaseDatabaseAdapter, DatabaseType
 from todorama.tracing import trace_span, add_span_attribute
 from todorama.storage.schema import SchemaManager
+from todorama.blocked_index import BlockedAncestorIndex
+from todorama.api_key_cache import APIKeyCache, APIKeyUsageBuffer
+from todorama.session_cache import SessionCache
+from todorama.storage.dependency_graph import find_dependency_path, find_dependency_cycles
+from todorama.storage.task_aggregates import TaskAggregateCache, load_task_aggregates
+from todorama.storage.memory_search import InMemorySearchIndex, highlight, snippet
+from todorama.storage.search_index import (
+    HIGHLIGHT_END, HIGHLIGHT_START, SNIPPET_ELLIPSIS, SNIPPET_WORDS,
+    fts5_query, fts5_rank, optimize_search_index, parse_search_terms, tsquery
+)
+from todorama.storage.task_context import TaskContextCache
+from todorama.storage.task_counters import load_task_counters, reconcile_task_counters
+from todorama.storage.bulk_operations import BulkOperations, ID_BATCH_SIZE
+from todorama.storage.webhook_index import WebhookSubscriptionIndex
+from todorama.storage.task_export import EXPORT_CHUNK_SIZE, export_filters, iter_export_chunks
+from todorama.storage.pagination import (
+    ACTIVITY_FEED_ORDER, CHANGE_HISTORY_ORDER, TASK_ORDERS,
+    created_id_key, make_page, paginate_query, task_cursor_key, task_cursor_kind
+)
 try:
     from opentelemetry import trace
 except ImportError:
@@ -35,6 +55,9 @@ QUERY_SLOW_THRESHOLD = float(os.getenv("DB_QUERY_SLOW_THRESHOLD", "0.1"))
 # Enable query logging (can be set via environment variable)
 ENABLE_QUERY_LOGGING = os.getenv("DB_ENABLE_QUERY_LOGGING", "true").lower() == "true"
 
+# Maximum number of parent levels get_task_context walks up (guards against cycles)
+ANCESTRY_MAX_DEPTH = 100
+
 
 class TaskType(Enum):
     """Task type enumeration."""
@@ -110,6 +133,31 @@ class TodoDatabase:
         
         self.db_type = db_type
         self.adapter = get_database_adapter(self.db_path)
+        self._blocked_index = BlockedAncestorIndex(db_type)
+        
+        from todorama.config import get_settings
+        settings = get_settings()
+        self._api_key_cache = APIKeyCache(ttl=settings.api_key_cache_ttl)
+        self._api_key_usage = APIKeyUsageBuffer(flush_interval=settings.api_key_last_used_flush_interval)
+        self._session_cache = SessionCache(max_size=settings.session_cache_size, ttl=settings.session_cache_ttl)
+        self._session_sweep_batch_size = settings.session_sweep_batch_size
+        self._stale_task_sweep_batch_size = settings.stale_task_sweep_batch_size
+        self._aggregate_cache = TaskAggregateCache(ttl=settings.analytics_cache_ttl)
+        self._task_context_cache = TaskContextCache(
+            ttl=settings.task_context_cache_ttl, max_size=settings.task_context_cache_size
+        )
+        self._webhook_index = WebhookSubscriptionIndex(ttl=settings.webhook_index_ttl)
+        self._task_counters = False
+        self._search_index = False
+        self._memory_search: Optional[InMemorySearchIndex] = None
+        if settings.search_backend == "memory":
+            snapshot_path = settings.search_snapshot_path or (
+                f"{self.db_path}.search-index" if db_type == "sqlite" else None
+            )
+            self._memory_search = InMemorySearchIndex(snapshot_path, db_type)
+        self._bulk_operations = BulkOperations(
+            db_type, self._write_transaction, self._execute_with_logging, self._normalize_sql
+        )
         
         if db_type == "sqlite":
             self._ensure_db_directory()
@@ -126,6 +174,64 @@ class TodoDatabase:
         """Get database connection using adapter."""
         return self.adapter.connect()
     
+    @contextmanager
+    def _write_transaction(self) -> Iterator[Any]:
+        """
+        Run a write transaction on a pooled connection.
+        
+        On SQLite the caller first waits its turn in the adapter's single-writer
+        queue and the transaction starts with BEGIN IMMEDIATE, so the write lock
+        is taken up front instead of failing with "database is locked" when a
+        read lock is upgraded. Commits on success and rolls back on error.
+        
+        Yields:
+            Connection with an open transaction
+        """
+        write_queue = getattr(self.adapter, "write_queue", None)
+        if write_queue is not None:
+            write_queue.acquire()
+        try:
+            conn = self._get_connection()
+            try:
+                if self.db_type == "sqlite":
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                self.adapter.close(conn)
+        finally:
+            if write_queue is not None:
+                write_queue.release()
+    
+    @contextmanager
+    def _read_transaction(self) -> Iterator[Any]:
+        """
+        Run several reads on one pooled connection against one snapshot.
+        
+        SQLite uses a deferred transaction, whose snapshot is taken at the first
+        read; PostgreSQL uses a REPEATABLE READ, READ ONLY transaction. The
+        transaction is always rolled back since nothing is written.
+        
+        Yields:
+            Connection with an open transaction
+        """
+        conn = self._get_connection()
+        try:
+            if self.db_type == "sqlite":
+                conn.execute("BEGIN")
+            else:
+                conn.rollback()
+                conn.cursor().execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+            yield conn
+        finally:
+            try:
+                conn.rollback()
+            finally:
+                self.adapter.close(conn)
+    
     def _log_query(self, query: str, params: Tuple, duration: float, rows_returned: int = None):
         """
         Log query performance information.
@@ -277,9 +383,15 @@ class TodoDatabase:
             adapter=self.adapter,
             get_connection=self._get_connection,
             normalize_sql=self._normalize_sql,
-            execute_with_logging=self._execute_with_logging
+            execute_with_logging=self._execute_with_logging,
+            search_feed=self._memory_search is not None
         )
         schema_manager.initialize_schema()
+        self._task_counters = schema_manager.task_counters_installed
+        self._search_index = schema_manager.search_index_installed
+        if self._memory_search is not None and not schema_manager.search_feed_installed:
+            logger.warning("In-memory search index needs the Alembic migrations; using full-text search")
+            self._memory_search = None
     
     def create_project(
         self,
@@ -1034,8 +1146,7 @@ class TodoDatabase:
             else:
                 due_date_str = due_date.isoformat()
         
-        conn = self._get_connection()
-        try:
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
             task_id = self._execute_insert(cursor, """
                 INSERT INTO tasks (title, task_type, task_instruction, verification_instruction, project_id, notes, priority, estimated_hours, due_date, organization_id)
@@ -1050,18 +1161,144 @@ class TodoDatabase:
             
             # Create initial version (version 1) before committing
             self._create_task_version(task_id, agent_id, conn)
+        
+        logger.info(f"Created task {task_id}: {title} by agent {agent_id}")
+        return task_id
+    
+    def _reserve_task_ids(self, cursor, count: int) -> List[int]:
+        """
+        Allocate IDs for count new tasks. Must run inside a write transaction.
+        
+        PostgreSQL draws them from the tasks id sequence. On SQLite the write
+        transaction excludes other writers, so the next count IDs after the
+        highest ever issued (AUTOINCREMENT never reuses IDs) are free.
+        """
+        if self.db_type == "postgresql":
+            self._execute_with_logging(
+                cursor,
+                "SELECT nextval(pg_get_serial_sequence('tasks', 'id')) AS id FROM generate_series(1, ?)",
+                (count,)
+            )
+            return [row["id"] for row in cursor.fetchall()]
+        self._execute_with_logging(cursor, """
+            SELECT MAX(
+                COALESCE((SELECT MAX(id) FROM tasks), 0),
+                COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'tasks'), 0)
+            ) AS last_id
+        """, None)
+        last_id = cursor.fetchone()["last_id"]
+        return list(range(last_id + 1, last_id + 1 + count))
+    
+    def bulk_create_tasks(self, tasks: List[Dict[str, Any]], agent_id: str) -> List[int]:
+        """
+        Create many tasks in one write transaction.
+        
+        Each task dictionary takes the keyword arguments of create_task() other
+        than agent_id. The tasks, their 'created' history entries and their
+        version 1 snapshots are written with executemany, so the cost is a few
+        statements and one commit instead of a transaction per task. Either
+        every task is created or none is.
+        
+        Args:
+            tasks: Task dictionaries (title, task_type, task_instruction,
+                   verification_instruction and optional project_id, notes,
+                   priority, estimated_hours, due_date, organization_id)
+            agent_id: Agent creating the tasks
             
-            conn.commit()
-            logger.info(f"Created task {task_id}: {title} by agent {agent_id}")
+        Returns:
+            IDs of the created tasks, in the order given
+            
+        Raises:
+            ValueError: If a task has an invalid priority
+        """
+        if not tasks:
+            return []
+        
+        rows = []
+        for task in tasks:
+            priority = task.get("priority") or "medium"
+            if priority not in ["low", "medium", "high", "critical"]:
+                raise ValueError(f"Invalid priority: {priority}. Must be one of: low, medium, high, critical")
+            due_date = task.get("due_date")
+            if due_date and not isinstance(due_date, str):
+                due_date = due_date.isoformat()
+            rows.append([
+                task["title"], task["task_type"], task["task_instruction"], task["verification_instruction"],
+                task.get("project_id"), task.get("notes"), priority, task.get("estimated_hours"),
+                due_date or None, task.get("organization_id")
+            ])
+        
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            
+            # Get organization_id from each distinct project once
+            project_ids = sorted({row[4] for row in rows if row[9] is None and row[4] is not None})
+            organizations = {}
+            for start in range(0, len(project_ids), 500):
+                batch = project_ids[start:start + 500]
+                self._execute_with_logging(
+                    cursor,
+                    f"SELECT id, organization_id FROM projects WHERE id IN ({','.join('?' for _ in batch)})",
+                    tuple(batch)
+                )
+                organizations.update((row["id"], row["organization_id"]) for row in cursor.fetchall())
+            for row in rows:
+                if row[9] is None and row[4] is not None:
+                    row[9] = organizations.get(row[4])
+            
+            task_ids = self._reserve_task_ids(cursor, len(rows))
+            cursor.executemany(self._normalize_sql("""
+                INSERT INTO tasks (id, title, task_type, task_instruction, verification_instruction, project_id, notes, priority, estimated_hours, due_date, organization_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """), [(task_id, *row) for task_id, row in zip(task_ids, rows)])
             
-            return task_id
+            # Record creation in history
+            cursor.executemany(self._normalize_sql("""
+                INSERT INTO change_history (task_id, agent_id, change_type, notes)
+                VALUES (?, ?, 'created', ?)
+            """), [(task_id, agent_id, row[5]) for task_id, row in zip(task_ids, rows)])
+            
+            # Version 1 snapshots, copied from the rows just inserted
+            cursor.executemany(self._normalize_sql("""
+                INSERT INTO task_versions (
+                    task_id, version_number, title, task_type, task_instruction,
+                    verification_instruction, task_status, verification_status,
+                    priority, assigned_agent, notes, estimated_hours, actual_hours,
+                    time_delta_hours, due_date, started_at, completed_at, created_by
+                )
+                SELECT id, 1, title, task_type, task_instruction,
+                       verification_instruction, task_status, verification_status,
+                       priority, assigned_agent, notes, estimated_hours, actual_hours,
+                       time_delta_hours, due_date, started_at, completed_at, ?
+                FROM tasks
+                WHERE id = ?
+            """), [(agent_id, task_id) for task_id in task_ids])
+        
+        logger.info(f"Created {len(task_ids)} tasks in bulk by agent {agent_id}")
+        return task_ids
+    
+    def get_task_titles(self, project_id: Optional[int] = None) -> Set[str]:
+        """
+        Get the distinct titles of existing tasks, stripped of surrounding whitespace.
+        
+        Args:
+            project_id: Optional project filter; None returns titles from all tasks
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            if project_id is not None:
+                self._execute_with_logging(cursor, "SELECT DISTINCT title FROM tasks WHERE project_id = ?", (project_id,))
+            else:
+                self._execute_with_logging(cursor, "SELECT DISTINCT title FROM tasks", None)
+            return {row["title"].strip() for row in cursor.fetchall() if row["title"]}
         finally:
             self.adapter.close(conn)
     
     def _find_tasks_with_blocked_subtasks_batch(self, task_ids: List[int]) -> set:
         """
         Efficiently find all tasks in the given list that have blocked subtasks (recursively).
-        Uses batch queries instead of individual recursive checks to avoid N+1 problem.
+        Answered from the blocked ancestor index; the only query reads its feed.
         
         Args:
             task_ids: List of task IDs to check
@@ -1071,111 +1308,78 @@ class TodoDatabase:
         """
         if not task_ids:
             return set()
-        
         conn = self._get_connection()
         try:
-            cursor = conn.cursor()
-            
-            # Find all directly blocked tasks first
-            cursor.execute("""
-                SELECT id FROM tasks WHERE task_status = 'blocked'
-            """)
-            directly_blocked = {row[0] for row in cursor.fetchall()}
-            
-            # Find all parent tasks that have directly blocked children
-            if directly_blocked:
-                placeholders = ",".join("?" * len(directly_blocked))
-                cursor.execute(f"""
-                    SELECT DISTINCT parent_task_id 
-                    FROM task_relationships 
-                    WHERE relationship_type = 'subtask' 
-                        AND child_task_id IN ({placeholders})
-                """, list(directly_blocked))
-                parent_ids = {row[0] for row in cursor.fetchall() if row[0] is not None}
-            else:
-                parent_ids = set()
-            
-            # Recursively find all ancestors (parents of parents, etc.)
-            all_blocked_parents = parent_ids.copy()
-            current_level = parent_ids
-            
-            # Traverse up the hierarchy (max depth limit for safety)
-            max_depth = 100
-            depth = 0
-            while current_level and depth < max_depth:
-                placeholders = ",".join("?" * len(current_level))
-                cursor.execute(f"""
-                    SELECT DISTINCT parent_task_id 
-                    FROM task_relationships 
-                    WHERE relationship_type = 'subtask' 
-                        AND child_task_id IN ({placeholders})
-                        AND parent_task_id IS NOT NULL
-                """, list(current_level))
-                next_level = {row[0] for row in cursor.fetchall() if row[0] is not None}
-                next_level -= all_blocked_parents  # Only new ones
-                current_level = next_level
-                all_blocked_parents.update(next_level)
-                depth += 1
-            
-            # Return intersection of requested task_ids and blocked parents
-            return all_blocked_parents & set(task_ids)
+            ancestors = self._blocked_ancestors(conn.cursor())
         finally:
             self.adapter.close(conn)
+        return {task_id for task_id in task_ids if task_id in ancestors}
     
-    def _has_blocked_subtasks(self, task_id: int, visited: Optional[set] = None) -> bool:
+    def _blocked_ancestors(self, cursor) -> FrozenSet[int]:
+        """Get the IDs of tasks with a blocked subtask at any depth, reading on the given cursor."""
+        return self._blocked_index.blocked_ancestors(cursor, self._execute_with_logging)
+    
+    def _stage_blocked_ancestors(self, conn, commit: bool = True) -> str:
         """
-        Recursively check if a task has any blocked subtasks.
-        For single task checks (used by get_task).
+        Copy the blocked ancestor set into a temporary table on the connection.
+        
+        Queries that filter on the set join against the table instead of
+        listing the IDs. The table is only rewritten when the set changed.
         
         Args:
-            task_id: Task ID to check
-            visited: Set of visited task IDs to prevent infinite loops
-            
+            conn: Connection that will run the query
+            commit: Commit the staged rows so they outlive the connection's
+                    release to the pool; pass False inside a write transaction,
+                    which commits them with its own changes
+        
         Returns:
-            True if any subtask (recursively) has status 'blocked', False otherwise
+            Name of the temporary table (one id column)
         """
-        if visited is None:
-            visited = set()
+        table = self._blocked_index.stage(conn.cursor(), self._execute_with_logging)
+        if commit:
+            conn.commit()
+        return table
+    
+    def rebuild_blocked_index(self) -> Dict[str, Any]:
+        """
+        Rebuild the blocked ancestor index from task_relationships and task statuses.
         
-        # Prevent infinite loops (shouldn't happen with proper relationships, but safety check)
-        if task_id in visited:
-            return False
-        visited.add(task_id)
+        Returns:
+            Index metrics after the rebuild
+        """
+        conn = self._get_connection()
+        try:
+            self._blocked_index.rebuild(conn.cursor(), self._execute_with_logging)
+        finally:
+            self.adapter.close(conn)
+        logger.info("Rebuilt blocked ancestor index")
+        return self._blocked_index.get_metrics()
+    
+    def verify_blocked_index(self) -> Dict[str, Any]:
+        """
+        Verify the blocked ancestor index against a walk of task_relationships.
         
+        Returns:
+            Dictionary with consistent flag and any missing/unexpected task IDs
+        """
         conn = self._get_connection()
         try:
-            cursor = conn.cursor()
-            # Find all subtasks of this task
-            cursor.execute("""
-                SELECT child_task_id 
-                FROM task_relationships 
-                WHERE parent_task_id = ? AND relationship_type = 'subtask'
-            """, (task_id,))
-            
-            subtask_ids = [row[0] for row in cursor.fetchall()]
-            
-            # Check each subtask
-            for subtask_id in subtask_ids:
-                # Get subtask status
-                cursor.execute("SELECT task_status FROM tasks WHERE id = ?", (subtask_id,))
-                subtask_row = cursor.fetchone()
-                if subtask_row:
-                    subtask_status = subtask_row[0]
-                    # If subtask is blocked, return True
-                    if subtask_status == "blocked":
-                        return True
-                    # Recursively check if this subtask has blocked subtasks
-                    if self._has_blocked_subtasks(subtask_id, visited.copy()):
-                        return True
-            
-            return False
+            result = self._blocked_index.verify(conn.cursor(), self._execute_with_logging)
         finally:
             self.adapter.close(conn)
+        if not result["consistent"]:
+            logger.warning(
+                f"Blocked ancestor index out of sync: "
+                f"{len(result['missing'])} missing, {len(result['unexpected'])} unexpected"
+            )
+        return result
     
     def get_task(self, task_id: int, organization_id: Optional[int] = None) -> Optional[Dict[str, Any]]:
         """
         Get a task by ID.
         
+        Tasks with a blocked subtask at any depth are reported as blocked.
+        
         Args:
             task_id: Task ID
             organization_id: Optional organization ID for tenant isolation. If provided, 
@@ -1184,24 +1388,172 @@ class TodoDatabase:
         Returns:
             Task dictionary if found and accessible, None otherwise
         """
+        return self.get_tasks([task_id], organization_id=organization_id).get(task_id)
+    
+    def get_tasks(
+        self,
+        task_ids: Iterable[int],
+        organization_id: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several tasks by ID on one connection.
+        
+        Each batch of IDs is one query; the blocked-subtask overlay comes from
+        the blocked ancestor index.
+        
+        Args:
+            task_ids: Task IDs (duplicates are ignored)
+            organization_id: Optional organization ID for tenant isolation. If provided,
+                           tasks of other organizations are left out.
+        
+        Returns:
+            Dictionary of task ID -> task dictionary for the tasks found
+        """
+        ids = list(dict.fromkeys(task_ids))
+        if not ids:
+            return {}
+        org_filter = "AND t.organization_id = ?" if organization_id is not None else ""
+        tasks: Dict[int, Dict[str, Any]] = {}
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            if organization_id is not None:
-                cursor.execute("SELECT * FROM tasks WHERE id = ? AND organization_id = ?", (task_id, organization_id))
-            else:
-                cursor.execute("SELECT * FROM tasks WHERE id = ?", (task_id,))
-            row = cursor.fetchone()
-            if row:
-                task = dict(row)
-                # Check if task has blocked subtasks - if so, override status to blocked
-                if self._has_blocked_subtasks(task_id):
-                    task["task_status"] = "blocked"
-                return task
-            return None
+            blocked_ancestors = self._blocked_ancestors(cursor)
+            for start in range(0, len(ids), ID_BATCH_SIZE):
+                batch = ids[start:start + ID_BATCH_SIZE]
+                placeholders = ",".join("?" for _ in batch)
+                params = list(batch)
+                if organization_id is not None:
+                    params.append(organization_id)
+                self._execute_with_logging(cursor, f"""
+                    SELECT t.* FROM tasks t
+                    WHERE t.id IN ({placeholders}) {org_filter}
+                """, tuple(params))
+                for row in cursor.fetchall():
+                    task = dict(row)
+                    if task["id"] in blocked_ancestors:
+                        task["task_status"] = "blocked"
+                    tasks[task["id"]] = task
+            return tasks
         finally:
             self.adapter.close(conn)
     
+    def get_task_context(
+        self,
+        task_id: int,
+        organization_id: Optional[int] = None,
+        updates_limit: int = 100,
+        history_limit: int = 50
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load everything get_task_context needs in one read transaction.
+        
+        The task and its ancestry come from one recursive CTE query: the task's
+        direct parents through any relationship, then further subtask parents
+        up the hierarchy. The blocked-subtask overlay comes from the blocked
+        ancestor index.
+        The project, updates and change history follow on the same connection.
+        When the task context cache is enabled, a context whose lineage, blocked
+        overlay, project and history are unchanged is served from it after the
+        lineage query alone.
+        
+        Args:
+            task_id: Task ID
+            organization_id: Optional organization ID for tenant isolation
+            updates_limit: Maximum number of updates (newest first)
+            history_limit: Maximum number of change history entries (newest first)
+        
+        Returns:
+            Dictionary with task, project, ancestry (nearest first), updates and
+            change_history, or None if the task is not found or not accessible
+        """
+        cache = self._task_context_cache
+        with self._read_transaction() as conn:
+            cursor = conn.cursor()
+            # The task row also carries what the cache stamp needs beyond the
+            # lineage rows: its newest change_history ID and the project's updated_at
+            self._execute_with_logging(cursor, """
+                WITH RECURSIVE lineage(id, depth) AS (
+                    SELECT ?, 0
+                    UNION
+                    SELECT tr.parent_task_id, l.depth + 1
+                    FROM task_relationships tr
+                    JOIN lineage l ON tr.child_task_id = l.id
+                    WHERE (l.depth = 0 OR tr.relationship_type = 'subtask') AND l.depth < ?
+                )
+                SELECT t.*, l.depth AS lineage_depth,
+                       CASE WHEN l.depth = 0 THEN
+                           (SELECT MAX(id) FROM change_history WHERE task_id = t.id)
+                       END AS last_change_id,
+                       CASE WHEN l.depth = 0 THEN
+                           (SELECT updated_at FROM projects WHERE id = t.project_id)
+                       END AS project_updated_at
+                FROM (SELECT id, MIN(depth) AS depth FROM lineage GROUP BY id) l
+                JOIN tasks t ON t.id = l.id
+                ORDER BY l.depth, t.id
+            """, (task_id, ANCESTRY_MAX_DEPTH))
+            rows = [dict(row) for row in cursor.fetchall()]
+            blocked_ancestors = self._blocked_ancestors(cursor)
+            
+            stamp = None
+            if cache.enabled:
+                # Raw lineage rows (task and ancestors, with the task's history and
+                # project marks) plus which of them the blocked overlay applies to:
+                # a write to any of them, a re-pointed parent or a subtask becoming
+                # blocked or unblocked changes the stamp
+                stamp = (
+                    tuple(tuple(row.values()) for row in rows),
+                    tuple(row["id"] for row in rows if row["id"] in blocked_ancestors),
+                )
+                cached = cache.get(task_id, organization_id, stamp)
+                if cached is not None:
+                    return cached
+            
+            task = None
+            ancestry = []
+            for item in rows:
+                depth = item.pop("lineage_depth")
+                del item["last_change_id"], item["project_updated_at"]
+                if item["id"] in blocked_ancestors:
+                    item["task_status"] = "blocked"
+                if depth == 0:
+                    task = item
+                else:
+                    ancestry.append(item)
+            if task is None or (organization_id is not None and task.get("organization_id") != organization_id):
+                return None
+            
+            project = None
+            if task.get("project_id"):
+                self._execute_with_logging(cursor, "SELECT * FROM projects WHERE id = ?", (task["project_id"],))
+                row = cursor.fetchone()
+                project = dict(row) if row else None
+            
+            self._execute_with_logging(cursor, """
+                SELECT * FROM change_history
+                WHERE task_id = ? AND change_type IN ('progress', 'note', 'blocker', 'question', 'finding')
+                ORDER BY created_at DESC
+                LIMIT ?
+            """, (task_id, updates_limit))
+            updates = [dict(row) for row in cursor.fetchall()]
+            
+            _, _, order_clause = paginate_query(CHANGE_HISTORY_ORDER, "change_history", None)
+            self._execute_with_logging(
+                cursor, f"SELECT * FROM change_history WHERE task_id = ? {order_clause} LIMIT ?",
+                (task_id, history_limit)
+            )
+            change_history = [dict(row) for row in cursor.fetchall()]
+        
+        context = {
+            "task": task,
+            "project": project,
+            "ancestry": ancestry,
+            "updates": updates,
+            "change_history": change_history,
+        }
+        if stamp is not None:
+            cache.put(task_id, organization_id, stamp, context)
+        return context
+    
     def _validate_github_url(self, url: str) -> bool:
         """Validate that URL is a valid GitHub issue or PR URL."""
         if not url or not isinstance(url, str):
@@ -1369,9 +1721,87 @@ class TodoDatabase:
         # Advanced filtering: text search
         search: Optional[str] = None,
         # Multi-tenancy: organization filtering
-        organization_id: Optional[int] = None
+        organization_id: Optional[int] = None,
+        # Keyset pagination: cursor from the previous page
+        after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Query tasks with filters including advanced date range and text search."""
+        """
+        Query tasks with filters including advanced date range and text search.
+        
+        Returns the tasks of the page query_tasks_page() would return.
+        """
+        return self.query_tasks_page(
+            task_type=task_type,
+            task_status=task_status,
+            assigned_agent=assigned_agent,
+            project_id=project_id,
+            priority=priority,
+            tag_id=tag_id,
+            tag_ids=tag_ids,
+            order_by=order_by,
+            has_due_date=has_due_date,
+            limit=limit,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            completed_after=completed_after,
+            completed_before=completed_before,
+            search=search,
+            organization_id=organization_id,
+            after=after
+        )["tasks"]
+    
+    def query_tasks_page(
+        self,
+        task_type: Optional[str] = None,
+        task_status: Optional[str] = None,
+        assigned_agent: Optional[str] = None,
+        project_id: Optional[int] = None,
+        priority: Optional[str] = None,
+        tag_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        order_by: Optional[str] = None,
+        has_due_date: Optional[bool] = None,
+        limit: int = 100,
+        # Advanced filtering: date ranges
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        updated_after: Optional[str] = None,
+        updated_before: Optional[str] = None,
+        completed_after: Optional[str] = None,
+        completed_before: Optional[str] = None,
+        # Advanced filtering: text search
+        search: Optional[str] = None,
+        # Multi-tenancy: organization filtering
+        organization_id: Optional[int] = None,
+        # Keyset pagination: cursor from the previous page
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Query one page of tasks with filters including advanced date range and text search.
+        
+        Pages are keyset-paginated on the ordering key ending in (created_at, id),
+        so each page is an index range scan starting after the previous page.
+        
+        Args:
+            order_by: None (newest first), 'created_at_asc', 'priority' or 'priority_asc'
+            limit: Page size
+            after: next_cursor of the previous page (None for the first page)
+        
+        Returns:
+            Dictionary with tasks, next_cursor (None on the last page) and has_more
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        if order_by not in TASK_ORDERS:
+            # Unknown orderings fall back to newest first
+            order_by = None
+        keyset_order = TASK_ORDERS[order_by]
+        cursor_kind = task_cursor_kind(order_by)
+        keyset_clause, keyset_params, order_clause = paginate_query(keyset_order, cursor_kind, after)
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -1435,7 +1865,14 @@ class TodoDatabase:
                 params.append(completed_before)
             
             # Handle text search (case-insensitive search in title and task_instruction)
-            if search:
+            search_ids = self._memory_search_ids(cursor, search, organization_id) if search else None
+            if search_ids is not None:
+                if search_ids:
+                    conditions.append(f"t.id IN ({','.join('?' * len(search_ids))})")
+                    params.extend(search_ids)
+                else:
+                    conditions.append("1 = 0")
+            elif search:
                 search_term = f"%{search.lower()}%"
                 # SQLite LIKE is case-insensitive by default, but use LOWER for consistency
                 conditions.append("(LOWER(t.title) LIKE ? OR LOWER(t.task_instruction) LIKE ?)")
@@ -1445,6 +1882,7 @@ class TodoDatabase:
             # Handle tag filtering
             join_clause = ""
             group_by_clause = ""
+            group_by_params = []
             if tag_id:
                 join_clause = "INNER JOIN task_tags tt ON t.id = tt.task_id"
                 conditions.append("tt.tag_id = ?")
@@ -1457,97 +1895,55 @@ class TodoDatabase:
                 params.extend(tag_ids)
                 # Group by to ensure we get tasks that have all tags
                 group_by_clause = "GROUP BY t.id HAVING COUNT(DISTINCT tt.tag_id) = ?"
-                params.append(len(tag_ids))
+                group_by_params.append(len(tag_ids))
             
             # If querying for task_status='blocked', also include tasks with blocked subtasks
             if filter_task_status == "blocked":
-                # Get all tasks that have blocked subtasks (recursively)
-                # First, find direct parents of blocked tasks
-                cursor.execute("""
-                    SELECT DISTINCT tr.parent_task_id as id
-                    FROM task_relationships tr
-                    JOIN tasks t_child ON tr.child_task_id = t_child.id
-                    WHERE tr.relationship_type = 'subtask' 
-                        AND t_child.task_status = 'blocked'
-                """)
-                all_blocked_parent_ids = {row[0] for row in cursor.fetchall()}
-                
-                # Recursively find grandparents, etc. with blocked descendants
-                new_parents = all_blocked_parent_ids
-                while new_parents:
-                    placeholders = ",".join("?" * len(new_parents))
-                    cursor.execute(f"""
-                        SELECT DISTINCT tr.parent_task_id as id
-                        FROM task_relationships tr
-                        WHERE tr.relationship_type = 'subtask' 
-                            AND tr.child_task_id IN ({placeholders})
-                            AND tr.parent_task_id IS NOT NULL
-                    """, list(new_parents))
-                    next_level = {row[0] for row in cursor.fetchall() if row[0] is not None}
-                    next_level -= all_blocked_parent_ids  # Only new ones
-                    new_parents = next_level
-                    all_blocked_parent_ids.update(next_level)
-                
-                # Add condition: task_status = 'blocked' OR id in (blocked parent ids)
-                if all_blocked_parent_ids:
-                    parent_placeholders = ",".join("?" * len(all_blocked_parent_ids))
-                    conditions.append(f"(t.task_status = 'blocked' OR t.id IN ({parent_placeholders}))")
-                    params.extend(all_blocked_parent_ids)
-                else:
-                    conditions.append("t.task_status = 'blocked'")
+                # Tasks that have blocked subtasks (recursively), staged as a temporary table
+                blocked_table = self._stage_blocked_ancestors(conn)
+                conditions.append(
+                    f"(t.task_status = 'blocked' OR t.id IN (SELECT id FROM {blocked_table}))"
+                )
             
-            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+            # Keyset pagination: rows after the previous page's last key
+            if keyset_clause:
+                conditions.append(keyset_clause)
+                params.extend(keyset_params)
             
-            # Default ordering by created_at DESC
-            order_clause = "ORDER BY t.created_at DESC"
-            if order_by == "priority":
-                # Order by priority: critical > high > medium > low
-                order_clause = """ORDER BY 
-                    CASE t.priority 
-                        WHEN 'critical' THEN 4
-                        WHEN 'high' THEN 3
-                        WHEN 'medium' THEN 2
-                        WHEN 'low' THEN 1
-                        ELSE 0
-                    END DESC, t.created_at DESC"""
-            elif order_by == "priority_asc":
-                # Order by priority ascending: low > medium > high > critical
-                order_clause = """ORDER BY 
-                    CASE t.priority 
-                        WHEN 'critical' THEN 4
-                        WHEN 'high' THEN 3
-                        WHEN 'medium' THEN 2
-                        WHEN 'low' THEN 1
-                        ELSE 0
-                    END ASC, t.created_at DESC"""
+            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+            params.extend(group_by_params)
             
-            params.append(limit)
+            # Fetch one extra row to know whether there is a next page
+            params.append(limit + 1)
             query = f"SELECT DISTINCT t.* FROM tasks t {join_clause} {where_clause} {group_by_clause} {order_clause} LIMIT ?"
             
             start_time = time.time()
             cursor.execute(query, params)
-            tasks = [dict(row) for row in cursor.fetchall()]
+            page = make_page(
+                [dict(row) for row in cursor.fetchall()], limit,
+                cursor_kind, task_cursor_key(order_by), "tasks"
+            )
+            tasks = page["tasks"]
             query_duration = time.time() - start_time
             
             if ENABLE_QUERY_LOGGING and query_duration >= QUERY_SLOW_THRESHOLD:
                 logger.warning(f"query_tasks took {query_duration:.4f}s, returned {len(tasks)} tasks")
             
-            # Batch check all tasks for blocked subtasks (much more efficient than individual checks)
+            # Override status for tasks with blocked subtasks
             if tasks:
-                task_ids = [task["id"] for task in tasks]
-                blocked_parent_ids = self._find_tasks_with_blocked_subtasks_batch(task_ids)
-                
-                # Override status for tasks with blocked subtasks
+                blocked_parent_ids = self._blocked_ancestors(cursor)
                 for task in tasks:
                     if task["id"] in blocked_parent_ids:
                         task["task_status"] = "blocked"
             
             # If filtering by task_status and we overrode some statuses, re-filter if needed
             if filter_task_status and filter_task_status != "blocked":
-                # Only return tasks that match the requested status (after propagation check)
+                # Only return tasks that match the requested status (after propagation check).
+                # next_cursor was taken from the last scanned row, so dropped rows are not rescanned.
                 tasks = [t for t in tasks if t["task_status"] == filter_task_status]
             
-            return tasks
+            page["tasks"] = tasks
+            return page
         finally:
             self.adapter.close(conn)
     
@@ -1636,13 +2032,22 @@ class TodoDatabase:
         Search tasks using full-text search across title, task_instruction, and notes.
         Supports both SQLite (FTS5) and PostgreSQL (tsvector) backends.
         
+        Bare words match as prefixes, "double quoted" text as a phrase and
+        "quoted text"* as a phrase ending in a prefix; every term must match
+        (see todorama.storage.search_index). Results are ranked by BM25 on
+        SQLite and ts_rank on PostgreSQL. The LIKE scan is only used when the
+        full-text index is not available.
+        
         Args:
             query: Search query string
             limit: Maximum number of results to return
             organization_id: Optional organization ID for tenant isolation
             
         Returns:
-            List of task dictionaries ranked by relevance
+            List of task dictionaries ranked by relevance. Full-text results
+            also have highlighted_title (the title with matches wrapped in
+            <mark> tags) and snippet (the best matching fragment, marked the
+            same way).
         """
         conn = self._get_connection()
         try:
@@ -1667,159 +2072,202 @@ class TodoDatabase:
                     self._execute_with_logging(cursor, query_sql, (limit,))
                 return [dict(row) for row in cursor.fetchall()]
             
-            search_query = query.strip()
+            terms = parse_search_terms(query)
+            if self._memory_search is not None:
+                return self._search_tasks_in_memory(cursor, terms, limit, organization_id)
             
-            # Use different full-text search based on database backend
-            if self.db_type == "postgresql":
-                # PostgreSQL uses tsvector with GIN index
-                # Use to_tsquery for proper query parsing
-                if organization_id is not None:
-                    query_sql = """
-                        SELECT *
-                        FROM tasks
-                        WHERE fts_vector @@ to_tsquery('english', %s)
-                            AND organization_id = %s
-                        ORDER BY ts_rank(fts_vector, to_tsquery('english', %s)) DESC, created_at DESC
-                        LIMIT %s
-                    """
-                    # Escape special characters for tsquery (replace spaces with & for AND, | for OR)
-                    # For simplicity, join words with & to require all terms
-                    tsquery = " & ".join(search_query.split())
-                    self._execute_with_logging(cursor, query_sql, (tsquery, organization_id, tsquery, limit))
-                else:
-                    query_sql = """
-                        SELECT *
-                        FROM tasks
-                        WHERE fts_vector @@ to_tsquery('english', %s)
-                        ORDER BY ts_rank(fts_vector, to_tsquery('english', %s)) DESC, created_at DESC
-                        LIMIT %s
-                    """
-                    # Escape special characters for tsquery (replace spaces with & for AND, | for OR)
-                    # For simplicity, join words with & to require all terms
-                    tsquery = " & ".join(search_query.split())
-                    self._execute_with_logging(cursor, query_sql, (tsquery, tsquery, limit))
-            else:
-                # SQLite uses FTS5
-                fts5_worked = False
-                fts5_results = []
-                try:
-                    # Use FTS5 MATCH with ranking
-                    # Join with tasks table to get full task data
-                    # bm25() provides BM25 ranking (lower is better, so we order ASC)
-                    # Note: In FTS5, MATCH must use the table name, not an alias
-                    if organization_id is not None:
-                        query_sql = """
-                            SELECT t.*
-                            FROM tasks t
-                            JOIN tasks_fts ON t.id = tasks_fts.rowid
-                            WHERE tasks_fts MATCH ? AND t.organization_id = ?
-                            ORDER BY bm25(tasks_fts) ASC, t.created_at DESC
-                            LIMIT ?
-                        """
-                        self._execute_with_logging(cursor, query_sql, (search_query, organization_id, limit))
-                    else:
-                        query_sql = """
-                            SELECT t.*
-                            FROM tasks t
-                            JOIN tasks_fts ON t.id = tasks_fts.rowid
-                            WHERE tasks_fts MATCH ?
-                            ORDER BY bm25(tasks_fts) ASC, t.created_at DESC
-                            LIMIT ?
-                        """
-                        self._execute_with_logging(cursor, query_sql, (search_query, limit))
-                    # Check if FTS5 returned results - if not, fall back to LIKE
-                    fts_results = cursor.fetchall()
-                    if fts_results:
-                        # FTS5 worked and returned results - use them
-                        fts5_worked = True
-                        # Store results temporarily to return them
-                        for row in fts_results:
-                            fts5_results.append(dict(row))
-                    else:
-                        # FTS5 returned empty - likely index not populated, use LIKE fallback
-                        logger.warning(f"FTS5 returned no results, falling back to LIKE")
-                except sqlite3.OperationalError:
-                    # If FTS5 isn't available or table doesn't exist, fall back to LIKE search
-                    logger.warning(f"FTS5 search failed, falling back to LIKE")
-                
-                # Use LIKE fallback (either FTS5 failed or returned empty)
-                if not fts5_worked:
-                    # Split search query into keywords and search for all of them
-                    keywords = search_query.split()
-                    if not keywords:
-                        # Empty query, return empty results
-                        if organization_id is not None:
-                            query_sql = "SELECT * FROM tasks WHERE organization_id = ? LIMIT ?"
-                            self._execute_with_logging(cursor, query_sql, (organization_id, limit))
-                        else:
-                            query_sql = "SELECT * FROM tasks WHERE 1=0 LIMIT ?"
-                            self._execute_with_logging(cursor, query_sql, (limit,))
-                    else:
-                        # Build LIKE conditions for each keyword (all keywords must match)
-                        like_conditions = []
-                        params = []
-                        for keyword in keywords:
-                            pattern = f"%{keyword}%"
-                            like_conditions.append(f"(title LIKE ? OR task_instruction LIKE ? OR notes LIKE ?)")
-                            params.extend([pattern, pattern, pattern])
-                        
-                        # Add organization_id filter if provided
-                        if organization_id is not None:
-                            like_conditions.append("organization_id = ?")
-                            params.append(organization_id)
-                        
-                        query_sql = f"""
-                            SELECT DISTINCT * FROM tasks
-                            WHERE {' AND '.join(like_conditions)}
-                            ORDER BY created_at DESC
-                            LIMIT ?
-                        """
-                        params.append(limit)
-                        self._execute_with_logging(cursor, query_sql, tuple(params))
-                else:
-                    # FTS5 worked, return its results
-                    return fts5_results
+            if not self._search_index:
+                return self._search_tasks_like(cursor, query.strip(), limit, organization_id)
             
-            # For PostgreSQL or LIKE fallback, fetch results from cursor
-            results = []
-            for row in cursor.fetchall():
-                results.append(dict(row))
+            if not terms:
+                # Nothing searchable (only punctuation)
+                return []
             
-            return results
-        except Exception as e:
-            # Fallback to LIKE search for any errors
-            logger.warning(f"Full-text search failed, falling back to LIKE: {e}")
-            try:
-                cursor = conn.cursor()
-                search_pattern = f"%{query.strip()}%"
-                if organization_id is not None:
-                    query_sql = self._normalize_sql("""
-                        SELECT * FROM tasks
-                        WHERE (title LIKE ? 
-                           OR task_instruction LIKE ?
-                           OR notes LIKE ?)
-                           AND organization_id = ?
-                        ORDER BY created_at DESC
-                        LIMIT ?
-                    """)
-                    self._execute_with_logging(cursor, query_sql, (search_pattern, search_pattern, search_pattern, organization_id, limit))
-                else:
-                    query_sql = self._normalize_sql("""
-                        SELECT * FROM tasks
-                        WHERE title LIKE ? 
-                           OR task_instruction LIKE ?
-                           OR notes LIKE ?
-                        ORDER BY created_at DESC
+            org_filter = "AND t.organization_id = ?" if organization_id is not None else ""
+            org_params = (organization_id,) if organization_id is not None else ()
+            
+            if self.db_type == "postgresql":
+                # Rank and limit first, so ts_headline only runs on returned rows
+                query_sql = self._normalize_sql(f"""
+                    SELECT r.*,
+                        ts_headline('english', r.title, r.search_query, ?) AS highlighted_title,
+                        ts_headline('english', concat_ws(' ', r.task_instruction, r.notes), r.search_query, ?) AS snippet
+                    FROM (
+                        SELECT t.*, search_query, ts_rank(t.fts_vector, search_query) AS search_rank
+                        FROM tasks t, to_tsquery('english', ?) AS search_query
+                        WHERE t.fts_vector @@ search_query {org_filter}
+                        ORDER BY search_rank DESC, t.created_at DESC, t.id DESC
                         LIMIT ?
-                    """)
-                    self._execute_with_logging(cursor, query_sql, (search_pattern, search_pattern, search_pattern, limit))
+                    ) r
+                    ORDER BY r.search_rank DESC, r.created_at DESC, r.id DESC
+                """)
+                marks = f'StartSel="{HIGHLIGHT_START}", StopSel="{HIGHLIGHT_END}"'
+                params = (
+                    f"{marks}, HighlightAll=true",
+                    f'{marks}, MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}, '
+                    f'MaxFragments=2, FragmentDelimiter=" {SNIPPET_ELLIPSIS} "',
+                    tsquery(terms),
+                ) + org_params + (limit,)
+                self._execute_with_logging(cursor, query_sql, params)
+                results = []
+                for row in cursor.fetchall():
+                    task = dict(row)
+                    for column in ("search_query", "search_rank", "fts_vector"):
+                        task.pop(column, None)
+                    results.append(task)
+                return results
+            
+            # SQLite uses FTS5; bm25() is lower for better matches, weighted by column
+            # Note: In FTS5, MATCH must use the table name, not an alias
+            query_sql = f"""
+                SELECT t.*,
+                    highlight(tasks_fts, 0, ?, ?) AS highlighted_title,
+                    snippet(tasks_fts, -1, ?, ?, ?, ?) AS snippet
+                FROM tasks_fts
+                JOIN tasks t ON t.id = tasks_fts.rowid
+                WHERE tasks_fts MATCH ? {org_filter}
+                ORDER BY {fts5_rank()} ASC, t.created_at DESC, t.id DESC
+                LIMIT ?
+            """
+            params = (
+                HIGHLIGHT_START, HIGHLIGHT_END,
+                HIGHLIGHT_START, HIGHLIGHT_END, SNIPPET_ELLIPSIS, SNIPPET_WORDS,
+                fts5_query(terms),
+            ) + org_params + (limit,)
+            try:
+                self._execute_with_logging(cursor, query_sql, params)
                 return [dict(row) for row in cursor.fetchall()]
-            except Exception as fallback_error:
-                logger.error(f"LIKE search also failed: {fallback_error}")
-                return []
+            except sqlite3.OperationalError as e:
+                # tasks_fts was dropped or FTS5 is missing from this SQLite build
+                logger.warning(f"FTS5 search failed, falling back to LIKE: {e}")
+                return self._search_tasks_like(cursor, query.strip(), limit, organization_id)
         finally:
             self.adapter.close(conn)
     
+    def _memory_search_ids(self, cursor, search: str, organization_id: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Get the IDs of tasks matching a query_tasks() search from the in-memory index.
+        
+        Returns:
+            Matching task IDs, or None to use the LIKE filter instead (no
+            in-memory index, or more than ID_BATCH_SIZE matches)
+        """
+        if self._memory_search is None:
+            return None
+        self._memory_search.refresh(cursor, self._execute_with_logging)
+        task_ids = self._memory_search.search(parse_search_terms(search), ID_BATCH_SIZE + 1, organization_id)
+        return task_ids if len(task_ids) <= ID_BATCH_SIZE else None
+    
+    def _search_tasks_in_memory(
+        self,
+        cursor,
+        terms: List[Tuple[Tuple[str, ...], bool]],
+        limit: int,
+        organization_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Rank with the in-memory index, then read the matching rows in one query."""
+        self._memory_search.refresh(cursor, self._execute_with_logging)
+        task_ids = self._memory_search.search(terms, limit, organization_id)
+        if not task_ids:
+            return []
+        placeholders = ",".join("?" * len(task_ids))
+        self._execute_with_logging(
+            cursor,
+            self._normalize_sql(f"SELECT * FROM tasks WHERE id IN ({placeholders})"),
+            tuple(task_ids)
+        )
+        rows = {row["id"]: dict(row) for row in cursor.fetchall()}
+        results = []
+        for task_id in task_ids:
+            task = rows.get(task_id)
+            if task is None:
+                continue  # deleted after the index was refreshed
+            task["highlighted_title"] = highlight(task["title"], terms)
+            task["snippet"] = snippet((task["task_instruction"], task["notes"], task["title"]), terms)
+            results.append(task)
+        return results
+    
+    def _search_tasks_like(
+        self,
+        cursor,
+        search_query: str,
+        limit: int,
+        organization_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Search with a LIKE scan when no full-text index is available (every keyword must match)."""
+        like_conditions = []
+        params = []
+        for keyword in search_query.split():
+            pattern = f"%{keyword}%"
+            like_conditions.append("(title LIKE ? OR task_instruction LIKE ? OR notes LIKE ?)")
+            params.extend([pattern, pattern, pattern])
+        
+        # Add organization_id filter if provided
+        if organization_id is not None:
+            like_conditions.append("organization_id = ?")
+            params.append(organization_id)
+        
+        query_sql = self._normalize_sql(f"""
+            SELECT * FROM tasks
+            WHERE {' AND '.join(like_conditions)}
+            ORDER BY created_at DESC
+            LIMIT ?
+        """)
+        params.append(limit)
+        self._execute_with_logging(cursor, query_sql, tuple(params))
+        return [dict(row) for row in cursor.fetchall()]
+    
+    def optimize_search_index(self, rebuild: bool = False) -> Dict[str, Any]:
+        """
+        Compact the full-text search index, optionally rebuilding it first.
+        
+        The index is maintained by triggers, so a rebuild is only needed to
+        repair it (e.g. after a restore or manual SQL with triggers off).
+        
+        With SEARCH_BACKEND=memory this rebuilds (if asked) and saves the
+        in-memory index snapshot instead.
+        
+        Args:
+            rebuild: Re-index every task before compacting
+        
+        Returns:
+            Dictionary with the actions taken and the number of indexed tasks
+        
+        Raises:
+            RuntimeError: If full-text search is not available
+        """
+        if self._memory_search is not None:
+            conn = self._get_connection()
+            try:
+                cursor = conn.cursor()
+                if rebuild:
+                    self._memory_search.rebuild(cursor, self._execute_with_logging)
+                self._memory_search.refresh(cursor, self._execute_with_logging)
+            finally:
+                self.adapter.close(conn)
+            actions = ["rebuild", "snapshot"] if rebuild else ["snapshot"]
+            if not self._memory_search.save():
+                actions.pop()
+            return {"actions": actions, "indexed": self._memory_search.size}
+        if not self._search_index:
+            raise RuntimeError("Full-text search is not available for this database")
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            result = optimize_search_index(cursor, self.db_type, rebuild=rebuild, execute=self._execute_with_logging)
+        logger.info(f"Optimized search index: {result}")
+        return result
+    
+    def save_search_snapshot(self) -> bool:
+        """
+        Save the in-memory search index snapshot (SEARCH_BACKEND=memory).
+        
+        Returns:
+            True if a snapshot was written
+        """
+        if self._memory_search is None:
+            return False
+        return self._memory_search.save()
+    
     def lock_task(self, task_id: int, agent_id: str, organization_id: Optional[int] = None) -> bool:
         """
         Lock a task for an agent (set to in_progress). Returns True if successful.
@@ -1835,8 +2283,7 @@ class TodoDatabase:
         if not agent_id:
             raise ValueError("agent_id is required for locking tasks")
         
-        conn = self._get_connection()
-        try:
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
             # Get current status for history and verify tenant isolation
             if organization_id is not None:
@@ -1872,14 +2319,242 @@ class TodoDatabase:
                     INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
                     VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
                 """, (task_id, agent_id, old_status))
-            
-            conn.commit()
-            if success:
-                logger.info(f"Task {task_id} locked by agent {agent_id}")
-            return success
-        finally:
-            self.adapter.close(conn)
-    
+        
+        if success:
+            logger.info(f"Task {task_id} locked by agent {agent_id}")
+        return success
+
+    def reserve_task(
+        self,
+        task_id: int,
+        agent_id: str,
+        organization_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Lock a specific task for an agent and gather what reserve_task returns.
+        
+        One write transaction on one connection. The first statement reads the
+        task with the blocked-subtask overlay together with its latest stale-task
+        finding (FOR UPDATE on PostgreSQL). The second locks it with
+        UPDATE ... RETURNING; on PostgreSQL the history entry is written by the
+        same statement, on SQLite by one more INSERT. Tasks with a blocked
+        subtask are not locked.
+        
+        Args:
+            task_id: Task ID
+            agent_id: Agent ID
+            organization_id: Optional organization ID for tenant isolation
+        
+        Returns:
+            Dictionary with:
+            - reserved: True if the task was locked for the agent
+            - task: The locked task, the current task (with blocked overlay) if it
+              could not be locked, or None if not found or not accessible
+            - stale_finding: Latest finding left when the task was unlocked as
+              stale or abandoned (only when reserved), or None
+        """
+        if not agent_id:
+            raise ValueError("agent_id is required for locking tasks")
+        
+        not_found = {"reserved": False, "task": None, "stale_finding": None}
+        lock_clause = "FOR UPDATE OF t" if self.db_type == "postgresql" else ""
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            # Same window as get_task_updates(limit=10): the latest stale finding
+            # among the task's last 10 updates
+            cursor.execute(f"""
+                SELECT t.*,
+                       f.agent_id AS stale_agent_id, f.notes AS stale_notes, f.created_at AS stale_created_at
+                FROM tasks t
+                LEFT JOIN (
+                    SELECT * FROM (
+                        SELECT agent_id, notes, created_at, change_type FROM change_history
+                        WHERE task_id = ? AND change_type IN ('progress', 'note', 'blocker', 'question', 'finding')
+                        ORDER BY created_at DESC
+                        LIMIT 10
+                    ) recent
+                    WHERE change_type = 'finding' AND (
+                        LOWER(notes) LIKE ? OR LOWER(notes) LIKE ? OR LOWER(notes) LIKE ?
+                    )
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                ) f ON 1 = 1
+                WHERE t.id = ?
+                {lock_clause}
+            """, (task_id, "%stale%", "%abandoned%", "%unlocked due to timeout%", task_id))
+            row = cursor.fetchone()
+            if not row:
+                return not_found
+            current = dict(row)
+            if organization_id is not None and current["organization_id"] != organization_id:
+                return not_found
+            stale_finding = None
+            if current["stale_notes"] is not None:
+                stale_finding = {
+                    "agent_id": current["stale_agent_id"],
+                    "notes": current["stale_notes"],
+                    "created_at": current["stale_created_at"],
+                }
+            for column in ("stale_agent_id", "stale_notes", "stale_created_at"):
+                del current[column]
+            if current["id"] in self._blocked_ancestors(cursor):
+                current["task_status"] = "blocked"
+            old_status = current["task_status"]
+            if not (old_status == "available" or (
+                old_status == "complete" and current.get("verification_status") == "unverified"
+            )):
+                return {"reserved": False, "task": current, "stale_finding": None}
+            
+            # The row is locked (FOR UPDATE / BEGIN IMMEDIATE), so the status
+            # condition only restates what was just checked
+            lock_sql = """
+                UPDATE tasks
+                SET task_status = 'in_progress',
+                    assigned_agent = ?,
+                    updated_at = CURRENT_TIMESTAMP,
+                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+                WHERE id = ? AND (
+                    task_status = 'available'
+                    OR (task_status = 'complete' AND verification_status = 'unverified')
+                )
+                RETURNING *
+            """
+            if self.db_type == "postgresql":
+                cursor.execute(f"""
+                    WITH locked AS ({lock_sql}),
+                    history AS (
+                        INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                        SELECT id, ?, 'locked', 'task_status', ?, 'in_progress' FROM locked
+                    )
+                    SELECT * FROM locked
+                """, (agent_id, task_id, agent_id, old_status))
+                row = cursor.fetchone()
+            else:
+                cursor.execute(lock_sql, (agent_id, task_id))
+                row = cursor.fetchone()
+                if row:
+                    cursor.execute("""
+                        INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                        VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
+                    """, (task_id, agent_id, old_status))
+            if not row:
+                return {"reserved": False, "task": current, "stale_finding": None}
+            task = dict(row)
+        
+        logger.info(f"Task {task_id} locked by agent {agent_id}")
+        return {"reserved": True, "task": task, "stale_finding": stale_finding}
+
+    def claim_next_task(
+        self,
+        agent_type: str,
+        agent_id: str,
+        project_id: Optional[int] = None,
+        organization_id: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Pick the next available task for an agent type and lock it atomically.
+
+        Uses the same selection rules and ordering as get_available_tasks_for_agent,
+        but selection and locking happen in one step so concurrent agents never
+        race for the same task. On PostgreSQL this is a single
+        UPDATE ... RETURNING statement whose candidate row is taken with
+        FOR UPDATE SKIP LOCKED, so agents skip rows another agent is claiming.
+        On SQLite the select and update run in one single-writer transaction.
+
+        Args:
+            agent_type: 'breakdown' or 'implementation'
+            agent_id: Agent ID claiming the task
+            project_id: Optional project ID to filter tasks
+            organization_id: Optional organization ID to filter tasks (for multi-tenancy)
+
+        Returns:
+            The locked task dictionary, or None if no task is available
+        """
+        if not agent_id:
+            raise ValueError("agent_id is required for locking tasks")
+
+        if agent_type == "breakdown":
+            type_filter = "t.task_status = 'available' AND t.task_type IN ('abstract', 'epic')"
+        elif agent_type == "implementation":
+            type_filter = """(
+                (t.task_status = 'available' AND t.task_type = 'concrete')
+                OR (t.task_status = 'complete' AND t.verification_status = 'unverified')
+            )"""
+        else:
+            return None
+
+        project_filter = "AND t.project_id = ?" if project_id is not None else ""
+        org_filter = "AND t.organization_id = ?" if organization_id is not None else ""
+        params = []
+        if project_id is not None:
+            params.append(project_id)
+        if organization_id is not None:
+            params.append(organization_id)
+
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            # Tasks with a blocked_by relationship or a blocked subtask (at any depth)
+            # are not claimable, matching get_available_tasks_for_agent. The staged
+            # rows commit or roll back with the claim.
+            blocked_table = self._stage_blocked_ancestors(conn, commit=False)
+            candidate_sql = f"""
+                SELECT t.id, t.task_status FROM tasks t
+                WHERE {type_filter}
+                    AND NOT EXISTS (
+                        SELECT 1 FROM task_relationships tr
+                        WHERE tr.child_task_id = t.id AND tr.relationship_type = 'blocked_by'
+                    )
+                    AND NOT EXISTS (SELECT 1 FROM {blocked_table} b WHERE b.id = t.id)
+                    {project_filter}
+                    {org_filter}
+                ORDER BY t.created_at ASC, t.id ASC
+                LIMIT 1
+            """
+            if self.db_type == "postgresql":
+                # Candidate selection, row lock and update in one statement
+                self._execute_with_logging(cursor, f"""
+                    WITH candidate AS ({candidate_sql} FOR UPDATE OF t SKIP LOCKED)
+                    UPDATE tasks
+                    SET task_status = 'in_progress',
+                        assigned_agent = ?,
+                        updated_at = CURRENT_TIMESTAMP,
+                        started_at = COALESCE(tasks.started_at, CURRENT_TIMESTAMP)
+                    FROM candidate
+                    WHERE tasks.id = candidate.id
+                    RETURNING tasks.*, candidate.task_status AS previous_status
+                """, tuple(params + [agent_id]))
+                row = cursor.fetchone()
+                if not row:
+                    return None
+                task = dict(row)
+                old_status = task.pop("previous_status")
+            else:
+                # BEGIN IMMEDIATE holds the write lock, so nobody can claim the
+                # candidate between the select and the update
+                self._execute_with_logging(cursor, candidate_sql, tuple(params))
+                candidate = cursor.fetchone()
+                if not candidate:
+                    return None
+                old_status = candidate["task_status"]
+                self._execute_with_logging(cursor, """
+                    UPDATE tasks
+                    SET task_status = 'in_progress',
+                        assigned_agent = ?,
+                        updated_at = CURRENT_TIMESTAMP,
+                        started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+                    WHERE id = ?
+                    RETURNING *
+                """, (agent_id, candidate["id"]))
+                task = dict(cursor.fetchone())
+
+            cursor.execute("""
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
+            """, (task["id"], agent_id, old_status))
+
+        logger.info(f"Task {task['id']} claimed by agent {agent_id}")
+        return task
+
     def unlock_task(self, task_id: int, agent_id: str, organization_id: Optional[int] = None):
         """
         Unlock a task (set back to available).
@@ -1892,8 +2567,7 @@ class TodoDatabase:
         if not agent_id:
             raise ValueError("agent_id is required for unlocking tasks")
         
-        conn = self._get_connection()
-        try:
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
             # Get current assigned agent for verification and verify tenant isolation
             if organization_id is not None:
@@ -1925,11 +2599,21 @@ class TodoDatabase:
                 INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
                 VALUES (?, ?, 'unlocked', 'task_status', ?, 'available')
             """, (task_id, agent_id, old_status))
-            
-            conn.commit()
-            logger.info(f"Task {task_id} unlocked by agent {agent_id}")
-        finally:
-            self.adapter.close(conn)
+        
+        logger.info(f"Task {task_id} unlocked by agent {agent_id}")
+    
+    def _stale_condition(self, hours: int) -> Tuple[str, Any]:
+        """
+        Predicate and parameter selecting tasks last updated more than hours ago.
+        
+        Both forms compare updated_at itself, so idx_tasks_status_updated
+        range-scans it. On SQLite the comparison is textual; the
+        task_timestamps triggers keep updated_at in the datetime() format
+        it compares against.
+        """
+        if self.db_type == "sqlite":
+            return "updated_at < datetime('now', ?)", f"-{hours} hours"
+        return "updated_at < CURRENT_TIMESTAMP - make_interval(hours => ?)", hours
     
     def get_stale_tasks(self, hours: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -1949,83 +2633,118 @@ class TodoDatabase:
         try:
             cursor = conn.cursor()
             
-            if self.db_type == "sqlite":
-                # SQLite: Use datetime subtraction with julianday
-                cursor.execute("""
-                    SELECT * FROM tasks
-                    WHERE task_status = 'in_progress'
-                    AND julianday('now') - julianday(updated_at) > ? / 24.0
-                    ORDER BY updated_at ASC
-                """, (hours,))
-            else:
-                # PostgreSQL: Use interval arithmetic with make_interval
-                cursor.execute("""
-                    SELECT * FROM tasks
-                    WHERE task_status = 'in_progress'
-                    AND updated_at < CURRENT_TIMESTAMP - make_interval(hours => ?)
-                    ORDER BY updated_at ASC
-                """, (hours,))
+            # Same cutoff as unlock_stale_tasks(), so every reported task is reaped
+            stale_condition, stale_param = self._stale_condition(hours)
+            self._execute_with_logging(cursor, f"""
+                SELECT * FROM tasks
+                WHERE task_status = 'in_progress'
+                AND {stale_condition}
+                ORDER BY updated_at ASC
+            """, (stale_param,))
             
             rows = cursor.fetchall()
             return [dict(row) for row in rows]
         finally:
             self.adapter.close(conn)
     
-    def unlock_stale_tasks(self, hours: Optional[int] = None, system_agent_id: str = "system") -> int:
+    def unlock_stale_tasks(
+        self,
+        hours: Optional[int] = None,
+        system_agent_id: str = "system",
+        batch_size: Optional[int] = None
+    ) -> int:
         """
         Automatically unlock stale tasks (tasks in_progress longer than timeout).
         Creates a finding update for each unlocked task indicating it was stale.
         
+        Stale tasks are unlocked oldest first in batches, each one short write
+        transaction: a single UPDATE releases the batch (PostgreSQL reports the
+        released rows and their previous agents with RETURNING) and the
+        unlocked/finding history rows are inserted with one executemany.
+        Candidates are read in updated_at order through
+        idx_tasks_status_updated.
+        
         Args:
             hours: Hours threshold for stale tasks (defaults to TASK_TIMEOUT_HOURS env var or 24)
             system_agent_id: Agent ID to use for system unlocks (default: "system")
+            batch_size: Tasks unlocked per transaction (default: STALE_TASK_SWEEP_BATCH_SIZE)
             
         Returns:
             Number of tasks unlocked
         """
-        stale_tasks = self.get_stale_tasks(hours=hours)
-        unlocked_count = 0
+        if hours is None:
+            hours = int(os.getenv("TASK_TIMEOUT_HOURS", "24"))
+        if batch_size is None:
+            batch_size = self._stale_task_sweep_batch_size
         
-        for task in stale_tasks:
-            task_id = task["id"]
-            old_agent = task.get("assigned_agent", "unknown")
-            
-            # Unlock the task
-            conn = self._get_connection()
-            try:
+        stale_condition, stale_param = self._stale_condition(hours)
+        
+        unlocked_count = 0
+        while True:
+            with self._write_transaction() as conn:
                 cursor = conn.cursor()
+                if self.db_type == "postgresql":
+                    # SKIP LOCKED leaves tasks another transaction is changing for the next pass
+                    self._execute_with_logging(cursor, f"""
+                        UPDATE tasks
+                        SET task_status = 'available',
+                            assigned_agent = NULL,
+                            updated_at = CURRENT_TIMESTAMP
+                        FROM (
+                            SELECT id, assigned_agent FROM tasks
+                            WHERE task_status = 'in_progress' AND {stale_condition}
+                            ORDER BY updated_at ASC
+                            LIMIT ?
+                            FOR UPDATE SKIP LOCKED
+                        ) stale
+                        WHERE tasks.id = stale.id AND tasks.task_status = 'in_progress'
+                        RETURNING tasks.id, stale.assigned_agent
+                    """, (stale_param, batch_size))
+                    unlocked = [(row["id"], row["assigned_agent"]) for row in cursor.fetchall()]
+                else:
+                    # The write transaction excludes other writers, so the selected
+                    # tasks are exactly the ones the UPDATE releases
+                    self._execute_with_logging(cursor, f"""
+                        SELECT id, assigned_agent FROM tasks
+                        WHERE task_status = 'in_progress' AND {stale_condition}
+                        ORDER BY updated_at ASC
+                        LIMIT ?
+                    """, (stale_param, batch_size))
+                    unlocked = [(row["id"], row["assigned_agent"]) for row in cursor.fetchall()]
+                    if unlocked:
+                        placeholders = ",".join("?" for _ in unlocked)
+                        self._execute_with_logging(cursor, f"""
+                            UPDATE tasks
+                            SET task_status = 'available',
+                                assigned_agent = NULL,
+                                updated_at = CURRENT_TIMESTAMP
+                            WHERE id IN ({placeholders})
+                        """, tuple(task_id for task_id, _ in unlocked))
                 
-                # Update task status
-                cursor.execute("""
-                    UPDATE tasks 
-                    SET task_status = 'available',
-                        assigned_agent = NULL,
-                        updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (task_id,))
-                
-                # Record in history
-                cursor.execute("""
-                    INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                    VALUES (?, ?, 'unlocked', 'task_status', 'in_progress', 'available')
-                """, (task_id, system_agent_id,))
-                
-                # Add finding update indicating task was stale
-                stale_message = f"Task automatically unlocked due to timeout. Previously assigned to agent '{old_agent}'. Task was in_progress for more than {hours} hours."
-                metadata_json = json.dumps({"auto_unlocked": True, "previous_agent": old_agent, "timeout_hours": hours})
-                cursor.execute("""
-                    INSERT INTO change_history (task_id, agent_id, change_type, notes, new_value)
-                    VALUES (?, ?, 'finding', ?, ?)
-                """, (task_id, system_agent_id, stale_message, metadata_json,))
-                
-                conn.commit()
-                unlocked_count += 1
+                if unlocked:
+                    # Record in history, with a finding update indicating each task was stale
+                    cursor.executemany(self._normalize_sql("""
+                        INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                        VALUES (?, ?, 'unlocked', 'task_status', 'in_progress', 'available')
+                    """), [(task_id, system_agent_id) for task_id, _ in unlocked])
+                    cursor.executemany(self._normalize_sql("""
+                        INSERT INTO change_history (task_id, agent_id, change_type, notes, new_value)
+                        VALUES (?, ?, 'finding', ?, ?)
+                    """), [
+                        (
+                            task_id,
+                            system_agent_id,
+                            f"Task automatically unlocked due to timeout. Previously assigned to agent '{old_agent or 'unknown'}'. Task was in_progress for more than {hours} hours.",
+                            json.dumps({"auto_unlocked": True, "previous_agent": old_agent, "timeout_hours": hours})
+                        )
+                        for task_id, old_agent in unlocked
+                    ])
+            
+            for task_id, old_agent in unlocked:
                 logger.info(f"Stale task {task_id} automatically unlocked (was assigned to {old_agent})")
-            except Exception as e:
-                logger.error(f"Error unlocking stale task {task_id}: {e}", exc_info=True)
-                conn.rollback()
-            finally:
-                self.adapter.close(conn)
+            unlocked_count += len(unlocked)
+            if len(unlocked) < batch_size:
+                break
         
         return unlocked_count
     
@@ -2043,8 +2762,7 @@ class TodoDatabase:
         if not agent_id:
             raise ValueError("agent_id is required for completing tasks")
         
-        conn = self._get_connection()
-        try:
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
             # Get current status, estimated_hours, and started_at for history and time calculation
             # Also verify tenant isolation
@@ -2102,77 +2820,27 @@ class TodoDatabase:
                 VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
             """, (task_id, agent_id, old_status, notes))
             
-            conn.commit()
-            logger.info(f"Task {task_id} marked as complete by agent {agent_id}")
-            
-            # Auto-complete parent tasks if all subtasks are complete
-            self._check_and_auto_complete_parents(task_id, agent_id)
-        finally:
-            self.adapter.close(conn)
+            # Auto-complete parent tasks if all subtasks are complete (same transaction)
+            self._check_and_auto_complete_parents(task_id, agent_id, conn)
+        
+        logger.info(f"Task {task_id} marked as complete by agent {agent_id}")
     
-    def _check_and_auto_complete_parents(self, completed_task_id: int, agent_id: str):
+    def _check_and_auto_complete_parents(self, completed_task_id: int, agent_id: str, conn=None):
         """
         Check if parent tasks should be auto-completed when all their subtasks are done.
         This works recursively up the chain.
+        
+        Args:
+            completed_task_id: Task that was just completed
+            agent_id: Agent ID recorded in history for auto-completions
+            conn: Optional connection with an open transaction (if provided, won't commit or close it)
         """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            
-            # Find all parent tasks where this task is a subtask
-            cursor.execute("""
-                SELECT DISTINCT parent_task_id
-                FROM task_relationships
-                WHERE child_task_id = ? AND relationship_type = 'subtask'
-            """, (completed_task_id,))
-            
-            parent_ids = [row[0] for row in cursor.fetchall()]
-            
-            for parent_id in parent_ids:
-                # Get all sibling subtasks (including the one just completed)
-                cursor.execute("""
-                    SELECT child_task_id, task_status
-                    FROM task_relationships tr
-                    JOIN tasks t ON tr.child_task_id = t.id
-                    WHERE tr.parent_task_id = ? AND tr.relationship_type = 'subtask'
-                """, (parent_id,))
-                
-                siblings = cursor.fetchall()
-                
-                # Check if all sibling subtasks are complete
-                all_complete = all(
-                    row[1] == 'complete' 
-                    for row in siblings
-                )
-                
-                if all_complete:
-                    # Get parent task to check current status
-                    cursor.execute("SELECT task_status FROM tasks WHERE id = ?", (parent_id,))
-                    parent_task = cursor.fetchone()
-                    
-                    if parent_task and parent_task[0] != 'complete':
-                        # Auto-complete the parent
-                        cursor.execute("""
-                            UPDATE tasks 
-                            SET task_status = 'complete',
-                                completed_at = CURRENT_TIMESTAMP,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (parent_id,))
-                        
-                        # Record in history
-                        cursor.execute("""
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
-                            VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
-                        """, (parent_id, agent_id, parent_task[0], "Auto-completed: all subtasks are complete"))
-                        
-                        conn.commit()
-                        logger.info(f"Parent task {parent_id} auto-completed (all subtasks complete) by agent {agent_id}")
-                        
-                        # Recursively check the parent's parents
-                        self._check_and_auto_complete_parents(parent_id, agent_id)
-        finally:
-            self.adapter.close(conn)
+        if conn is None:
+            with self._write_transaction() as conn:
+                self._check_and_auto_complete_parents(completed_task_id, agent_id, conn)
+            return
+        
+        self._bulk_operations.auto_complete_parents(conn.cursor(), [completed_task_id], agent_id)
     
     def verify_task(self, task_id: int, agent_id: str, notes: Optional[str] = None) -> bool:
         """Mark a task as verified (verification check passed)."""
@@ -2271,88 +2939,68 @@ class TodoDatabase:
         
         Returns True if a circular dependency would be created, False otherwise.
         """
-        # Use BFS to check if blocker_task_id (or anything it's blocked by) can reach blocked_task_id
-        visited = set()
-        queue = [blocker_task_id]
+        return self._find_circular_dependency_path(
+            cursor, blocker_task_id, blocked_task_id,
+            exclude_parent_task_id=exclude_parent_task_id,
+            exclude_child_task_id=exclude_child_task_id
+        ) is not None
+    
+    def _find_circular_dependency_path(
+        self,
+        cursor: sqlite3.Cursor,
+        blocker_task_id: int,
+        blocked_task_id: int,
+        exclude_parent_task_id: Optional[int] = None,
+        exclude_child_task_id: Optional[int] = None
+    ) -> Optional[List[int]]:
+        """
+        Find the chain of blocking relationships that would close a cycle.
+        
+        Walks the relationship graph server-side with a single WITH RECURSIVE query.
+        
+        Args:
+            blocker_task_id: The task that would block blocked_task_id
+            blocked_task_id: The task that would be blocked by blocker_task_id
+            exclude_parent_task_id: Optional parent task ID to exclude from the check (the relationship being created)
+            exclude_child_task_id: Optional child task ID to exclude from the check (the relationship being created)
+        
+        Returns:
+            Task IDs from blocker_task_id to blocked_task_id, or None if there is no cycle
+        
+        Raises:
+            ValueError: If the dependency chain is too deep to check
+        """
+        return find_dependency_path(
+            cursor, blocker_task_id, blocked_task_id,
+            exclude_parent_task_id=exclude_parent_task_id,
+            exclude_child_task_id=exclude_child_task_id,
+            execute=self._execute_with_logging
+        )
+    
+    def check_circular_dependencies(
+        self,
+        relationships: List[Tuple[int, int, str]]
+    ) -> List[Optional[List[int]]]:
+        """
+        Validate many relationships for circular dependencies at once.
         
-        while queue:
-            current_task_id = queue.pop(0)
-            
-            # If we reach the blocked task, we have a cycle
-            if current_task_id == blocked_task_id:
-                return True
-            
-            if current_task_id in visited:
-                continue
-            visited.add(current_task_id)
-            
-            # Find all tasks that this task is blocked by
-            # For blocked_by: parent is blocked by child
-            # So if A is blocked by B: parent=A, child=B means B blocks A
-            # To find what blocks current_task_id, look for relationships where
-            # parent_task_id = current_task_id, which gives us child_task_id (the blocker)
-            # Exclude the relationship we're checking if provided
-            if exclude_parent_task_id is not None and exclude_child_task_id is not None:
-                cursor.execute("""
-                    SELECT child_task_id
-                    FROM task_relationships
-                    WHERE parent_task_id = ? AND relationship_type = 'blocked_by'
-                    AND NOT (parent_task_id = ? AND child_task_id = ?)
-                """, (current_task_id, exclude_parent_task_id, exclude_child_task_id))
-            else:
-                cursor.execute("""
-                    SELECT child_task_id
-                    FROM task_relationships
-                    WHERE parent_task_id = ? AND relationship_type = 'blocked_by'
-                """, (current_task_id,))
-            
-            blocking_tasks = [row[0] for row in cursor.fetchall()]
-            
-            # Also find what current_task_id blocks (tasks that are blocked by current_task_id)
-            # Look for relationships where child_task_id = current_task_id
-            # This gives us parent_task_id (tasks blocked by current_task_id)
-            if exclude_parent_task_id is not None and exclude_child_task_id is not None:
-                cursor.execute("""
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocked_by'
-                    AND NOT (parent_task_id = ? AND child_task_id = ?)
-                """, (current_task_id, exclude_parent_task_id, exclude_child_task_id))
-            else:
-                cursor.execute("""
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocked_by'
-                """, (current_task_id,))
-            
-            # Tasks blocked by current_task_id (current_task_id blocks these)
-            blocked_by_current = [row[0] for row in cursor.fetchall()]
-            
-            # Also check for "blocking" relationships (which are inverse of blocked_by)
-            # Exclude the relationship we're checking if provided
-            if exclude_parent_task_id is not None and exclude_child_task_id is not None:
-                cursor.execute("""
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocking'
-                    AND NOT (parent_task_id = ? AND child_task_id = ?)
-                """, (current_task_id, exclude_parent_task_id, exclude_child_task_id))
-            else:
-                cursor.execute("""
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocking'
-                """, (current_task_id,))
-            
-            # "blocking" relationship means: if A blocks B, then B is blocked_by A
-            blocking_from_blocking = [row[0] for row in cursor.fetchall()]
-            
-            # Add all blocking tasks to the queue (what blocks current, and what current blocks)
-            for task_id in blocking_tasks + blocked_by_current + blocking_from_blocking:
-                if task_id not in visited:
-                    queue.append(task_id)
+        Loads the blocking relationship graph with a single query and checks each
+        relationship in order, treating earlier relationships in the list as if
+        they had been created. Use this before creating relationships in bulk.
+        
+        Args:
+            relationships: List of (parent_task_id, child_task_id, relationship_type)
         
-        return False
+        Returns:
+            List aligned with relationships: None if the relationship can be created,
+            otherwise the task IDs forming the cycle it would close
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            return find_dependency_cycles(cursor, relationships, execute=self._execute_with_logging)
+        finally:
+            self.adapter.close(conn)
     
     def create_relationship(
         self,
@@ -2405,13 +3053,15 @@ class TodoDatabase:
                     # Check if child_task_id (or anything blocking it) can reach parent_task_id
                     # This would create a cycle: parent -> child -> ... -> parent
                     # Exclude the relationship we're checking to avoid false positives
-                    if self._check_circular_dependency(cursor, child_task_id, parent_task_id, 
-                                                       exclude_parent_task_id=parent_task_id, 
-                                                       exclude_child_task_id=child_task_id):
+                    cycle = self._find_circular_dependency_path(cursor, child_task_id, parent_task_id,
+                                                                exclude_parent_task_id=parent_task_id,
+                                                                exclude_child_task_id=child_task_id)
+                    if cycle:
                         raise ValueError(
                             f"Circular dependency detected: Cannot create blocked_by relationship "
                             f"from task {parent_task_id} to task {child_task_id}. "
-                            f"Task {child_task_id} (or something blocking it) already blocks task {parent_task_id}."
+                            f"Task {child_task_id} (or something blocking it) already blocks task {parent_task_id} "
+                            f"(cycle: {' -> '.join(str(task_id) for task_id in cycle + [child_task_id])})."
                         )
                 elif relationship_type == "blocking":
                     # Check if the inverse (blocked_by) relationship exists with same parent/child
@@ -2440,13 +3090,15 @@ class TodoDatabase:
                     # Check if parent_task_id (or anything blocking it) can reach child_task_id
                     # This would create a cycle: parent -> child -> ... -> parent
                     # Exclude the relationship we're checking to avoid false positives
-                    if self._check_circular_dependency(cursor, parent_task_id, child_task_id,
-                                                       exclude_parent_task_id=parent_task_id,
-                                                       exclude_child_task_id=child_task_id):
+                    cycle = self._find_circular_dependency_path(cursor, parent_task_id, child_task_id,
+                                                                exclude_parent_task_id=parent_task_id,
+                                                                exclude_child_task_id=child_task_id)
+                    if cycle:
                         raise ValueError(
                             f"Circular dependency detected: Cannot create blocking relationship "
                             f"from task {parent_task_id} to task {child_task_id}. "
-                            f"Task {parent_task_id} (or something blocking it) already blocks task {child_task_id}."
+                            f"Task {parent_task_id} (or something blocking it) already blocks task {child_task_id} "
+                            f"(cycle: {' -> '.join(str(task_id) for task_id in cycle + [parent_task_id])})."
                         )
             
             # Check if relationship already exists (idempotent behavior)
@@ -2489,13 +3141,95 @@ class TodoDatabase:
         finally:
             self.adapter.close(conn)
     
+    def bulk_create_relationships(
+        self,
+        relationships: List[Tuple[int, int, str]],
+        agent_id: str
+    ) -> int:
+        """
+        Create many relationships in one write transaction.
+        
+        Relationships that already exist (or repeat earlier in the list) are
+        skipped, as create_relationship() does. Circular dependencies are NOT
+        checked here; validate blocking relationships with
+        check_circular_dependencies() first.
+        
+        Args:
+            relationships: List of (parent_task_id, child_task_id, relationship_type)
+            agent_id: Agent creating the relationships
+            
+        Returns:
+            Number of relationships created
+        """
+        if not agent_id:
+            raise ValueError("agent_id is required for creating relationships")
+        relationships = list(dict.fromkeys(relationships))
+        if not relationships:
+            return 0
+        
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            parent_ids = sorted({parent_id for parent_id, _, _ in relationships})
+            existing = set()
+            for start in range(0, len(parent_ids), 500):
+                batch = parent_ids[start:start + 500]
+                self._execute_with_logging(cursor, f"""
+                    SELECT parent_task_id, child_task_id, relationship_type
+                    FROM task_relationships
+                    WHERE parent_task_id IN ({','.join('?' for _ in batch)})
+                """, tuple(batch))
+                existing.update(
+                    (row["parent_task_id"], row["child_task_id"], row["relationship_type"])
+                    for row in cursor.fetchall()
+                )
+            new = [rel for rel in relationships if rel not in existing]
+            if not new:
+                return 0
+            
+            cursor.executemany(self._normalize_sql("""
+                INSERT INTO task_relationships (parent_task_id, child_task_id, relationship_type)
+                VALUES (?, ?, ?)
+            """), new)
+            
+            # Record in history
+            cursor.executemany(self._normalize_sql("""
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, new_value)
+                VALUES (?, ?, 'relationship_added', 'relationship', ?)
+            """), [(parent_id, agent_id, f"{relationship_type}:{child_id}") for parent_id, child_id, relationship_type in new])
+            
+            # Auto-update blocking status
+            blocked = sorted({parent_id for parent_id, _, relationship_type in new if relationship_type == "blocked_by"})
+            if blocked:
+                cursor.executemany(self._normalize_sql("""
+                    UPDATE tasks SET task_status = 'blocked', updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                """), [(task_id,) for task_id in blocked])
+        
+        logger.info(f"Created {len(new)} relationships in bulk by agent {agent_id}")
+        return len(new)
+    
     def get_change_history(
         self,
         task_id: Optional[int] = None,
         agent_id: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get change history with optional filters."""
+        """
+        Get change history with optional filters, newest first.
+        
+        Args:
+            task_id: Optional task ID filter
+            agent_id: Optional agent ID filter
+            limit: Maximum number of results
+            after: next_cursor from get_change_history_page() to continue after
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        keyset_clause, keyset_params, order_clause = paginate_query(
+            CHANGE_HISTORY_ORDER, "change_history", after
+        )
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -2508,9 +3242,12 @@ class TodoDatabase:
             if agent_id:
                 conditions.append("agent_id = ?")
                 params.append(agent_id)
+            if keyset_clause:
+                conditions.append(keyset_clause)
+                params.extend(keyset_params)
             
             where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
-            query = f"SELECT * FROM change_history {where_clause} ORDER BY created_at DESC LIMIT ?"
+            query = f"SELECT * FROM change_history {where_clause} {order_clause} LIMIT ?"
             params.append(limit)
             
             cursor.execute(query, params)
@@ -2518,13 +3255,30 @@ class TodoDatabase:
         finally:
             self.adapter.close(conn)
     
+    def get_change_history_page(
+        self,
+        task_id: Optional[int] = None,
+        agent_id: Optional[str] = None,
+        limit: int = 100,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one keyset-paginated page of change history, newest first.
+        
+        Returns:
+            Dictionary with history, next_cursor (None on the last page) and has_more
+        """
+        rows = self.get_change_history(task_id=task_id, agent_id=agent_id, limit=limit + 1, after=after)
+        return make_page(rows, limit, "change_history", created_id_key, "history")
+    
     def get_activity_feed(
         self,
         task_id: Optional[int] = None,
         agent_id: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        limit: int = 1000
+        limit: int = 1000,
+        after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Get activity feed showing all task updates, completions, and relationship changes
@@ -2536,10 +3290,17 @@ class TodoDatabase:
             start_date: Optional start date filter (ISO format string)
             end_date: Optional end date filter (ISO format string)
             limit: Maximum number of results to return
+            after: next_cursor from get_activity_feed_page() to continue after
             
         Returns:
             List of activity entries in chronological order (oldest first)
+        
+        Raises:
+            ValueError: If the cursor is invalid
         """
+        keyset_clause, keyset_params, order_clause = paginate_query(
+            ACTIVITY_FEED_ORDER, "activity_feed", after
+        )
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -2636,6 +3397,9 @@ class TodoDatabase:
                     logger.warning(f"Failed to parse end_date '{end_date}': {e}, using as-is")
                     conditions.append("ch.created_at <= ?")
                     params.append(end_date)
+            if keyset_clause:
+                conditions.append(keyset_clause)
+                params.extend(keyset_params)
             
             where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
             
@@ -2647,7 +3411,7 @@ class TodoDatabase:
                 FROM change_history ch
                 LEFT JOIN tasks t ON ch.task_id = t.id
                 {where_clause}
-                ORDER BY ch.created_at ASC
+                {order_clause}
                 LIMIT ?
             """
             params.append(limit)
@@ -2658,6 +3422,101 @@ class TodoDatabase:
         finally:
             self.adapter.close(conn)
     
+    def get_activity_feed_page(
+        self,
+        task_id: Optional[int] = None,
+        agent_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 1000,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one keyset-paginated page of the activity feed, oldest first.
+        
+        Returns:
+            Dictionary with feed, next_cursor (None on the last page) and has_more
+        """
+        rows = self.get_activity_feed(
+            task_id=task_id, agent_id=agent_id, start_date=start_date,
+            end_date=end_date, limit=limit + 1, after=after
+        )
+        return make_page(rows, limit, "activity_feed", created_id_key, "feed")
+
+    def get_task_events(self, after_id: int = 0, limit: int = 500) -> List[Dict[str, Any]]:
+        """
+        Get task lifecycle events recorded after a change_history ID, oldest first.
+
+        Events are read from change_history: 'task.created', 'task.unlocked',
+        'task.completed', and 'task.available' for a status change from
+        blocked to available. The change_history ID is the event ID, so a
+        reader resumes exactly where it stopped.
+
+        Args:
+            after_id: Return events with a change_history ID above this
+            limit: Maximum number of events
+
+        Returns:
+            List of event dictionaries (id, event, task_id, agent_id, created_at,
+            title, task_type, task_status, project_id, organization_id)
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            self._execute_with_logging(cursor, """
+                SELECT ch.id,
+                       CASE ch.change_type
+                           WHEN 'created' THEN 'task.created'
+                           WHEN 'unlocked' THEN 'task.unlocked'
+                           WHEN 'completed' THEN 'task.completed'
+                           ELSE 'task.available'
+                       END AS event,
+                       ch.task_id, ch.agent_id, ch.created_at,
+                       t.title, t.task_type, t.task_status, t.project_id, t.organization_id
+                FROM change_history ch
+                JOIN tasks t ON t.id = ch.task_id
+                WHERE ch.id > ?
+                  AND (ch.change_type IN ('created', 'unlocked', 'completed')
+                       OR (ch.change_type = 'status_changed'
+                           AND ch.old_value = 'blocked' AND ch.new_value = 'available'))
+                ORDER BY ch.id
+                LIMIT ?
+            """, (after_id, limit))
+            return [dict(row) for row in cursor.fetchall()]
+        finally:
+            self.adapter.close(conn)
+
+    def get_change_history_ids(self, after_id: int = 0, limit: int = 500) -> List[int]:
+        """
+        Get committed change_history IDs above after_id, lowest first.
+        
+        Lets the task event poller see gaps left by transactions that have not
+        committed yet (or were rolled back).
+        
+        Args:
+            after_id: Return IDs above this
+            limit: Maximum number of IDs
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            self._execute_with_logging(cursor, """
+                SELECT id FROM change_history WHERE id > ? ORDER BY id LIMIT ?
+            """, (after_id, limit))
+            return [row["id"] for row in cursor.fetchall()]
+        finally:
+            self.adapter.close(conn)
+    
+    def get_latest_task_event_id(self) -> int:
+        """Get the highest change_history ID (0 if there is no history)."""
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            self._execute_with_logging(cursor, "SELECT COALESCE(MAX(id), 0) FROM change_history", ())
+            return cursor.fetchone()[0]
+        finally:
+            self.adapter.close(conn)
+
     def add_task_update(
         self,
         task_id: int,
@@ -3007,62 +3866,17 @@ class TodoDatabase:
                 conditions.append("task_type = ?")
                 params.append(task_type)
             
-            where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-            
-            # Get total tasks
-            cursor.execute(f"SELECT COUNT(*) as count FROM tasks{where_clause}", params)
-            total_tasks = cursor.fetchone()["count"]
-            
-            # Get completed tasks
-            completed_params = params + ["complete"]
-            if where_clause:
-                completed_query = f"SELECT COUNT(*) as count FROM tasks{where_clause} AND task_status = ?"
+            if self._task_counters:
+                aggregates = load_task_counters(
+                    cursor, project_id=project_id or None, task_type=task_type,
+                    execute=self._execute_with_logging
+                )
             else:
-                completed_query = "SELECT COUNT(*) as count FROM tasks WHERE task_status = ?"
-            cursor.execute(completed_query, completed_params)
-            completed_tasks = cursor.fetchone()["count"]
-            
-            # Calculate percentage
-            completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
-            
-            # Get status breakdown
-            status_params = params + []
-            cursor.execute(
-                f"""
-                SELECT task_status, COUNT(*) as count 
-                FROM tasks{where_clause}
-                GROUP BY task_status
-                """,
-                status_params if where_clause else []
-            )
-            status_breakdown = {row["task_status"]: row["count"] for row in cursor.fetchall()}
-            
-            # Get type breakdown
-            type_params = params + []
-            cursor.execute(
-                f"""
-                SELECT task_type, COUNT(*) as count,
-                       SUM(CASE WHEN task_status = 'complete' THEN 1 ELSE 0 END) as completed
-                FROM tasks{where_clause}
-                GROUP BY task_type
-                """,
-                type_params if where_clause else []
-            )
-            tasks_by_type = {}
-            for row in cursor.fetchall():
-                tasks_by_type[row["task_type"]] = {
-                    "total": row["count"],
-                    "completed": row["completed"],
-                    "completion_percentage": (row["completed"] / row["count"] * 100) if row["count"] > 0 else 0.0
-                }
-            
-            return {
-                "total_tasks": total_tasks,
-                "completed_tasks": completed_tasks,
-                "completion_percentage": round(completion_percentage, 2),
-                "status_breakdown": status_breakdown,
-                "tasks_by_type": tasks_by_type
-            }
+                aggregates = load_task_aggregates(
+                    cursor, conditions, params,
+                    execute=self._execute_with_logging, cache=self._aggregate_cache
+                )
+            return aggregates.completion_rates()
         finally:
             self.adapter.close(conn)
     
@@ -3476,31 +4290,11 @@ class TodoDatabase:
                 conditions.append("DATE(created_at) <= DATE(?)")
                 params.append(end_date)
             
-            where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-            
-            # Status distribution
-            cursor.execute(
-                f"""
-                SELECT task_status, COUNT(*) as count
-                FROM tasks
-                {where_clause}
-                GROUP BY task_status
-                """,
-                params if where_clause else []
-            )
-            status_distribution = {row["task_status"]: row["count"] for row in cursor.fetchall()}
-            
-            # Type distribution
-            cursor.execute(
-                f"""
-                SELECT task_type, COUNT(*) as count
-                FROM tasks
-                {where_clause}
-                GROUP BY task_type
-                """,
-                params if where_clause else []
+            # Status, type and priority distributions from one grouped pass
+            aggregates = load_task_aggregates(
+                cursor, conditions, params,
+                execute=self._execute_with_logging, cache=self._aggregate_cache
             )
-            type_distribution = {row["task_type"]: row["count"] for row in cursor.fetchall()}
             
             # Completion timeline (by day)
             timeline_conditions = ["completed_at IS NOT NULL"]
@@ -3535,24 +4329,9 @@ class TodoDatabase:
                 for row in cursor.fetchall()
             ]
             
-            # Priority distribution
-            cursor.execute(
-                f"""
-                SELECT priority, COUNT(*) as count
-                FROM tasks
-                {where_clause}
-                GROUP BY priority
-                """,
-                params if where_clause else []
-            )
-            priority_distribution = {row["priority"]: row["count"] for row in cursor.fetchall()}
-            
-            return {
-                "status_distribution": status_distribution,
-                "type_distribution": type_distribution,
-                "priority_distribution": priority_distribution,
-                "completion_timeline": completion_timeline
-            }
+            result = aggregates.distributions()
+            result["completion_timeline"] = completion_timeline
+            return result
         finally:
             self.adapter.close(conn)
     
@@ -3630,6 +4409,11 @@ class TodoDatabase:
             if organization_id is not None:
                 params.append(organization_id)
             
+            # Tasks with blocked subtasks are effectively blocked; excluding them
+            # in the query keeps the page full
+            if agent_type in ("breakdown", "implementation"):
+                blocked_table = self._stage_blocked_ancestors(conn)
+            
             if agent_type == "breakdown":
                 # Abstract or epic tasks that are available and have no blocking tasks
                 cursor.execute(f"""
@@ -3639,6 +4423,7 @@ class TodoDatabase:
                     WHERE t.task_status = 'available'
                         AND t.task_type IN ('abstract', 'epic')
                         AND tr.id IS NULL
+                        AND NOT EXISTS (SELECT 1 FROM {blocked_table} b WHERE b.id = t.id)
                         {project_filter}
                         {org_filter}
                     ORDER BY t.created_at ASC
@@ -3657,6 +4442,7 @@ class TodoDatabase:
                         (t.task_status = 'complete' AND t.verification_status = 'unverified')
                     )
                         AND tr.id IS NULL
+                        AND NOT EXISTS (SELECT 1 FROM {blocked_table} b WHERE b.id = t.id)
                         {project_filter}
                         {org_filter}
                     ORDER BY 
@@ -3666,22 +4452,7 @@ class TodoDatabase:
             else:
                 return []
             
-            tasks = [dict(row) for row in cursor.fetchall()]
-            
-            # Batch check for blocked subtasks (much more efficient than individual checks)
-            if tasks:
-                task_ids = [task["id"] for task in tasks]
-                blocked_parent_ids = self._find_tasks_with_blocked_subtasks_batch(task_ids)
-                
-                # Filter out tasks that have blocked subtasks (they're effectively blocked)
-                available_tasks = [
-                    task for task in tasks 
-                    if task["id"] not in blocked_parent_ids
-                ]
-            else:
-                available_tasks = []
-            
-            return available_tasks
+            return [dict(row) for row in cursor.fetchall()]
         finally:
             self.adapter.close(conn)
     
@@ -3949,6 +4720,7 @@ class TodoDatabase:
                 VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (project_id, url, events_json, secret, 1 if enabled else 0, retry_count, timeout_seconds))
             conn.commit()
+            self._webhook_index.invalidate()
             logger.info(f"Created webhook {webhook_id} for project {project_id}")
             return webhook_id
         finally:
@@ -3996,29 +4768,20 @@ class TodoDatabase:
             self.adapter.close(conn)
     
     def get_webhooks_for_event(self, project_id: Optional[int], event_type: str) -> List[Dict[str, Any]]:
-        """Get all enabled webhooks that are subscribed to a specific event type."""
+        """
+        Get all enabled webhooks that are subscribed to a specific event type.
+        
+        Served from the webhook subscription index, which reloads every
+        enabled webhook with one query when it is invalidated or expires.
+        """
+        return self._webhook_index.get(self._load_enabled_webhooks, project_id, event_type)
+    
+    def _load_enabled_webhooks(self) -> List[Dict[str, Any]]:
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
-            import json
-            
-            # Get all enabled webhooks for the project (or all if project_id is None)
-            if project_id is not None:
-                cursor.execute("SELECT * FROM webhooks WHERE project_id = ? AND enabled = 1", (project_id,))
-            else:
-                cursor.execute("SELECT * FROM webhooks WHERE enabled = 1")
-            
-            webhooks = []
-            for row in cursor.fetchall():
-                webhook = dict(row)
-                events = json.loads(webhook["events"])
-                # Check if this webhook subscribes to the event
-                if event_type in events:
-                    webhook["events"] = events
-                    webhook["enabled"] = bool(webhook["enabled"])
-                    webhooks.append(webhook)
-            
-            return webhooks
+            cursor.execute("SELECT * FROM webhooks WHERE enabled = 1")
+            return [dict(row) for row in cursor.fetchall()]
         finally:
             self.adapter.close(conn)
     
@@ -4029,6 +4792,7 @@ class TodoDatabase:
             cursor = conn.cursor()
             cursor.execute("DELETE FROM webhooks WHERE id = ?", (webhook_id,))
             conn.commit()
+            self._webhook_index.invalidate()
             logger.info(f"Deleted webhook {webhook_id}")
         finally:
             self.adapter.close(conn)
@@ -4065,17 +4829,87 @@ class TodoDatabase:
         finally:
             self.adapter.close(conn)
     
-    def export_tasks(
+    def record_webhook_deliveries(self, deliveries: List[Dict[str, Any]]) -> None:
+        """
+        Record a batch of webhook delivery attempts in one transaction.
+        
+        Args:
+            deliveries: Dictionaries with webhook_id, event_type, payload, status,
+                        and optional response_code, response_body and attempt_number
+        """
+        if not deliveries:
+            return
+        with self._write_transaction() as conn:
+            conn.cursor().executemany(self._normalize_sql("""
+                INSERT INTO webhook_deliveries
+                (webhook_id, event_type, payload, status, response_code, response_body, attempt_number, delivered_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, CASE WHEN ? = 'success' THEN CURRENT_TIMESTAMP ELSE NULL END)
+            """), [
+                (
+                    d["webhook_id"], d["event_type"], d["payload"], d["status"],
+                    d.get("response_code"), d.get("response_body"), d.get("attempt_number", 1), d["status"]
+                )
+                for d in deliveries
+            ])
+    
+    def save_webhook_outbox(self, deliveries: List[Dict[str, Any]]) -> None:
+        """
+        Persist undelivered webhook deliveries so they survive a shutdown.
+        
+        Args:
+            deliveries: Dictionaries with webhook_id, event_type, payload and attempt_number
+        """
+        if not deliveries:
+            return
+        with self._write_transaction() as conn:
+            conn.cursor().executemany(self._normalize_sql("""
+                INSERT INTO webhook_outbox (webhook_id, event_type, payload, attempt_number)
+                VALUES (?, ?, ?, ?)
+            """), [
+                (d["webhook_id"], d["event_type"], d["payload"], d.get("attempt_number", 1))
+                for d in deliveries
+            ])
+    
+    def take_webhook_outbox(self, limit: int = 10000) -> List[Dict[str, Any]]:
+        """
+        Remove and return persisted webhook deliveries, oldest first.
+        
+        Args:
+            limit: Maximum number of deliveries to take
+        
+        Returns:
+            List of dictionaries with webhook_id, event_type, payload and attempt_number
+        """
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            self._execute_with_logging(cursor, """
+                SELECT id, webhook_id, event_type, payload, attempt_number
+                FROM webhook_outbox ORDER BY id LIMIT ?
+            """, (limit,))
+            rows = [dict(row) for row in cursor.fetchall()]
+            if rows:
+                placeholders = ",".join("?" for _ in rows)
+                self._execute_with_logging(
+                    cursor, f"DELETE FROM webhook_outbox WHERE id IN ({placeholders})",
+                    tuple(row["id"] for row in rows)
+                )
+        return rows
+    
+    def iter_export_tasks(
         self,
         task_type: Optional[str] = None,
         task_status: Optional[str] = None,
         project_id: Optional[int] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        limit: int = 10000
-    ) -> List[Dict[str, Any]]:
+        limit: Optional[int] = None,
+        chunk_size: int = EXPORT_CHUNK_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Export tasks with all their fields, relationships, and tags.
+        Stream tasks with their relationships and tags in chunks, newest first.
+        
+        Each chunk costs three queries and holds a connection only while it is
+        read, so memory and connection use do not grow with the export size.
         
         Args:
             task_type: Filter by task type
@@ -4083,82 +4917,56 @@ class TodoDatabase:
             project_id: Filter by project ID
             start_date: Filter by start date (ISO format)
             end_date: Filter by end date (ISO format)
-            limit: Maximum number of tasks to export
-            
-        Returns:
-            List of task dictionaries with relationships and tags
-        """
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            conditions = []
-            params = []
-            
-            if task_type:
-                conditions.append("t.task_type = ?")
-                params.append(task_type)
-            if task_status:
-                conditions.append("t.task_status = ?")
-                params.append(task_status)
-            if project_id is not None:
-                conditions.append("t.project_id = ?")
-                params.append(project_id)
-            if start_date:
-                conditions.append("t.created_at >= ?")
-                params.append(start_date)
-            if end_date:
-                conditions.append("t.created_at <= ?")
-                params.append(end_date)
-            
-            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
-            query = f"SELECT t.* FROM tasks t {where_clause} ORDER BY t.created_at DESC LIMIT ?"
-            params.append(limit)
-            
-            cursor.execute(query, params)
-            tasks = [dict(row) for row in cursor.fetchall()]
+            limit: Optional maximum number of tasks to export (None for all)
+            chunk_size: Tasks read per chunk
+            
+        Yields:
+            Lists of task dictionaries with relationships and tags
+        """
+        conditions, params = export_filters(task_type, task_status, project_id, start_date, end_date)
+        return iter_export_chunks(
+            self._get_connection,
+            self.adapter.close,
+            self._execute_with_logging,
+            conditions,
+            params,
+            limit=limit,
+            chunk_size=chunk_size
+        )
+    
+    def export_tasks(
+        self,
+        task_type: Optional[str] = None,
+        task_status: Optional[str] = None,
+        project_id: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 10000
+    ) -> List[Dict[str, Any]]:
+        """
+        Export tasks with all their fields, relationships, and tags.
+        
+        Args:
+            task_type: Filter by task type
+            task_status: Filter by task status
+            project_id: Filter by project ID
+            start_date: Filter by start date (ISO format)
+            end_date: Filter by end date (ISO format)
+            limit: Maximum number of tasks to export
             
-            # Enrich each task with relationships and tags
-            for task in tasks:
-                task_id = task["id"]
-                
-                # Get relationships where this task is parent or child
-                relationships = self.get_related_tasks(task_id)
-                task["relationships"] = []
-                for rel in relationships:
-                    if rel["parent_task_id"] == task_id:
-                        # This task is the parent
-                        task["relationships"].append({
-                            "type": rel["relationship_type"],
-                            "direction": "parent",
-                            "related_task_id": rel["child_task_id"],
-                            "related_task_title": rel.get("child_title")
-                        })
-                    else:
-                        # This task is the child
-                        task["relationships"].append({
-                            "type": rel["relationship_type"],
-                            "direction": "child",
-                            "related_task_id": rel["parent_task_id"],
-                            "related_task_title": rel.get("parent_title")
-                        })
-                
-                # Get tags
-                tags = self.get_task_tags(task_id)
-                task["tags"] = [{"id": t["id"], "name": t["name"]} for t in tags]
-                
+        Returns:
+            List of task dictionaries with relationships and tags
+        """
+        tasks = []
+        numeric_fields = ["id", "project_id", "estimated_hours", "actual_hours", "time_delta_hours"]
+        for chunk in self.iter_export_tasks(task_type, task_status, project_id, start_date, end_date, limit=limit):
+            for task in chunk:
                 # Convert None values to empty strings for cleaner export (except for numeric fields)
-                numeric_fields = ["id", "project_id", "estimated_hours", "actual_hours", "time_delta_hours"]
                 for key in task:
-                    if task[key] is None:
-                        if key in ["relationships", "tags"]:
-                            continue  # Already initialized as lists
-                        if key not in numeric_fields:
-                            task[key] = ""
-                        # Keep None for numeric fields - let CSV/JSON handle it
-            
-            return tasks
-        finally:
-            self.adapter.close(conn)
+                    if task[key] is None and key not in numeric_fields:
+                        task[key] = ""
+                tasks.append(task)
+        return tasks
     
     # File attachment methods
     def create_attachment(
@@ -4475,140 +5283,7 @@ class TodoDatabase:
         Returns:
             Dictionary with success status, completed count, and failed task IDs
         """
-        if not agent_id:
-            raise ValueError("agent_id is required for bulk operations")
-        if not task_ids:
-            raise ValueError("task_ids cannot be empty")
-        
-        conn = self._get_connection()
-        completed = []
-        failed = []
-        
-        try:
-            cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Get current status
-                            cursor.execute("SELECT task_status, estimated_hours FROM tasks WHERE id = ?", (task_id,))
-                            current = cursor.fetchone()
-                            if not current:
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            old_status = current["task_status"]
-                            estimated_hours = current["estimated_hours"]
-                            
-                            # Calculate time_delta_hours
-                            time_delta_hours = None
-                            if actual_hours is not None and estimated_hours is not None:
-                                time_delta_hours = actual_hours - estimated_hours
-                            
-                            # Complete task
-                            cursor.execute("""
-                                UPDATE tasks 
-                                SET task_status = 'complete',
-                                    completed_at = CURRENT_TIMESTAMP,
-                                    updated_at = CURRENT_TIMESTAMP,
-                                    notes = COALESCE(?, notes),
-                                    actual_hours = COALESCE(?, actual_hours),
-                                    time_delta_hours = COALESCE(?, time_delta_hours)
-                                WHERE id = ?
-                            """, (notes, actual_hours, time_delta_hours, task_id))
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} could not be completed")
-                            
-                            # Record in history
-                            cursor.execute("""
-                                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
-                                VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
-                            """, (task_id, agent_id, old_status, notes))
-                            
-                            completed.append(task_id)
-                            
-                            # Auto-complete parent tasks if all subtasks are complete
-                            self._check_and_auto_complete_parents(task_id, agent_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk complete failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk completed {len(completed)} tasks by agent {agent_id}")
-                    return {
-                        "success": True,
-                        "completed": len(completed),
-                        "failed": len(failed),
-                        "task_ids": completed,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: complete as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Get current status
-                        cursor.execute("SELECT task_status, estimated_hours FROM tasks WHERE id = ?", (task_id,))
-                        current = cursor.fetchone()
-                        if not current:
-                            failed.append(task_id)
-                            continue
-                        
-                        old_status = current["task_status"]
-                        estimated_hours = current["estimated_hours"]
-                        
-                        # Calculate time_delta_hours
-                        time_delta_hours = None
-                        if actual_hours is not None and estimated_hours is not None:
-                            time_delta_hours = actual_hours - estimated_hours
-                        
-                        # Complete task
-                        cursor.execute("""
-                            UPDATE tasks 
-                            SET task_status = 'complete',
-                                completed_at = CURRENT_TIMESTAMP,
-                                updated_at = CURRENT_TIMESTAMP,
-                                notes = COALESCE(?, notes),
-                                actual_hours = COALESCE(?, actual_hours),
-                                time_delta_hours = COALESCE(?, time_delta_hours)
-                            WHERE id = ?
-                        """, (notes, actual_hours, time_delta_hours, task_id))
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        # Record in history
-                        cursor.execute("""
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
-                            VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
-                        """, (task_id, agent_id, old_status, notes))
-                        
-                        completed.append(task_id)
-                        
-                        # Auto-complete parent tasks if all subtasks are complete
-                        self._check_and_auto_complete_parents(task_id, agent_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to complete task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk completed {len(completed)} tasks (failed: {len(failed)}) by agent {agent_id}")
-                return {
-                    "success": True,
-                    "completed": len(completed),
-                    "failed": len(failed),
-                    "task_ids": completed,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
+        return self._bulk_operations.complete_tasks(task_ids, agent_id, notes, actual_hours, require_all)
     
     def bulk_assign_tasks(
         self,
@@ -4627,118 +5302,7 @@ class TodoDatabase:
         Returns:
             Dictionary with success status, assigned count, and failed task IDs
         """
-        if not agent_id:
-            raise ValueError("agent_id is required for bulk operations")
-        if not task_ids:
-            raise ValueError("task_ids cannot be empty")
-        
-        conn = self._get_connection()
-        assigned = []
-        failed = []
-        
-        try:
-            cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Get current status
-                            cursor.execute("SELECT task_status, assigned_agent FROM tasks WHERE id = ?", (task_id,))
-                            current = cursor.fetchone()
-                            if not current:
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            old_status = current["task_status"]
-                            
-                            # Only assign if task is available
-                            cursor.execute("""
-                                UPDATE tasks 
-                                SET task_status = 'in_progress', 
-                                    assigned_agent = ?,
-                                    updated_at = CURRENT_TIMESTAMP,
-                                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
-                                WHERE id = ? AND task_status = 'available'
-                            """, (agent_id, task_id))
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} is not available for assignment")
-                            
-                            # Record in history
-                            cursor.execute("""
-                                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                                VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
-                            """, (task_id, agent_id, old_status))
-                            
-                            assigned.append(task_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk assign failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk assigned {len(assigned)} tasks to agent {agent_id}")
-                    return {
-                        "success": True,
-                        "assigned": len(assigned),
-                        "failed": len(failed),
-                        "task_ids": assigned,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: assign as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Get current status
-                        cursor.execute("SELECT task_status, assigned_agent FROM tasks WHERE id = ?", (task_id,))
-                        current = cursor.fetchone()
-                        if not current:
-                            failed.append(task_id)
-                            continue
-                        
-                        old_status = current["task_status"]
-                        
-                        # Only assign if task is available
-                        cursor.execute("""
-                            UPDATE tasks 
-                            SET task_status = 'in_progress', 
-                                assigned_agent = ?,
-                                updated_at = CURRENT_TIMESTAMP,
-                                started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
-                            WHERE id = ? AND task_status = 'available'
-                        """, (agent_id, task_id))
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        # Record in history
-                        cursor.execute("""
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                            VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
-                        """, (task_id, agent_id, old_status))
-                        
-                        assigned.append(task_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to assign task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk assigned {len(assigned)} tasks (failed: {len(failed)}) to agent {agent_id}")
-                return {
-                    "success": True,
-                    "assigned": len(assigned),
-                    "failed": len(failed),
-                    "task_ids": assigned,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
+        return self._bulk_operations.assign_tasks(task_ids, agent_id, require_all)
     
     def bulk_update_status(
         self,
@@ -4759,116 +5323,7 @@ class TodoDatabase:
         Returns:
             Dictionary with success status, updated count, and failed task IDs
         """
-        if not agent_id:
-            raise ValueError("agent_id is required for bulk operations")
-        if not task_ids:
-            raise ValueError("task_ids cannot be empty")
-        if task_status not in ["available", "in_progress", "complete", "blocked", "cancelled"]:
-            raise ValueError(f"Invalid task_status: {task_status}")
-        
-        conn = self._get_connection()
-        updated = []
-        failed = []
-        
-        try:
-            cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Get current status
-                            cursor.execute("SELECT task_status FROM tasks WHERE id = ?", (task_id,))
-                            current = cursor.fetchone()
-                            if not current:
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            old_status = current["task_status"]
-                            
-                            # Update status
-                            cursor.execute("""
-                                UPDATE tasks 
-                                SET task_status = ?,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE id = ?
-                            """, (task_status, task_id))
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} could not be updated")
-                            
-                            # Record in history
-                            cursor.execute("""
-                                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                                VALUES (?, ?, 'status_changed', 'task_status', ?, ?)
-                            """, (task_id, agent_id, old_status, task_status))
-                            
-                            updated.append(task_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk update status failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk updated status for {len(updated)} tasks by agent {agent_id}")
-                    return {
-                        "success": True,
-                        "updated": len(updated),
-                        "failed": len(failed),
-                        "task_ids": updated,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: update as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Get current status
-                        cursor.execute("SELECT task_status FROM tasks WHERE id = ?", (task_id,))
-                        current = cursor.fetchone()
-                        if not current:
-                            failed.append(task_id)
-                            continue
-                        
-                        old_status = current["task_status"]
-                        
-                        # Update status
-                        cursor.execute("""
-                            UPDATE tasks 
-                            SET task_status = ?,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """, (task_status, task_id))
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        # Record in history
-                        cursor.execute("""
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                            VALUES (?, ?, 'status_changed', 'task_status', ?, ?)
-                        """, (task_id, agent_id, old_status, task_status))
-                        
-                        updated.append(task_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to update status for task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk updated status for {len(updated)} tasks (failed: {len(failed)}) by agent {agent_id}")
-                return {
-                    "success": True,
-                    "updated": len(updated),
-                    "failed": len(failed),
-                    "task_ids": updated,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
+        return self._bulk_operations.update_status(task_ids, task_status, agent_id, require_all)
     
     def bulk_delete_tasks(
         self,
@@ -4885,84 +5340,7 @@ class TodoDatabase:
         Returns:
             Dictionary with success status, deleted count, and failed task IDs
         """
-        if not task_ids:
-            raise ValueError("task_ids cannot be empty")
-        
-        conn = self._get_connection()
-        deleted = []
-        failed = []
-        
-        try:
-            cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                cursor.execute("BEGIN TRANSACTION")
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Verify task exists
-                            cursor.execute("SELECT id FROM tasks WHERE id = ?", (task_id,))
-                            if not cursor.fetchone():
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            # Delete task (cascade will handle relationships, comments, etc.)
-                            cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} could not be deleted")
-                            
-                            deleted.append(task_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk delete failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk deleted {len(deleted)} tasks")
-                    return {
-                        "success": True,
-                        "deleted": len(deleted),
-                        "failed": len(failed),
-                        "task_ids": deleted,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: delete as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Verify task exists
-                        cursor.execute("SELECT id FROM tasks WHERE id = ?", (task_id,))
-                        if not cursor.fetchone():
-                            failed.append(task_id)
-                            continue
-                        
-                        # Delete task (cascade will handle relationships, comments, etc.)
-                        cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        deleted.append(task_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk deleted {len(deleted)} tasks (failed: {len(failed)})")
-                return {
-                    "success": True,
-                    "deleted": len(deleted),
-                    "failed": len(failed),
-                    "task_ids": deleted,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
+        return self._bulk_operations.delete_tasks(task_ids, require_all)
 
     # User Management Methods
     
@@ -5192,6 +5570,7 @@ class TodoDatabase:
             query = self._normalize_sql("DELETE FROM users WHERE id = ?")
             self._execute_with_logging(cursor, query, (user_id,))
             conn.commit()
+            self._session_cache.invalidate_user(user_id)
             return cursor.rowcount > 0
         finally:
             self.adapter.close(conn)
@@ -5266,7 +5645,17 @@ class TodoDatabase:
             self.adapter.close(conn)
     
     def get_session_by_token(self, session_token: str) -> Optional[Dict[str, Any]]:
-        """Get session by token, checking expiration."""
+        """
+        Get session by token, checking expiration.
+        
+        Active sessions are served from an in-memory LRU cache for up to
+        SESSION_CACHE_TTL seconds and never past their expires_at; last_used_at
+        is only written when the session is read from the database.
+        """
+        cached = self._session_cache.get(session_token)
+        if cached is not None:
+            return cached
+        
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -5318,6 +5707,7 @@ class TodoDatabase:
             if has_org_column:
                 result["organization_id"] = row["organization_id"] if hasattr(row, 'keys') else (row[6] if len(row) > 6 else None)
             
+            self._session_cache.put(session_token, result)
             return result
         finally:
             self.adapter.close(conn)
@@ -5334,6 +5724,7 @@ class TodoDatabase:
             """)
             self._execute_with_logging(cursor, query, (session_token,))
             conn.commit()
+            self._session_cache.invalidate(session_token)
             return cursor.rowcount > 0
         finally:
             self.adapter.close(conn)
@@ -5346,24 +5737,50 @@ class TodoDatabase:
             query = self._normalize_sql("DELETE FROM user_sessions WHERE session_token = ?")
             self._execute_with_logging(cursor, query, (session_token,))
             conn.commit()
+            self._session_cache.invalidate(session_token)
             return cursor.rowcount > 0
         finally:
             self.adapter.close(conn)
     
-    def clean_expired_sessions(self) -> int:
-        """Delete expired sessions. Returns number of deleted sessions."""
-        conn = self._get_connection()
-        try:
-            cursor = conn.cursor()
-            query = self._normalize_sql("DELETE FROM user_sessions WHERE expires_at <= CURRENT_TIMESTAMP")
-            self._execute_with_logging(cursor, query)
-            deleted_count = cursor.rowcount
-            conn.commit()
-            if deleted_count > 0:
-                logger.info(f"Cleaned up {deleted_count} expired sessions")
-            return deleted_count
-        finally:
-            self.adapter.close(conn)
+    def clean_expired_sessions(self, batch_size: Optional[int] = None) -> int:
+        """
+        Delete expired sessions in bounded batches.
+        
+        Each batch deletes at most batch_size of the oldest expired sessions
+        (found through idx_user_sessions_expires) in its own short write
+        transaction, so a large backlog never holds the write lock for long.
+        
+        Args:
+            batch_size: Sessions deleted per transaction (default: SESSION_SWEEP_BATCH_SIZE)
+            
+        Returns:
+            Number of deleted sessions
+        """
+        if batch_size is None:
+            batch_size = self._session_sweep_batch_size
+        query = self._normalize_sql("""
+            DELETE FROM user_sessions
+            WHERE id IN (
+                SELECT id FROM user_sessions
+                WHERE expires_at <= CURRENT_TIMESTAMP
+                ORDER BY expires_at
+                LIMIT ?
+            )
+        """)
+        deleted_count = 0
+        while True:
+            with self._write_transaction() as conn:
+                cursor = conn.cursor()
+                self._execute_with_logging(cursor, query, (batch_size,))
+                deleted = cursor.rowcount
+            if deleted <= 0:
+                break
+            deleted_count += deleted
+            if deleted < batch_size:
+                break
+        if deleted_count > 0:
+            logger.info(f"Cleaned up {deleted_count} expired sessions")
+        return deleted_count
 
     # API Key Management Methods
 
@@ -5440,6 +5857,7 @@ class TodoDatabase:
         Returns:
             API key dictionary or None if not found
         """
+        self.flush_api_key_usage()
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -5483,6 +5901,7 @@ class TodoDatabase:
         Returns:
             List of API key dictionaries (without full key)
         """
+        self.flush_api_key_usage()
         conn = self._get_connection()
         try:
             cursor = conn.cursor()
@@ -5528,6 +5947,7 @@ class TodoDatabase:
                 WHERE id = ?
             """, (key_id,))
             conn.commit()
+            self._api_key_cache.invalidate(key_id)
             if cursor.rowcount > 0:
                 logger.info(f"Revoked API key {key_id}")
                 return True
@@ -5589,6 +6009,97 @@ class TodoDatabase:
         finally:
             self.adapter.close(conn)
 
+    def authenticate_api_key(self, key_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an API key for request authentication (read-through cache).
+        
+        Returns the key row together with its admin flag from one query, and
+        serves repeat lookups from memory for API_KEY_CACHE_TTL seconds.
+        Revoking or rotating a key drops its cache entry. Unknown keys are not
+        cached. The returned last_used_at may lag behind pending usage.
+        
+        Args:
+            key_hash: Hashed API key
+            
+        Returns:
+            API key dictionary (as get_api_key_by_hash, plus 'is_admin') or None if not found
+        """
+        key_info = self._api_key_cache.get(key_hash)
+        if key_info is not None:
+            return key_info
+        
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            query = self._normalize_sql("""
+                SELECT *
+                FROM api_keys
+                WHERE key_hash = ?
+            """)
+            self._execute_with_logging(cursor, query, (key_hash,))
+            row = cursor.fetchone()
+            if not row:
+                return None
+            columns = row.keys()
+            key_info = {
+                "id": row["id"],
+                "project_id": row["project_id"],
+                # organization_id and is_admin may not exist in older databases
+                "organization_id": row["organization_id"] if "organization_id" in columns else None,
+                "key_hash": row["key_hash"],
+                "key_prefix": row["key_prefix"],
+                "name": row["name"],
+                "enabled": row["enabled"],
+                "created_at": row["created_at"],
+                "updated_at": row["updated_at"],
+                "last_used_at": row["last_used_at"],
+                "is_admin": bool(row["is_admin"]) if "is_admin" in columns and row["enabled"] == 1 else False
+            }
+        finally:
+            self.adapter.close(conn)
+        
+        self._api_key_cache.put(key_hash, key_info)
+        return dict(key_info)
+
+    def record_api_key_use(self, key_id: int):
+        """
+        Record that an API key was used, without writing immediately.
+        
+        The timestamp is buffered and written by flush_api_key_usage() together
+        with other pending keys once API_KEY_LAST_USED_FLUSH_INTERVAL seconds
+        have passed since the last flush. Use update_api_key_last_used() to
+        write straight away.
+        
+        Args:
+            key_id: API key ID
+        """
+        used_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+        if self._api_key_usage.record(key_id, used_at):
+            self.flush_api_key_usage()
+
+    def flush_api_key_usage(self) -> int:
+        """
+        Write buffered last_used_at timestamps in one batched UPDATE.
+        
+        Returns:
+            Number of API keys updated
+        """
+        pending = self._api_key_usage.drain()
+        if not pending:
+            return 0
+        try:
+            with self._write_transaction() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(self._normalize_sql("""
+                    UPDATE api_keys
+                    SET last_used_at = ?
+                    WHERE id = ?
+                """), pending)
+        except Exception:
+            self._api_key_usage.restore(pending)
+            raise
+        return len(pending)
+
     def is_api_key_admin(self, key_id: int) -> bool:
         """
         Check if an API key has admin privileges.
@@ -5881,21 +6392,16 @@ class TodoDatabase:
             database_status = {"connected": True}
             
             # Task statistics
-            query = self._normalize_sql("""
-                SELECT 
-                    COUNT(*) as total,
-                    SUM(CASE WHEN task_status = 'available' THEN 1 ELSE 0 END) as available,
-                    SUM(CASE WHEN task_status = 'in_progress' THEN 1 ELSE 0 END) as in_progress,
-                    SUM(CASE WHEN task_status = 'complete' THEN 1 ELSE 0 END) as complete
-                FROM tasks
-            """)
-            self._execute_with_logging(cursor, query)
-            row = cursor.fetchone()
+            if self._task_counters:
+                aggregates = load_task_counters(cursor, execute=self._execute_with_logging)
+            else:
+                aggregates = load_task_aggregates(cursor, [], [], execute=self._execute_with_logging)
+            by_status = aggregates.count_by("task_status")
             tasks = {
-                "total": row["total"] if row else 0,
-                "available": row["available"] if row else 0,
-                "in_progress": row["in_progress"] if row else 0,
-                "complete": row["complete"] if row else 0
+                "total": aggregates.total,
+                "available": by_status.get("available", 0),
+                "in_progress": by_status.get("in_progress", 0),
+                "complete": by_status.get("complete", 0)
             }
             
             # Agent statistics
@@ -6309,6 +6815,10 @@ class TodoDatabase:
         """
         Get aggregated statistics about tasks.
         
+        Without date filters the counts are read from the task_counters
+        rollup (see todorama/storage/task_counters.py); date-filtered calls
+        make one grouped pass over tasks (todorama/storage/task_aggregates.py).
+        
         Args:
             project_id: Optional project filter
             task_type: Optional task type filter
@@ -6339,63 +6849,40 @@ class TodoDatabase:
                 conditions.append("created_at <= ?")
                 params.append(end_date)
             
-            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
-            
-            # Total count
-            cursor.execute(f"SELECT COUNT(*) FROM tasks {where_clause}", params)
-            total = cursor.fetchone()[0]
-            
-            # Counts by status
-            status_counts = {}
-            for status in ["available", "in_progress", "complete", "blocked", "cancelled"]:
-                status_params = params + [status]
-                if conditions:
-                    status_where = f"{where_clause} AND task_status = ?"
-                else:
-                    status_where = "WHERE task_status = ?"
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM tasks {status_where}",
-                    status_params
+            if self._task_counters and not (start_date or end_date):
+                aggregates = load_task_counters(
+                    cursor, project_id=project_id, task_type=task_type,
+                    execute=self._execute_with_logging
                 )
-                status_counts[status] = cursor.fetchone()[0]
-            
-            # Counts by task_type
-            type_counts = {}
-            for task_type_val in ["concrete", "abstract", "epic"]:
-                type_params = params + [task_type_val]
-                if conditions:
-                    type_where = f"{where_clause} AND task_type = ?"
-                else:
-                    type_where = "WHERE task_type = ?"
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM tasks {type_where}",
-                    type_params
+            else:
+                aggregates = load_task_aggregates(
+                    cursor, conditions, params,
+                    execute=self._execute_with_logging, cache=self._aggregate_cache
                 )
-                type_counts[task_type_val] = cursor.fetchone()[0]
-            
-            # Counts by project (if not filtering by project)
-            project_counts = {}
-            if project_id is None:
-                cursor.execute("SELECT project_id, COUNT(*) FROM tasks GROUP BY project_id")
-                for row in cursor.fetchall():
-                    proj_id = row[0]
-                    count = row[1]
-                    project_counts[proj_id] = count
-            
-            # Completion rate
-            completion_rate = 0.0
-            if total > 0:
-                completion_rate = (status_counts.get("complete", 0) / total) * 100
-            
-            return {
-                "total": total,
-                "by_status": status_counts,
-                "by_type": type_counts,
-                "by_project": project_counts if project_id is None else {project_id: total},
-                "completion_rate": round(completion_rate, 2)
-            }
+            return aggregates.task_statistics(project_id)
         finally:
-            conn.close()
+            self.adapter.close(conn)
+    
+    def reconcile_task_counters(self) -> Dict[str, Any]:
+        """
+        Rebuild the task_counters rollup from the tasks table.
+        
+        The counters are maintained by triggers, so this is only needed to
+        repair drift (e.g. after a restore or manual SQL with triggers off).
+        
+        Returns:
+            Dictionary with counter rows, total tasks and corrected rows
+        
+        Raises:
+            RuntimeError: If the task_counters rollup is not installed
+        """
+        if not self._task_counters:
+            raise RuntimeError("task_counters is not installed; run the Alembic migrations and restart")
+        with self._write_transaction() as conn:
+            cursor = conn.cursor()
+            result = reconcile_task_counters(cursor, self.db_type, execute=self._execute_with_logging)
+        logger.info(f"Reconciled task counters: {result}")
+        return result
     
     def get_recent_completions(
         self,
@@ -6524,89 +7011,22 @@ class TodoDatabase:
         Returns:
             Dictionary with success status and summary of unlocked tasks
         """
-        if not task_ids:
-            return {
-                "success": True,
-                "unlocked_count": 0,
-                "unlocked_task_ids": [],
-                "failed_count": 0,
-                "failed_task_ids": []
-            }
-        
-        if not agent_id:
-            raise ValueError("agent_id is required for bulk unlock")
-        
-        conn = self._get_connection()
-        unlocked = []
-        failed = []
-        
-        try:
-            cursor = conn.cursor()
-            
-            for task_id in task_ids:
-                try:
-                    # Get current status
-                    cursor.execute("SELECT assigned_agent, task_status FROM tasks WHERE id = ?", (task_id,))
-                    current = cursor.fetchone()
-                    
-                    if not current:
-                        failed.append({"task_id": task_id, "error": "Task not found"})
-                        continue
-                    
-                    old_status = current["task_status"]
-                    
-                    # Unlock the task
-                    cursor.execute("""
-                        UPDATE tasks 
-                        SET task_status = 'available',
-                            assigned_agent = NULL,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ? AND task_status = 'in_progress'
-                    """, (task_id,))
-                    
-                    if cursor.rowcount > 0:
-                        # Record in history
-                        cursor.execute("""
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                            VALUES (?, ?, 'unlocked', 'task_status', ?, 'available')
-                        """, (task_id, agent_id, old_status))
-                        unlocked.append(task_id)
-                    else:
-                        failed.append({"task_id": task_id, "error": "Task not in_progress"})
-                
-                except Exception as e:
-                    logger.error(f"Error unlocking task {task_id}: {e}", exc_info=True)
-                    failed.append({"task_id": task_id, "error": str(e)})
-            
-            conn.commit()
-            
-            return {
-                "success": True,
-                "unlocked_count": len(unlocked),
-                "unlocked_task_ids": unlocked,
-                "failed_count": len(failed),
-                "failed_task_ids": failed
-            }
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Bulk unlock failed: {e}", exc_info=True)
-            raise
-        finally:
-            conn.close()
-
+        return self._bulk_operations.unlock_tasks(task_ids, agent_id)
 
 class StaleTaskScheduler:
     """Schedules and manages automatic cleanup of stale tasks."""
     
-    def __init__(self, database: TodoDatabase, cleanup_interval_hours: int = 1):
+    def __init__(self, database: TodoDatabase, interval_seconds: int = 30, batch_size: Optional[int] = None):
         """Initialize stale task cleanup scheduler.
         
         Args:
             database: TodoDatabase instance
-            cleanup_interval_hours: Hours between cleanup runs (default: 1 hour)
+            interval_seconds: Seconds between cleanup runs (default: 30 seconds)
+            batch_size: Tasks unlocked per transaction (default: STALE_TASK_SWEEP_BATCH_SIZE)
         """
         self.database = database
-        self.cleanup_interval_hours = cleanup_interval_hours
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
         self.running = False
         self._thread: Optional[threading.Thread] = None
     
@@ -6619,7 +7039,7 @@ class StaleTaskScheduler:
         self.running = True
         self._thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self._thread.start()
-        logger.info(f"Stale task cleanup scheduler started (interval: {self.cleanup_interval_hours} hours)")
+        logger.info(f"Stale task cleanup scheduler started (interval: {self.interval_seconds} seconds)")
     
     def stop(self):
         """Stop the stale task cleanup scheduler."""
@@ -6633,18 +7053,64 @@ class StaleTaskScheduler:
         while self.running:
             try:
                 # Unlock stale tasks
-                unlocked_count = self.database.unlock_stale_tasks()
+                unlocked_count = self.database.unlock_stale_tasks(batch_size=self.batch_size)
                 if unlocked_count > 0:
                     logger.info(f"Stale task cleanup: unlocked {unlocked_count} stale task(s)")
-                
-                # Sleep until next cleanup
-                sleep_seconds = self.cleanup_interval_hours * 3600
-                for _ in range(sleep_seconds):
-                    if not self.running:
-                        break
-                    time.sleep(1)
             except Exception as e:
                 logger.error(f"Error in stale task cleanup scheduler: {e}", exc_info=True)
-                # Sleep 1 hour before retrying
-                time.sleep(3600)
+            
+            # Sleep until next cleanup
+            for _ in range(max(self.interval_seconds, 1)):
+                if not self.running:
+                    break
+                time.sleep(1)
+
 
+class SessionSweeper:
+    """Periodically deletes expired user sessions in bounded batches."""
+    
+    def __init__(self, database: TodoDatabase, interval_seconds: int = 300, batch_size: Optional[int] = None):
+        """Initialize expired session sweeper.
+        
+        Args:
+            database: TodoDatabase instance
+            interval_seconds: Seconds between sweeps (default: 5 minutes)
+            batch_size: Sessions deleted per transaction (default: SESSION_SWEEP_BATCH_SIZE)
+        """
+        self.database = database
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.running = False
+        self._thread: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the expired session sweeper."""
+        if self.running:
+            logger.warning("Expired session sweeper already running")
+            return
+        
+        self.running = True
+        self._thread = threading.Thread(target=self._run_sweeper, daemon=True)
+        self._thread.start()
+        logger.info(f"Expired session sweeper started (interval: {self.interval_seconds} seconds)")
+    
+    def stop(self):
+        """Stop the expired session sweeper."""
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=5)
+        logger.info("Expired session sweeper stopped")
+    
+    def _run_sweeper(self):
+        """Run the expired session sweeper loop."""
+        while self.running:
+            try:
+                self.database.clean_expired_sessions(batch_size=self.batch_size)
+            except Exception as e:
+                logger.error(f"Error in expired session sweeper: {e}", exc_info=True)
+            
+            # Sleep until next sweep
+            for _ in range(max(self.interval_seconds, 1)):
+                if not self.running:
+                    break
+                time.sleep(1)
@@ -1,12 +1,22 @@
 """
 Database adapter abstraction layer for supporting multiple database backends.
+
+Adapters hand out pooled connections: SQLite connections are kept open per
+thread and PostgreSQL connections come from a bounded, thread-safe pool.
+Callers keep using ``adapter.connect()`` / ``adapter.close(conn)`` (or
+``conn.close()``); closing a pooled connection returns it to its pool.
 """
 import os
+import time
 import logging
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple, List
+from collections import deque
+from typing import Any, Callable, Dict, Optional, Tuple, List
 from enum import Enum
 
+from todorama.exceptions.errors import DatabaseError
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,28 +26,543 @@ class DatabaseType(Enum):
     POSTGRESQL = "postgresql"
 
 
+class _PoolEntry:
+    """Bookkeeping for a raw connection owned by a pool."""
+    
+    __slots__ = ("connection", "created_at", "last_used_at", "generation")
+    
+    def __init__(self, connection: Any, generation: int):
+        now = time.monotonic()
+        self.connection = connection
+        self.created_at = now
+        self.last_used_at = now
+        self.generation = generation
+
+
+class PooledConnection:
+    """
+    Proxy around a raw DB-API connection borrowed from a pool.
+    
+    Every attribute is forwarded to the underlying connection, except
+    ``close()`` which hands the connection back to the pool instead of
+    tearing it down. Closing twice is harmless.
+    """
+    
+    def __init__(self, pool: "ConnectionPool", entry: _PoolEntry, home: Any = None):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_entry", entry)
+        object.__setattr__(self, "_home", home)
+    
+    @property
+    def raw_connection(self) -> Any:
+        """The underlying driver connection."""
+        return self._entry.connection
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in ("_pool", "_entry", "_home"):
+            raise AttributeError(name)
+        return getattr(self._entry.connection, name)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._entry.connection, name, value)
+    
+    def __enter__(self):
+        self._entry.connection.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._entry.connection.__exit__(exc_type, exc_value, traceback)
+    
+    def close(self) -> None:
+        """Return the connection to its pool."""
+        pool = self._pool
+        if pool is None:
+            return
+        object.__setattr__(self, "_pool", None)
+        pool._release(self._entry, self._home)
+    
+    def __del__(self):
+        # Connections leaked without close() still give their slot back
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool(ABC):
+    """
+    Base class for connection pools.
+    
+    Handles connection lifetime recycling, health checks of idle connections
+    and pool metrics. Subclasses decide where idle connections live.
+    """
+    
+    def __init__(
+        self,
+        create_connection: Callable[[], Any],
+        max_lifetime: float = 3600.0,
+        health_check_interval: float = 30.0
+    ):
+        """
+        Initialize connection pool.
+        
+        Args:
+            create_connection: Factory that opens a new, fully configured raw connection
+            max_lifetime: Seconds after which a connection is closed and replaced (0 disables)
+            health_check_interval: Idle seconds after which a connection is pinged before reuse
+        """
+        self._create_connection = create_connection
+        self.max_lifetime = max_lifetime
+        self.health_check_interval = health_check_interval
+        self._generation = 0
+        self._metrics_lock = threading.Lock()
+        self._metrics = {
+            "connections_created": 0,
+            "connections_closed": 0,
+            "checkouts": 0,
+            "reused": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "in_use": 0,
+            "idle": 0,
+            "waits": 0,
+            "timeouts": 0,
+        }
+    
+    @abstractmethod
+    def acquire(self) -> PooledConnection:
+        """Borrow a connection from the pool."""
+        pass
+    
+    @abstractmethod
+    def _release(self, entry: _PoolEntry, home: Any) -> None:
+        """Give a borrowed connection back to the pool."""
+        pass
+    
+    @abstractmethod
+    def dispose(self) -> None:
+        """Close idle connections and retire every connection currently handed out."""
+        pass
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of pool counters."""
+        with self._metrics_lock:
+            metrics = dict(self._metrics)
+        metrics["pool_type"] = self.__class__.__name__
+        return metrics
+    
+    def _incr(self, key: str, amount: int = 1) -> None:
+        with self._metrics_lock:
+            self._metrics[key] += amount
+    
+    def _open_entry(self) -> _PoolEntry:
+        """Open a new raw connection and wrap it in a pool entry."""
+        entry = _PoolEntry(self._create_connection(), self._generation)
+        self._incr("connections_created")
+        return entry
+    
+    def _discard(self, entry: _PoolEntry) -> None:
+        """Close a raw connection that is leaving the pool."""
+        try:
+            entry.connection.close()
+        except Exception:
+            pass
+        self._incr("connections_closed")
+    
+    def _ping(self, connection: Any) -> bool:
+        """Run a trivial query to check the connection is still alive."""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+                cursor.fetchone()
+            finally:
+                cursor.close()
+            # psycopg2 opens a transaction even for SELECT 1
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+    
+    def _is_usable(self, entry: _PoolEntry) -> bool:
+        """
+        Decide whether an idle entry can be handed out again.
+        
+        Retires connections past max_lifetime or from a disposed generation,
+        and pings connections that sat idle longer than health_check_interval.
+        """
+        now = time.monotonic()
+        if entry.generation != self._generation:
+            return False
+        if self.max_lifetime and now - entry.created_at >= self.max_lifetime:
+            self._incr("recycled")
+            return False
+        if getattr(entry.connection, "closed", False):
+            self._incr("health_check_failures")
+            return False
+        if now - entry.last_used_at >= self.health_check_interval:
+            if not self._ping(entry.connection):
+                self._incr("health_check_failures")
+                return False
+        return True
+    
+    def _reset(self, entry: _PoolEntry) -> bool:
+        """
+        Roll back anything the borrower left uncommitted.
+        
+        Returns:
+            True if the connection is clean and can go back to the pool
+        """
+        try:
+            entry.connection.rollback()
+        except Exception:
+            return False
+        entry.last_used_at = time.monotonic()
+        return True
+
+
+class ThreadLocalConnectionPool(ConnectionPool):
+    """
+    Pool of persistent per-thread connections (used for SQLite).
+    
+    SQLite connections must stay on the thread that created them, so every
+    thread keeps a small stack of idle connections. Nested borrows on the same
+    thread get separate connections, preserving per-call transaction isolation.
+    """
+    
+    def __init__(
+        self,
+        create_connection: Callable[[], Any],
+        max_idle_per_thread: int = 2,
+        max_lifetime: float = 3600.0,
+        health_check_interval: float = 30.0
+    ):
+        """
+        Initialize thread-local pool.
+        
+        Args:
+            create_connection: Factory that opens a new, fully configured raw connection
+            max_idle_per_thread: Idle connections each thread keeps open
+            max_lifetime: Seconds after which a connection is closed and replaced (0 disables)
+            health_check_interval: Idle seconds after which a connection is pinged before reuse
+        """
+        super().__init__(create_connection, max_lifetime, health_check_interval)
+        self.max_idle_per_thread = max_idle_per_thread
+        self._local = threading.local()
+    
+    def _idle_stack(self) -> List[_PoolEntry]:
+        stack = getattr(self._local, "idle", None)
+        if stack is None:
+            stack = []
+            self._local.idle = stack
+            self._local.owner = threading.get_ident()
+        return stack
+    
+    def acquire(self) -> PooledConnection:
+        stack = self._idle_stack()
+        entry = None
+        while stack:
+            candidate = stack.pop()
+            self._incr("idle", -1)
+            if self._is_usable(candidate):
+                entry = candidate
+                self._incr("reused")
+                break
+            self._discard(candidate)
+        if entry is None:
+            entry = self._open_entry()
+        self._incr("checkouts")
+        self._incr("in_use")
+        return PooledConnection(self, entry, (stack, self._local.owner))
+    
+    def _release(self, entry: _PoolEntry, home: Any) -> None:
+        self._incr("in_use", -1)
+        stack, owner = home
+        if threading.get_ident() != owner:
+            # SQLite connections cannot be touched from another thread;
+            # drop the reference and let the driver close it on collection.
+            self._incr("connections_closed")
+            return
+        if (
+            entry.generation == self._generation
+            and len(stack) < self.max_idle_per_thread
+            and self._reset(entry)
+        ):
+            stack.append(entry)
+            self._incr("idle")
+        else:
+            self._discard(entry)
+    
+    def dispose(self) -> None:
+        # Other threads' idle connections are retired lazily via the generation check
+        self._generation += 1
+        stack = self._idle_stack()
+        while stack:
+            self._discard(stack.pop())
+            self._incr("idle", -1)
+
+
+class BoundedConnectionPool(ConnectionPool):
+    """
+    Bounded, thread-safe connection pool (used for PostgreSQL).
+    
+    At most ``pool_size + max_overflow`` connections are open at once; callers
+    beyond that wait up to ``timeout`` seconds for a connection to be returned.
+    Idle connections above ``pool_size`` are closed on release.
+    """
+    
+    def __init__(
+        self,
+        create_connection: Callable[[], Any],
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        timeout: float = 30.0,
+        max_lifetime: float = 3600.0,
+        health_check_interval: float = 30.0
+    ):
+        """
+        Initialize bounded pool.
+        
+        Args:
+            create_connection: Factory that opens a new, fully configured raw connection
+            pool_size: Connections kept open while idle
+            max_overflow: Extra connections allowed under load
+            timeout: Seconds to wait for a free connection before raising DatabaseError
+            max_lifetime: Seconds after which a connection is closed and replaced (0 disables)
+            health_check_interval: Idle seconds after which a connection is pinged before reuse
+        """
+        super().__init__(create_connection, max_lifetime, health_check_interval)
+        self.pool_size = pool_size
+        self.max_size = pool_size + max_overflow
+        self.timeout = timeout
+        self._idle: deque = deque()
+        self._open = 0
+        self._condition = threading.Condition()
+    
+    def acquire(self) -> PooledConnection:
+        deadline = time.monotonic() + self.timeout
+        while True:
+            entry = None
+            create = False
+            with self._condition:
+                waited = False
+                while not self._idle and self._open >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._incr("timeouts")
+                        raise DatabaseError(
+                            f"Timed out after {self.timeout}s waiting for a database connection "
+                            f"(pool size {self.max_size})",
+                            operation="connect"
+                        )
+                    if not waited:
+                        self._incr("waits")
+                        waited = True
+                    self._condition.wait(remaining)
+                if self._idle:
+                    entry = self._idle.pop()
+                    self._incr("idle", -1)
+                else:
+                    self._open += 1
+                    create = True
+            
+            if create:
+                try:
+                    entry = self._open_entry()
+                except Exception:
+                    with self._condition:
+                        self._open -= 1
+                        self._condition.notify()
+                    raise
+            elif self._is_usable(entry):
+                self._incr("reused")
+            else:
+                self._discard(entry)
+                with self._condition:
+                    self._open -= 1
+                    self._condition.notify()
+                continue
+            
+            self._incr("checkouts")
+            self._incr("in_use")
+            return PooledConnection(self, entry)
+    
+    def _release(self, entry: _PoolEntry, home: Any) -> None:
+        self._incr("in_use", -1)
+        keep = entry.generation == self._generation and self._reset(entry)
+        with self._condition:
+            if keep and len(self._idle) < self.pool_size:
+                self._idle.append(entry)
+                self._incr("idle")
+            else:
+                self._open -= 1
+                keep = False
+            self._condition.notify()
+        if not keep:
+            self._discard(entry)
+    
+    def dispose(self) -> None:
+        with self._condition:
+            self._generation += 1
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+            self._incr("idle", -len(idle))
+            self._condition.notify_all()
+        for entry in idle:
+            self._discard(entry)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = super().get_metrics()
+        with self._condition:
+            metrics["open"] = self._open
+        metrics["max_size"] = self.max_size
+        return metrics
+
+
+
+class SQLiteWriteQueue:
+    """
+    FIFO queue that admits one writer at a time.
+    
+    SQLite allows a single writer per database. Funnelling in-process writers
+    through this queue means they wait their turn here instead of spinning on
+    SQLITE_BUSY, while readers (which never enter the queue) keep running
+    concurrently under WAL. The queue is re-entrant for the owning thread.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters: deque = deque()
+        self._owner: Optional[int] = None
+        self._depth = 0
+        self._metrics = {
+            "writes": 0,
+            "waits": 0,
+            "max_queue_length": 0,
+            "total_wait_seconds": 0.0,
+        }
+    
+    def acquire(self) -> None:
+        """Block until this thread is the active writer."""
+        me = threading.get_ident()
+        with self._lock:
+            if self._owner == me:
+                self._depth += 1
+                return
+            self._metrics["writes"] += 1
+            if self._owner is None and not self._waiters:
+                self._owner = me
+                self._depth = 1
+                return
+            turn = threading.Event()
+            self._waiters.append((me, turn))
+            self._metrics["waits"] += 1
+            self._metrics["max_queue_length"] = max(
+                self._metrics["max_queue_length"], len(self._waiters)
+            )
+        started = time.monotonic()
+        # Ownership is handed over by release(), so no re-check is needed
+        turn.wait()
+        with self._lock:
+            self._metrics["total_wait_seconds"] += time.monotonic() - started
+    
+    def release(self) -> None:
+        """Leave the writer slot and hand it to the next queued writer."""
+        with self._lock:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("release() called by a thread that is not the active writer")
+            self._depth -= 1
+            if self._depth:
+                return
+            if self._waiters:
+                owner, turn = self._waiters.popleft()
+                self._owner = owner
+                self._depth = 1
+                turn.set()
+            else:
+                self._owner = None
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+        return False
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Return a snapshot of writer queue counters."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["queue_length"] = len(self._waiters)
+        return metrics
+
+
 class BaseDatabaseAdapter(ABC):
     """Abstract base class for database adapters."""
     
-    def __init__(self, connection_string: str):
+    def __init__(
+        self,
+        connection_string: str,
+        pool_enabled: bool = True,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: float = 3600.0,
+        pool_health_check_interval: float = 30.0
+    ):
         """
         Initialize database adapter.
         
         Args:
             connection_string: Database connection string (path for SQLite, URI for PostgreSQL)
+            pool_enabled: Reuse connections through a pool instead of connecting per call
+            pool_size: Idle connections kept open (PostgreSQL)
+            max_overflow: Extra connections allowed under load (PostgreSQL)
+            pool_timeout: Seconds to wait for a free connection (PostgreSQL)
+            pool_recycle: Maximum connection lifetime in seconds (0 disables)
+            pool_health_check_interval: Idle seconds after which a connection is pinged before reuse
         """
         self.connection_string = connection_string
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_health_check_interval = pool_health_check_interval
+        self.pool: Optional[ConnectionPool] = self._create_pool() if pool_enabled else None
     
     @abstractmethod
-    def connect(self):
-        """Get a database connection."""
+    def _create_connection(self):
+        """Open a new, fully configured driver connection."""
         pass
     
     @abstractmethod
-    def close(self, conn):
-        """Close a database connection."""
+    def _create_pool(self) -> ConnectionPool:
+        """Create the connection pool for this backend."""
         pass
     
+    def connect(self):
+        """Get a database connection (borrowed from the pool when pooling is enabled)."""
+        if self.pool is None:
+            return self._create_connection()
+        return self.pool.acquire()
+    
+    def close(self, conn):
+        """Close a database connection (returns pooled connections to their pool)."""
+        conn.close()
+    
+    def get_pool_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get connection pool metrics, or None if pooling is disabled."""
+        if self.pool is None:
+            return None
+        return self.pool.get_metrics()
+    
+    def dispose(self):
+        """Close idle pooled connections and retire those currently borrowed."""
+        if self.pool is not None:
+            self.pool.dispose()
+    
     @abstractmethod
     def execute(self, cursor, query: str, params: Tuple = None):
         """Execute a query with parameters."""
@@ -77,15 +602,78 @@ class BaseDatabaseAdapter(ABC):
 class SQLiteAdapter(BaseDatabaseAdapter):
     """SQLite database adapter."""
     
-    def connect(self):
+    JOURNAL_MODES = ("delete", "truncate", "persist", "memory", "wal", "off")
+    SYNCHRONOUS_MODES = ("off", "normal", "full", "extra")
+    
+    def __init__(
+        self,
+        connection_string: str,
+        journal_mode: str = "wal",
+        synchronous: str = "normal",
+        mmap_size: int = 268435456,
+        cache_size: int = -64000,
+        busy_timeout: int = 5000,
+        write_queue_enabled: bool = True,
+        **pool_options: Any
+    ):
+        """
+        Initialize SQLite adapter with its performance profile.
+        
+        Args:
+            connection_string: Path to the database file
+            journal_mode: PRAGMA journal_mode (WAL lets readers run alongside the writer)
+            synchronous: PRAGMA synchronous (NORMAL is durable enough under WAL)
+            mmap_size: PRAGMA mmap_size in bytes (0 disables memory-mapped I/O)
+            cache_size: PRAGMA cache_size (negative values are KiB, positive values pages)
+            busy_timeout: PRAGMA busy_timeout in milliseconds
+            write_queue_enabled: Funnel write transactions through a single-writer queue
+            **pool_options: Connection pool options passed to BaseDatabaseAdapter
+        
+        Raises:
+            ValueError: If journal_mode or synchronous is not a valid SQLite setting
+        """
+        journal_mode = journal_mode.lower()
+        synchronous = synchronous.lower()
+        if journal_mode not in self.JOURNAL_MODES:
+            raise ValueError(f"Invalid SQLite journal_mode: {journal_mode}. Must be one of: {', '.join(self.JOURNAL_MODES)}")
+        if synchronous not in self.SYNCHRONOUS_MODES:
+            raise ValueError(f"Invalid SQLite synchronous: {synchronous}. Must be one of: {', '.join(self.SYNCHRONOUS_MODES)}")
+        self.journal_mode = journal_mode
+        self.synchronous = synchronous
+        self.mmap_size = int(mmap_size)
+        self.cache_size = int(cache_size)
+        self.busy_timeout = int(busy_timeout)
+        self.write_queue = SQLiteWriteQueue() if write_queue_enabled else None
+        super().__init__(connection_string, **pool_options)
+    
+    def _create_connection(self):
         import sqlite3
-        conn = sqlite3.connect(self.connection_string)
+        conn = sqlite3.connect(self.connection_string, timeout=self.busy_timeout / 1000.0)
         conn.row_factory = sqlite3.Row
         conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute(f"PRAGMA busy_timeout = {self.busy_timeout}")
+        try:
+            # journal_mode is persistent; this is a no-op once the file is in the right mode
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+        except sqlite3.OperationalError as e:
+            logger.warning(f"Could not set SQLite journal_mode={self.journal_mode}: {e}")
+        conn.execute(f"PRAGMA synchronous = {self.synchronous}")
+        conn.execute(f"PRAGMA cache_size = {self.cache_size}")
+        conn.execute(f"PRAGMA mmap_size = {self.mmap_size}")
         return conn
     
-    def close(self, conn):
-        conn.close()
+    def get_pool_metrics(self) -> Optional[Dict[str, Any]]:
+        metrics = super().get_pool_metrics()
+        if metrics is not None and self.write_queue is not None:
+            metrics["write_queue"] = self.write_queue.get_metrics()
+        return metrics
+    
+    def _create_pool(self) -> ConnectionPool:
+        return ThreadLocalConnectionPool(
+            self._create_connection,
+            max_lifetime=self.pool_recycle,
+            health_check_interval=self.pool_health_check_interval
+        )
     
     def execute(self, cursor, query: str, params: Tuple = None):
         if params:
@@ -127,7 +715,7 @@ class SQLiteAdapter(BaseDatabaseAdapter):
 class PostgreSQLAdapter(BaseDatabaseAdapter):
     """PostgreSQL database adapter."""
     
-    def connect(self):
+    def _create_connection(self):
         try:
             import psycopg2
             from psycopg2.extras import RealDictRow
@@ -151,8 +739,15 @@ class PostgreSQLAdapter(BaseDatabaseAdapter):
         except ImportError:
             raise ImportError("psycopg2-binary is required for PostgreSQL support. Install it with: pip install psycopg2-binary")
     
-    def close(self, conn):
-        conn.close()
+    def _create_pool(self) -> ConnectionPool:
+        return BoundedConnectionPool(
+            self._create_connection,
+            pool_size=self.pool_size,
+            max_overflow=self.max_overflow,
+            timeout=self.pool_timeout,
+            max_lifetime=self.pool_recycle,
+            health_check_interval=self.pool_health_check_interval
+        )
     
     def execute(self, cursor, query: str, params: Tuple = None):
         # Convert ? placeholders to %s for PostgreSQL
@@ -234,17 +829,41 @@ class PostgreSQLAdapter(BaseDatabaseAdapter):
         return f"fts_vector @@ to_tsquery('english', %s)"
 
 
-def get_database_adapter(connection_string: Optional[str] = None) -> BaseDatabaseAdapter:
+def is_postgresql_dsn(connection_string: str) -> bool:
+    """True if connection_string is a PostgreSQL URI or key=value DSN rather than a file path."""
+    if connection_string.startswith(("postgresql://", "postgres://")):
+        return True
+    keys = {part.split("=", 1)[0] for part in connection_string.split() if "=" in part}
+    return bool(keys & {"host", "hostaddr", "dbname", "user", "port", "service"})
+
+
+def get_database_adapter(
+    connection_string: Optional[str] = None,
+    db_type: Optional[str] = None
+) -> BaseDatabaseAdapter:
     """
     Factory function to get the appropriate database adapter.
     
     Args:
         connection_string: Database connection string. If None, uses environment variables.
+        db_type: 'sqlite' or 'postgresql'. If None, a PostgreSQL DSN selects
+                 PostgreSQL and anything else follows the DB_TYPE environment variable.
         
     Returns:
         Database adapter instance
+        
+    Raises:
+        ValueError: If db_type is 'sqlite' and connection_string is a PostgreSQL DSN
     """
-    db_type = os.getenv("DB_TYPE", "sqlite").lower()
+    if db_type is None:
+        if connection_string is not None and is_postgresql_dsn(connection_string):
+            db_type = "postgresql"
+        else:
+            db_type = os.getenv("DB_TYPE", "sqlite")
+    db_type = db_type.lower()
+    if db_type != "postgresql" and connection_string is not None and is_postgresql_dsn(connection_string):
+        # SQLite would create a file named after the DSN
+        raise ValueError("A PostgreSQL connection string cannot be opened with the SQLite adapter")
     
     if connection_string is None:
         if db_type == "postgresql":
@@ -264,7 +883,27 @@ def get_database_adapter(connection_string: Optional[str] = None) -> BaseDatabas
             from todorama.config import get_database_path
             connection_string = get_database_path()
     
+    from todorama.config import get_settings
+    settings = get_settings()
+    pool_options = {
+        "pool_enabled": settings.db_pool_enabled,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_health_check_interval": settings.db_pool_health_check_interval,
+    }
+    
     if db_type == "postgresql":
-        return PostgreSQLAdapter(connection_string)
+        return PostgreSQLAdapter(connection_string, **pool_options)
     else:
-        return SQLiteAdapter(connection_string)
+        return SQLiteAdapter(
+            connection_string,
+            journal_mode=settings.sqlite_journal_mode,
+            synchronous=settings.sqlite_synchronous,
+            mmap_size=settings.sqlite_mmap_size,
+            cache_size=settings.sqlite_cache_size,
+            busy_timeout=settings.sqlite_busy_timeout,
+            write_queue_enabled=settings.sqlite_write_queue_enabled,
+            **pool_options
+        )
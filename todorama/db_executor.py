@@ -0,0 +1,170 @@
+"""
+Run blocking database calls from async routes without stalling the event loop.
+
+The routes are ``async def`` but TodoDatabase is synchronous (sqlite3 and
+psycopg2). Calling it directly on the event loop blocks every other request
+for as long as the query runs, so one slow analytics report stalls all
+concurrent agents.
+
+DatabaseExecutor runs those calls on bounded thread pools instead:
+
+- the default lane serves short queries and writes;
+- the analytics lane serves heavy reports (bottlenecks, agent comparisons,
+  completion rates, ...) with only a few workers, so a burst of reports queues
+  behind its own small pool and never occupies the threads agents need.
+
+Every call has a timeout. A timed-out call raises DatabaseTimeoutError (503)
+to the caller; the worker thread finishes the query in the background, since
+a running sqlite3/psycopg2 statement cannot be interrupted from another
+thread. contextvars (request ID, tracing span) are copied into the worker so
+logs and traces stay attached to the request.
+
+AsyncTodoDatabase wraps a TodoDatabase so that ``await adb.get_task(1)`` runs
+the call on the executor, picking the analytics lane for the methods in
+ANALYTICS_METHODS.
+"""
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from todorama.exceptions import DatabaseTimeoutError
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional["DatabaseExecutor"] = None
+_executor_lock = threading.Lock()
+
+# TodoDatabase methods served by the analytics lane
+ANALYTICS_METHODS = frozenset({
+    "get_agent_comparisons",
+    "get_agent_stats",
+    "get_average_time_to_complete",
+    "get_bottlenecks",
+    "get_completion_rates",
+    "get_system_status",
+    "get_task_statistics",
+    "get_visualization_data",
+    "reconcile_task_counters",
+})
+
+
+class DatabaseExecutor:
+    """Bounded thread pools for blocking database calls made from async code."""
+
+    def __init__(
+        self,
+        max_workers: int = 16,
+        analytics_workers: int = 2,
+        timeout: Optional[float] = 30.0,
+        analytics_timeout: Optional[float] = 120.0
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Threads for short queries and writes
+            analytics_workers: Threads for heavy analytics queries
+            timeout: Default seconds to wait for a call (None or 0 waits forever)
+            analytics_timeout: Default seconds to wait for an analytics call
+        """
+        self.timeout = timeout or None
+        self.analytics_timeout = analytics_timeout or None
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="todorama-db")
+        self._analytics_executor = ThreadPoolExecutor(
+            max_workers=analytics_workers, thread_name_prefix="todorama-db-analytics"
+        )
+
+    async def run(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) on the default lane and await its result."""
+        return await self._submit(self._executor, self.timeout, func, args, kwargs)
+
+    async def run_analytics(self, func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+        """Run func(*args, **kwargs) on the analytics lane and await its result."""
+        return await self._submit(self._analytics_executor, self.analytics_timeout, func, args, kwargs)
+
+    async def _submit(
+        self,
+        executor: ThreadPoolExecutor,
+        timeout: Optional[float],
+        func: Callable[..., T],
+        args: tuple,
+        kwargs: dict
+    ) -> T:
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, func, *args, **kwargs)
+        future = loop.run_in_executor(executor, call)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            name = getattr(func, "__qualname__", repr(func))
+            logger.warning(f"Database call {name} timed out after {timeout} seconds")
+            raise DatabaseTimeoutError(
+                f"Database call timed out after {timeout} seconds",
+                operation=name,
+                context={"timeout_seconds": timeout}
+            ) from None
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop accepting calls; queued calls that have not started are dropped."""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._analytics_executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class AsyncTodoDatabase:
+    """Async facade over TodoDatabase: every method call runs on a DatabaseExecutor."""
+
+    def __init__(self, db: Any, executor: DatabaseExecutor):
+        """
+        Initialize the facade.
+
+        Args:
+            db: TodoDatabase instance
+            executor: Executor the calls run on
+        """
+        self._db = db
+        self._executor = executor
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._db, name)
+        if not callable(attr):
+            return attr
+        run = self._executor.run_analytics if name in ANALYTICS_METHODS else self._executor.run
+
+        @functools.wraps(attr)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await run(attr, *args, **kwargs)
+
+        return call
+
+
+def get_db_executor() -> DatabaseExecutor:
+    """Get the process-wide database executor, creating it from settings on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                from todorama.config import get_settings
+                settings = get_settings()
+                _executor = DatabaseExecutor(
+                    max_workers=settings.db_executor_workers,
+                    analytics_workers=settings.db_executor_analytics_workers,
+                    timeout=settings.db_call_timeout,
+                    analytics_timeout=settings.db_analytics_call_timeout
+                )
+    return _executor
+
+
+def shutdown_db_executor() -> None:
+    """Shut down the process-wide executor; the next get_db_executor() creates a new one."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown()
@@ -5,21 +5,25 @@ Centralizes service initialization and provides access to all services.
 import os
 import logging
 import tempfile
-from typing import Optional
+from typing import Any, Callable, Optional, TypeVar
 
-from todorama.database import TodoDatabase
-from todorama.config import get_database_path, ensure_database_directory
+from todorama.database import TodoDatabase, SessionSweeper, StaleTaskScheduler
+from todorama.db_executor import AsyncTodoDatabase, get_db_executor
+from todorama.config import get_database_path, ensure_database_directory, get_settings
 from todorama.backup import BackupManager, BackupScheduler
 from todorama.conversation_storage import ConversationStorage
 from todorama.conversation_backup import ConversationBackupManager, BackupScheduler as ConversationBackupScheduler
 from todorama.adapters.job_queue_adapter import JobQueueAdapter
 from todorama.mcp_api import set_db
+from todorama.webhooks import get_webhook_dispatcher
 
 logger = logging.getLogger(__name__)
 
 # Global service instance
 _service_instance: Optional['ServiceContainer'] = None
 
+T = TypeVar("T")
+
 
 class ServiceContainer:
     """Container for all application services."""
@@ -56,6 +60,23 @@ class ServiceContainer:
         self.backup_scheduler = BackupScheduler(self.backup_manager, backup_interval_hours)
         self.backup_scheduler.start()
         
+        # Initialize and start expired session sweeper
+        self.session_sweeper = None
+        session_sweep_interval = get_settings().session_sweep_interval
+        if session_sweep_interval > 0:
+            self.session_sweeper = SessionSweeper(self.db, session_sweep_interval)
+            self.session_sweeper.start()
+        
+        # Initialize and start stale task reaper
+        self.stale_task_scheduler = None
+        stale_task_sweep_interval = get_settings().stale_task_sweep_interval
+        if stale_task_sweep_interval > 0:
+            self.stale_task_scheduler = StaleTaskScheduler(self.db, stale_task_sweep_interval)
+            self.stale_task_scheduler.start()
+        
+        # Start webhook delivery (replays deliveries saved at the last shutdown)
+        get_webhook_dispatcher(self.db)
+        
         # Initialize conversation storage
         self.conversation_storage = ConversationStorage()
         
@@ -122,6 +143,21 @@ def get_db() -> TodoDatabase:
     return get_services().db
 
 
+def get_async_db() -> AsyncTodoDatabase:
+    """Get an async facade over the container database that runs calls on the database executor."""
+    return AsyncTodoDatabase(get_db(), get_db_executor())
+
+
+async def run_db(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a blocking database call from an async route without blocking the event loop."""
+    return await get_db_executor().run(func, *args, **kwargs)
+
+
+async def run_db_analytics(func: Callable[..., T], /, *args: Any, **kwargs: Any) -> T:
+    """Run a heavy analytics call on the analytics lane of the database executor."""
+    return await get_db_executor().run_analytics(func, *args, **kwargs)
+
+
 def get_backup_manager() -> BackupManager:
     """Get the backup manager instance from the service container."""
     return get_services().backup_manager
@@ -7,6 +7,7 @@ from todorama.exceptions.errors import (
     ValidationError,
     DuplicateError,
     DatabaseError,
+    DatabaseTimeoutError,
     TaskNotFoundError,
     ProjectNotFoundError,
     OrganizationNotFoundError,
@@ -22,6 +23,7 @@ __all__ = [
     "ValidationError",
     "DuplicateError",
     "DatabaseError",
+    "DatabaseTimeoutError",
     "TaskNotFoundError",
     "ProjectNotFoundError",
     "OrganizationNotFoundError",
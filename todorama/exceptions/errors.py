@@ -219,6 +219,14 @@ class DatabaseError(ServiceError):
             self.context.setdefault("operation", operation)
 
 
+class DatabaseTimeoutError(DatabaseError):
+    """Raised when a database call does not finish within its timeout.
+    
+    The call may still complete in the background; callers should treat the
+    outcome of a timed-out write as unknown.
+    """
+
+
 # ============================================================================
 # Service-Specific Exceptions
 # ============================================================================
@@ -293,6 +301,7 @@ def to_http_exception(
         ValidationError: 422,
         DuplicateError: 409,
         DatabaseError: 500,
+        DatabaseTimeoutError: 503,
     }
     
     status_code = status_code_map.get(type(exc), default_status_code)
@@ -334,6 +343,7 @@ def to_mcp_error_response(exc: ServiceError) -> dict[str, Any]:
         ValidationError: -32602,  # Invalid Params
         DuplicateError: -32002,  # Custom: Duplicate
         DatabaseError: -32603,  # Internal Error
+        DatabaseTimeoutError: -32603,  # Internal Error
     }
     
     error_code = error_code_map.get(type(exc), -32603)
@@ -367,6 +377,7 @@ __all__ = [
     "ValidationError",
     "DuplicateError",
     "DatabaseError",
+    "DatabaseTimeoutError",
     "TaskNotFoundError",
     "ProjectNotFoundError",
     "OrganizationNotFoundError",
@@ -86,6 +86,7 @@ class PageInfo:
     """Pagination info."""
     limit: int
     has_more: bool
+    end_cursor: Optional[str] = None
 
 
 @type
@@ -143,7 +144,8 @@ class Query:
         self,
         filter: Optional[TaskFilter] = None,
         order_by: Optional[TaskOrderBy] = None,
-        limit: int = 100
+        limit: int = 100,
+        after: Optional[str] = None
     ) -> TasksConnection:
         """
         Query tasks with filtering, sorting, and pagination.
@@ -152,6 +154,7 @@ class Query:
             filter: Optional filter criteria
             order_by: Optional ordering (field and direction)
             limit: Maximum number of results (default 100, max 1000)
+            after: Optional page_info.end_cursor of the previous page
         """
         # Validate limit
         if limit < 1:
@@ -175,15 +178,10 @@ class Query:
         if order_by:
             if order_by.field == "priority":
                 order_by_str = "priority" if order_by.direction == "DESC" else "priority_asc"
-            elif order_by.field == "created_at":
-                # Database defaults to created_at DESC, so only need to handle ascending
-                if order_by.direction == "ASC":
-                    # Note: database.py doesn't support created_at ASC directly,
-                    # so we'll sort in memory if needed
-                    pass
+            elif order_by.field == "created_at" and order_by.direction == "ASC":
+                order_by_str = "created_at_asc"
         
-        # Query tasks from database (query one extra to check if there are more)
-        tasks = db.query_tasks(
+        page = db.query_tasks_page(
             task_type=task_type,
             task_status=task_status,
             assigned_agent=assigned_agent,
@@ -192,18 +190,10 @@ class Query:
             tag_id=tag_id,
             tag_ids=tag_ids,
             order_by=order_by_str,
-            limit=limit + 1  # Query one extra to check if there are more
+            limit=limit,
+            after=after
         )
-        
-        # Check if there are more results
-        has_more = len(tasks) > limit
-        if has_more:
-            tasks = tasks[:limit]
-        
-        # Handle created_at ASC ordering if requested (database defaults to DESC)
-        if order_by and order_by.field == "created_at" and order_by.direction == "ASC":
-            # Reverse the list since database returns DESC by default
-            tasks = list(reversed(tasks))
+        tasks = page["tasks"]
         
         # Convert to GraphQL types
         # Filter task dicts to only include fields in Task GraphQL type
@@ -220,7 +210,8 @@ class Query:
             tasks=task_objects,
             page_info=PageInfo(
                 limit=limit,
-                has_more=has_more
+                has_more=page["has_more"],
+                end_cursor=page["next_cursor"]
             )
         )
     
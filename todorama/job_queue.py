@@ -3,6 +3,20 @@ Background job queue system for handling long-running tasks.
 
 Uses Redis as the queue backend for reliability and scalability.
 Supports job types: backup, webhook delivery, bulk operations, etc.
+
+Each job type has its own ready queue (a sorted set scored by priority, then
+enqueue time) and delayed queue (a sorted set scored by the time the job
+becomes due). Dequeueing is one Lua script: it promotes due delayed jobs and
+pops the best pending jobs across the requested types, marking them
+processing, atomically. Two workers therefore never receive the same job,
+and a delayed job never blocks the ready jobs behind it. Workers that want to
+wait for work block on BLPOP of a per-type wake-up list instead of polling:
+every job added to a ready queue also pushes one token there. A token only
+means "try again"; jobs are only ever taken from the ready queues by the
+script.
+
+Job state lives in single-node Redis keys (job:status:<id>, job:data:<id>)
+that the scripts address by name, so the queue is not Redis Cluster aware.
 """
 import os
 import json
@@ -10,7 +24,7 @@ import time
 import uuid
 import logging
 from enum import Enum
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Iterable, List, Optional, Callable, Union
 from datetime import datetime, timedelta
 
 try:
@@ -26,6 +40,62 @@ from todorama.adapters import HTTPClientAdapterFactory, HTTPStatusError, Timeout
 
 logger = logging.getLogger(__name__)
 
+# Ready-queue score: priority first, then enqueue (or due) time
+PRIORITY_SCORE_STEP = 1000000000
+
+# Delayed jobs moved to their ready queue per type and dequeue call
+PROMOTE_LIMIT = 100
+
+# Longest single BLPOP wait; bounds how late a delayed job is noticed
+MAX_BLOCK_SECONDS = 1.0
+
+# KEYS: ready queues, then the delayed queues, then the wake-up lists of the same job types
+# ARGV: now, count, status key prefix, data key prefix, started_at, promote limit
+# Returns the JSON job data of up to count claimed jobs, best first.
+_DEQUEUE_SCRIPT = """
+local n = #KEYS / 3
+local now = tonumber(ARGV[1])
+local count = tonumber(ARGV[2])
+for i = 1, n do
+    local due = redis.call('ZRANGEBYSCORE', KEYS[n + i], '-inf', now, 'WITHSCORES', 'LIMIT', 0, tonumber(ARGV[6]))
+    for j = 1, #due, 2 do
+        local priority = tonumber(redis.call('HGET', ARGV[3] .. due[j], 'priority') or '2')
+        redis.call('ZADD', KEYS[i], priority * 1000000000 + tonumber(due[j + 1]), due[j])
+        redis.call('ZREM', KEYS[n + i], due[j])
+        redis.call('LPUSH', KEYS[2 * n + i], 1)
+    end
+end
+local jobs = {}
+while #jobs < count do
+    local best_key, best_id, best_score = nil, nil, nil
+    for i = 1, n do
+        local head = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+        if head[1] and (best_score == nil or tonumber(head[2]) < best_score) then
+            best_key, best_id, best_score = KEYS[i], head[1], tonumber(head[2])
+        end
+    end
+    if best_key == nil then
+        break
+    end
+    redis.call('ZREM', best_key, best_id)
+    local status_key = ARGV[3] .. best_id
+    if redis.call('HGET', status_key, 'status') == 'pending' then
+        local data = redis.call('GET', ARGV[4] .. best_id)
+        if data then
+            redis.call('HSET', status_key, 'status', 'processing', 'started_at', ARGV[5])
+            jobs[#jobs + 1] = data
+        end
+    end
+end
+-- Tokens left for an empty ready queue would only cause spurious wake-ups
+for i = 1, n do
+    if redis.call('ZCARD', KEYS[i]) == 0 then
+        redis.call('DEL', KEYS[2 * n + i])
+    end
+end
+return jobs
+"""
+
 
 class JobStatus(Enum):
     """Job status enumeration."""
@@ -127,10 +197,50 @@ class JobQueue:
         self.max_retries = max_retries
         
         # Redis key prefixes
-        self.queue_prefix = "job:queue:"
+        self.ready_prefix = "job:ready:"
+        self.delayed_prefix = "job:delayed:"
+        self.wakeup_prefix = "job:wakeup:"
         self.status_prefix = "job:status:"
+        self.data_prefix = "job:data:"
         self.result_prefix = "job:result:"
-        self.priority_queue_key = "job:priority_queue"
+        
+        self._dequeue_script = self.redis.register_script(_DEQUEUE_SCRIPT)
+    
+    def _job_types(self, job_type: Union[JobType, Iterable[JobType], None]) -> List[JobType]:
+        if job_type is None:
+            return list(JobType)
+        if isinstance(job_type, JobType):
+            return [job_type]
+        return list(job_type)
+    
+    def _ready_key(self, job_type: str) -> str:
+        return f"{self.ready_prefix}{job_type}"
+    
+    def _delayed_key(self, job_type: str) -> str:
+        return f"{self.delayed_prefix}{job_type}"
+    
+    def _wakeup_key(self, job_type: str) -> str:
+        return f"{self.wakeup_prefix}{job_type}"
+    
+    def _dequeue(self, job_types: List[JobType], count: int) -> List[Dict[str, Any]]:
+        keys = (
+            [self._ready_key(t.value) for t in job_types]
+            + [self._delayed_key(t.value) for t in job_types]
+            + [self._wakeup_key(t.value) for t in job_types]
+        )
+        jobs = self._dequeue_script(keys=keys, args=[
+            time.time(), count, self.status_prefix, self.data_prefix,
+            datetime.utcnow().isoformat(), PROMOTE_LIMIT
+        ])
+        return [json.loads(job) for job in jobs]
+    
+    def _seconds_until_due(self, job_types: List[JobType]) -> Optional[float]:
+        """Seconds until the earliest delayed job of these types is due (None if none)."""
+        pipe = self.redis.pipeline(transaction=False)
+        for t in job_types:
+            pipe.zrange(self._delayed_key(t.value), 0, 0, withscores=True)
+        due = [head[0][1] for head in pipe.execute() if head]
+        return min(due) - time.time() if due else None
         
     def submit_job(
         self,
@@ -183,123 +293,92 @@ class JobQueue:
                 "retry_count": "0"
             }
             
-            # Use Redis hash for status
-            self.redis.hset(status_key, mapping={
+            # Status hash, full job data and queue entry are written in one transaction
+            pipe = self.redis.pipeline()
+            pipe.hset(status_key, mapping={
                 k.encode(): json.dumps(v).encode() if isinstance(v, (dict, list)) else str(v).encode()
                 for k, v in status_data.items()
             })
+            # Keep status and data for 7 days
+            pipe.expire(status_key, 7 * 24 * 3600)
+            pipe.setex(f"{self.data_prefix}{job_id}", 7 * 24 * 3600, json.dumps(job_data).encode())
             
-            # Set expiration on status (7 days)
-            self.redis.expire(status_key, 7 * 24 * 3600)
-            
-            # Add to priority queue (sorted set)
-            # Score = priority * 1000000000 + timestamp (higher priority = lower score)
-            score = priority.value * 1000000000 + time.time() + delay
-            self.redis.zadd(
-                self.priority_queue_key,
-                {job_id.encode(): score}
-            )
-            
-            # Also add to simple queue for compatibility
-            queue_key = f"{self.queue_prefix}{job_type.value}"
-            self.redis.lpush(queue_key, json.dumps(job_data).encode())
+            if delay > 0:
+                # Delayed queue is scored by due time; promoted when due
+                pipe.zadd(self._delayed_key(job_type.value), {job_id.encode(): time.time() + delay})
+            else:
+                # Ready queue score = priority * 1000000000 + timestamp (higher priority = lower score)
+                score = priority.value * PRIORITY_SCORE_STEP + time.time()
+                pipe.zadd(self._ready_key(job_type.value), {job_id.encode(): score})
+                pipe.lpush(self._wakeup_key(job_type.value), 1)
+            pipe.execute()
             
             logger.info(f"Job submitted: {job_id} (type={job_type.value}, priority={priority.value})")
             add_span_attribute("job.id", job_id)
             
             return job_id
     
-    def get_next_job(self, job_type: Optional[JobType] = None) -> Optional[Dict[str, Any]]:
+    def get_next_job(
+        self,
+        job_type: Union[JobType, Iterable[JobType], None] = None,
+        timeout: float = 0
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get next job from queue (priority-based).
+        Get next job from queue (priority-based) and mark it processing.
         
         Args:
-            job_type: Optional job type filter
+            job_type: Optional job type (or job types) to take jobs from
+            timeout: Seconds to wait for a job to become available (0 returns immediately)
             
         Returns:
             Job data dictionary or None if no jobs available
         """
-        with trace_span("job_queue.get_next_job"):
-            # Get highest priority job (lowest score)
-            jobs = self.redis.zrange(self.priority_queue_key, 0, 0, withscores=True)
-            
-            if not jobs:
-                return None
-            
-            job_id_bytes, score = jobs[0]
-            job_id = job_id_bytes.decode()
-            
-            # Check if job is ready (delay has passed)
-            status_key = f"{self.status_prefix}{job_id}"
-            status_data = self.redis.hgetall(status_key)
-            
-            if not status_data:
-                # Status missing, remove from queue
-                self.redis.zrem(self.priority_queue_key, job_id_bytes)
-                return None
-            
-            # Decode status data
-            status = {
-                k.decode(): json.loads(v.decode()) if v.startswith(b'[') or v.startswith(b'{') else v.decode()
-                for k, v in status_data.items()
-            }
-            
-            # Check delay
-            created_at_str = status.get("created_at", "")
-            if created_at_str:
-                try:
-                    created_at = datetime.fromisoformat(created_at_str.replace('Z', '+00:00'))
-                    delay_seconds = float(status.get("delay", "0"))
-                    if time.time() < created_at.timestamp() + delay_seconds:
-                        return None  # Not ready yet
-                except (ValueError, TypeError):
-                    pass
-            
-            # Check status
-            if status.get("status") != JobStatus.PENDING.value:
-                # Already processing or completed, remove from queue
-                self.redis.zrem(self.priority_queue_key, job_id_bytes)
-                return None
-            
-            # Get full job data from simple queue or reconstruct
-            job_type_str = status.get("job_type", "")
-            queue_key = f"{self.queue_prefix}{job_type_str}"
-            
-            # Try to pop from queue (may have been processed already)
-            job_json = self.redis.rpop(queue_key)
+        jobs = self.get_next_jobs(1, job_type=job_type, timeout=timeout)
+        return jobs[0] if jobs else None
+    
+    def get_next_jobs(
+        self,
+        count: int,
+        job_type: Union[JobType, Iterable[JobType], None] = None,
+        timeout: float = 0
+    ) -> List[Dict[str, Any]]:
+        """
+        Atomically take up to count jobs, best priority first, and mark them processing.
+        
+        Due delayed jobs are promoted in the same script, so they never block
+        the ready jobs behind them. With a timeout, waits on the wake-up lists
+        until a job is queued or a delayed job becomes due.
+        
+        Args:
+            count: Maximum number of jobs to take
+            job_type: Optional job type (or job types) to take jobs from
+            timeout: Seconds to wait for a job to become available (0 returns immediately)
             
-            if job_json:
-                job_data = json.loads(job_json.decode())
-            else:
-                # Reconstruct from status
-                parameters_json = status.get("parameters", "{}")
-                if isinstance(parameters_json, str):
-                    try:
-                        parameters = json.loads(parameters_json)
-                    except json.JSONDecodeError:
-                        parameters = {}
-                else:
-                    parameters = parameters_json
+        Returns:
+            List of job data dictionaries (empty if no jobs available)
+        """
+        with trace_span("job_queue.get_next_jobs", attributes={"job.count": count}):
+            job_types = self._job_types(job_type)
+            deadline = time.monotonic() + timeout
+            while True:
+                jobs = self._dequeue(job_types, count)
+                remaining = deadline - time.monotonic()
+                if jobs or remaining <= 0:
+                    break
                 
-                job_data = {
-                    "job_id": job_id,
-                    "job_type": job_type_str,
-                    "parameters": parameters,
-                    "priority": int(status.get("priority", JobPriority.MEDIUM.value)),
-                    "created_at": created_at_str,
-                    "timeout": int(status.get("timeout", self.default_timeout)),
-                    "retry_count": int(status.get("retry_count", "0"))
-                }
-            
-            # Filter by job type if specified
-            if job_type and job_data.get("job_type") != job_type.value:
-                return None
-            
-            # Remove from priority queue (will be re-added if processing fails)
-            self.redis.zrem(self.priority_queue_key, job_id_bytes)
-            
-            add_span_attribute("job.id", job_id)
-            return job_data
+                wait = min(remaining, MAX_BLOCK_SECONDS)
+                due_in = self._seconds_until_due(job_types)
+                if due_in is not None:
+                    wait = min(wait, due_in)
+                if wait <= 0:
+                    continue
+                # A token only signals that work arrived; the dequeue script claims
+                # the job, which keeps priority across types
+                self.redis.blpop([self._wakeup_key(t.value) for t in job_types], timeout=wait)
+            
+            for job in jobs:
+                add_span_attribute("job.id", job["job_id"])
+            return jobs
     
     def start_job_processing(self, job_id: str) -> None:
         """Mark job as processing."""
@@ -354,7 +433,7 @@ class JobQueue:
             retry_count = int(self.redis.hget(status_key, "retry_count") or b"0")
             
             is_retryable = isinstance(error, RetryableJobError) or (
-                isinstance(error, Exception) and retry
+                retry and not isinstance(error, NonRetryableJobError)
             )
             
             if is_retryable and retry_count < self.max_retries:
@@ -365,14 +444,22 @@ class JobQueue:
                 self.redis.hset(status_key, "last_error", str(error))
                 self.redis.hset(status_key, "last_error_at", datetime.utcnow().isoformat())
                 
-                # Re-add to priority queue with lower priority (higher score)
+                # Re-add to its ready queue with lower priority (higher score)
                 status_data = self.redis.hgetall(status_key)
-                priority = int(status_data.get(b"priority", str(JobPriority.LOW.value).encode()))
+                status_data = {
+                    (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+                    for k, v in status_data.items()
+                }
+                priority = int(status_data.get("priority", JobPriority.LOW.value))
                 
                 # Lower priority for retries (add 1 to priority value = higher score)
                 retry_priority = min(priority + 1, JobPriority.LOW.value)
-                score = retry_priority * 1000000000 + time.time()
-                self.redis.zadd(self.priority_queue_key, {job_id.encode(): score})
+                score = retry_priority * PRIORITY_SCORE_STEP + time.time()
+                job_type = status_data.get("job_type", "")
+                pipe = self.redis.pipeline()
+                pipe.zadd(self._ready_key(job_type), {job_id.encode(): score})
+                pipe.lpush(self._wakeup_key(job_type), 1)
+                pipe.execute()
                 
                 logger.warning(f"Job error (will retry {retry_count}/{self.max_retries}): {job_id} - {error}")
             else:
@@ -478,8 +565,10 @@ class JobQueue:
         self.redis.hset(status_key, "status", JobStatus.CANCELLED.value)
         self.redis.hset(status_key, "cancelled_at", datetime.utcnow().isoformat())
         
-        # Remove from priority queue
-        self.redis.zrem(self.priority_queue_key, job_id.encode())
+        # Remove from its ready and delayed queues
+        job_type = status.get("job_type", "")
+        self.redis.zrem(self._ready_key(job_type), job_id.encode())
+        self.redis.zrem(self._delayed_key(job_type), job_id.encode())
         
         logger.info(f"Job cancelled: {job_id}")
         return True
@@ -513,7 +602,7 @@ class BackupJobProcessor(JobProcessor):
     def __init__(self, job_queue: JobQueue, backup_manager=None):
         super().__init__(job_queue)
         if backup_manager is None:
-            from backup import BackupManager
+            from todorama.backup import BackupManager
             db_path = get_database_path()
             backups_dir = os.getenv("TODO_BACKUPS_DIR", "/app/backups")
             self.backup_manager = BackupManager(db_path, backups_dir)
@@ -527,7 +616,7 @@ class BackupJobProcessor(JobProcessor):
         project_id = parameters.get("project_id")
         
         try:
-            backup_file = self.backup_manager.create_backup()
+            backup_file = self.backup_manager.create_backup_archive()
             logger.info(f"Backup job completed: {job_id} -> {backup_file}")
             return {
                 "backup_file": backup_file,
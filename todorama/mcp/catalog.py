@@ -0,0 +1,147 @@
+"""
+Precomputed MCP tool catalog.
+
+MCP_FUNCTIONS is static, but every tools/list call used to rebuild the tool
+list from it, recompute each "required" array and re-serialize the whole
+schema, and every agent calls tools/list on every connect.
+
+The catalog is built once at import time instead:
+
+- TOOLS: the tools/list entries (name, description, inputSchema);
+- COMPACT_TOOLS: the same tools with descriptions cut to their first
+  sentence and examples dropped, for bandwidth-sensitive agents;
+- the JSON bytes of the tools/list result and of /mcp/functions, serialized
+  once and spliced into responses;
+- CATALOG_VERSION: a hash of the catalog, served as the ETag so clients can
+  revalidate with If-None-Match instead of downloading it again.
+
+Everything here is shared between requests and must be treated as read-only.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, List
+
+from todorama.mcp.functions import MCP_FUNCTIONS
+
+# Parameter schema keys that only document; dropped from the compact catalog
+_COMPACT_DROPPED_KEYS = frozenset({"example", "enumDescriptions", "optional"})
+
+_FIRST_SENTENCE = re.compile(r"^(.+?[.!?])(?=\s)", re.DOTALL)
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _first_sentence(text: str) -> str:
+    paragraph = text.split("\n\n", 1)[0].strip()
+    match = _FIRST_SENTENCE.match(paragraph)
+    return match.group(1) if match else paragraph
+
+
+def _build_tool(func_def: Dict[str, Any]) -> Dict[str, Any]:
+    parameters = func_def.get("parameters", {})
+    return {
+        "name": func_def["name"],
+        "description": func_def["description"],
+        "inputSchema": {
+            "type": "object",
+            "properties": parameters,
+            "required": [k for k, v in parameters.items() if v.get("optional") is not True]
+        }
+    }
+
+
+def _compact_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    compact = {}
+    for key, value in schema.items():
+        if key in _COMPACT_DROPPED_KEYS:
+            continue
+        if key == "description" and isinstance(value, str):
+            value = _first_sentence(value)
+        elif isinstance(value, dict):
+            value = _compact_schema(value)
+        compact[key] = value
+    return compact
+
+
+def _compact_tool(tool: Dict[str, Any]) -> Dict[str, Any]:
+    input_schema = tool["inputSchema"]
+    return {
+        "name": tool["name"],
+        "description": _first_sentence(tool["description"]),
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                name: _compact_schema(schema) for name, schema in input_schema["properties"].items()
+            },
+            "required": input_schema["required"]
+        }
+    }
+
+
+TOOLS: List[Dict[str, Any]] = [_build_tool(func_def) for func_def in MCP_FUNCTIONS]
+COMPACT_TOOLS: List[Dict[str, Any]] = [_compact_tool(tool) for tool in TOOLS]
+FUNCTION_NAMES: List[str] = [func_def["name"] for func_def in MCP_FUNCTIONS]
+
+CATALOG_VERSION = hashlib.sha256(_dumps(MCP_FUNCTIONS)).hexdigest()[:16]
+CATALOG_ETAG = f'"{CATALOG_VERSION}"'
+COMPACT_CATALOG_ETAG = f'"{CATALOG_VERSION}-compact"'
+
+_META = {"catalogVersion": CATALOG_VERSION}
+_TOOLS_RESULT = {"tools": TOOLS, "_meta": _META}
+_COMPACT_TOOLS_RESULT = {"tools": COMPACT_TOOLS, "_meta": _META}
+_TOOLS_RESULT_JSON = _dumps(_TOOLS_RESULT)
+_COMPACT_TOOLS_RESULT_JSON = _dumps(_COMPACT_TOOLS_RESULT)
+
+FUNCTIONS_JSON = _dumps({"functions": MCP_FUNCTIONS})
+
+
+def tools_list_result(compact: bool = False) -> Dict[str, Any]:
+    """Get the (shared, read-only) tools/list result object."""
+    return _COMPACT_TOOLS_RESULT if compact else _TOOLS_RESULT
+
+
+def tools_list_result_json(compact: bool = False) -> bytes:
+    """Get the serialized tools/list result object."""
+    return _COMPACT_TOOLS_RESULT_JSON if compact else _TOOLS_RESULT_JSON
+
+
+def tools_list_response_json(request_id: Any, jsonrpc: str = "2.0", compact: bool = False) -> bytes:
+    """
+    Build a serialized tools/list JSON-RPC response.
+
+    Only the envelope is serialized per call; the result is spliced in from
+    the bytes built at import time.
+
+    Args:
+        request_id: JSON-RPC request id to echo
+        jsonrpc: JSON-RPC version to echo
+        compact: Use the compact catalog
+
+    Returns:
+        UTF-8 encoded JSON-RPC response
+    """
+    return b"".join((
+        b'{"jsonrpc":', _dumps(jsonrpc),
+        b',"id":', _dumps(request_id),
+        b',"result":', tools_list_result_json(compact),
+        b"}"
+    ))
+
+
+def catalog_etag(compact: bool = False) -> str:
+    """Get the ETag of the full or compact catalog."""
+    return COMPACT_CATALOG_ETAG if compact else CATALOG_ETAG
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Check an If-None-Match header value against an ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
@@ -49,6 +49,32 @@ MCP_FUNCTIONS = [
             }
         }
     },
+    {
+        "name": "claim_next_task",
+        "description": "Pick the next available task for your agent type and reserve it in a single atomic step. Prefer this over list_available_tasks() followed by reserve_task() when you just want the next task to work on: the task is selected and locked together, so concurrent agents never race for the same task and no retry loop is needed. Tasks are claimed oldest first using the same rules as list_available_tasks(). MANDATORY: You must either complete_task() or unlock_task() when done - never leave a task reserved. Returns: Dictionary with success status, task data, and optional stale_warning.\n\nERROR HANDLING:\n- Returns {\"success\": False, \"error\": \"No available tasks for agent type...\"} if there is nothing to claim. Wait and retry later, or create new tasks.\n- Returns {\"success\": False, \"error\": \"Invalid agent_type...\"} if agent_type is not 'breakdown' or 'implementation'.\n- If stale_warning is present in response, the task was previously abandoned - you MUST verify all previous work before continuing.",
+        "parameters": {
+            "agent_type": {
+                "type": "string",
+                "enum": ["breakdown", "implementation"],
+                "description": "Your agent type determines which task is claimed. 'breakdown': abstract/epic tasks. 'implementation': concrete tasks and completed tasks awaiting verification.",
+                "example": "implementation"
+            },
+            "agent_id": {
+                "type": "string",
+                "description": "Your unique agent identifier. The claimed task is assigned to this agent. Must be a non-empty string (typically 1-100 characters). This must match the agent_id used in complete_task() or unlock_task().",
+                "minLength": 1,
+                "maxLength": 100,
+                "example": "cursor-agent"
+            },
+            "project_id": {
+                "type": "integer",
+                "optional": True,
+                "description": "Only claim tasks from this project. Must be a positive integer if provided. Omit to claim from all projects.",
+                "minimum": 1,
+                "example": 1
+            }
+        }
+    },
     {
         "name": "complete_task",
         "description": "CRITICAL: Mark a task as complete when finished. This is MANDATORY - you must call this or unlock_task() when done working. Optionally create a followup task that will be automatically linked. Use notes to document completion details. Returns: Dictionary with success status and optional followup_task_id if a followup was created. Example: After finishing implementation, call with notes='Implemented feature X with tests passing'.\n\nERROR HANDLING:\n- Returns {\"success\": False, \"error\": \"Task X not found...\"} if task_id doesn't exist. Verify task_id is correct.\n- Returns {\"success\": False, \"error\": \"Task X is currently assigned to agent 'Y'...\"} if task is assigned to a different agent. Only the agent that reserved the task can complete it. Ensure you're using the same agent_id that reserved the task.\n- If followup task creation fails (validation errors on followup fields), the main task is still completed but followup_task_id is not returned. Check followup parameter validation if followup creation needed.\n- Database errors during completion are rare; if they occur, verify task status separately to confirm completion state.",
@@ -290,7 +316,7 @@ MCP_FUNCTIONS = [
     },
     {
         "name": "query_tasks",
-        "description": "Query tasks using flexible filtering criteria. Use this to find specific tasks by status, type, agent, priority, tags, or project. More powerful than list_available_tasks - can query any tasks, not just available ones. Returns: List of task dictionaries matching criteria. Example: query_tasks(task_status='in_progress', task_type='concrete') finds all in-progress concrete tasks.\n\nERROR HANDLING:\n- No errors typically returned - function returns empty list [] if no tasks match criteria.\n- Parameter validation errors (invalid enum values, invalid IDs, limit out of range) are handled by framework validation before function is called.\n- Database errors are rare; if connection issues occur, retry with exponential backoff.",
+        "description": "Query tasks using flexible filtering criteria. Use this to find specific tasks by status, type, agent, priority, tags, or project. More powerful than list_available_tasks - can query any tasks, not just available ones. Returns: Dictionary with tasks (list of task dictionaries matching criteria), next_cursor and has_more. Results are paginated: when has_more is true, call query_tasks again with the same filters and cursor=next_cursor to get the next page. Example: query_tasks(task_status='in_progress', task_type='concrete') finds all in-progress concrete tasks.\n\nERROR HANDLING:\n- No errors typically returned - function returns an empty tasks list if no tasks match criteria.\n- Returns {\"success\": False, \"error\": \"Invalid cursor...\"} if cursor is malformed or came from a query with a different order_by. Omit cursor to start from the first page.\n- Parameter validation errors (invalid enum values, invalid IDs, limit out of range) are handled by framework validation before function is called.\n- Database errors are rare; if connection issues occur, retry with exponential backoff.",
         "parameters": {
             "project_id": {
                 "type": "integer",
@@ -363,7 +389,7 @@ MCP_FUNCTIONS = [
             "order_by": {
                 "type": "string",
                 "optional": True,
-                "description": "Sort order for results. Use 'priority' for high-to-low priority, 'priority_asc' for low-to-high priority. Default is no specific ordering.",
+                "description": "Sort order for results. Use 'priority' for high-to-low priority, 'priority_asc' for low-to-high priority, 'created_at_asc' for oldest first. Default is newest first.",
                 "example": "priority"
             },
             "limit": {
@@ -373,6 +399,12 @@ MCP_FUNCTIONS = [
                 "minimum": 1,
                 "maximum": 1000,
                 "example": 100
+            },
+            "cursor": {
+                "type": "string",
+                "optional": True,
+                "description": "next_cursor from the previous query_tasks response, to fetch the next page. Use the same filters and order_by as that call. Omit for the first page.",
+                "example": "eyJrIjoidGFza3M6Y3JlYXRlZF9hdCIsInYiOlsiMjAyNS0wMS0wMSAxMjowMDowMCIsNDJdfQ"
             }
         }
     },
@@ -16,7 +16,8 @@ def handle_query_tasks(
     tag_id: Optional[int] = None,
     tag_ids: Optional[List[int]] = None,
     order_by: Optional[str] = None,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """
     Query tasks by various criteria.
@@ -29,8 +30,9 @@ def handle_query_tasks(
         priority: Optional priority filter
         tag_id: Optional single tag ID filter
         tag_ids: Optional list of tag IDs filter (tasks must have all tags)
-        order_by: Optional ordering (priority, priority_asc)
+        order_by: Optional ordering (priority, priority_asc, created_at_asc)
         limit: Maximum number of results
+        cursor: Optional next_cursor from a previous page
         
     Returns:
         List of task dictionaries
@@ -44,11 +46,55 @@ def handle_query_tasks(
         tag_id=tag_id,
         tag_ids=tag_ids,
         order_by=order_by,
-        limit=limit
+        limit=limit,
+        after=cursor
     )
     return [add_computed_status_fields(dict(task)) for task in tasks]
 
 
+def handle_query_tasks_page(
+    project_id: Optional[int] = None,
+    task_type: Optional[Literal["concrete", "abstract", "epic"]] = None,
+    task_status: Optional[Literal["available", "in_progress", "complete", "blocked", "cancelled"]] = None,
+    agent_id: Optional[str] = None,
+    priority: Optional[Literal["low", "medium", "high", "critical"]] = None,
+    tag_id: Optional[int] = None,
+    tag_ids: Optional[List[int]] = None,
+    order_by: Optional[str] = None,
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Query one keyset-paginated page of tasks.
+    
+    Takes the same arguments as handle_query_tasks().
+    
+    Returns:
+        Dictionary with tasks, next_cursor (None on the last page) and has_more,
+        or success False and an error if the cursor is invalid
+    """
+    try:
+        page = get_db().query_tasks_page(
+            task_type=task_type,
+            task_status=task_status,
+            assigned_agent=agent_id,
+            project_id=project_id,
+            priority=priority,
+            tag_id=tag_id,
+            tag_ids=tag_ids,
+            order_by=order_by,
+            limit=limit,
+            after=cursor
+        )
+    except ValueError as e:
+        return {
+            "success": False,
+            "error": f"{e}. Pass the next_cursor returned by a query_tasks call with the same filters and order_by, or omit cursor to start over."
+        }
+    page["tasks"] = [add_computed_status_fields(dict(task)) for task in page["tasks"]]
+    return page
+
+
 def handle_search_tasks(query: str, limit: int = 100) -> List[Dict[str, Any]]:
     """
     Search tasks using full-text search across titles, instructions, and notes.
@@ -45,6 +45,40 @@ def handle_list_available_tasks(
         return result
 
 
+def _stale_warning(finding: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the stale warning for a finding left when a task was abandoned."""
+    add_span_attribute("mcp.stale_task", True)
+    return {
+        "is_stale": True,
+        "previous_agent": finding.get("agent_id", "unknown"),
+        "unlocked_at": finding.get("created_at"),
+        "stale_finding": finding.get("notes", ""),
+        "warning": "⚠️ WARNING: This task was previously abandoned/stale and may have partially completed work. You MUST verify all previous work before continuing."
+    }
+
+
+def _get_stale_warning(task_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Build a warning if a task was previously abandoned by another agent.
+    
+    Looks at recent "finding" updates left by the stale task reaper.
+    
+    Args:
+        task_id: Task ID that was just locked
+        
+    Returns:
+        Stale warning dictionary, or None if the task was not abandoned
+    """
+    updates = get_db().get_task_updates(task_id, limit=10)
+    for update in updates:
+        if update.get("change_type") == "finding":
+            notes = update.get("notes", "")
+            # Check if this is a stale/abandoned task finding
+            if "stale" in notes.lower() or "abandoned" in notes.lower() or "unlocked due to timeout" in notes.lower():
+                return _stale_warning(update)
+    return None
+
+
 def handle_reserve_task(task_id: int, agent_id: str) -> Dict[str, Any]:
     """
     Reserve (lock) a task for an agent.
@@ -63,8 +97,9 @@ def handle_reserve_task(task_id: int, agent_id: str) -> Dict[str, Any]:
             "mcp.agent_id": agent_id,
         }
     ) as span:
-        # Check if task exists first
-        task = get_db().get_task(task_id)
+        # Lock, post-lock row and stale finding in one transaction
+        reservation = get_db().reserve_task(task_id, agent_id)
+        task = reservation["task"]
         if not task:
             add_span_attribute("mcp.success", False)
             add_span_attribute("mcp.error", "task_not_found")
@@ -73,14 +108,8 @@ def handle_reserve_task(task_id: int, agent_id: str) -> Dict[str, Any]:
                 "error": f"Task {task_id} not found. Please verify the task_id is correct."
             }
         
-        # Allow locking tasks in needs_verification state (complete but unverified)
-        # These tasks should be lockable for verification work
-        task_status = task.get("task_status", "unknown")
-        verification_status = task.get("verification_status", "unverified")
-        is_needs_verification = task_status == "complete" and verification_status == "unverified"
-        
-        # Only allow locking if task is available OR in needs_verification state
-        if task_status != "available" and not is_needs_verification:
+        if not reservation["reserved"]:
+            task_status = task.get("task_status", "unknown")
             assigned_to = task.get("assigned_agent", "none")
             add_span_attribute("mcp.success", False)
             add_span_attribute("mcp.error", "cannot_lock")
@@ -90,39 +119,65 @@ def handle_reserve_task(task_id: int, agent_id: str) -> Dict[str, Any]:
                 "error": f"Task {task_id} cannot be locked. Current status: {task_status}, assigned to: {assigned_to}. Only tasks with status 'available' or in 'needs_verification' state (complete but unverified) can be locked."
             }
         
-        success = get_db().lock_task(task_id, agent_id)
-        if not success:
-            assigned_to = task.get("assigned_agent", "none")
+        result = {"success": True, "task": add_computed_status_fields(dict(task))}
+        if reservation["stale_finding"]:
+            result["stale_warning"] = _stale_warning(reservation["stale_finding"])
+        add_span_attribute("mcp.success", True)
+        return result
+
+
+def handle_claim_next_task(
+    agent_type: Literal["breakdown", "implementation"],
+    agent_id: str,
+    project_id: Optional[int] = None,
+    organization_id: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Pick the next available task for an agent type and reserve it in one step.
+    
+    Args:
+        agent_type: 'breakdown' for abstract/epic tasks, 'implementation' for concrete tasks
+        agent_id: Agent ID claiming the task
+        project_id: Optional project ID to filter tasks
+        organization_id: Optional organization ID to filter tasks (for multi-tenancy)
+        
+    Returns:
+        Dictionary with the claimed task, or success=False if nothing is available
+    """
+    with trace_span(
+        "mcp.claim_next_task",
+        attributes={
+            "mcp.agent_type": agent_type,
+            "mcp.agent_id": agent_id,
+            "mcp.project_id": project_id,
+            "mcp.organization_id": organization_id,
+        }
+    ):
+        if agent_type not in ("breakdown", "implementation"):
             add_span_attribute("mcp.success", False)
-            add_span_attribute("mcp.error", "cannot_lock")
-            add_span_attribute("mcp.current_status", task_status)
+            add_span_attribute("mcp.error", "invalid_agent_type")
             return {
                 "success": False,
-                "error": f"Task {task_id} cannot be locked. Task is assigned to: {assigned_to}. It may already be locked by another agent."
+                "error": f"Invalid agent_type '{agent_type}'. Must be 'breakdown' or 'implementation'."
             }
         
-        # Check for stale status - look for recent "finding" updates that indicate task was abandoned
-        updates = get_db().get_task_updates(task_id, limit=10)
-        stale_warning = None
-        for update in updates:
-            if update.get("change_type") == "finding":
-                notes = update.get("notes", "")
-                # Check if this is a stale/abandoned task finding
-                if "stale" in notes.lower() or "abandoned" in notes.lower() or "unlocked due to timeout" in notes.lower():
-                    stale_warning = {
-                        "is_stale": True,
-                        "previous_agent": update.get("agent_id", "unknown"),
-                        "unlocked_at": update.get("created_at"),
-                        "stale_finding": notes,
-                        "warning": "⚠️ WARNING: This task was previously abandoned/stale and may have partially completed work. You MUST verify all previous work before continuing."
-                    }
-                    add_span_attribute("mcp.stale_task", True)
-                    break
+        task = get_db().claim_next_task(
+            agent_type,
+            agent_id,
+            project_id=project_id,
+            organization_id=organization_id
+        )
+        if not task:
+            add_span_attribute("mcp.success", False)
+            add_span_attribute("mcp.error", "no_tasks_available")
+            return {
+                "success": False,
+                "error": f"No available tasks for agent type '{agent_type}'. Try again later or create new tasks."
+            }
         
-        # Refresh task data after locking
-        updated_task = get_db().get_task(task_id)
-        task_dict = add_computed_status_fields(dict(updated_task))
-        result = {"success": True, "task": task_dict}
+        add_span_attribute("mcp.task_id", task["id"])
+        result = {"success": True, "task": add_computed_status_fields(dict(task))}
+        stale_warning = _get_stale_warning(task["id"])
         if stale_warning:
             result["stale_warning"] = stale_warning
         add_span_attribute("mcp.success", True)
@@ -545,8 +600,9 @@ def handle_get_task_context(task_id: int) -> Dict[str, Any]:
         Dictionary with task, project, updates, ancestry, and recent changes
     """
     try:
-        task = get_db().get_task(task_id)
-        if not task:
+        # Task, project, ancestry, updates and history in one read transaction
+        context = get_db().get_task_context(task_id)
+        if not context:
             return {
                 "success": False,
                 "error": f"Task {task_id} not found. Please verify the task_id is correct."
@@ -558,24 +614,11 @@ def handle_get_task_context(task_id: int) -> Dict[str, Any]:
         }
     
     try:
-        # Get project if task has one
-        project = None
-        if task.get("project_id"):
-            try:
-                project = get_db().get_project(task["project_id"])
-            except Exception as e:
-                # Log error but continue - project not critical for context
-                # Project will remain None
-                pass
-        
-        # Get task updates
-        try:
-            updates = get_db().get_task_updates(task_id, limit=100)
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to retrieve updates for task {task_id}: {str(e)}"
-            }
+        task = context["task"]
+        project = context["project"]
+        updates = context["updates"]
+        ancestry = context["ancestry"]
+        change_history = context["change_history"]
         
         # Check for stale status - look for "finding" updates indicating task was abandoned/stale
         stale_info = None
@@ -593,35 +636,6 @@ def handle_get_task_context(task_id: int) -> Dict[str, Any]:
                     }
                     break
         
-        # Get ancestry (parent tasks via relationships)
-        # Get all relationships where this task is involved
-        try:
-            relationships = get_db().get_related_tasks(task_id)
-        except Exception as e:
-            return {
-                "success": False,
-                "error": f"Failed to retrieve relationships for task {task_id}: {str(e)}"
-            }
-        
-        ancestry = []
-        for rel in relationships:
-            # If this task is a child, then rel["parent_task_id"] is the parent
-            if rel["child_task_id"] == task_id:
-                try:
-                    parent_task = get_db().get_task(rel["parent_task_id"])
-                    if parent_task:
-                        ancestry.append(dict(parent_task))
-                except Exception:
-                    # Skip invalid parent task references
-                    pass
-        
-        # Get recent change history (excluding updates which are already included)
-        try:
-            change_history = get_db().get_change_history(task_id=task_id, limit=50)
-        except Exception as e:
-            # Change history is not critical, continue with empty list
-            change_history = []
-        
         # Filter out update types we already have
         recent_changes = [
             ch for ch in change_history 
@@ -1,14 +1,16 @@
 """Request handlers for JSON-RPC and SSE requests."""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, List, Optional
 
-# Import MCPTodoAPI and MCP_FUNCTIONS - use late import to avoid circular dependency
+# Import MCPTodoAPI - use late import to avoid circular dependency
 def _get_mcp_api():
     """Lazy import to avoid circular dependency."""
     from todorama.mcp_api import MCPTodoAPI
     return MCPTodoAPI
 
-from todorama.mcp.functions import MCP_FUNCTIONS
+from todorama.exceptions import DatabaseTimeoutError
+from todorama.mcp.catalog import FUNCTION_NAMES, tools_list_result
 
 
 def handle_jsonrpc_request(request: Dict[str, Any]) -> Dict[str, Any]:
@@ -40,24 +42,11 @@ def handle_jsonrpc_request(request: Dict[str, Any]) -> Dict[str, Any]:
             }
         }
     elif method == "tools/list":
-        # Return list of available tools
-        tools = []
-        for func_def in MCP_FUNCTIONS:
-            tools.append({
-                "name": func_def["name"],
-                "description": func_def["description"],
-                "inputSchema": {
-                    "type": "object",
-                    "properties": func_def.get("parameters", {}),
-                    "required": [k for k, v in func_def.get("parameters", {}).items() if v.get("optional") is not True]
-                }
-            })
+        # Catalog is precomputed at import time; params.compact selects the short variant
         return {
             "jsonrpc": jsonrpc,
             "id": request_id,
-            "result": {
-                "tools": tools
-            }
+            "result": tools_list_result(compact=bool((params or {}).get("compact")))
         }
     elif method == "prompts/list":
         # Return empty list - todo service doesn't expose prompts
@@ -93,6 +82,11 @@ def handle_jsonrpc_request(request: Dict[str, Any]) -> Dict[str, Any]:
                 arguments.get("task_id"),
                 arguments.get("agent_id")
             ),
+            "claim_next_task": lambda: MCPTodoAPI.claim_next_task(
+                arguments.get("agent_type", "implementation"),
+                arguments.get("agent_id"),
+                arguments.get("project_id")
+            ),
             "complete_task": lambda: MCPTodoAPI.complete_task(
                 arguments.get("task_id"),
                 arguments.get("agent_id"),
@@ -129,7 +123,7 @@ def handle_jsonrpc_request(request: Dict[str, Any]) -> Dict[str, Any]:
                 arguments.get("task_ids"),
                 arguments.get("agent_id")
             ),
-            "query_tasks": lambda: {"tasks": MCPTodoAPI.query_tasks(
+            "query_tasks": lambda: MCPTodoAPI.query_tasks_page(
                 project_id=arguments.get("project_id"),
                 task_type=arguments.get("task_type"),
                 task_status=arguments.get("task_status"),
@@ -138,8 +132,9 @@ def handle_jsonrpc_request(request: Dict[str, Any]) -> Dict[str, Any]:
                 tag_id=arguments.get("tag_id"),
                 tag_ids=arguments.get("tag_ids"),
                 order_by=arguments.get("order_by"),
-                limit=arguments.get("limit", 100)
-            )},
+                limit=arguments.get("limit", 100),
+                cursor=arguments.get("cursor")
+            ),
             "add_task_update": lambda: MCPTodoAPI.add_task_update(
                 arguments.get("task_id"),
                 arguments.get("agent_id"),
@@ -237,6 +232,126 @@ def handle_jsonrpc_request(request: Dict[str, Any]) -> Dict[str, Any]:
         }
 
 
+# JSON-RPC methods and tools/call tools that never write. Consecutive read-only
+# calls in a batch run concurrently; any other call runs on its own, in order.
+READ_ONLY_METHODS = frozenset({"initialize", "tools/list", "prompts/list", "resources/list"})
+READ_ONLY_TOOLS = frozenset({
+    "list_available_tasks",
+    "get_agent_performance",
+    "query_tasks",
+    "get_task_context",
+    "search_tasks",
+    "query_stale_tasks",
+    "get_task_statistics",
+    "get_recent_completions",
+    "get_task_summary",
+})
+
+# Upper bound on the number of calls in one batch
+MAX_BATCH_SIZE = 100
+
+
+def _invalid_request(message: str = "Invalid Request") -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": message}}
+
+
+async def _run_batch_call(run: Callable[..., Awaitable[Any]], request: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one batch call; an exception becomes that call's error response."""
+    try:
+        return await run(handle_jsonrpc_request, request)
+    except DatabaseTimeoutError as e:
+        # The call may still finish in the background, so a write's outcome is unknown
+        message = f"Database timeout: {e.message}"
+        error_type = "DatabaseTimeoutError"
+    except Exception as e:
+        message = f"Internal error: {str(e)}"
+        error_type = e.__class__.__name__
+    return {
+        "jsonrpc": request.get("jsonrpc", "2.0"),
+        "id": request.get("id"),
+        "error": {"code": -32603, "message": message, "data": {"error_type": error_type}}
+    }
+
+
+def _is_read_only(request: Dict[str, Any]) -> bool:
+    method = request.get("method")
+    if method == "tools/call":
+        params = request.get("params") or {}
+        return params.get("name") in READ_ONLY_TOOLS
+    return method in READ_ONLY_METHODS
+
+
+def plan_jsonrpc_batch(requests: List[Dict[str, Any]]) -> List[List[int]]:
+    """
+    Split a batch into steps that run one after another.
+    
+    Each step is either a run of consecutive read-only calls, which may run
+    concurrently, or a single call that may write. Every call therefore sees
+    the writes of the calls before it in the batch.
+    
+    Args:
+        requests: Valid JSON-RPC request objects, in batch order
+        
+    Returns:
+        List of steps, each a list of indexes into requests
+    """
+    steps: List[List[int]] = []
+    for index, request in enumerate(requests):
+        if _is_read_only(request) and steps and _is_read_only(requests[steps[-1][0]]):
+            steps[-1].append(index)
+        else:
+            steps.append([index])
+    return steps
+
+
+async def handle_jsonrpc_batch(
+    requests: List[Any],
+    run: Optional[Callable[..., Awaitable[Any]]] = None
+) -> Any:
+    """
+    Handle a JSON-RPC 2.0 batch (an array of request objects).
+    
+    Calls run in the steps of plan_jsonrpc_batch(): consecutive read-only
+    calls concurrently, writes one at a time in batch order. Responses come
+    back in batch order. Notifications (requests without an "id") are
+    executed but get no response. A call that raises, for example with a
+    DatabaseTimeoutError from run, gets a -32603 error response; the calls
+    around it still run and keep their responses.
+    
+    Args:
+        requests: Decoded batch array
+        run: Coroutine function run(func, *args) that executes a blocking call
+             (default: asyncio.to_thread)
+        
+    Returns:
+        List of JSON-RPC responses (empty if every call was a notification),
+        or a single error response for an empty or oversized batch
+    """
+    if run is None:
+        run = asyncio.to_thread
+    if not requests:
+        return _invalid_request()
+    if len(requests) > MAX_BATCH_SIZE:
+        return _invalid_request(f"Invalid Request: batch exceeds {MAX_BATCH_SIZE} calls")
+    
+    responses: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    valid = []
+    for index, request in enumerate(requests):
+        if isinstance(request, dict) and isinstance(request.get("method"), str):
+            valid.append(index)
+        else:
+            responses[index] = _invalid_request()
+    
+    for step in plan_jsonrpc_batch([requests[index] for index in valid]):
+        indexes = [valid[position] for position in step]
+        results = await asyncio.gather(*(_run_batch_call(run, requests[index]) for index in indexes))
+        for index, result in zip(indexes, results):
+            responses[index] = result
+    
+    notifications = {index for index in valid if "id" not in requests[index]}
+    return [response for index, response in enumerate(responses) if index not in notifications]
+
+
 def handle_sse_request(request: Dict[str, Any]) -> str:
     """
     Handle SSE request (returns JSON-RPC response as SSE format string).
@@ -261,7 +376,7 @@ def handle_sse_request(request: Dict[str, Any]) -> str:
                 "jsonrpc": "2.0",
                 "id": None,
                 "result": {
-                    "functions": [f["name"] for f in MCP_FUNCTIONS]
+                    "functions": FUNCTION_NAMES
                 }
             }
             return f"data: {json.dumps(response)}\n\n"
@@ -4,6 +4,7 @@ Minimal MCP (Model Context Protocol) API for TODO service.
 Provides 4-5 core functions for agent interaction:
 1. list_available_tasks - Get tasks available for agent type
 2. reserve_task - Lock and reserve a task for an agent
+   (claim_next_task picks and reserves the next available task in one step)
 3. complete_task - Mark task as complete and optionally add followup
 4. create_task - Create a new task (for breakdown agents)
 5. get_agent_performance - Get agent statistics
@@ -80,6 +81,21 @@ class MCPTodoAPI:
         """Reserve (lock) a task for an agent."""
         return task_handlers.handle_reserve_task(task_id=task_id, agent_id=agent_id)
     
+    @staticmethod
+    def claim_next_task(
+        agent_type: Literal["breakdown", "implementation"],
+        agent_id: str,
+        project_id: Optional[int] = None,
+        organization_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Pick the next available task for an agent type and reserve it atomically."""
+        return task_handlers.handle_claim_next_task(
+            agent_type=agent_type,
+            agent_id=agent_id,
+            project_id=project_id,
+            organization_id=organization_id
+        )
+    
     @staticmethod
     def complete_task(
         task_id: int,
@@ -162,7 +178,8 @@ class MCPTodoAPI:
         tag_id: Optional[int] = None,
         tag_ids: Optional[List[int]] = None,
         order_by: Optional[str] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Query tasks by various criteria."""
         return query_handlers.handle_query_tasks(
@@ -174,7 +191,35 @@ class MCPTodoAPI:
             tag_id=tag_id,
             tag_ids=tag_ids,
             order_by=order_by,
-            limit=limit
+            limit=limit,
+            cursor=cursor
+        )
+    
+    @staticmethod
+    def query_tasks_page(
+        project_id: Optional[int] = None,
+        task_type: Optional[Literal["concrete", "abstract", "epic"]] = None,
+        task_status: Optional[Literal["available", "in_progress", "complete", "blocked", "cancelled"]] = None,
+        agent_id: Optional[str] = None,
+        priority: Optional[Literal["low", "medium", "high", "critical"]] = None,
+        tag_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        order_by: Optional[str] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Query one page of tasks with its next_cursor."""
+        return query_handlers.handle_query_tasks_page(
+            project_id=project_id,
+            task_type=task_type,
+            task_status=task_status,
+            agent_id=agent_id,
+            priority=priority,
+            tag_id=tag_id,
+            tag_ids=tag_ids,
+            order_by=order_by,
+            limit=limit,
+            cursor=cursor
         )
     
     @staticmethod
@@ -551,7 +596,7 @@ class MCPTodoAPI:
 
 # Import MCP functions and request handlers
 from todorama.mcp.functions import MCP_FUNCTIONS
-from todorama.mcp.request_handlers import handle_jsonrpc_request, handle_sse_request
+from todorama.mcp.request_handlers import handle_jsonrpc_request, handle_jsonrpc_batch, handle_sse_request
 
 # Re-export for backward compatibility
-__all__ = ["MCPTodoAPI", "set_db", "get_db", "MCP_FUNCTIONS", "handle_jsonrpc_request", "handle_sse_request"]
+__all__ = ["MCPTodoAPI", "set_db", "get_db", "MCP_FUNCTIONS", "handle_jsonrpc_request", "handle_jsonrpc_batch", "handle_sse_request"]
@@ -2,7 +2,7 @@
 Pydantic models for request/response validation.
 """
 from .project_models import ProjectCreate, ProjectResponse
-from .task_models import TaskCreate, TaskUpdate, TaskResponse
+from .task_models import TaskCreate, TaskUpdate, TaskResponse, TaskSearchResult
 from .request_models import (
     LockTaskRequest,
     CompleteTaskRequest,
@@ -20,6 +20,7 @@ __all__ = [
     "TaskCreate",
     "TaskUpdate",
     "TaskResponse",
+    "TaskSearchResult",
     "LockTaskRequest",
     "CompleteTaskRequest",
     "BulkCompleteRequest",
@@ -126,3 +126,9 @@ class TaskResponse(BaseModel):
     time_delta_hours: Optional[float]
     started_at: Optional[str]
 
+
+class TaskSearchResult(TaskResponse):
+    """Task search result with matches marked in <mark> tags."""
+    highlighted_title: Optional[str] = None
+    snippet: Optional[str] = None
+
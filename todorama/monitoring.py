@@ -231,12 +231,17 @@ def check_database_health(db) -> Dict[str, Any]:
             
             response_time_ms = round((time.time() - start_time) * 1000, 2)
             
-            return {
+            health = {
                 "status": "healthy",
                 "connectivity": "connected",
                 "response_time_ms": response_time_ms,
                 "type": getattr(db, 'db_type', 'unknown')
             }
+            if hasattr(db, 'adapter') and hasattr(db.adapter, 'get_pool_metrics'):
+                pool_metrics = db.adapter.get_pool_metrics()
+                if pool_metrics is not None:
+                    health["pool"] = pool_metrics
+            return health
         finally:
             if hasattr(db, 'adapter') and hasattr(db.adapter, 'close'):
                 db.adapter.close(conn)
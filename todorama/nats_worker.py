@@ -108,7 +108,6 @@ class TaskWorker(NATSWorker):
     async def _handle_webhook_delivery(self, data: Dict[str, Any]) -> None:
         """Handle webhook delivery message."""
         import httpx
-        from webhooks import notify_webhooks
         
         webhook_id = data.get("webhook_id")
         url = data.get("url")
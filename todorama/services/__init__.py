@@ -7,10 +7,11 @@ from todorama.services.task_service import TaskService
 from todorama.services.project_service import ProjectService
 from todorama.services.tag_service import TagService
 from todorama.services.import_service import ImportService
+from todorama.services.export_service import ExportService
 from todorama.services.attachment_service import AttachmentService
 from todorama.services.recurring_task_service import RecurringTaskService
 
-__all__ = ["TaskService", "ProjectService", "TagService", "ImportService", "AttachmentService", "RecurringTaskService"]
+__all__ = ["TaskService", "ProjectService", "TagService", "ImportService", "ExportService", "AttachmentService", "RecurringTaskService"]
 
 
 
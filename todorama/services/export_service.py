@@ -0,0 +1,113 @@
+"""
+Export service - business logic for task export operations.
+This layer contains no HTTP framework dependencies.
+Serializes tasks to JSON, NDJSON or CSV as a stream of text chunks.
+"""
+import csv
+import io
+import json
+import logging
+from typing import Dict, Any, Iterator, List, Optional
+
+from todorama.database import TodoDatabase
+
+logger = logging.getLogger(__name__)
+
+# format -> (media type, download file name)
+EXPORT_FORMATS = {
+    "json": ("application/json", "tasks.json"),
+    "ndjson": ("application/x-ndjson", "tasks.ndjson"),
+    "csv": ("text/csv", "tasks.csv"),
+}
+
+# CSV columns holding lists; written as JSON so they fit in one cell
+_CSV_JSON_COLUMNS = ("relationships", "tags")
+
+
+class ExportService:
+    """Service for task export business logic."""
+
+    def __init__(self, db: TodoDatabase):
+        """Initialize export service with database dependency."""
+        self.db = db
+
+    def stream_tasks(
+        self,
+        format: str,
+        task_type: Optional[str] = None,
+        task_status: Optional[str] = None,
+        project_id: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None
+    ) -> Iterator[str]:
+        """
+        Stream an export of tasks, with relationships and tags.
+
+        The database is read one chunk at a time and each chunk is
+        serialized to a single string, so memory stays constant however many
+        tasks are exported.
+
+        Args:
+            format: "json" ({"tasks": [...]}), "ndjson" (one task per line) or "csv"
+            task_type: Filter by task type
+            task_status: Filter by task status
+            project_id: Filter by project ID
+            start_date: Filter by start date (ISO format)
+            end_date: Filter by end date (ISO format)
+            limit: Optional maximum number of tasks (None for all)
+
+        Returns:
+            Iterator of text chunks
+
+        Raises:
+            ValueError: If format is not supported
+        """
+        serializers = {"json": _json_chunks, "ndjson": _ndjson_chunks, "csv": _csv_chunks}
+        if format not in serializers:
+            raise ValueError(f"Unsupported format: {format}")
+        chunks = self.db.iter_export_tasks(
+            task_type=task_type,
+            task_status=task_status,
+            project_id=project_id,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+        return serializers[format](chunks)
+
+
+def _dumps(task: Dict[str, Any]) -> str:
+    return json.dumps(task, default=str)
+
+
+def _json_chunks(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    yield '{"tasks": ['
+    separator = ""
+    for tasks in chunks:
+        yield separator + ",".join(_dumps(task) for task in tasks)
+        separator = ","
+    yield "]}"
+
+
+def _ndjson_chunks(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    for tasks in chunks:
+        yield "".join(_dumps(task) + "\n" for task in tasks)
+
+
+def _csv_chunks(chunks: Iterator[List[Dict[str, Any]]]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = None
+    for tasks in chunks:
+        for task in tasks:
+            row = dict(task)
+            for column in _CSV_JSON_COLUMNS:
+                if column in row:
+                    row[column] = json.dumps(row[column], default=str)
+            if writer is None:
+                writer = csv.DictWriter(buffer, fieldnames=list(row.keys()), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow(row)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
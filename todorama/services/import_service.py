@@ -2,18 +2,53 @@
 Import service - business logic for task import operations.
 This layer contains no HTTP framework dependencies.
 Handles JSON/CSV parsing, validation, duplicate detection, and relationship creation.
+
+Rows are validated first, then written in chunks of IMPORT_CHUNK_SIZE with
+bulk_create_tasks() (one transaction per chunk) and relationships with
+bulk_create_relationships(). Duplicate detection loads the existing titles of
+each target project once into a set instead of searching per row.
 """
 import csv
 import io
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 
 from todorama.database import TodoDatabase
+from todorama.storage.dependency_graph import BLOCKING_RELATIONSHIP_TYPES
 
 logger = logging.getLogger(__name__)
 
+# Tasks written per transaction
+IMPORT_CHUNK_SIZE = 1000
+
+# Called after each chunk with (tasks processed, total tasks to create)
+ProgressCallback = Callable[[int, int], None]
+
+
+class _ExistingTitles:
+    """Titles of existing and already queued tasks, loaded once per project."""
+    
+    def __init__(self, db: TodoDatabase):
+        self.db = db
+        self._titles: Dict[Optional[int], Set[str]] = {}
+        self._queued: List[Tuple[Optional[int], str]] = []
+    
+    def contains(self, project_id: Optional[int], title: str) -> bool:
+        if project_id not in self._titles:
+            # project_id None matches tasks in any project
+            titles = self.db.get_task_titles(project_id)
+            titles.update(t for p, t in self._queued if project_id is None or p == project_id)
+            self._titles[project_id] = titles
+        return title in self._titles[project_id]
+    
+    def add(self, project_id: Optional[int], title: str) -> None:
+        self._queued.append((project_id, title))
+        for loaded_project_id, titles in self._titles.items():
+            if loaded_project_id is None or loaded_project_id == project_id:
+                titles.add(title)
+
 
 class ImportService:
     """Service for task import business logic."""
@@ -27,7 +62,8 @@ class ImportService:
         tasks: List[Dict[str, Any]],
         agent_id: str,
         project_id: Optional[int] = None,
-        handle_duplicates: str = "error"
+        handle_duplicates: str = "error",
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
         Import tasks from JSON format.
@@ -37,6 +73,7 @@ class ImportService:
             agent_id: Agent ID for task creation
             project_id: Optional project ID (can be overridden per task)
             handle_duplicates: "skip" to skip duplicates, "error" to raise errors
+            progress: Optional callback(processed, total) run after each chunk
             
         Returns:
             Dictionary with import results:
@@ -57,10 +94,13 @@ class ImportService:
         errors = []
         import_id_map = {}  # Map import_id to task_id for relationship creation
         seen_titles = set()  # Track titles seen in this import batch
+        existing_titles = _ExistingTitles(self.db)
+        pending = []  # (task_data, create_task arguments) of rows to create
         
         for task_data in tasks:
             try:
                 title = task_data.get("title", "").strip()
+                target_project_id = project_id or task_data.get("project_id")
                 
                 # Check for duplicates if handle_duplicates is "skip"
                 if handle_duplicates == "skip":
@@ -70,17 +110,9 @@ class ImportService:
                         continue
                     
                     # Then check against existing tasks in database
-                    if title:
-                        existing = self.db.query_tasks(
-                            search=title,
-                            project_id=project_id or task_data.get("project_id"),
-                            limit=10
-                        )
-                        # Filter to exact title match
-                        exact_match = [t for t in existing if t.get("title", "").strip() == title]
-                        if exact_match:
-                            skipped.append({"title": title, "reason": "duplicate"})
-                            continue
+                    if title and existing_titles.contains(target_project_id, title):
+                        skipped.append({"title": title, "reason": "duplicate"})
+                        continue
                     
                     # Mark this title as seen
                     seen_titles.add(title)
@@ -97,29 +129,33 @@ class ImportService:
                     except (ValueError, AttributeError):
                         pass
                 
-                task_id = self.db.create_task(
+                pending.append((task_data, dict(
                     title=task_data["title"],
                     task_type=task_data["task_type"],
                     task_instruction=task_data["task_instruction"],
                     verification_instruction=task_data["verification_instruction"],
-                    agent_id=agent_id,
-                    project_id=project_id or task_data.get("project_id"),
+                    project_id=target_project_id,
                     priority=task_data.get("priority"),
                     estimated_hours=task_data.get("estimated_hours"),
                     notes=task_data.get("notes"),
                     due_date=due_date_obj
-                )
-                imported.append(task_id)
-                
-                # Store import_id mapping for relationship creation
-                if task_data.get("import_id"):
-                    import_id_map[task_data["import_id"]] = task_id
-                    
+                )))
             except Exception as e:
                 logger.error(f"Failed to import task '{task_data.get('title', 'Unknown')}': {str(e)}", exc_info=True)
                 errors.append({"task": task_data.get("title", "Unknown"), "error": str(e)})
         
+        task_ids = self._create_tasks([kwargs for _, kwargs in pending], agent_id, errors, "task", progress)
+        for (task_data, _), task_id in zip(pending, task_ids):
+            if task_id is None:
+                continue
+            imported.append(task_id)
+            
+            # Store import_id mapping for relationship creation
+            if task_data.get("import_id"):
+                import_id_map[task_data["import_id"]] = task_id
+        
         # Create relationships if import_id and parent_import_id are provided
+        relationships = []
         for task_data in tasks:
             if task_data.get("parent_import_id") and task_data.get("import_id"):
                 parent_id = import_id_map.get(task_data["parent_import_id"])
@@ -127,17 +163,26 @@ class ImportService:
                 relationship_type = task_data.get("relationship_type", "subtask")
                 
                 if parent_id and child_id:
-                    try:
-                        self.db.create_relationship(
-                            parent_task_id=parent_id,
-                            child_task_id=child_id,
-                            relationship_type=relationship_type,
-                            agent_id=agent_id
-                        )
-                    except Exception as e:
-                        # Relationship creation failed, but task was created
-                        logger.error(f"Failed to create relationship {parent_id}->{child_id}: {str(e)}", exc_info=True)
-                        errors.append({"relationship": f"{parent_id}->{child_id}", "error": str(e)})
+                    relationships.append((parent_id, child_id, relationship_type))
+        
+        # Validate all blocking edges for circular dependencies in one pass before creating any
+        blocking = [rel for rel in relationships if rel[2] in BLOCKING_RELATIONSHIP_TYPES]
+        cycles = dict(zip(blocking, self.db.check_circular_dependencies(blocking))) if blocking else {}
+        valid = []
+        for parent_id, child_id, relationship_type in relationships:
+            cycle = cycles.get((parent_id, child_id, relationship_type))
+            if cycle:
+                errors.append({
+                    "relationship": f"{parent_id}->{child_id}",
+                    "error": (
+                        f"Circular dependency detected: Cannot create {relationship_type} relationship "
+                        f"from task {parent_id} to task {child_id} "
+                        f"(cycle: {' -> '.join(str(task_id) for task_id in cycle)})."
+                    )
+                })
+                continue
+            valid.append((parent_id, child_id, relationship_type))
+        self._create_relationships(valid, agent_id, errors)
         
         return {
             "success": True,
@@ -157,7 +202,8 @@ class ImportService:
         agent_id: str,
         project_id: Optional[int] = None,
         handle_duplicates: str = "error",
-        field_mapping: Optional[Dict[str, str]] = None
+        field_mapping: Optional[Dict[str, str]] = None,
+        progress: Optional[ProgressCallback] = None
     ) -> Dict[str, Any]:
         """
         Import tasks from CSV format.
@@ -169,6 +215,7 @@ class ImportService:
             handle_duplicates: "skip" to skip duplicates, "error" to raise errors
             field_mapping: Optional mapping from CSV column names to task fields
                           e.g., {"title": "Task Title", "task_type": "Type"}
+            progress: Optional callback(processed, total) run after each chunk
             
         Returns:
             Dictionary with import results:
@@ -187,9 +234,10 @@ class ImportService:
         csv_file = io.StringIO(csv_content)
         reader = csv.DictReader(csv_file)
         
-        imported = []
         skipped = []
         errors = []
+        existing_titles = _ExistingTitles(self.db)
+        pending = []  # create_task arguments of rows to create
         
         for row in reader:
             try:
@@ -223,16 +271,12 @@ class ImportService:
                 
                 # Check for duplicates if handle_duplicates is "skip"
                 if handle_duplicates == "skip" and title:
-                    existing = self.db.query_tasks(
-                        search=title,
-                        project_id=project_id or (int(mapped_row["project_id"]) if mapped_row.get("project_id") else None),
-                        limit=10
-                    )
-                    # Filter to exact title match
-                    exact_match = [t for t in existing if t.get("title", "").strip() == title]
-                    if exact_match:
+                    duplicate_project_id = project_id or (int(mapped_row["project_id"]) if mapped_row.get("project_id") else None)
+                    if existing_titles.contains(duplicate_project_id, title):
                         skipped.append({"title": title, "reason": "duplicate"})
                         continue
+                    # Later rows with the same title are duplicates of this one
+                    existing_titles.add(duplicate_project_id, title)
                 
                 # Parse optional fields
                 parsed_project_id = project_id
@@ -256,23 +300,24 @@ class ImportService:
                     except (ValueError, AttributeError):
                         pass
                 
-                task_id = self.db.create_task(
+                pending.append(dict(
                     title=title,
                     task_type=task_type,
                     task_instruction=task_instruction,
                     verification_instruction=verification_instruction,
-                    agent_id=agent_id,
                     project_id=parsed_project_id,
                     priority=mapped_row.get("priority"),
                     estimated_hours=parsed_estimated_hours,
                     notes=mapped_row.get("notes"),
                     due_date=parsed_due_date
-                )
-                imported.append(task_id)
+                ))
             except Exception as e:
                 logger.error(f"Failed to import CSV row '{row.get('title', 'Unknown')}': {str(e)}", exc_info=True)
                 errors.append({"row": row.get("title", "Unknown"), "error": str(e)})
         
+        task_ids = self._create_tasks(pending, agent_id, errors, "row", progress)
+        imported = [task_id for task_id in task_ids if task_id is not None]
+        
         return {
             "success": True,
             "created": len(imported),
@@ -284,3 +329,68 @@ class ImportService:
             "skipped_tasks": skipped,
             "errors": errors
         }
+    
+    def _create_tasks(
+        self,
+        pending: List[Dict[str, Any]],
+        agent_id: str,
+        errors: List[Dict[str, Any]],
+        error_key: str,
+        progress: Optional[ProgressCallback] = None
+    ) -> List[Optional[int]]:
+        """
+        Create tasks one transaction per chunk.
+        
+        A chunk that fails as a whole (e.g. one row violates a constraint) is
+        rolled back and retried row by row, so only the offending rows are
+        reported in errors under error_key.
+        
+        Returns:
+            Task IDs aligned with pending, None where creation failed
+        """
+        task_ids: List[Optional[int]] = []
+        total = len(pending)
+        for start in range(0, total, IMPORT_CHUNK_SIZE):
+            chunk = pending[start:start + IMPORT_CHUNK_SIZE]
+            try:
+                task_ids.extend(self.db.bulk_create_tasks(chunk, agent_id))
+            except Exception as e:
+                logger.warning(f"Bulk insert of {len(chunk)} imported tasks failed ({e}); retrying row by row")
+                for kwargs in chunk:
+                    try:
+                        task_ids.append(self.db.create_task(agent_id=agent_id, **kwargs))
+                    except Exception as row_error:
+                        logger.error(f"Failed to import task '{kwargs.get('title', 'Unknown')}': {str(row_error)}", exc_info=True)
+                        errors.append({error_key: kwargs.get("title", "Unknown"), "error": str(row_error)})
+                        task_ids.append(None)
+            processed = start + len(chunk)
+            logger.info(f"Imported {processed}/{total} tasks")
+            if progress:
+                progress(processed, total)
+        return task_ids
+    
+    def _create_relationships(
+        self,
+        relationships: List[Tuple[int, int, str]],
+        agent_id: str,
+        errors: List[Dict[str, Any]]
+    ) -> None:
+        """Create validated relationships one transaction per chunk, retrying a failed chunk row by row."""
+        for start in range(0, len(relationships), IMPORT_CHUNK_SIZE):
+            chunk = relationships[start:start + IMPORT_CHUNK_SIZE]
+            try:
+                self.db.bulk_create_relationships(chunk, agent_id)
+            except Exception as e:
+                logger.warning(f"Bulk insert of {len(chunk)} imported relationships failed ({e}); retrying row by row")
+                for parent_id, child_id, relationship_type in chunk:
+                    try:
+                        self.db.create_relationship(
+                            parent_task_id=parent_id,
+                            child_task_id=child_id,
+                            relationship_type=relationship_type,
+                            agent_id=agent_id
+                        )
+                    except Exception as row_error:
+                        # Relationship creation failed, but task was created
+                        logger.error(f"Failed to create relationship {parent_id}->{child_id}: {str(row_error)}", exc_info=True)
+                        errors.append({"relationship": f"{parent_id}->{child_id}", "error": str(row_error)})
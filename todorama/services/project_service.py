@@ -10,6 +10,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, UTC
 
 from todorama.database import TodoDatabase
+from todorama.webhooks import notify_webhooks
 from todorama.storage import ProjectRepository, OrganizationRepository
 from todorama.models.project_models import ProjectCreate
 
@@ -111,8 +112,7 @@ class ProjectService:
         """Dispatch all notifications for project creation (webhooks, Slack, etc.)."""
         # Send webhook notifications
         try:
-            from webhooks import notify_webhooks
-            asyncio.create_task(notify_webhooks(
+            notify_webhooks(
                 self.db,
                 project_id=project_id,
                 event_type="project.created",
@@ -121,7 +121,7 @@ class ProjectService:
                     "project": project_data,
                     "timestamp": datetime.now(UTC).isoformat()
                 }
-            ))
+            )
         except Exception as e:
             logger.warning(f"Failed to dispatch webhook notification: {e}")
         
@@ -9,6 +9,7 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, UTC
 
 from todorama.database import TodoDatabase
+from todorama.webhooks import notify_webhooks
 from todorama.storage import TaskRepository, ProjectRepository
 from todorama.models.task_models import TaskCreate, TaskUpdate, TaskResponse
 
@@ -140,8 +141,7 @@ class TaskService:
         """Dispatch all notifications for task creation (webhooks, Slack, etc.)."""
         # Send webhook notifications
         try:
-            from webhooks import notify_webhooks
-            asyncio.create_task(notify_webhooks(
+            notify_webhooks(
                 self.db,
                 project_id=project_id,
                 event_type="task.created",
@@ -150,7 +150,7 @@ class TaskService:
                     "task": task_data,
                     "timestamp": datetime.now(UTC).isoformat()
                 }
-            ))
+            )
         except Exception as e:
             logger.warning(f"Failed to dispatch webhook notification: {e}")
         
@@ -212,13 +212,15 @@ class TaskService:
         completed_after: Optional[str] = None,
         completed_before: Optional[str] = None,
         search: Optional[str] = None,
-        organization_id: Optional[int] = None
+        organization_id: Optional[int] = None,
+        after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Query tasks with filters including advanced date range and text search.
         
         Args:
             organization_id: Optional organization ID for tenant isolation
+            after: Optional cursor from a previous page (keyset pagination)
         
         Returns:
             List of task dictionaries
@@ -246,7 +248,8 @@ class TaskService:
                 completed_after=completed_after,
                 completed_before=completed_before,
                 search=search,
-                organization_id=organization_id
+                organization_id=organization_id,
+                after=after
             )
         # For simpler queries, use repository
         return self.task_repository.list(
@@ -258,6 +261,61 @@ class TaskService:
             organization_id=organization_id,
             limit=limit,
             order_by=order_by,
+            after=after,
+        )
+    
+    def query_tasks_page(
+        self,
+        task_type: Optional[str] = None,
+        task_status: Optional[str] = None,
+        assigned_agent: Optional[str] = None,
+        project_id: Optional[int] = None,
+        priority: Optional[str] = None,
+        tag_id: Optional[int] = None,
+        tag_ids: Optional[List[int]] = None,
+        order_by: Optional[str] = None,
+        limit: int = 100,
+        created_after: Optional[str] = None,
+        created_before: Optional[str] = None,
+        updated_after: Optional[str] = None,
+        updated_before: Optional[str] = None,
+        completed_after: Optional[str] = None,
+        completed_before: Optional[str] = None,
+        search: Optional[str] = None,
+        organization_id: Optional[int] = None,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Query one keyset-paginated page of tasks.
+        
+        Args:
+            after: Cursor from the previous page (None for the first page)
+        
+        Returns:
+            Dictionary with tasks, next_cursor (None on the last page) and has_more
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        return self.db.query_tasks_page(
+            task_type=task_type,
+            task_status=task_status,
+            assigned_agent=assigned_agent,
+            project_id=project_id,
+            priority=priority,
+            tag_id=tag_id,
+            tag_ids=tag_ids,
+            order_by=order_by,
+            limit=limit,
+            created_after=created_after,
+            created_before=created_before,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            completed_after=completed_after,
+            completed_before=completed_before,
+            search=search,
+            organization_id=organization_id,
+            after=after
         )
     
     def search_tasks(self, query: str, limit: int = 100, organization_id: Optional[int] = None) -> List[Dict[str, Any]]:
@@ -309,7 +367,8 @@ class TaskService:
         agent_id: Optional[str] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        limit: int = 1000
+        limit: int = 1000,
+        after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         Get activity feed showing all task updates, completions, and relationship changes
@@ -321,6 +380,7 @@ class TaskService:
             start_date: Optional start date filter (ISO format string)
             end_date: Optional end date filter (ISO format string)
             limit: Maximum number of results
+            after: Optional cursor from a previous page (keyset pagination)
             
         Returns:
             List of activity entries in chronological order
@@ -330,7 +390,35 @@ class TaskService:
             agent_id=agent_id,
             start_date=start_date,
             end_date=end_date,
-            limit=limit
+            limit=limit,
+            after=after
+        )
+    
+    def get_activity_feed_page(
+        self,
+        task_id: Optional[int] = None,
+        agent_id: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 1000,
+        after: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Get one keyset-paginated page of the activity feed, oldest first.
+        
+        Returns:
+            Dictionary with feed, next_cursor (None on the last page) and has_more
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        return self.db.get_activity_feed_page(
+            task_id=task_id,
+            agent_id=agent_id,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            after=after
         )
     
     def get_task_relationships(self, task_id: int, relationship_type: Optional[str] = None, organization_id: Optional[int] = None) -> List[Dict[str, Any]]:
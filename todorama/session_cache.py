@@ -0,0 +1,153 @@
+"""
+In-memory LRU cache for session token lookups.
+
+verify_session_token() looks the session up on every request. SessionCache
+keeps recently used sessions in memory, bounded by size, and never serves a
+session past its expires_at: each entry is valid until the earlier of its TTL
+and the session's own expiry. When the cache is full, expired entries are
+evicted before the least recently used ones. Entries are dropped explicitly
+when a session is expired or deleted.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+def _seconds_until(expires_at: Any) -> Optional[float]:
+    """Seconds from now (UTC, like CURRENT_TIMESTAMP) until expires_at, or None if unparseable."""
+    if isinstance(expires_at, str):
+        try:
+            expires_at = datetime.fromisoformat(expires_at)
+        except ValueError:
+            return None
+    if not isinstance(expires_at, datetime):
+        return None
+    if expires_at.tzinfo is not None:
+        expires_at = datetime.utcfromtimestamp(expires_at.timestamp())
+    return (expires_at - datetime.utcnow()).total_seconds()
+
+
+class SessionCache:
+    """Thread-safe, size-bounded LRU cache of active sessions keyed by token."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of sessions kept in memory
+            ttl: Maximum seconds an entry is served without re-reading the database
+                (0 or less disables caching)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # session_token -> (valid_until, session), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._metrics = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        """Whether entries are cached at all."""
+        return self.ttl > 0 and self.max_size > 0
+
+    def get(self, session_token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached session.
+
+        Args:
+            session_token: Session token
+
+        Returns:
+            Copy of the cached session, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(session_token)
+            if entry is None:
+                self._metrics["misses"] += 1
+                return None
+            valid_until, session = entry
+            if valid_until <= time.monotonic():
+                del self._entries[session_token]
+                self._metrics["expired"] += 1
+                self._metrics["misses"] += 1
+                return None
+            self._entries.move_to_end(session_token)
+            self._metrics["hits"] += 1
+            return dict(session)
+
+    def put(self, session_token: str, session: Dict[str, Any]) -> None:
+        """
+        Cache a session until the earlier of the TTL and its expires_at.
+
+        Args:
+            session_token: Session token
+            session: Session dictionary (as returned by get_session_by_token)
+        """
+        if not self.enabled:
+            return
+        lifetime = self.ttl
+        remaining = _seconds_until(session.get("expires_at"))
+        if remaining is not None:
+            lifetime = min(lifetime, remaining)
+        if lifetime <= 0:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            self._entries[session_token] = (now + lifetime, dict(session))
+            self._entries.move_to_end(session_token)
+            if len(self._entries) > self.max_size:
+                self._evict(now)
+
+    def invalidate(self, session_token: Optional[str] = None) -> None:
+        """
+        Drop cached sessions.
+
+        Args:
+            session_token: Session token to drop, or None to clear the whole cache
+        """
+        with self._lock:
+            self._metrics["invalidations"] += 1
+            if session_token is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(session_token, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop all cached sessions of a user.
+
+        Args:
+            user_id: User ID
+        """
+        with self._lock:
+            self._metrics["invalidations"] += 1
+            for session_token in [token for token, (_, session) in self._entries.items()
+                                  if session.get("user_id") == user_id]:
+                del self._entries[session_token]
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._entries)
+            return metrics
+
+    def _evict(self, now: float) -> None:
+        """Evict expired entries first, then the least recently used (caller holds the lock)."""
+        for session_token in [token for token, (valid_until, _) in self._entries.items()
+                              if valid_until <= now]:
+            del self._entries[session_token]
+            self._metrics["evictions"] += 1
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._metrics["evictions"] += 1
@@ -10,6 +10,9 @@ from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime, timedelta, timezone as dt_timezone
 import time
 
+from todorama.storage.task_aggregates import TaskAggregateCache, load_task_aggregates
+from todorama.storage.task_counters import load_task_counters
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,7 +25,9 @@ class AnalyticsRepository:
         get_connection: Callable[[], Any],
         adapter: Any,
         execute_insert: Callable[[Any, str, tuple], int],
-        execute_with_logging: Callable[[Any, str, tuple], Any]
+        execute_with_logging: Callable[[Any, str, tuple], Any],
+        aggregate_cache: Optional[TaskAggregateCache] = None,
+        task_counters: bool = False
     ):
         """
         Initialize AnalyticsRepository.
@@ -33,12 +38,16 @@ class AnalyticsRepository:
             adapter: Database adapter (for closing connections)
             execute_insert: Function to execute INSERT queries and return ID
             execute_with_logging: Function to execute queries with logging
+            aggregate_cache: Optional short-TTL cache for grouped task counts
+            task_counters: Whether the trigger-maintained task_counters rollup is installed
         """
         self.db_type = db_type
         self._get_connection = get_connection
         self.adapter = adapter
         self._execute_insert = execute_insert
         self._execute_with_logging = execute_with_logging
+        self._aggregate_cache = aggregate_cache
+        self._task_counters = task_counters
     
     def get_change_history(
         self,
@@ -307,62 +316,17 @@ class AnalyticsRepository:
                 conditions.append("task_type = ?")
                 params.append(task_type)
             
-            where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-            
-            # Get total tasks
-            cursor.execute(f"SELECT COUNT(*) as count FROM tasks{where_clause}", params)
-            total_tasks = cursor.fetchone()["count"]
-            
-            # Get completed tasks
-            completed_params = params + ["complete"]
-            if where_clause:
-                completed_query = f"SELECT COUNT(*) as count FROM tasks{where_clause} AND task_status = ?"
+            if self._task_counters:
+                aggregates = load_task_counters(
+                    cursor, project_id=project_id or None, task_type=task_type,
+                    execute=self._execute_with_logging
+                )
             else:
-                completed_query = "SELECT COUNT(*) as count FROM tasks WHERE task_status = ?"
-            cursor.execute(completed_query, completed_params)
-            completed_tasks = cursor.fetchone()["count"]
-            
-            # Calculate percentage
-            completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
-            
-            # Get status breakdown
-            status_params = params + []
-            cursor.execute(
-                f"""
-                SELECT task_status, COUNT(*) as count 
-                FROM tasks{where_clause}
-                GROUP BY task_status
-                """,
-                status_params if where_clause else []
-            )
-            status_breakdown = {row["task_status"]: row["count"] for row in cursor.fetchall()}
-            
-            # Get type breakdown
-            type_params = params + []
-            cursor.execute(
-                f"""
-                SELECT task_type, COUNT(*) as count,
-                       SUM(CASE WHEN task_status = 'complete' THEN 1 ELSE 0 END) as completed
-                FROM tasks{where_clause}
-                GROUP BY task_type
-                """,
-                type_params if where_clause else []
-            )
-            tasks_by_type = {}
-            for row in cursor.fetchall():
-                tasks_by_type[row["task_type"]] = {
-                    "total": row["count"],
-                    "completed": row["completed"],
-                    "completion_percentage": (row["completed"] / row["count"] * 100) if row["count"] > 0 else 0.0
-                }
-            
-            return {
-                "total_tasks": total_tasks,
-                "completed_tasks": completed_tasks,
-                "completion_percentage": round(completion_percentage, 2),
-                "status_breakdown": status_breakdown,
-                "tasks_by_type": tasks_by_type
-            }
+                aggregates = load_task_aggregates(
+                    cursor, conditions, params,
+                    execute=self._execute_with_logging, cache=self._aggregate_cache
+                )
+            return aggregates.completion_rates()
         finally:
             self.adapter.close(conn)
     
@@ -776,31 +740,11 @@ class AnalyticsRepository:
                 conditions.append("DATE(created_at) <= DATE(?)")
                 params.append(end_date)
             
-            where_clause = " WHERE " + " AND ".join(conditions) if conditions else ""
-            
-            # Status distribution
-            cursor.execute(
-                f"""
-                SELECT task_status, COUNT(*) as count
-                FROM tasks
-                {where_clause}
-                GROUP BY task_status
-                """,
-                params if where_clause else []
+            # Status, type and priority distributions from one grouped pass
+            aggregates = load_task_aggregates(
+                cursor, conditions, params,
+                execute=self._execute_with_logging, cache=self._aggregate_cache
             )
-            status_distribution = {row["task_status"]: row["count"] for row in cursor.fetchall()}
-            
-            # Type distribution
-            cursor.execute(
-                f"""
-                SELECT task_type, COUNT(*) as count
-                FROM tasks
-                {where_clause}
-                GROUP BY task_type
-                """,
-                params if where_clause else []
-            )
-            type_distribution = {row["task_type"]: row["count"] for row in cursor.fetchall()}
             
             # Completion timeline (by day)
             timeline_conditions = ["completed_at IS NOT NULL"]
@@ -835,24 +779,9 @@ class AnalyticsRepository:
                 for row in cursor.fetchall()
             ]
             
-            # Priority distribution
-            cursor.execute(
-                f"""
-                SELECT priority, COUNT(*) as count
-                FROM tasks
-                {where_clause}
-                GROUP BY priority
-                """,
-                params if where_clause else []
-            )
-            priority_distribution = {row["priority"]: row["count"] for row in cursor.fetchall()}
-            
-            return {
-                "status_distribution": status_distribution,
-                "type_distribution": type_distribution,
-                "priority_distribution": priority_distribution,
-                "completion_timeline": completion_timeline
-            }
+            result = aggregates.distributions()
+            result["completion_timeline"] = completion_timeline
+            return result
         finally:
             self.adapter.close(conn)
     
@@ -866,6 +795,10 @@ class AnalyticsRepository:
         """
         Get aggregated statistics about tasks.
         
+        Without date filters the counts are read from the task_counters
+        rollup (see todorama/storage/task_counters.py); date-filtered calls
+        make one grouped pass over tasks (todorama/storage/task_aggregates.py).
+        
         Args:
             project_id: Optional project filter
             task_type: Optional task type filter
@@ -896,63 +829,19 @@ class AnalyticsRepository:
                 conditions.append("created_at <= ?")
                 params.append(end_date)
             
-            where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
-            
-            # Total count
-            cursor.execute(f"SELECT COUNT(*) FROM tasks {where_clause}", params)
-            total = cursor.fetchone()[0]
-            
-            # Counts by status
-            status_counts = {}
-            for status in ["available", "in_progress", "complete", "blocked", "cancelled"]:
-                status_params = params + [status]
-                if conditions:
-                    status_where = f"{where_clause} AND task_status = ?"
-                else:
-                    status_where = "WHERE task_status = ?"
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM tasks {status_where}",
-                    status_params
+            if self._task_counters and not (start_date or end_date):
+                aggregates = load_task_counters(
+                    cursor, project_id=project_id, task_type=task_type,
+                    execute=self._execute_with_logging
                 )
-                status_counts[status] = cursor.fetchone()[0]
-            
-            # Counts by task_type
-            type_counts = {}
-            for task_type_val in ["concrete", "abstract", "epic"]:
-                type_params = params + [task_type_val]
-                if conditions:
-                    type_where = f"{where_clause} AND task_type = ?"
-                else:
-                    type_where = "WHERE task_type = ?"
-                cursor.execute(
-                    f"SELECT COUNT(*) FROM tasks {type_where}",
-                    type_params
+            else:
+                aggregates = load_task_aggregates(
+                    cursor, conditions, params,
+                    execute=self._execute_with_logging, cache=self._aggregate_cache
                 )
-                type_counts[task_type_val] = cursor.fetchone()[0]
-            
-            # Counts by project (if not filtering by project)
-            project_counts = {}
-            if project_id is None:
-                cursor.execute("SELECT project_id, COUNT(*) FROM tasks GROUP BY project_id")
-                for row in cursor.fetchall():
-                    proj_id = row[0]
-                    count = row[1]
-                    project_counts[proj_id] = count
-            
-            # Completion rate
-            completion_rate = 0.0
-            if total > 0:
-                completion_rate = (status_counts.get("complete", 0) / total) * 100
-            
-            return {
-                "total": total,
-                "by_status": status_counts,
-                "by_type": type_counts,
-                "by_project": project_counts if project_id is None else {project_id: total},
-                "completion_rate": round(completion_rate, 2)
-            }
+            return aggregates.task_statistics(project_id)
         finally:
-            conn.close()
+            self.adapter.close(conn)
     
     def get_recent_completions(
         self,
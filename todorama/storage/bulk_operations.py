@@ -3,40 +3,162 @@ Repository for bulk task operations.
 
 This module extracts bulk operation-related database operations from TodoDatabase
 to improve separation of concerns and maintainability.
+
+Every operation is set-based: one SELECT reads the current state of all
+requested tasks, one UPDATE (or DELETE) ... WHERE id IN (...) changes the
+eligible ones, and one executemany writes their change_history rows, all in a
+single write transaction. Completing tasks then auto-completes parents in one
+pass per hierarchy level over the affected parent set. Tasks that are missing
+or not eligible are still reported individually in failed_task_ids.
 """
 import logging
-from typing import Optional, List, Dict, Any, Callable
+from contextlib import AbstractContextManager
+from typing import Optional, List, Dict, Any, Callable, Iterable, Iterator, Set
 
 logger = logging.getLogger(__name__)
 
+# IDs bound per IN (...) list, below SQLite's historical limit of 999 parameters
+ID_BATCH_SIZE = 500
+
+TASK_STATUSES = ["available", "in_progress", "complete", "blocked", "cancelled"]
+
+
+def _batches(ids: List[int], size: int = ID_BATCH_SIZE) -> Iterator[List[int]]:
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def _placeholders(ids: List[int]) -> str:
+    return ",".join("?" for _ in ids)
+
 
 class BulkOperations:
     """Repository for bulk task operations."""
-    
+
     def __init__(
         self,
         db_type: str,
-        get_connection: Callable[[], Any],
-        adapter: Any,
+        write_transaction: Callable[[], AbstractContextManager],
         execute_with_logging: Callable[[Any, str, tuple], Any],
-        check_and_auto_complete_parents: Callable[[int, str], None]
+        normalize_sql: Callable[[str], str]
     ):
         """
         Initialize BulkOperations.
-        
+
         Args:
             db_type: Database type ('sqlite' or 'postgresql')
-            get_connection: Function to get database connection
-            adapter: Database adapter (for closing connections)
+            write_transaction: Function returning a context manager that yields a
+                               connection inside a write transaction
             execute_with_logging: Function to execute queries with logging
-            check_and_auto_complete_parents: Function to check and auto-complete parent tasks
+            normalize_sql: Function adapting a query to the database backend
         """
         self.db_type = db_type
-        self._get_connection = get_connection
-        self.adapter = adapter
+        self._write_transaction = write_transaction
         self._execute_with_logging = execute_with_logging
-        self._check_and_auto_complete_parents = check_and_auto_complete_parents
-    
+        self._normalize_sql = normalize_sql
+
+    def _executemany(self, cursor: Any, query: str, rows: List[tuple]) -> None:
+        if rows:
+            cursor.executemany(self._normalize_sql(query), rows)
+
+    def _load(self, cursor: Any, columns: str, task_ids: List[int]) -> Dict[int, Any]:
+        """Read the given columns of the requested tasks, keyed by ID."""
+        rows = {}
+        for batch in _batches(task_ids):
+            self._execute_with_logging(
+                cursor,
+                f"SELECT id, {columns} FROM tasks WHERE id IN ({_placeholders(batch)})",
+                tuple(batch)
+            )
+            rows.update((row["id"], row) for row in cursor.fetchall())
+        return rows
+
+    def _update(self, cursor: Any, query: str, params: tuple, task_ids: List[int]) -> Set[int]:
+        """
+        Run an UPDATE/DELETE whose WHERE clause ends with "id IN ({ids})" over task_ids.
+
+        Returns:
+            IDs of the rows changed. On SQLite the write transaction excludes other
+            writers, so the rows selected before the statement are exactly the rows
+            it changes; PostgreSQL reports them with RETURNING.
+        """
+        changed: Set[int] = set()
+        for batch in _batches(task_ids):
+            batch_query = query.format(ids=_placeholders(batch))
+            if self.db_type == "postgresql":
+                self._execute_with_logging(cursor, batch_query + " RETURNING id", params + tuple(batch))
+                changed.update(row["id"] for row in cursor.fetchall())
+            else:
+                self._execute_with_logging(cursor, batch_query, params + tuple(batch))
+                changed.update(batch)
+        return changed
+
+    def auto_complete_parents(
+        self,
+        cursor: Any,
+        completed_task_ids: Iterable[int],
+        agent_id: str
+    ) -> List[int]:
+        """
+        Auto-complete parents whose subtasks are now all complete, recursively.
+
+        Each hierarchy level costs one query to find the parents that became
+        complete, one UPDATE and one history insert, however many tasks were
+        completed. Runs inside the caller's write transaction.
+
+        Args:
+            cursor: Database cursor inside a write transaction
+            completed_task_ids: Tasks that were just completed
+            agent_id: Agent ID recorded in history for auto-completions
+
+        Returns:
+            IDs of the parents that were auto-completed
+        """
+        auto_completed: List[int] = []
+        frontier = sorted(set(completed_task_ids))
+        while frontier:
+            parents: Dict[int, str] = {}
+            for batch in _batches(frontier):
+                self._execute_with_logging(cursor, f"""
+                    SELECT p.id, p.task_status
+                    FROM tasks p
+                    WHERE p.id IN (
+                        SELECT parent_task_id FROM task_relationships
+                        WHERE relationship_type = 'subtask' AND child_task_id IN ({_placeholders(batch)})
+                    )
+                    AND p.task_status != 'complete'
+                    AND NOT EXISTS (
+                        SELECT 1 FROM task_relationships tr
+                        JOIN tasks c ON tr.child_task_id = c.id
+                        WHERE tr.parent_task_id = p.id AND tr.relationship_type = 'subtask'
+                          AND c.task_status != 'complete'
+                    )
+                """, tuple(batch))
+                parents.update((row["id"], row["task_status"]) for row in cursor.fetchall())
+            if not parents:
+                break
+
+            frontier = sorted(parents)
+            for batch in _batches(frontier):
+                self._execute_with_logging(cursor, f"""
+                    UPDATE tasks
+                    SET task_status = 'complete',
+                        completed_at = CURRENT_TIMESTAMP,
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE id IN ({_placeholders(batch)})
+                """, tuple(batch))
+            self._executemany(cursor, """
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
+                VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
+            """, [
+                (parent_id, agent_id, parents[parent_id], "Auto-completed: all subtasks are complete")
+                for parent_id in frontier
+            ])
+            for parent_id in frontier:
+                logger.info(f"Parent task {parent_id} auto-completed (all subtasks complete) by agent {agent_id}")
+            auto_completed.extend(frontier)
+        return auto_completed
+
     def complete_tasks(
         self,
         task_ids: List[int],
@@ -47,168 +169,68 @@ class BulkOperations:
     ) -> Dict[str, Any]:
         """
         Bulk complete multiple tasks.
-        
+
         Args:
             task_ids: List of task IDs to complete
             agent_id: Agent ID performing the operation
             notes: Optional notes for completion
             actual_hours: Optional actual hours worked
             require_all: If True, all tasks must succeed or none will be completed (transaction)
-        
+
         Returns:
             Dictionary with success status, completed count, and failed task IDs
-        
+
         Raises:
-            ValueError: If agent_id is missing or task_ids is empty
+            ValueError: If agent_id is missing or task_ids is empty, or (with
+                        require_all) if any task does not exist
         """
         if not agent_id:
             raise ValueError("agent_id is required for bulk operations")
         if not task_ids:
             raise ValueError("task_ids cannot be empty")
-        
-        conn = self._get_connection()
-        completed = []
-        failed = []
-        
-        try:
+        task_ids = list(dict.fromkeys(task_ids))
+
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                query = "BEGIN TRANSACTION"
-                self._execute_with_logging(cursor, query, None)
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Get current status
-                            query = "SELECT task_status, estimated_hours FROM tasks WHERE id = ?"
-                            params = (task_id,)
-                            self._execute_with_logging(cursor, query, params)
-                            current = cursor.fetchone()
-                            if not current:
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            old_status = current["task_status"]
-                            estimated_hours = current["estimated_hours"]
-                            
-                            # Calculate time_delta_hours
-                            time_delta_hours = None
-                            if actual_hours is not None and estimated_hours is not None:
-                                time_delta_hours = actual_hours - estimated_hours
-                            
-                            # Complete task
-                            query = """
-                                UPDATE tasks 
-                                SET task_status = 'complete',
-                                    completed_at = CURRENT_TIMESTAMP,
-                                    updated_at = CURRENT_TIMESTAMP,
-                                    notes = COALESCE(?, notes),
-                                    actual_hours = COALESCE(?, actual_hours),
-                                    time_delta_hours = COALESCE(?, time_delta_hours)
-                                WHERE id = ?
-                            """
-                            params = (notes, actual_hours, time_delta_hours, task_id)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} could not be completed")
-                            
-                            # Record in history
-                            query = """
-                                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
-                                VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
-                            """
-                            params = (task_id, agent_id, old_status, notes)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            completed.append(task_id)
-                            
-                            # Auto-complete parent tasks if all subtasks are complete
-                            self._check_and_auto_complete_parents(task_id, agent_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk complete failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk completed {len(completed)} tasks by agent {agent_id}")
-                    return {
-                        "success": True,
-                        "completed": len(completed),
-                        "failed": len(failed),
-                        "task_ids": completed,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: complete as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Get current status
-                        query = "SELECT task_status, estimated_hours FROM tasks WHERE id = ?"
-                        params = (task_id,)
-                        self._execute_with_logging(cursor, query, params)
-                        current = cursor.fetchone()
-                        if not current:
-                            failed.append(task_id)
-                            continue
-                        
-                        old_status = current["task_status"]
-                        estimated_hours = current["estimated_hours"]
-                        
-                        # Calculate time_delta_hours
-                        time_delta_hours = None
-                        if actual_hours is not None and estimated_hours is not None:
-                            time_delta_hours = actual_hours - estimated_hours
-                        
-                        # Complete task
-                        query = """
-                            UPDATE tasks 
-                            SET task_status = 'complete',
-                                completed_at = CURRENT_TIMESTAMP,
-                                updated_at = CURRENT_TIMESTAMP,
-                                notes = COALESCE(?, notes),
-                                actual_hours = COALESCE(?, actual_hours),
-                                time_delta_hours = COALESCE(?, time_delta_hours)
-                            WHERE id = ?
-                        """
-                        params = (notes, actual_hours, time_delta_hours, task_id)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        # Record in history
-                        query = """
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
-                            VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
-                        """
-                        params = (task_id, agent_id, old_status, notes)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        completed.append(task_id)
-                        
-                        # Auto-complete parent tasks if all subtasks are complete
-                        self._check_and_auto_complete_parents(task_id, agent_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to complete task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk completed {len(completed)} tasks (failed: {len(failed)}) by agent {agent_id}")
-                return {
-                    "success": True,
-                    "completed": len(completed),
-                    "failed": len(failed),
-                    "task_ids": completed,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
-    
+            current = self._load(cursor, "task_status", task_ids)
+            failed = [task_id for task_id in task_ids if task_id not in current]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} not found")
+
+            # time_delta_hours is actual - estimated per task; kept when either is unknown
+            changed = self._update(cursor, """
+                UPDATE tasks
+                SET task_status = 'complete',
+                    completed_at = CURRENT_TIMESTAMP,
+                    updated_at = CURRENT_TIMESTAMP,
+                    notes = COALESCE(?, notes),
+                    actual_hours = COALESCE(?, actual_hours),
+                    time_delta_hours = COALESCE(? - estimated_hours, time_delta_hours)
+                WHERE id IN ({ids})
+            """, (notes, actual_hours, actual_hours), [task_id for task_id in task_ids if task_id in current])
+            completed = [task_id for task_id in task_ids if task_id in changed]
+            failed = [task_id for task_id in task_ids if task_id not in changed]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} could not be completed")
+
+            # Record in history
+            self._executemany(cursor, """
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value, notes)
+                VALUES (?, ?, 'completed', 'task_status', ?, 'complete', ?)
+            """, [(task_id, agent_id, current[task_id]["task_status"], notes) for task_id in completed])
+
+            # Auto-complete parent tasks if all subtasks are complete
+            self.auto_complete_parents(cursor, completed, agent_id)
+
+        logger.info(f"Bulk completed {len(completed)} tasks (failed: {len(failed)}) by agent {agent_id}")
+        return {
+            "success": True,
+            "completed": len(completed),
+            "failed": len(failed),
+            "task_ids": completed,
+            "failed_task_ids": failed
+        }
+
     def assign_tasks(
         self,
         task_ids: List[int],
@@ -217,144 +239,68 @@ class BulkOperations:
     ) -> Dict[str, Any]:
         """
         Bulk assign (lock) multiple tasks to an agent.
-        
+
+        Only available tasks are assigned; others are reported as failed.
+
         Args:
             task_ids: List of task IDs to assign
             agent_id: Agent ID to assign tasks to
             require_all: If True, all tasks must succeed or none will be assigned (transaction)
-        
+
         Returns:
             Dictionary with success status, assigned count, and failed task IDs
-        
+
         Raises:
-            ValueError: If agent_id is missing or task_ids is empty
+            ValueError: If agent_id is missing or task_ids is empty, or (with
+                        require_all) if any task is missing or not available
         """
         if not agent_id:
             raise ValueError("agent_id is required for bulk operations")
         if not task_ids:
             raise ValueError("task_ids cannot be empty")
-        
-        conn = self._get_connection()
-        assigned = []
-        failed = []
-        
-        try:
+        task_ids = list(dict.fromkeys(task_ids))
+
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
-            
+            current = self._load(cursor, "task_status", task_ids)
             if require_all:
-                # Transaction mode: all or nothing
-                query = "BEGIN TRANSACTION"
-                self._execute_with_logging(cursor, query, None)
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Get current status
-                            query = "SELECT task_status, assigned_agent FROM tasks WHERE id = ?"
-                            params = (task_id,)
-                            self._execute_with_logging(cursor, query, params)
-                            current = cursor.fetchone()
-                            if not current:
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            old_status = current["task_status"]
-                            
-                            # Only assign if task is available
-                            query = """
-                                UPDATE tasks 
-                                SET task_status = 'in_progress', 
-                                    assigned_agent = ?,
-                                    updated_at = CURRENT_TIMESTAMP,
-                                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
-                                WHERE id = ? AND task_status = 'available'
-                            """
-                            params = (agent_id, task_id)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} is not available for assignment")
-                            
-                            # Record in history
-                            query = """
-                                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                                VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
-                            """
-                            params = (task_id, agent_id, old_status)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            assigned.append(task_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk assign failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk assigned {len(assigned)} tasks to agent {agent_id}")
-                    return {
-                        "success": True,
-                        "assigned": len(assigned),
-                        "failed": len(failed),
-                        "task_ids": assigned,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: assign as many as possible
                 for task_id in task_ids:
-                    try:
-                        # Get current status
-                        query = "SELECT task_status, assigned_agent FROM tasks WHERE id = ?"
-                        params = (task_id,)
-                        self._execute_with_logging(cursor, query, params)
-                        current = cursor.fetchone()
-                        if not current:
-                            failed.append(task_id)
-                            continue
-                        
-                        old_status = current["task_status"]
-                        
-                        # Only assign if task is available
-                        query = """
-                            UPDATE tasks 
-                            SET task_status = 'in_progress', 
-                                assigned_agent = ?,
-                                updated_at = CURRENT_TIMESTAMP,
-                                started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
-                            WHERE id = ? AND task_status = 'available'
-                        """
-                        params = (agent_id, task_id)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        # Record in history
-                        query = """
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                            VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
-                        """
-                        params = (task_id, agent_id, old_status)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        assigned.append(task_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to assign task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk assigned {len(assigned)} tasks (failed: {len(failed)}) to agent {agent_id}")
-                return {
-                    "success": True,
-                    "assigned": len(assigned),
-                    "failed": len(failed),
-                    "task_ids": assigned,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
-    
+                    if task_id not in current:
+                        raise ValueError(f"Task {task_id} not found")
+                    if current[task_id]["task_status"] != "available":
+                        raise ValueError(f"Task {task_id} is not available for assignment")
+
+            changed = self._update(cursor, """
+                UPDATE tasks
+                SET task_status = 'in_progress',
+                    assigned_agent = ?,
+                    updated_at = CURRENT_TIMESTAMP,
+                    started_at = COALESCE(started_at, CURRENT_TIMESTAMP)
+                WHERE task_status = 'available' AND id IN ({ids})
+            """, (agent_id,), [
+                task_id for task_id in task_ids
+                if task_id in current and current[task_id]["task_status"] == "available"
+            ])
+            assigned = [task_id for task_id in task_ids if task_id in changed]
+            failed = [task_id for task_id in task_ids if task_id not in changed]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} is not available for assignment")
+
+            # Record in history
+            self._executemany(cursor, """
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                VALUES (?, ?, 'locked', 'task_status', ?, 'in_progress')
+            """, [(task_id, agent_id, current[task_id]["task_status"]) for task_id in assigned])
+
+        logger.info(f"Bulk assigned {len(assigned)} tasks (failed: {len(failed)}) to agent {agent_id}")
+        return {
+            "success": True,
+            "assigned": len(assigned),
+            "failed": len(failed),
+            "task_ids": assigned,
+            "failed_task_ids": failed
+        }
+
     def update_status(
         self,
         task_ids: List[int],
@@ -364,143 +310,61 @@ class BulkOperations:
     ) -> Dict[str, Any]:
         """
         Bulk update status of multiple tasks.
-        
+
         Args:
             task_ids: List of task IDs to update
             task_status: New task status
             agent_id: Agent ID performing the operation
             require_all: If True, all tasks must succeed or none will be updated (transaction)
-        
+
         Returns:
             Dictionary with success status, updated count, and failed task IDs
-        
+
         Raises:
-            ValueError: If agent_id is missing, task_ids is empty, or invalid task_status
+            ValueError: If agent_id is missing, task_ids is empty, task_status is
+                        invalid, or (with require_all) any task does not exist
         """
         if not agent_id:
             raise ValueError("agent_id is required for bulk operations")
         if not task_ids:
             raise ValueError("task_ids cannot be empty")
-        if task_status not in ["available", "in_progress", "complete", "blocked", "cancelled"]:
+        if task_status not in TASK_STATUSES:
             raise ValueError(f"Invalid task_status: {task_status}")
-        
-        conn = self._get_connection()
-        updated = []
-        failed = []
-        
-        try:
+        task_ids = list(dict.fromkeys(task_ids))
+
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                query = "BEGIN TRANSACTION"
-                self._execute_with_logging(cursor, query, None)
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Get current status
-                            query = "SELECT task_status FROM tasks WHERE id = ?"
-                            params = (task_id,)
-                            self._execute_with_logging(cursor, query, params)
-                            current = cursor.fetchone()
-                            if not current:
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            old_status = current["task_status"]
-                            
-                            # Update status
-                            query = """
-                                UPDATE tasks 
-                                SET task_status = ?,
-                                    updated_at = CURRENT_TIMESTAMP
-                                WHERE id = ?
-                            """
-                            params = (task_status, task_id)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} could not be updated")
-                            
-                            # Record in history
-                            query = """
-                                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                                VALUES (?, ?, 'status_changed', 'task_status', ?, ?)
-                            """
-                            params = (task_id, agent_id, old_status, task_status)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            updated.append(task_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk update status failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk updated status for {len(updated)} tasks by agent {agent_id}")
-                    return {
-                        "success": True,
-                        "updated": len(updated),
-                        "failed": len(failed),
-                        "task_ids": updated,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: update as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Get current status
-                        query = "SELECT task_status FROM tasks WHERE id = ?"
-                        params = (task_id,)
-                        self._execute_with_logging(cursor, query, params)
-                        current = cursor.fetchone()
-                        if not current:
-                            failed.append(task_id)
-                            continue
-                        
-                        old_status = current["task_status"]
-                        
-                        # Update status
-                        query = """
-                            UPDATE tasks 
-                            SET task_status = ?,
-                                updated_at = CURRENT_TIMESTAMP
-                            WHERE id = ?
-                        """
-                        params = (task_status, task_id)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        # Record in history
-                        query = """
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                            VALUES (?, ?, 'status_changed', 'task_status', ?, ?)
-                        """
-                        params = (task_id, agent_id, old_status, task_status)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        updated.append(task_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to update status for task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk updated status for {len(updated)} tasks (failed: {len(failed)}) by agent {agent_id}")
-                return {
-                    "success": True,
-                    "updated": len(updated),
-                    "failed": len(failed),
-                    "task_ids": updated,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
-    
+            current = self._load(cursor, "task_status", task_ids)
+            failed = [task_id for task_id in task_ids if task_id not in current]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} not found")
+
+            changed = self._update(cursor, """
+                UPDATE tasks
+                SET task_status = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id IN ({ids})
+            """, (task_status,), [task_id for task_id in task_ids if task_id in current])
+            updated = [task_id for task_id in task_ids if task_id in changed]
+            failed = [task_id for task_id in task_ids if task_id not in changed]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} could not be updated")
+
+            # Record in history
+            self._executemany(cursor, """
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                VALUES (?, ?, 'status_changed', 'task_status', ?, ?)
+            """, [(task_id, agent_id, current[task_id]["task_status"], task_status) for task_id in updated])
+
+        logger.info(f"Bulk updated status for {len(updated)} tasks (failed: {len(failed)}) by agent {agent_id}")
+        return {
+            "success": True,
+            "updated": len(updated),
+            "failed": len(failed),
+            "task_ids": updated,
+            "failed_task_ids": failed
+        }
+
     def delete_tasks(
         self,
         task_ids: List[int],
@@ -508,122 +372,63 @@ class BulkOperations:
     ) -> Dict[str, Any]:
         """
         Bulk delete multiple tasks.
-        
+
+        Relationships, comments and other dependent rows are removed by the
+        foreign key cascades.
+
         Args:
             task_ids: List of task IDs to delete
             require_all: If True, all tasks must succeed or none will be deleted (transaction)
-        
+
         Returns:
             Dictionary with success status, deleted count, and failed task IDs
-        
+
         Raises:
-            ValueError: If task_ids is empty
+            ValueError: If task_ids is empty, or (with require_all) any task does not exist
         """
         if not task_ids:
             raise ValueError("task_ids cannot be empty")
-        
-        conn = self._get_connection()
-        deleted = []
-        failed = []
-        
-        try:
+        task_ids = list(dict.fromkeys(task_ids))
+
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
-            
-            if require_all:
-                # Transaction mode: all or nothing
-                query = "BEGIN TRANSACTION"
-                self._execute_with_logging(cursor, query, None)
-                try:
-                    for task_id in task_ids:
-                        try:
-                            # Verify task exists
-                            query = "SELECT id FROM tasks WHERE id = ?"
-                            params = (task_id,)
-                            self._execute_with_logging(cursor, query, params)
-                            if not cursor.fetchone():
-                                raise ValueError(f"Task {task_id} not found")
-                            
-                            # Delete task (cascade will handle relationships, comments, etc.)
-                            query = "DELETE FROM tasks WHERE id = ?"
-                            params = (task_id,)
-                            self._execute_with_logging(cursor, query, params)
-                            
-                            if cursor.rowcount == 0:
-                                raise ValueError(f"Task {task_id} could not be deleted")
-                            
-                            deleted.append(task_id)
-                        except Exception as e:
-                            conn.rollback()
-                            logger.error(f"Bulk delete failed for task {task_id}: {e}")
-                            raise
-                    
-                    conn.commit()
-                    logger.info(f"Bulk deleted {len(deleted)} tasks")
-                    return {
-                        "success": True,
-                        "deleted": len(deleted),
-                        "failed": len(failed),
-                        "task_ids": deleted,
-                        "failed_task_ids": failed
-                    }
-                except Exception:
-                    conn.rollback()
-                    raise
-            else:
-                # Best-effort mode: delete as many as possible
-                for task_id in task_ids:
-                    try:
-                        # Verify task exists
-                        query = "SELECT id FROM tasks WHERE id = ?"
-                        params = (task_id,)
-                        self._execute_with_logging(cursor, query, params)
-                        if not cursor.fetchone():
-                            failed.append(task_id)
-                            continue
-                        
-                        # Delete task (cascade will handle relationships, comments, etc.)
-                        query = "DELETE FROM tasks WHERE id = ?"
-                        params = (task_id,)
-                        self._execute_with_logging(cursor, query, params)
-                        
-                        if cursor.rowcount == 0:
-                            failed.append(task_id)
-                            continue
-                        
-                        deleted.append(task_id)
-                    except Exception as e:
-                        logger.warning(f"Failed to delete task {task_id}: {e}")
-                        failed.append(task_id)
-                
-                conn.commit()
-                logger.info(f"Bulk deleted {len(deleted)} tasks (failed: {len(failed)})")
-                return {
-                    "success": True,
-                    "deleted": len(deleted),
-                    "failed": len(failed),
-                    "task_ids": deleted,
-                    "failed_task_ids": failed
-                }
-        finally:
-            self.adapter.close(conn)
-    
-    def unlock_tasks(
-        self,
-        task_ids: List[int],
-        agent_id: str
-    ) -> Dict[str, Any]:
+            current = self._load(cursor, "task_status", task_ids)
+            failed = [task_id for task_id in task_ids if task_id not in current]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} not found")
+
+            changed = self._update(
+                cursor,
+                "DELETE FROM tasks WHERE id IN ({ids})",
+                (),
+                [task_id for task_id in task_ids if task_id in current]
+            )
+            deleted = [task_id for task_id in task_ids if task_id in changed]
+            failed = [task_id for task_id in task_ids if task_id not in changed]
+            if failed and require_all:
+                raise ValueError(f"Task {failed[0]} could not be deleted")
+
+        logger.info(f"Bulk deleted {len(deleted)} tasks (failed: {len(failed)})")
+        return {
+            "success": True,
+            "deleted": len(deleted),
+            "failed": len(failed),
+            "task_ids": deleted,
+            "failed_task_ids": failed
+        }
+
+    def unlock_tasks(self, task_ids: List[int], agent_id: str) -> Dict[str, Any]:
         """
         Unlock multiple tasks atomically.
-        
+
+        Only in-progress tasks are unlocked; others are reported with the reason.
+
         Args:
             task_ids: List of task IDs to unlock
             agent_id: Agent ID performing the unlock
-        
+
         Returns:
             Dictionary with success status and summary of unlocked tasks
-        
-        Raises:
-            ValueError: If agent_id is missing
         """
         if not task_ids:
             return {
@@ -633,70 +438,40 @@ class BulkOperations:
                 "failed_count": 0,
                 "failed_task_ids": []
             }
-        
+
         if not agent_id:
             raise ValueError("agent_id is required for bulk unlock")
-        
-        conn = self._get_connection()
-        unlocked = []
-        failed = []
-        
-        try:
+        task_ids = list(dict.fromkeys(task_ids))
+
+        with self._write_transaction() as conn:
             cursor = conn.cursor()
-            
-            for task_id in task_ids:
-                try:
-                    # Get current status
-                    query = "SELECT assigned_agent, task_status FROM tasks WHERE id = ?"
-                    params = (task_id,)
-                    self._execute_with_logging(cursor, query, params)
-                    current = cursor.fetchone()
-                    
-                    if not current:
-                        failed.append({"task_id": task_id, "error": "Task not found"})
-                        continue
-                    
-                    old_status = current["task_status"]
-                    
-                    # Unlock the task
-                    query = """
-                        UPDATE tasks 
-                        SET task_status = 'available',
-                            assigned_agent = NULL,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ? AND task_status = 'in_progress'
-                    """
-                    params = (task_id,)
-                    self._execute_with_logging(cursor, query, params)
-                    
-                    if cursor.rowcount > 0:
-                        # Record in history
-                        query = """
-                            INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
-                            VALUES (?, ?, 'unlocked', 'task_status', ?, 'available')
-                        """
-                        params = (task_id, agent_id, old_status)
-                        self._execute_with_logging(cursor, query, params)
-                        unlocked.append(task_id)
-                    else:
-                        failed.append({"task_id": task_id, "error": "Task not in_progress"})
-                
-                except Exception as e:
-                    logger.error(f"Error unlocking task {task_id}: {e}", exc_info=True)
-                    failed.append({"task_id": task_id, "error": str(e)})
-            
-            conn.commit()
-            
-            return {
-                "success": True,
-                "unlocked_count": len(unlocked),
-                "unlocked_task_ids": unlocked,
-                "failed_count": len(failed),
-                "failed_task_ids": failed
-            }
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"Bulk unlock failed: {e}", exc_info=True)
-            raise
-        finally:
-            self.adapter.close(conn)
+            current = self._load(cursor, "task_status", task_ids)
+            changed = self._update(cursor, """
+                UPDATE tasks
+                SET task_status = 'available',
+                    assigned_agent = NULL,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE task_status = 'in_progress' AND id IN ({ids})
+            """, (), [
+                task_id for task_id in task_ids
+                if task_id in current and current[task_id]["task_status"] == "in_progress"
+            ])
+            unlocked = [task_id for task_id in task_ids if task_id in changed]
+            failed = [
+                {"task_id": task_id, "error": "Task not found" if task_id not in current else "Task not in_progress"}
+                for task_id in task_ids if task_id not in changed
+            ]
+
+            # Record in history
+            self._executemany(cursor, """
+                INSERT INTO change_history (task_id, agent_id, change_type, field_name, old_value, new_value)
+                VALUES (?, ?, 'unlocked', 'task_status', ?, 'available')
+            """, [(task_id, agent_id, current[task_id]["task_status"]) for task_id in unlocked])
+
+        return {
+            "success": True,
+            "unlocked_count": len(unlocked),
+            "unlocked_task_ids": unlocked,
+            "failed_count": len(failed),
+            "failed_task_ids": failed
+        }
@@ -0,0 +1,243 @@
+"""
+Circular dependency detection for blocking relationships.
+
+Blocking relationships ('blocked_by' and 'blocking') must not form cycles.
+Creating an edge is rejected when its endpoints are already connected through
+existing blocking relationships, following the same rules the original
+breadth-first walk used:
+
+- a 'blocked_by' row (parent, child) can be followed in both directions
+- a 'blocking' row (parent, child) can be followed from child to parent
+
+find_dependency_path() does the walk server-side with a single WITH RECURSIVE
+query (SQLite and PostgreSQL) instead of three queries per visited task. The
+query only computes which tasks are reachable (UNION visits each task once), so
+it is linear in the relationships it reaches even on dense graphs; the
+shortest path is rebuilt in Python from the reachable edges.
+find_dependency_cycles() validates many proposed edges with one query by
+loading the blocking graph once and walking it in memory.
+"""
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+BLOCKING_RELATIONSHIP_TYPES = ("blocked_by", "blocking")
+
+# Longest dependency chain find_dependency_path() reports; longer ones are rejected
+DEFAULT_MAX_DEPTH = 1000
+
+
+def find_dependency_path(
+    cursor: Any,
+    start_task_id: int,
+    target_task_id: int,
+    exclude_parent_task_id: Optional[int] = None,
+    exclude_child_task_id: Optional[int] = None,
+    max_depth: int = DEFAULT_MAX_DEPTH,
+    execute: Optional[Callable[[Any, str, tuple], Any]] = None
+) -> Optional[List[int]]:
+    """
+    Find a path of blocking relationships from start_task_id to target_task_id.
+
+    Args:
+        cursor: Database cursor
+        start_task_id: Task to start walking from
+        target_task_id: Task whose reachability closes the cycle
+        exclude_parent_task_id: Optional parent task ID of a relationship to ignore
+        exclude_child_task_id: Optional child task ID of a relationship to ignore
+        max_depth: Maximum number of relationships to follow
+        execute: Optional function(cursor, query, params) used to run the query
+
+    Returns:
+        List of task IDs from start_task_id to target_task_id, or None if
+        target_task_id is not reachable
+
+    Raises:
+        ValueError: If the shortest path is longer than max_depth relationships
+    """
+    if start_task_id == target_task_id:
+        return [start_task_id]
+
+    exclude_filter = ""
+    exclude_params: tuple = ()
+    if exclude_parent_task_id is not None and exclude_child_task_id is not None:
+        exclude_filter = "AND NOT (parent_task_id = ? AND child_task_id = ?)"
+        exclude_params = (exclude_parent_task_id, exclude_child_task_id)
+
+    # dependency_reach holds each reachable task once, so the walk ends on
+    # cycles and never enumerates alternative paths. When the target is
+    # reached, the edges between reachable tasks are returned for the path.
+    query = f"""
+        WITH RECURSIVE dependency_edges(src, dst) AS (
+            SELECT parent_task_id, child_task_id
+            FROM task_relationships
+            WHERE relationship_type = 'blocked_by' {exclude_filter}
+            UNION ALL
+            SELECT child_task_id, parent_task_id
+            FROM task_relationships
+            WHERE relationship_type IN ('blocked_by', 'blocking') {exclude_filter}
+        ),
+        dependency_reach(task_id) AS (
+            SELECT ?
+            UNION
+            SELECT e.dst
+            FROM dependency_reach r
+            JOIN dependency_edges e ON e.src = r.task_id
+            WHERE r.task_id <> ?
+        )
+        SELECT e.src, e.dst
+        FROM dependency_edges e
+        JOIN dependency_reach r ON r.task_id = e.src
+        WHERE e.src <> ?
+            AND EXISTS (SELECT 1 FROM dependency_reach WHERE task_id = ?)
+    """
+    params = exclude_params + exclude_params + (
+        start_task_id, target_task_id, target_task_id, target_task_id
+    )
+    if execute is not None:
+        execute(cursor, query, params)
+    else:
+        cursor.execute(query, params)
+    edges: Dict[int, List[int]] = {}
+    for row in cursor.fetchall():
+        edges.setdefault(row[0], []).append(row[1])
+    if not edges:
+        return None
+
+    path = _shortest_path(edges, start_task_id, target_task_id)
+    if path is None:
+        return None
+    if len(path) - 1 > max_depth:
+        raise ValueError(
+            f"Dependency chain from task {start_task_id} is deeper than {max_depth} relationships; "
+            f"cannot verify that the relationship does not create a circular dependency."
+        )
+    return path
+
+
+def _shortest_path(edges: Dict[int, List[int]], start: int, target: int) -> Optional[List[int]]:
+    """Breadth-first search over a src -> [dst, ...] adjacency map."""
+    previous: Dict[int, int] = {start: start}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for dst in edges.get(current, ()):
+            if dst in previous:
+                continue
+            previous[dst] = current
+            if dst == target:
+                path = [dst]
+                while path[-1] != start:
+                    path.append(previous[path[-1]])
+                return list(reversed(path))
+            queue.append(dst)
+    return None
+
+
+def find_dependency_cycles(
+    cursor: Any,
+    relationships: Sequence[Tuple[int, int, str]],
+    execute: Optional[Callable[[Any, str, tuple], Any]] = None
+) -> List[Optional[List[int]]]:
+    """
+    Check many proposed relationships for circular dependencies at once.
+
+    Loads the existing blocking relationships with one query and walks them in
+    memory. Relationships are checked in order and each one that passes is
+    added to the graph, so cycles formed within the batch itself are caught.
+    Non-blocking relationship types are never cycles.
+
+    Args:
+        cursor: Database cursor
+        relationships: Sequence of (parent_task_id, child_task_id, relationship_type)
+        execute: Optional function(cursor, query, params) used to run the query
+
+    Returns:
+        List aligned with relationships: None if the relationship is safe to
+        create, otherwise the task IDs forming the cycle, starting and ending
+        with the same task
+    """
+    results: List[Optional[List[int]]] = [None] * len(relationships)
+    if not any(rel_type in BLOCKING_RELATIONSHIP_TYPES for _, _, rel_type in relationships):
+        return results
+
+    query = """
+        SELECT parent_task_id, child_task_id, relationship_type
+        FROM task_relationships
+        WHERE relationship_type IN ('blocked_by', 'blocking')
+    """
+    if execute is not None:
+        execute(cursor, query, ())
+    else:
+        cursor.execute(query)
+
+    graph = _DependencyGraph()
+    for row in cursor.fetchall():
+        graph.add(row[0], row[1], row[2])
+
+    for index, (parent_task_id, child_task_id, relationship_type) in enumerate(relationships):
+        if relationship_type not in BLOCKING_RELATIONSHIP_TYPES:
+            continue
+        cycle = graph.find_cycle(parent_task_id, child_task_id, relationship_type)
+        if cycle:
+            results[index] = cycle
+        else:
+            graph.add(parent_task_id, child_task_id, relationship_type)
+    return results
+
+
+class _DependencyGraph:
+    """In-memory blocking relationship graph with the same walk rules as find_dependency_path."""
+
+    def __init__(self):
+        # src -> {dst: {(parent_task_id, child_task_id), ...}}
+        self._edges: Dict[int, Dict[int, Set[Tuple[int, int]]]] = {}
+        self._relationships: Set[Tuple[int, int, str]] = set()
+
+    def add(self, parent_task_id: int, child_task_id: int, relationship_type: str) -> None:
+        """Add a relationship to the graph."""
+        self._relationships.add((parent_task_id, child_task_id, relationship_type))
+        pair = (parent_task_id, child_task_id)
+        if relationship_type == "blocked_by":
+            self._link(parent_task_id, child_task_id, pair)
+        self._link(child_task_id, parent_task_id, pair)
+
+    def _link(self, src: int, dst: int, pair: Tuple[int, int]) -> None:
+        """Record a walkable edge and the relationship it came from."""
+        self._edges.setdefault(src, {}).setdefault(dst, set()).add(pair)
+
+    def find_cycle(self, parent_task_id: int, child_task_id: int, relationship_type: str) -> Optional[List[int]]:
+        """Return the cycle the relationship would create, mirroring create_relationship."""
+        inverse_type = "blocking" if relationship_type == "blocked_by" else "blocked_by"
+        if ((parent_task_id, child_task_id, inverse_type) in self._relationships
+                or (child_task_id, parent_task_id, inverse_type) in self._relationships):
+            return [parent_task_id, child_task_id, parent_task_id]
+
+        if relationship_type == "blocked_by":
+            start, target = child_task_id, parent_task_id
+        else:
+            start, target = parent_task_id, child_task_id
+        path = self._shortest_path(start, target, exclude=(parent_task_id, child_task_id))
+        if path is None:
+            return None
+        # The new relationship leads from target back to start
+        return path + [start]
+
+    def _shortest_path(self, start: int, target: int, exclude: Tuple[int, int]) -> Optional[List[int]]:
+        """Breadth-first search ignoring edges that only come from the excluded relationship."""
+        if start == target:
+            return [start]
+        previous: Dict[int, int] = {start: start}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for dst, pairs in self._edges.get(current, {}).items():
+                if dst in previous or not (pairs - {exclude}):
+                    continue
+                previous[dst] = current
+                if dst == target:
+                    path = [dst]
+                    while path[-1] != start:
+                        path.append(previous[path[-1]])
+                    return list(reversed(path))
+                queue.append(dst)
+        return None
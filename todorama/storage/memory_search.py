@@ -0,0 +1,634 @@
+"""
+In-process inverted index for task search.
+
+Without FTS5 or PostgreSQL full-text search, search_tasks() and
+query_tasks(search=...) fall back to a LIKE scan over every task, and the UI
+runs that on each keystroke. With SEARCH_BACKEND=memory, InMemorySearchIndex
+answers those searches from memory instead:
+
+- Title, task_instruction and notes are split into lowercase \\w+ tokens.
+  Each term maps to a postings list: an array('I') of document numbers and a
+  parallel array('I') of term frequencies.
+- Results are ranked with BM25 (k1=1.2, b=0.75). Query syntax matches the
+  full-text backends (see todorama.storage.search_index): bare words match as
+  prefixes, and every term must match. Quoted phrases need all of their
+  words, but word order and adjacency are not checked, because postings
+  carry no positions.
+- Writes reach the index through the task_search_feed table. Triggers on
+  tasks upsert the written task's ID there with a new sequence number. Before
+  each search, the index reads the feed past the last sequence it applied and
+  re-indexes those tasks, so writes from any code path or process are seen.
+  The feed holds one row per task, so it stays bounded.
+- A re-indexed task gets a new document number. Its old postings become
+  stale and are skipped while scoring, and compaction drops them once stale
+  documents outnumber live ones.
+
+On PostgreSQL, sequence numbers are assigned before commit, so a feed row can
+become visible after a higher one was applied. As in the blocked ancestor
+index, feed rows record the writing transaction, and each refresh also
+re-indexes rows from transactions that were still in flight at the previous
+refresh (txid_snapshot_xmin). Re-indexing a task only re-reads its current
+text, so it is harmless.
+
+The index is saved to a snapshot file after it is first built and again at
+shutdown. The snapshot is a fixed header followed by flat native-endian
+arrays, read back through mmap. A restart loads it and replays only the feed
+entries written since, instead of re-tokenizing every task. The header
+records the feed position, the transaction horizon and the epoch of the
+database it was built from (a random token kept in task_search_feed_state).
+A snapshot whose epoch differs, or whose position is past the end of the
+feed (a restored or replaced database file), is ignored and the index is
+rebuilt.
+"""
+import heapq
+import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from todorama.storage.search_index import (
+    HIGHLIGHT_END, HIGHLIGHT_START, SEARCH_COLUMNS, SNIPPET_ELLIPSIS, SNIPPET_WORDS
+)
+
+logger = logging.getLogger(__name__)
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Feed entries and tasks read per query while building or catching up
+FEED_BATCH_SIZE = 500
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# magic, version, little-endian flag, feed sequence, horizon, documents, terms,
+# postings, database epoch
+_SNAPSHOT_HEADER = struct.Struct("<4sIB3xQQIIQ32s")
+_SNAPSHOT_MAGIC = b"TDSI"
+_SNAPSHOT_VERSION = 2
+
+# Columns of tasks the feed triggers watch; organization_id is added by Alembic migrations
+_FEED_COLUMNS = SEARCH_COLUMNS + ("organization_id",)
+
+_FEED_TABLES = {
+    "sqlite": """
+        CREATE TABLE IF NOT EXISTS task_search_feed (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL UNIQUE
+        )
+    """,
+    "postgresql": """
+        CREATE TABLE IF NOT EXISTS task_search_feed (
+            seq BIGSERIAL PRIMARY KEY,
+            task_id INTEGER NOT NULL UNIQUE,
+            xact BIGINT NOT NULL DEFAULT txid_current()
+        )
+    """,
+}
+
+# Feeds created before rows recorded their transaction
+_POSTGRESQL_FEED_UPGRADE = (
+    "ALTER TABLE task_search_feed ADD COLUMN IF NOT EXISTS xact BIGINT NOT NULL DEFAULT txid_current()"
+)
+_POSTGRESQL_FEED_INDEX = "CREATE INDEX IF NOT EXISTS idx_task_search_feed_xact ON task_search_feed(xact)"
+
+# One row holding a random token that identifies this database to snapshots
+_STATE_TABLE = "CREATE TABLE IF NOT EXISTS task_search_feed_state (epoch TEXT NOT NULL)"
+_NEW_EPOCH = {
+    "sqlite": "lower(hex(randomblob(16)))",
+    "postgresql": "md5(random()::text || clock_timestamp()::text)",
+}
+
+# Feed position, database epoch and, on PostgreSQL, the oldest transaction still in flight
+_FEED_POSITION_QUERIES = {
+    "sqlite": """
+        SELECT COALESCE(MAX(seq), 0) AS seq, 0 AS horizon,
+               (SELECT epoch FROM task_search_feed_state) AS epoch
+        FROM task_search_feed
+    """,
+    "postgresql": """
+        SELECT COALESCE(MAX(seq), 0) AS seq, txid_snapshot_xmin(txid_current_snapshot()) AS horizon,
+               (SELECT epoch FROM task_search_feed_state) AS epoch
+        FROM task_search_feed
+    """,
+}
+
+_SQLITE_FEED_TRIGGERS = {
+    "task_search_feed_after_insert": """
+        CREATE TRIGGER IF NOT EXISTS task_search_feed_after_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT OR REPLACE INTO task_search_feed (task_id) VALUES (NEW.id);
+        END
+    """,
+    "task_search_feed_after_delete": """
+        CREATE TRIGGER IF NOT EXISTS task_search_feed_after_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT OR REPLACE INTO task_search_feed (task_id) VALUES (OLD.id);
+        END
+    """,
+    "task_search_feed_after_update": f"""
+        CREATE TRIGGER IF NOT EXISTS task_search_feed_after_update
+        AFTER UPDATE OF {", ".join(_FEED_COLUMNS)} ON tasks
+        BEGIN
+            INSERT OR REPLACE INTO task_search_feed (task_id) VALUES (NEW.id);
+        END
+    """,
+}
+
+_POSTGRESQL_FEED_FUNCTION = """
+    CREATE OR REPLACE FUNCTION task_search_feed_apply() RETURNS trigger AS $$
+    DECLARE
+        changed_id INTEGER;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            changed_id := OLD.id;
+        ELSE
+            changed_id := NEW.id;
+        END IF;
+        INSERT INTO task_search_feed (task_id) VALUES (changed_id)
+        ON CONFLICT (task_id)
+        DO UPDATE SET seq = nextval(pg_get_serial_sequence('task_search_feed', 'seq')),
+                      xact = txid_current();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_POSTGRESQL_FEED_TRIGGERS = {
+    "task_search_feed_insert_delete": """
+        CREATE TRIGGER task_search_feed_insert_delete AFTER INSERT OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_search_feed_apply()
+    """,
+    "task_search_feed_update": f"""
+        CREATE TRIGGER task_search_feed_update
+        AFTER UPDATE OF {", ".join(_FEED_COLUMNS)} ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_search_feed_apply()
+    """,
+}
+
+
+def _run(cursor: Any, query: str, params: tuple = (), execute: Optional[Callable] = None) -> None:
+    if execute is not None:
+        execute(cursor, query, params)
+    elif params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def install_search_feed(cursor: Any, db_type: str, execute: Optional[Callable] = None) -> bool:
+    """
+    Create the task_search_feed table and the triggers that fill it.
+
+    When a trigger is first installed, every task is queued, so an index
+    built from an older snapshot re-reads anything written while it was
+    missing. Nothing is installed while tasks lacks organization_id.
+
+    Args:
+        cursor: Database cursor inside the schema transaction
+        db_type: 'sqlite' or 'postgresql'
+        execute: Optional function(cursor, query, params) used to run queries
+
+    Returns:
+        True if the feed is installed and maintained by triggers
+    """
+    if db_type == "postgresql":
+        _run(cursor, "SELECT column_name AS name FROM information_schema.columns WHERE table_name = 'tasks'", execute=execute)
+    else:
+        _run(cursor, "PRAGMA table_info(tasks)", execute=execute)
+    missing = set(_FEED_COLUMNS) - {row["name"] for row in cursor.fetchall()}
+    if missing:
+        logger.info(f"Search feed not installed; tasks is missing columns: {sorted(missing)}")
+        return False
+
+    _run(cursor, _FEED_TABLES[db_type], execute=execute)
+    _run(cursor, _STATE_TABLE, execute=execute)
+    _run(cursor, f"""
+        INSERT INTO task_search_feed_state (epoch)
+        SELECT {_NEW_EPOCH[db_type]} WHERE NOT EXISTS (SELECT 1 FROM task_search_feed_state)
+    """, execute=execute)
+    if db_type == "postgresql":
+        _run(cursor, _POSTGRESQL_FEED_UPGRADE, execute=execute)
+        _run(cursor, _POSTGRESQL_FEED_INDEX, execute=execute)
+        triggers = _POSTGRESQL_FEED_TRIGGERS
+        _run(cursor, "SELECT tgname AS name FROM pg_trigger WHERE tgname LIKE 'task_search_feed_%'", execute=execute)
+        existing = {row["name"] for row in cursor.fetchall()}
+        _run(cursor, _POSTGRESQL_FEED_FUNCTION, execute=execute)
+    else:
+        triggers = _SQLITE_FEED_TRIGGERS
+        _run(cursor, "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'task_search_feed_%'", execute=execute)
+        existing = {row["name"] for row in cursor.fetchall()}
+    for name, ddl in triggers.items():
+        if name not in existing:
+            _run(cursor, ddl, execute=execute)
+
+    if not set(triggers) <= existing:
+        # Writes made while a trigger was missing were not queued
+        _run(cursor, "DELETE FROM task_search_feed", execute=execute)
+        _run(cursor, "INSERT INTO task_search_feed (task_id) SELECT id FROM tasks ORDER BY id", execute=execute)
+    return True
+
+
+def _term_matcher(terms: List[Tuple[Tuple[str, ...], bool]]) -> Callable[[str], bool]:
+    exact = set()
+    prefixes = []
+    for tokens, prefix in terms:
+        tokens = [token.lower() for token in tokens]
+        exact.update(tokens[:-1] if prefix else tokens)
+        if prefix:
+            prefixes.append(tokens[-1])
+    return lambda word: word in exact or any(word.startswith(p) for p in prefixes)
+
+
+def highlight(text: Optional[str], terms: List[Tuple[Tuple[str, ...], bool]]) -> Optional[str]:
+    """Wrap the words of text that match the query terms in highlight markers."""
+    if text is None:
+        return None
+    matches = _term_matcher(terms)
+    return _TOKEN_PATTERN.sub(
+        lambda m: f"{HIGHLIGHT_START}{m.group()}{HIGHLIGHT_END}" if matches(m.group().lower()) else m.group(),
+        text
+    )
+
+
+def snippet(texts: Iterable[Optional[str]], terms: List[Tuple[Tuple[str, ...], bool]]) -> Optional[str]:
+    """
+    Cut a highlighted fragment of about SNIPPET_WORDS words around the first match.
+
+    Args:
+        texts: Candidate texts, most interesting first
+        terms: Parsed query terms
+
+    Returns:
+        The fragment of the first text containing a match, or None
+    """
+    matches = _term_matcher(terms)
+    for text in texts:
+        if not text:
+            continue
+        words = text.split()
+        for i, word in enumerate(words):
+            if any(matches(token) for token in tokenize(word)):
+                start = max(0, i - SNIPPET_WORDS // 4)
+                end = min(len(words), start + SNIPPET_WORDS)
+                fragment = highlight(" ".join(words[start:end]), terms)
+                return (SNIPPET_ELLIPSIS if start > 0 else "") + fragment + (SNIPPET_ELLIPSIS if end < len(words) else "")
+    return None
+
+
+class InMemorySearchIndex:
+    """Thread-safe inverted index over tasks, kept current from task_search_feed."""
+
+    def __init__(self, snapshot_path: Optional[str] = None, db_type: str = "sqlite"):
+        """
+        Initialize an empty index; it is loaded or built on the first refresh().
+
+        Args:
+            snapshot_path: File the index is saved to and restored from (None disables snapshots)
+            db_type: 'sqlite' or 'postgresql'
+        """
+        self.snapshot_path = snapshot_path
+        self._db_type = db_type
+        self._lock = threading.RLock()
+        self._reset()
+        self._loaded = False
+
+    def _reset(self) -> None:
+        self._feed_seq = 0
+        self._horizon = 0
+        self._epoch = ""
+        # Indexed by document number
+        self._doc_task = array("I")
+        self._doc_length = array("I")
+        self._doc_org = array("I")
+        # Task ID -> live document number
+        self._current: Dict[int, int] = {}
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._sorted_terms: Optional[List[str]] = None
+        self._total_length = 0
+
+    @property
+    def size(self) -> int:
+        """Number of indexed tasks."""
+        return len(self._current)
+
+    def _add(self, task_id: int, organization_id: Optional[int], texts: Iterable[Optional[str]]) -> None:
+        tokens = [token for text in texts for token in tokenize(text)]
+        docno = len(self._doc_task)
+        self._doc_task.append(task_id)
+        self._doc_length.append(len(tokens))
+        self._doc_org.append(organization_id or 0)
+        for term, frequency in Counter(tokens).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = (array("I"), array("I"))
+                self._sorted_terms = None
+            postings[0].append(docno)
+            postings[1].append(frequency)
+        self._current[task_id] = docno
+        self._total_length += len(tokens)
+
+    def _remove(self, task_id: int) -> None:
+        docno = self._current.pop(task_id, None)
+        if docno is not None:
+            self._total_length -= self._doc_length[docno]
+
+    def _index_rows(self, rows: Iterable[Any]) -> None:
+        for row in rows:
+            self._remove(row["id"])
+            self._add(row["id"], row["organization_id"], (row[column] for column in SEARCH_COLUMNS))
+
+    def _select_tasks(self, cursor: Any, execute: Optional[Callable], task_ids: List[int]) -> List[Any]:
+        placeholders = ",".join("?" * len(task_ids))
+        _run(cursor, f"""
+            SELECT id, organization_id, {", ".join(SEARCH_COLUMNS)}
+            FROM tasks WHERE id IN ({placeholders})
+        """, tuple(task_ids), execute=execute)
+        return cursor.fetchall()
+
+    def _reindex(self, cursor: Any, execute: Optional[Callable], task_ids: List[int]) -> None:
+        for task_id in task_ids:
+            self._remove(task_id)
+        self._index_rows(self._select_tasks(cursor, execute, task_ids))
+
+    def _feed_position(self, cursor: Any, execute: Optional[Callable]) -> Any:
+        _run(cursor, _FEED_POSITION_QUERIES[self._db_type], execute=execute)
+        return cursor.fetchone()
+
+    def _build(self, cursor: Any, execute: Optional[Callable]) -> None:
+        self._reset()
+        # Read the feed position first: writes made during the scan are replayed
+        position = self._feed_position(cursor, execute)
+        self._feed_seq, self._horizon = position["seq"], position["horizon"]
+        self._epoch = position["epoch"] or ""
+        last_id = 0
+        while True:
+            _run(cursor, f"""
+                SELECT id, organization_id, {", ".join(SEARCH_COLUMNS)}
+                FROM tasks WHERE id > ? ORDER BY id LIMIT ?
+            """, (last_id, FEED_BATCH_SIZE), execute=execute)
+            rows = cursor.fetchall()
+            self._index_rows(rows)
+            if len(rows) < FEED_BATCH_SIZE:
+                break
+            last_id = rows[-1]["id"]
+        logger.info(f"Built in-memory search index: {self.size} tasks, {len(self._postings)} terms")
+
+    def _apply_feed(self, cursor: Any, execute: Optional[Callable]) -> int:
+        applied = 0
+        if self._db_type == "postgresql":
+            previous_horizon = self._horizon
+            # Taken before reading the feed: a transaction still in flight now
+            # has an ID at or above it, so its rows are re-read next time
+            _run(cursor, "SELECT txid_snapshot_xmin(txid_current_snapshot()) AS horizon", execute=execute)
+            self._horizon = cursor.fetchone()["horizon"]
+            # Rows at or below the applied sequence that were not yet committed last time
+            _run(cursor, """
+                SELECT task_id FROM task_search_feed WHERE xact >= ? AND seq <= ?
+            """, (previous_horizon, self._feed_seq), execute=execute)
+            late_ids = [row["task_id"] for row in cursor.fetchall()]
+            for start in range(0, len(late_ids), FEED_BATCH_SIZE):
+                self._reindex(cursor, execute, late_ids[start:start + FEED_BATCH_SIZE])
+            applied += len(late_ids)
+        while True:
+            _run(cursor, """
+                SELECT seq, task_id FROM task_search_feed
+                WHERE seq > ? ORDER BY seq LIMIT ?
+            """, (self._feed_seq, FEED_BATCH_SIZE), execute=execute)
+            entries = cursor.fetchall()
+            if not entries:
+                break
+            self._reindex(cursor, execute, [entry["task_id"] for entry in entries])
+            self._feed_seq = entries[-1]["seq"]
+            applied += len(entries)
+            if len(entries) < FEED_BATCH_SIZE:
+                break
+        if len(self._doc_task) > 2 * self.size + FEED_BATCH_SIZE:
+            self._compact()
+        return applied
+
+    def refresh(self, cursor: Any, execute: Optional[Callable] = None) -> int:
+        """
+        Load or build the index if needed, then apply new feed entries.
+
+        Args:
+            cursor: Database cursor
+            execute: Optional function(cursor, query, params) used to run queries
+
+        Returns:
+            Number of feed entries applied
+        """
+        with self._lock:
+            if not self._loaded:
+                built = not self._load_snapshot(cursor, execute)
+                if built:
+                    self._build(cursor, execute)
+                self._loaded = True
+                if built:
+                    self.save()
+            return self._apply_feed(cursor, execute)
+
+    def rebuild(self, cursor: Any, execute: Optional[Callable] = None) -> None:
+        """Re-index every task from scratch."""
+        with self._lock:
+            self._build(cursor, execute)
+            self._loaded = True
+
+    def _expand(self, token: str) -> List[str]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = self._sorted_terms
+        expanded = []
+        for i in range(bisect_left(terms, token), len(terms)):
+            if not terms[i].startswith(token):
+                break
+            expanded.append(terms[i])
+        return expanded
+
+    def search(
+        self,
+        terms: List[Tuple[Tuple[str, ...], bool]],
+        limit: Optional[int] = None,
+        organization_id: Optional[int] = None
+    ) -> List[int]:
+        """
+        Rank the tasks matching every query term.
+
+        Args:
+            terms: Parsed query terms (see search_index.parse_search_terms)
+            limit: Maximum number of task IDs to return (None for all)
+            organization_id: Only tasks of this organization
+
+        Returns:
+            Task IDs, best match first (most recently indexed first among equal scores)
+        """
+        with self._lock:
+            live = self.size
+            if not terms or not live:
+                return []
+            average_length = self._total_length / live or 1.0
+            scores: Optional[Dict[int, float]] = None
+            for tokens, prefix in terms:
+                for i, token in enumerate(tokens):
+                    token = token.lower()
+                    expanded = self._expand(token) if prefix and i == len(tokens) - 1 else [token]
+                    token_scores: Dict[int, float] = {}
+                    for term in expanded:
+                        postings = self._postings.get(term)
+                        if postings is None:
+                            continue
+                        docnos, frequencies = postings
+                        frequency_in_docs = len(docnos)
+                        idf = math.log(1 + (live - frequency_in_docs + 0.5) / (frequency_in_docs + 0.5))
+                        for docno, frequency in zip(docnos, frequencies):
+                            if self._current.get(self._doc_task[docno]) != docno:
+                                continue  # stale: the task was re-indexed or deleted
+                            if organization_id is not None and self._doc_org[docno] != organization_id:
+                                continue
+                            norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_length[docno] / average_length)
+                            token_scores[docno] = token_scores.get(docno, 0.0) + idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                    if scores is None:
+                        scores = token_scores
+                    else:
+                        scores = {docno: score + scores[docno] for docno, score in token_scores.items() if docno in scores}
+                    if not scores:
+                        return []
+            ranked = heapq.nlargest(
+                limit if limit is not None else len(scores),
+                scores.items(),
+                key=lambda item: (item[1], item[0])
+            )
+            return [self._doc_task[docno] for docno, _ in ranked]
+
+    def _compact(self) -> None:
+        """Drop stale documents and renumber live ones in order."""
+        renumber: Dict[int, int] = {}
+        doc_task, doc_length, doc_org = array("I"), array("I"), array("I")
+        for docno, task_id in enumerate(self._doc_task):
+            if self._current.get(task_id) == docno:
+                renumber[docno] = len(doc_task)
+                doc_task.append(task_id)
+                doc_length.append(self._doc_length[docno])
+                doc_org.append(self._doc_org[docno])
+        postings: Dict[str, Tuple[array, array]] = {}
+        for term, (docnos, frequencies) in self._postings.items():
+            kept_docnos, kept_frequencies = array("I"), array("I")
+            for docno, frequency in zip(docnos, frequencies):
+                new_docno = renumber.get(docno)
+                if new_docno is not None:
+                    kept_docnos.append(new_docno)
+                    kept_frequencies.append(frequency)
+            if kept_docnos:
+                postings[term] = (kept_docnos, kept_frequencies)
+        self._doc_task, self._doc_length, self._doc_org = doc_task, doc_length, doc_org
+        self._current = {task_id: docno for docno, task_id in enumerate(doc_task)}
+        self._postings = postings
+        self._sorted_terms = None
+
+    def save(self) -> bool:
+        """
+        Compact the index and write it to the snapshot file.
+
+        The file is written next to the target and renamed into place, so a
+        crash never leaves a partial snapshot.
+
+        Returns:
+            True if a snapshot was written
+        """
+        if not self.snapshot_path:
+            return False
+        with self._lock:
+            if not self._loaded:
+                return False
+            self._compact()
+            terms = sorted(self._postings)
+            offsets = array("Q", [0])
+            docnos, frequencies = array("I"), array("I")
+            for term in terms:
+                term_docnos, term_frequencies = self._postings[term]
+                docnos.extend(term_docnos)
+                frequencies.extend(term_frequencies)
+                offsets.append(len(docnos))
+            term_blob = "\n".join(terms).encode("utf-8")
+            header = _SNAPSHOT_HEADER.pack(
+                _SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, sys.byteorder == "little",
+                self._feed_seq, self._horizon, len(self._doc_task), len(terms), len(docnos),
+                self._epoch.encode("ascii")
+            )
+            temp_path = f"{self.snapshot_path}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(header)
+                f.write(struct.pack("<Q", len(term_blob)))
+                f.write(term_blob)
+                for data in (self._doc_task, self._doc_length, self._doc_org, offsets, docnos, frequencies):
+                    f.write(data.tobytes())
+            os.replace(temp_path, self.snapshot_path)
+        logger.info(f"Saved search index snapshot: {self.size} tasks to {self.snapshot_path}")
+        return True
+
+    def _load_snapshot(self, cursor: Any, execute: Optional[Callable] = None) -> bool:
+        """Load the snapshot if it was built from this database; False if it must be rebuilt."""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                magic, version, little_endian, feed_seq, horizon, doc_count, term_count, posting_count, epoch = \
+                    _SNAPSHOT_HEADER.unpack_from(data, 0)
+                if (magic, version, bool(little_endian)) != (_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, sys.byteorder == "little"):
+                    logger.warning(f"Ignoring incompatible search index snapshot {self.snapshot_path}")
+                    return False
+                epoch = epoch.rstrip(b"\0").decode("ascii")
+                feed = self._feed_position(cursor, execute)
+                if epoch != (feed["epoch"] or "") or feed_seq > feed["seq"]:
+                    logger.warning(
+                        f"Ignoring search index snapshot {self.snapshot_path} from another database "
+                        f"(epoch {epoch or '-'}, feed position {feed_seq}; "
+                        f"database epoch {feed['epoch'] or '-'}, feed position {feed['seq']})"
+                    )
+                    return False
+                position = _SNAPSHOT_HEADER.size
+                (blob_length,) = struct.unpack_from("<Q", data, position)
+                position += 8
+                terms = data[position:position + blob_length].decode("utf-8").split("\n") if term_count else []
+                position += blob_length
+
+                def read(typecode: str, count: int) -> array:
+                    nonlocal position
+                    values = array(typecode)
+                    end = position + count * values.itemsize
+                    values.frombytes(data[position:end])
+                    position = end
+                    return values
+
+                doc_task = read("I", doc_count)
+                doc_length = read("I", doc_count)
+                doc_org = read("I", doc_count)
+                offsets = read("Q", term_count + 1)
+                docnos = read("I", posting_count)
+                frequencies = read("I", posting_count)
+        except (OSError, ValueError, struct.error) as e:
+            logger.warning(f"Could not load search index snapshot {self.snapshot_path}: {e}")
+            return False
+
+        self._reset()
+        self._feed_seq, self._horizon, self._epoch = feed_seq, horizon, epoch
+        self._doc_task, self._doc_length, self._doc_org = doc_task, doc_length, doc_org
+        self._current = {task_id: docno for docno, task_id in enumerate(doc_task)}
+        self._total_length = sum(doc_length)
+        for i, term in enumerate(terms):
+            start, end = offsets[i], offsets[i + 1]
+            self._postings[term] = (docnos[start:end], frequencies[start:end])
+        logger.info(f"Loaded search index snapshot: {self.size} tasks from {self.snapshot_path}")
+        return True
@@ -0,0 +1,202 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered by a unique key, normally (created_at, id). A page ends
+with an opaque cursor that encodes the key of its last row. The next page
+asks for rows strictly after that key:
+
+    WHERE (t.created_at, t.id) < (?, ?) ORDER BY t.created_at DESC, t.id DESC LIMIT ?
+
+This is an index range scan starting at the cursor, so page 1000 costs the
+same as page 1, unlike OFFSET which reads and discards every earlier row.
+Rows inserted or deleted between requests do not shift later pages.
+
+Cursors are URL-safe base64 of a small JSON document naming the listing
+("kind") and the key values. A cursor from one listing or ordering is
+rejected by another instead of silently returning the wrong rows.
+"""
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# (SQL expression, descending) for each column of a keyset ordering
+KeysetOrder = Sequence[Tuple[str, bool]]
+
+
+def encode_cursor(kind: str, values: Sequence[Any]) -> str:
+    """
+    Encode the key of the last row of a page as an opaque cursor.
+
+    Args:
+        kind: Name of the listing and ordering the cursor belongs to
+        values: Key values of the last row, in ordering column order
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps({"k": kind, "v": list(values)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, size: int) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor string from a previous page
+        kind: Listing and ordering the cursor must belong to
+        size: Number of key values expected
+
+    Returns:
+        Key values of the last row of the previous page
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another listing
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (binascii.Error, UnicodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise ValueError(f"Invalid cursor: {cursor!r} does not belong to this listing or ordering")
+    values = payload.get("v")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return values
+
+
+def order_clause(order: KeysetOrder) -> str:
+    """Build the ORDER BY clause for a keyset ordering."""
+    return "ORDER BY " + ", ".join(
+        f"{expression} {'DESC' if descending else 'ASC'}" for expression, descending in order
+    )
+
+
+def keyset_condition(order: KeysetOrder, values: Sequence[Any]) -> Tuple[str, List[Any]]:
+    """
+    Build the condition selecting rows after the given key.
+
+    When every column sorts in the same direction this is a single row-value
+    comparison, which SQLite and PostgreSQL answer with an index range scan.
+    Mixed directions are expanded into the equivalent OR of prefixes.
+
+    Args:
+        order: Keyset ordering
+        values: Key of the last row of the previous page
+
+    Returns:
+        Tuple of (SQL condition, parameters)
+    """
+    directions = {descending for _, descending in order}
+    if len(directions) == 1:
+        operator = "<" if directions.pop() else ">"
+        columns = ", ".join(expression for expression, _ in order)
+        placeholders = ", ".join("?" for _ in order)
+        return f"({columns}) {operator} ({placeholders})", list(values)
+
+    branches = []
+    params: List[Any] = []
+    for i, (expression, descending) in enumerate(order):
+        parts = [f"{prefix} = ?" for prefix, _ in order[:i]]
+        parts.append(f"{expression} {'<' if descending else '>'} ?")
+        branches.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:i])
+        params.append(values[i])
+    return "(" + " OR ".join(branches) + ")", params
+
+
+def make_page(
+    rows: List[Dict[str, Any]],
+    limit: int,
+    kind: str,
+    key: Callable[[Dict[str, Any]], Sequence[Any]],
+    items_name: str
+) -> Dict[str, Any]:
+    """
+    Trim rows fetched with LIMIT limit + 1 to a page with its next cursor.
+
+    Args:
+        rows: Rows fetched with one more than the page size
+        limit: Page size
+        kind: Listing and ordering name for the cursor
+        key: Function returning the key values of a row
+        items_name: Name of the list in the returned dictionary
+
+    Returns:
+        Dictionary with the page rows, next_cursor (None on the last page) and has_more
+    """
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = encode_cursor(kind, key(rows[-1])) if has_more and rows else None
+    return {items_name: rows, "next_cursor": next_cursor, "has_more": has_more}
+
+
+def paginate_query(
+    order: KeysetOrder,
+    kind: str,
+    after: Optional[str]
+) -> Tuple[Optional[str], List[Any], str]:
+    """
+    Resolve the cursor condition and ORDER BY clause for one page.
+
+    Args:
+        order: Keyset ordering
+        kind: Listing and ordering name for the cursor
+        after: Cursor from the previous page, or None for the first page
+
+    Returns:
+        Tuple of (condition or None, condition parameters, ORDER BY clause)
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    condition = None
+    params: List[Any] = []
+    if after:
+        condition, params = keyset_condition(order, decode_cursor(after, kind, len(order)))
+    return condition, params, order_clause(order)
+
+
+# ---------------------------------------------------------------------------
+# Keyset orderings of the paginated listings
+# ---------------------------------------------------------------------------
+
+PRIORITY_RANKS = {"critical": 4, "high": 3, "medium": 2, "low": 1}
+
+_PRIORITY_RANK_SQL = """CASE t.priority
+                        WHEN 'critical' THEN 4
+                        WHEN 'high' THEN 3
+                        WHEN 'medium' THEN 2
+                        WHEN 'low' THEN 1
+                        ELSE 0
+                    END"""
+
+# query_tasks() orderings; the key always ends with the unique t.id
+TASK_ORDERS: Dict[Optional[str], KeysetOrder] = {
+    None: (("t.created_at", True), ("t.id", True)),
+    "created_at_asc": (("t.created_at", False), ("t.id", False)),
+    "priority": ((_PRIORITY_RANK_SQL, True), ("t.created_at", True), ("t.id", True)),
+    "priority_asc": ((_PRIORITY_RANK_SQL, False), ("t.created_at", True), ("t.id", True)),
+}
+
+CHANGE_HISTORY_ORDER: KeysetOrder = (("created_at", True), ("id", True))
+ACTIVITY_FEED_ORDER: KeysetOrder = (("ch.created_at", False), ("ch.id", False))
+
+
+def task_cursor_kind(order_by: Optional[str]) -> str:
+    """Cursor kind for a query_tasks() ordering."""
+    return f"tasks:{order_by or 'created_at'}"
+
+
+def task_cursor_key(order_by: Optional[str]) -> Callable[[Dict[str, Any]], List[Any]]:
+    """Function returning the keyset values of a task row for a query_tasks() ordering."""
+    if order_by in ("priority", "priority_asc"):
+        return lambda task: [PRIORITY_RANKS.get(task.get("priority"), 0), task["created_at"], task["id"]]
+    return lambda task: [task["created_at"], task["id"]]
+
+
+def created_id_key(row: Dict[str, Any]) -> List[Any]:
+    """Keyset values of a row ordered by (created_at, id)."""
+    return [row["created_at"], row["id"]]
@@ -8,6 +8,8 @@ import sqlite3
 import logging
 from typing import Optional, List, Dict, Any, Tuple, Callable
 
+from todorama.storage.search_index import fts5_rank
+
 logger = logging.getLogger(__name__)
 
 
@@ -362,7 +364,7 @@ class TaskQueryBuilder:
                     FROM tasks
                     WHERE fts_vector @@ to_tsquery('english', %s)
                         AND organization_id = %s
-                    ORDER BY ts_rank(fts_vector, to_tsquery('english', %s)) DESC, created_at DESC
+                    ORDER BY ts_rank(fts_vector, to_tsquery('english', %s)) DESC, created_at DESC, id DESC
                     LIMIT %s
                 """
                 return query_sql, [tsquery, organization_id, tsquery, limit], False
@@ -371,29 +373,29 @@ class TaskQueryBuilder:
                     SELECT *
                     FROM tasks
                     WHERE fts_vector @@ to_tsquery('english', %s)
-                    ORDER BY ts_rank(fts_vector, to_tsquery('english', %s)) DESC, created_at DESC
+                    ORDER BY ts_rank(fts_vector, to_tsquery('english', %s)) DESC, created_at DESC, id DESC
                     LIMIT %s
                 """
                 return query_sql, [tsquery, tsquery, limit], False
         else:
             # SQLite uses FTS5
             if organization_id is not None:
-                query_sql = """
+                query_sql = f"""
                     SELECT t.*
                     FROM tasks t
                     JOIN tasks_fts ON t.id = tasks_fts.rowid
                     WHERE tasks_fts MATCH ? AND t.organization_id = ?
-                    ORDER BY bm25(tasks_fts) ASC, t.created_at DESC
+                    ORDER BY {fts5_rank()} ASC, t.created_at DESC, t.id DESC
                     LIMIT ?
                 """
                 return query_sql, [search_query, organization_id, limit], True
             else:
-                query_sql = """
+                query_sql = f"""
                     SELECT t.*
                     FROM tasks t
                     JOIN tasks_fts ON t.id = tasks_fts.rowid
                     WHERE tasks_fts MATCH ?
-                    ORDER BY bm25(tasks_fts) ASC, t.created_at DESC
+                    ORDER BY {fts5_rank()} ASC, t.created_at DESC, t.id DESC
                     LIMIT ?
                 """
                 return query_sql, [search_query, limit], True
@@ -7,6 +7,8 @@ to improve separation of concerns and maintainability.
 import logging
 from typing import Optional, List, Dict, Any, Callable
 
+from todorama.storage.dependency_graph import find_dependency_path, find_dependency_cycles
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,97 +61,30 @@ class RelationshipRepository:
         Returns:
             True if a circular dependency would be created, False otherwise
         """
-        # Use BFS to check if blocker_task_id (or anything it's blocked by) can reach blocked_task_id
-        visited = set()
-        queue = [blocker_task_id]
+        return find_dependency_path(
+            cursor, blocker_task_id, blocked_task_id,
+            exclude_parent_task_id=exclude_parent_task_id,
+            exclude_child_task_id=exclude_child_task_id,
+            execute=self._execute_with_logging
+        ) is not None
+    
+    def check_circular_dependencies(self, relationships: List[tuple]) -> List[Optional[List[int]]]:
+        """
+        Validate many relationships for circular dependencies at once.
         
-        while queue:
-            current_task_id = queue.pop(0)
-            
-            # If we reach the blocked task, we have a cycle
-            if current_task_id == blocked_task_id:
-                return True
-            
-            if current_task_id in visited:
-                continue
-            visited.add(current_task_id)
-            
-            # Find all tasks that this task is blocked by
-            # For blocked_by: parent is blocked by child
-            # So if A is blocked by B: parent=A, child=B means B blocks A
-            # To find what blocks current_task_id, look for relationships where
-            # parent_task_id = current_task_id, which gives us child_task_id (the blocker)
-            # Exclude the relationship we're checking if provided
-            if exclude_parent_task_id is not None and exclude_child_task_id is not None:
-                query = """
-                    SELECT child_task_id
-                    FROM task_relationships
-                    WHERE parent_task_id = ? AND relationship_type = 'blocked_by'
-                    AND NOT (parent_task_id = ? AND child_task_id = ?)
-                """
-                params = (current_task_id, exclude_parent_task_id, exclude_child_task_id)
-            else:
-                query = """
-                    SELECT child_task_id
-                    FROM task_relationships
-                    WHERE parent_task_id = ? AND relationship_type = 'blocked_by'
-                """
-                params = (current_task_id,)
-            
-            self._execute_with_logging(cursor, query, params)
-            blocking_tasks = [row[0] for row in cursor.fetchall()]
-            
-            # Also find what current_task_id blocks (tasks that are blocked by current_task_id)
-            # Look for relationships where child_task_id = current_task_id
-            # This gives us parent_task_id (tasks blocked by current_task_id)
-            if exclude_parent_task_id is not None and exclude_child_task_id is not None:
-                query = """
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocked_by'
-                    AND NOT (parent_task_id = ? AND child_task_id = ?)
-                """
-                params = (current_task_id, exclude_parent_task_id, exclude_child_task_id)
-            else:
-                query = """
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocked_by'
-                """
-                params = (current_task_id,)
-            
-            self._execute_with_logging(cursor, query, params)
-            # Tasks blocked by current_task_id (current_task_id blocks these)
-            blocked_by_current = [row[0] for row in cursor.fetchall()]
-            
-            # Also check for "blocking" relationships (which are inverse of blocked_by)
-            # Exclude the relationship we're checking if provided
-            if exclude_parent_task_id is not None and exclude_child_task_id is not None:
-                query = """
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocking'
-                    AND NOT (parent_task_id = ? AND child_task_id = ?)
-                """
-                params = (current_task_id, exclude_parent_task_id, exclude_child_task_id)
-            else:
-                query = """
-                    SELECT parent_task_id
-                    FROM task_relationships
-                    WHERE child_task_id = ? AND relationship_type = 'blocking'
-                """
-                params = (current_task_id,)
-            
-            self._execute_with_logging(cursor, query, params)
-            # "blocking" relationship means: if A blocks B, then B is blocked_by A
-            blocking_from_blocking = [row[0] for row in cursor.fetchall()]
-            
-            # Add all blocking tasks to the queue (what blocks current, and what current blocks)
-            for task_id in blocking_tasks + blocked_by_current + blocking_from_blocking:
-                if task_id not in visited:
-                    queue.append(task_id)
+        Args:
+            relationships: List of (parent_task_id, child_task_id, relationship_type)
         
-        return False
+        Returns:
+            List aligned with relationships: None if the relationship can be created,
+            otherwise the task IDs forming the cycle it would close
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            return find_dependency_cycles(cursor, relationships, execute=self._execute_with_logging)
+        finally:
+            self.adapter.close(conn)
     
     def create(
         self,
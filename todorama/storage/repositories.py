@@ -10,7 +10,7 @@ services to interact with data, enabling better separation of concerns,
 testability, and maintainability.
 """
 
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
 from datetime import datetime
 
 if TYPE_CHECKING:
@@ -88,6 +88,20 @@ class TaskRepository:
         """
         return self.db.get_task(task_id, organization_id=organization_id)
 
+    def get_by_ids(
+        self, task_ids: Iterable[int], organization_id: Optional[int] = None
+    ) -> Dict[int, Dict[str, Any]]:
+        """Get several tasks by ID in one query.
+        
+        Args:
+            task_ids: Task IDs
+            organization_id: Optional organization ID for multi-tenancy filtering
+            
+        Returns:
+            Dictionary of task ID -> task dictionary for the tasks found
+        """
+        return self.db.get_tasks(task_ids, organization_id=organization_id)
+
     def list(
         self,
         task_type: Optional[str] = None,
@@ -98,6 +112,7 @@ class TaskRepository:
         organization_id: Optional[int] = None,
         limit: int = 100,
         order_by: Optional[str] = None,
+        after: Optional[str] = None,
     ) -> List[Dict[str, Any]]:
         """List tasks with filters.
         
@@ -110,6 +125,7 @@ class TaskRepository:
             organization_id: Optional organization ID for multi-tenancy
             limit: Maximum number of results
             order_by: Optional ordering (e.g., 'priority', 'created_at')
+            after: Optional cursor from a previous page (keyset pagination)
             
         Returns:
             List of task dictionaries
@@ -123,6 +139,7 @@ class TaskRepository:
             organization_id=organization_id,
             limit=limit,
             order_by=order_by,
+            after=after,
         )
 
     def search(
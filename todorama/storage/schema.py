@@ -8,7 +8,12 @@ import sqlite3
 import logging
 from typing import Callable, Any
 
+from todorama.blocked_index import install_blocked_index_feed
 from todorama.db_adapter import BaseDatabaseAdapter
+from todorama.storage.memory_search import install_search_feed
+from todorama.storage.search_index import install_search_index
+from todorama.storage.task_counters import install_task_counters
+from todorama.storage.task_timestamps import install_timestamp_normalization
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +27,8 @@ class SchemaManager:
         adapter: BaseDatabaseAdapter,
         get_connection: Callable[[], Any],
         normalize_sql: Callable[[str], str],
-        execute_with_logging: Callable[[Any, str, tuple], Any]
+        execute_with_logging: Callable[[Any, str, tuple], Any],
+        search_feed: bool = False
     ):
         """
         Initialize SchemaManager.
@@ -33,12 +39,17 @@ class SchemaManager:
             get_connection: Function to get database connection
             normalize_sql: Function to normalize SQL queries
             execute_with_logging: Function to execute queries with logging
+            search_feed: Install the task_search_feed used by the in-memory search index
         """
         self.db_type = db_type
         self.adapter = adapter
         self._get_connection = get_connection
         self._normalize_sql = normalize_sql
         self._execute_with_logging = execute_with_logging
+        self.task_counters_installed = False
+        self.search_index_installed = False
+        self.search_feed = search_feed
+        self.search_feed_installed = False
     
     def initialize_schema(self):
         """
@@ -77,6 +88,17 @@ class SchemaManager:
             
             # Setup full-text search
             self._setup_fulltext_search(cursor)
+            if self.search_feed:
+                self._create_search_feed_schema(cursor)
+            
+            # Trigger-maintained analytics rollup
+            self._create_task_counters_schema(cursor)
+            
+            # Feed of hierarchy and blocked-status changes for the blocked ancestor index
+            self._create_blocked_index_feed_schema(cursor)
+            
+            # One updated_at text format, so the stale-task cutoff can compare as text
+            self._create_timestamp_normalization(cursor)
             
             conn.commit()
             logger.info("Database schema initialized")
@@ -308,7 +330,7 @@ class SchemaManager:
         self._execute_with_logging(cursor, query)
     
     def _create_webhooks_schema(self, cursor):
-        """Create webhooks and webhook_deliveries tables."""
+        """Create webhooks, webhook_deliveries and webhook_outbox tables."""
         # Webhooks table
         query = self._normalize_sql("""
             CREATE TABLE IF NOT EXISTS webhooks (
@@ -344,6 +366,20 @@ class SchemaManager:
             )
         """)
         self._execute_with_logging(cursor, query)
+        
+        # Deliveries still pending at shutdown, replayed on the next start
+        query = self._normalize_sql("""
+            CREATE TABLE IF NOT EXISTS webhook_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                webhook_id INTEGER NOT NULL,
+                event_type TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                attempt_number INTEGER NOT NULL DEFAULT 1,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (webhook_id) REFERENCES webhooks(id) ON DELETE CASCADE
+            )
+        """)
+        self._execute_with_logging(cursor, query)
     
     def _create_versions_schema(self, cursor):
         """Create task versions table."""
@@ -610,6 +646,9 @@ class SchemaManager:
             "CREATE INDEX IF NOT EXISTS idx_change_history_task ON change_history(task_id)",
             "CREATE INDEX IF NOT EXISTS idx_change_history_agent ON change_history(agent_id)",
             "CREATE INDEX IF NOT EXISTS idx_change_history_created ON change_history(created_at)",
+            # Keyset pagination on (created_at, id)
+            "CREATE INDEX IF NOT EXISTS idx_change_history_created_id ON change_history(created_at, id)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_created_id ON tasks(created_at, id)",
             "CREATE INDEX IF NOT EXISTS idx_task_versions_task ON task_versions(task_id)",
             "CREATE INDEX IF NOT EXISTS idx_task_versions_number ON task_versions(task_id, version_number)",
             "CREATE INDEX IF NOT EXISTS idx_tags_name ON tags(name)",
@@ -653,6 +692,7 @@ class SchemaManager:
             "CREATE INDEX IF NOT EXISTS idx_tasks_project_status ON tasks(project_id, task_status)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_project_status_type ON tasks(project_id, task_status, task_type)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_status_priority ON tasks(task_status, priority)",
+            "CREATE INDEX IF NOT EXISTS idx_tasks_status_updated ON tasks(task_status, updated_at)",
             "CREATE INDEX IF NOT EXISTS idx_relationships_parent_type ON task_relationships(parent_task_id, relationship_type)",
             "CREATE INDEX IF NOT EXISTS idx_relationships_child_type ON task_relationships(child_task_id, relationship_type)",
             "CREATE INDEX IF NOT EXISTS idx_task_tags_task_tag ON task_tags(task_id, tag_id)",
@@ -677,34 +717,28 @@ class SchemaManager:
         for index_query in indexes:
             self._execute_with_logging(cursor, index_query)
     
+    def _create_task_counters_schema(self, cursor):
+        """Create the task_counters rollup and the triggers that maintain it."""
+        self.task_counters_installed = install_task_counters(
+            cursor, self.db_type, execute=self._execute_with_logging
+        )
+    
+    def _create_blocked_index_feed_schema(self, cursor):
+        """Create the blocked_index_feed table and the triggers that fill it."""
+        install_blocked_index_feed(cursor, self.db_type, execute=self._execute_with_logging)
+    
+    def _create_timestamp_normalization(self, cursor):
+        """Create the triggers that keep tasks.updated_at in one text format (SQLite)."""
+        install_timestamp_normalization(cursor, self.db_type, execute=self._execute_with_logging)
+    
+    def _create_search_feed_schema(self, cursor):
+        """Create the task_search_feed table and the triggers that fill it."""
+        self.search_feed_installed = install_search_feed(
+            cursor, self.db_type, execute=self._execute_with_logging
+        )
+    
     def _setup_fulltext_search(self, cursor):
-        """Setup full-text search for tasks."""
-        if self.db_type == "sqlite":
-            # FTS5 virtual table for SQLite
-            try:
-                self._execute_with_logging(cursor, """
-                    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
-                        title,
-                        task_instruction,
-                        notes,
-                        content='tasks',
-                        content_rowid='id'
-                    )
-                """)
-                # Rebuild FTS5 index if needed
-                try:
-                    self._execute_with_logging(cursor, "SELECT COUNT(*) FROM tasks_fts")
-                    count = cursor.fetchone()[0] if hasattr(cursor.fetchone(), '__getitem__') else cursor.fetchone()['count']
-                    if count == 0:
-                        self._execute_with_logging(cursor, "SELECT COUNT(*) FROM tasks")
-                        task_count = cursor.fetchone()[0] if hasattr(cursor.fetchone(), '__getitem__') else cursor.fetchone()['count']
-                        if task_count > 0:
-                            self._execute_with_logging(cursor, "INSERT INTO tasks_fts(tasks_fts) VALUES('rebuild')")
-                except Exception:
-                    pass
-            except Exception:
-                logger.warning("FTS5 not available, full-text search will use fallback")
-        else:
-            # PostgreSQL full-text search
-            if self.adapter.supports_fulltext_search():
-                self.adapter.create_fulltext_index(cursor, "tasks", ["title", "task_instruction", "notes"])
+        """Setup the full-text index over tasks and the triggers that maintain it."""
+        self.search_index_installed = install_search_index(
+            cursor, self.db_type, self.adapter, execute=self._execute_with_logging
+        )
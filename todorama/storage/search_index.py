@@ -0,0 +1,226 @@
+"""
+Trigger-maintained full-text search index for tasks.
+
+On SQLite, tasks_fts is an external-content FTS5 table over title,
+task_instruction and notes. It stores only the index, so it has to be told
+about every write. Triggers on tasks do that inside the writing transaction:
+an INSERT adds the new row, a DELETE removes the old one, and an UPDATE of
+any indexed column removes the old text and adds the new. create_task(),
+update_task(), bulk operations, deletes and manual SQL all keep the index
+current, and search_tasks() can trust an empty result.
+
+On PostgreSQL the adapter already maintains tasks.fts_vector with a BEFORE
+INSERT OR UPDATE trigger and a GIN index; rows that predate the column are
+backfilled here.
+
+Queries are built from the user's text instead of being passed through, so
+FTS5 and tsquery syntax errors cannot happen:
+
+- bare words match as prefixes ("auth" finds "authentication");
+- "double quoted" text matches as an exact phrase, and "quoted text"* makes
+  the last word of the phrase a prefix;
+- words joined by punctuation ("test@example") match as a phrase;
+- all terms must match.
+
+FTS5 results are ranked by bm25() with SEARCH_COLUMN_WEIGHTS, so a title
+match outweighs one in the notes; ties go to the newest task.
+
+optimize_search_index() merges FTS5 segments (or cleans the GIN pending
+list) and, with rebuild=True, rebuilds the index from tasks. It is only
+needed after bulk imports or manual SQL with triggers disabled.
+"""
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ("title", "task_instruction", "notes")
+
+# bm25() weight of a match in each SEARCH_COLUMNS column: the title says what
+# a task is about, notes are incidental
+SEARCH_COLUMN_WEIGHTS = (10.0, 5.0, 1.0)
+
+# Markers around matched terms in highlighted_title and snippet
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_WORDS = 16
+
+_TERM_PATTERN = re.compile(r'"([^"]*)"(\*?)|(\S+)')
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_FTS5_COLUMNS = ", ".join(SEARCH_COLUMNS)
+
+_FTS5_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+        {_FTS5_COLUMNS},
+        content='tasks',
+        content_rowid='id'
+    )
+"""
+
+
+def _fts_row(row: str) -> str:
+    return ", ".join(f"{row}.{column}" for column in SEARCH_COLUMNS)
+
+
+_SQLITE_TRIGGERS = {
+    "tasks_fts_after_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_after_insert AFTER INSERT ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (rowid, {_FTS5_COLUMNS}) VALUES (NEW.id, {_fts_row("NEW")});
+        END
+    """,
+    "tasks_fts_after_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_after_delete AFTER DELETE ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, {_FTS5_COLUMNS}) VALUES ('delete', OLD.id, {_fts_row("OLD")});
+        END
+    """,
+    "tasks_fts_after_update": f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_after_update AFTER UPDATE OF {_FTS5_COLUMNS} ON tasks
+        BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, {_FTS5_COLUMNS}) VALUES ('delete', OLD.id, {_fts_row("OLD")});
+            INSERT INTO tasks_fts (rowid, {_FTS5_COLUMNS}) VALUES (NEW.id, {_fts_row("NEW")});
+        END
+    """,
+}
+
+
+def _run(cursor: Any, query: str, params: tuple = (), execute: Optional[Callable] = None) -> None:
+    if execute is not None:
+        execute(cursor, query, params)
+    elif params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+
+def parse_search_terms(text: str) -> List[Tuple[Tuple[str, ...], bool]]:
+    """
+    Split search text into terms.
+
+    Args:
+        text: Search text as typed by the user
+
+    Returns:
+        List of (tokens, prefix) pairs. A term matches when its tokens appear
+        in order; prefix means the last token may be the start of a word.
+        Terms without word characters are dropped.
+    """
+    terms = []
+    for phrase, phrase_star, word in _TERM_PATTERN.findall(text):
+        if word:
+            tokens, prefix = _TOKEN_PATTERN.findall(word), True
+        else:
+            tokens, prefix = _TOKEN_PATTERN.findall(phrase), bool(phrase_star)
+        if tokens:
+            terms.append((tuple(tokens), prefix))
+    return terms
+
+
+def fts5_query(terms: List[Tuple[Tuple[str, ...], bool]]) -> str:
+    """Build an FTS5 MATCH expression requiring every term."""
+    return " ".join(
+        '"' + " ".join(tokens) + '"' + ("*" if prefix else "")
+        for tokens, prefix in terms
+    )
+
+
+def fts5_rank() -> str:
+    """SQL expression ranking tasks_fts matches, lower is better."""
+    return "bm25(tasks_fts, " + ", ".join(str(weight) for weight in SEARCH_COLUMN_WEIGHTS) + ")"
+
+
+def tsquery(terms: List[Tuple[Tuple[str, ...], bool]]) -> str:
+    """Build a to_tsquery() expression requiring every term."""
+    parts = []
+    for tokens, prefix in terms:
+        lexemes = list(tokens)
+        if prefix:
+            lexemes[-1] += ":*"
+        parts.append("(" + " <-> ".join(lexemes) + ")" if len(lexemes) > 1 else lexemes[0])
+    return " & ".join(parts)
+
+
+def _existing_triggers(cursor: Any, execute: Optional[Callable]) -> set:
+    _run(cursor, "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'tasks_fts_%'", execute=execute)
+    return {row["name"] for row in cursor.fetchall()}
+
+
+def install_search_index(cursor: Any, db_type: str, adapter: Any, execute: Optional[Callable] = None) -> bool:
+    """
+    Create the full-text index over tasks and the triggers that maintain it.
+
+    The index is rebuilt from tasks whenever a trigger was missing, so rows
+    written before the triggers existed become searchable.
+
+    Args:
+        cursor: Database cursor inside the schema transaction
+        db_type: 'sqlite' or 'postgresql'
+        adapter: Database adapter (creates the PostgreSQL tsvector index)
+        execute: Optional function(cursor, query, params) used to run queries
+
+    Returns:
+        True if full-text search is available
+    """
+    if db_type == "postgresql":
+        if not adapter.supports_fulltext_search():
+            return False
+        adapter.create_fulltext_index(cursor, "tasks", list(SEARCH_COLUMNS))
+        # The BEFORE UPDATE trigger computes fts_vector for rows added before the column
+        _run(cursor, "UPDATE tasks SET fts_vector = NULL WHERE fts_vector IS NULL", execute=execute)
+        return True
+
+    try:
+        _run(cursor, _FTS5_TABLE, execute=execute)
+    except Exception as e:
+        logger.warning(f"FTS5 not available, full-text search will use fallback: {e}")
+        return False
+    existing = _existing_triggers(cursor, execute)
+    for name, ddl in _SQLITE_TRIGGERS.items():
+        if name not in existing:
+            _run(cursor, ddl, execute=execute)
+    if not set(_SQLITE_TRIGGERS) <= existing:
+        # Writes made while a trigger was missing were not indexed
+        _run(cursor, "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')", execute=execute)
+    return True
+
+
+def optimize_search_index(
+    cursor: Any,
+    db_type: str,
+    rebuild: bool = False,
+    execute: Optional[Callable] = None
+) -> Dict[str, Any]:
+    """
+    Compact the full-text index, optionally rebuilding it from tasks first.
+
+    Must run inside a write transaction.
+
+    Args:
+        cursor: Database cursor inside a write transaction
+        db_type: 'sqlite' or 'postgresql'
+        rebuild: Re-index every task before compacting
+        execute: Optional function(cursor, query, params) used to run queries
+
+    Returns:
+        Dictionary with the actions taken and the number of indexed tasks
+    """
+    actions = []
+    if db_type == "postgresql":
+        if rebuild:
+            _run(cursor, "UPDATE tasks SET fts_vector = NULL", execute=execute)
+            actions.append("rebuild")
+        _run(cursor, "SELECT gin_clean_pending_list('idx_tasks_fts'::regclass)", execute=execute)
+        actions.append("optimize")
+        _run(cursor, "SELECT COUNT(*) AS indexed FROM tasks WHERE fts_vector IS NOT NULL", execute=execute)
+    else:
+        if rebuild:
+            _run(cursor, "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')", execute=execute)
+            actions.append("rebuild")
+        _run(cursor, "INSERT INTO tasks_fts (tasks_fts) VALUES ('optimize')", execute=execute)
+        actions.append("optimize")
+        _run(cursor, "SELECT COUNT(*) AS indexed FROM tasks", execute=execute)
+    return {"actions": actions, "indexed": cursor.fetchone()["indexed"]}
@@ -0,0 +1,213 @@
+"""
+Single-pass task aggregates for the analytics endpoints.
+
+get_task_statistics(), get_completion_rates() and get_visualization_data()
+used to scan the tasks table once per status, per type and per breakdown (up
+to ten COUNT queries per call). They now share one grouped query:
+
+    SELECT task_status, task_type, priority, project_id, COUNT(*)
+    FROM tasks WHERE ... GROUP BY task_status, task_type, priority, project_id
+
+and derive every count, breakdown and rate from the grouped rows in Python.
+The result has at most one row per combination of those four columns, so it
+stays small however many tasks there are.
+
+TaskAggregateCache optionally keeps the grouped rows for a few seconds, keyed
+by the filter tuple, because dashboards poll these endpoints continuously.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+TASK_STATUSES = ("available", "in_progress", "complete", "blocked", "cancelled")
+TASK_TYPES = ("concrete", "abstract", "epic")
+
+
+class TaskGroup(NamedTuple):
+    """Number of tasks sharing one (status, type, priority, project) combination."""
+    task_status: Optional[str]
+    task_type: Optional[str]
+    priority: Optional[str]
+    project_id: Optional[int]
+    count: int
+
+
+class TaskAggregates:
+    """Grouped task counts with the breakdowns the analytics endpoints need."""
+
+    def __init__(self, groups: Sequence[TaskGroup]):
+        self.groups = list(groups)
+
+    @property
+    def total(self) -> int:
+        """Total number of tasks."""
+        return sum(group.count for group in self.groups)
+
+    def count_by(self, field: str, task_status: Optional[str] = None) -> Dict[Any, int]:
+        """
+        Count tasks per value of one column.
+
+        Args:
+            field: 'task_status', 'task_type', 'priority' or 'project_id'
+            task_status: Only count tasks with this status
+
+        Returns:
+            Dictionary mapping each value present to its task count
+        """
+        counts: Dict[Any, int] = {}
+        for group in self.groups:
+            if task_status is not None and group.task_status != task_status:
+                continue
+            key = getattr(group, field)
+            counts[key] = counts.get(key, 0) + group.count
+        return counts
+
+    def task_statistics(self, project_id: Optional[int] = None) -> Dict[str, Any]:
+        """Build the get_task_statistics() result."""
+        total = self.total
+        by_status = self.count_by("task_status")
+        by_type = self.count_by("task_type")
+        completed = by_status.get("complete", 0)
+        completion_rate = (completed / total) * 100 if total > 0 else 0.0
+        return {
+            "total": total,
+            "by_status": {status: by_status.get(status, 0) for status in TASK_STATUSES},
+            "by_type": {task_type: by_type.get(task_type, 0) for task_type in TASK_TYPES},
+            "by_project": self.count_by("project_id") if project_id is None else {project_id: total},
+            "completion_rate": round(completion_rate, 2)
+        }
+
+    def completion_rates(self) -> Dict[str, Any]:
+        """Build the get_completion_rates() result."""
+        total_tasks = self.total
+        status_breakdown = self.count_by("task_status")
+        completed_tasks = status_breakdown.get("complete", 0)
+        completion_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0
+
+        completed_by_type = self.count_by("task_type", task_status="complete")
+        tasks_by_type = {}
+        for task_type, count in self.count_by("task_type").items():
+            completed = completed_by_type.get(task_type, 0)
+            tasks_by_type[task_type] = {
+                "total": count,
+                "completed": completed,
+                "completion_percentage": (completed / count * 100) if count > 0 else 0.0
+            }
+
+        return {
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "completion_percentage": round(completion_percentage, 2),
+            "status_breakdown": status_breakdown,
+            "tasks_by_type": tasks_by_type
+        }
+
+    def distributions(self) -> Dict[str, Dict[Any, int]]:
+        """Build the status/type/priority distributions of get_visualization_data()."""
+        return {
+            "status_distribution": self.count_by("task_status"),
+            "type_distribution": self.count_by("task_type"),
+            "priority_distribution": self.count_by("priority")
+        }
+
+
+class TaskAggregateCache:
+    """Thread-safe short-TTL cache of grouped task rows keyed by filter tuple."""
+
+    def __init__(self, ttl: float = 0.0):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds grouped rows are reused (0 or less disables caching)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[Any, ...], Tuple[float, List[TaskGroup]]] = {}
+        self._metrics = {"hits": 0, "misses": 0}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether grouped rows are cached at all."""
+        return self.ttl > 0
+
+    def get(self, key: Tuple[Any, ...]) -> Optional[List[TaskGroup]]:
+        """Get cached grouped rows, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self._entries.pop(key, None)
+                self._metrics["misses"] += 1
+                return None
+            self._metrics["hits"] += 1
+            return entry[1]
+
+    def put(self, key: Tuple[Any, ...], groups: List[TaskGroup]) -> None:
+        """Cache grouped rows."""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            # Drop expired entries so polling with many distinct filters cannot grow the cache
+            for stale_key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+                del self._entries[stale_key]
+            self._entries[key] = (now + self.ttl, groups)
+
+    def clear(self) -> None:
+        """Drop all cached grouped rows."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["entries"] = len(self._entries)
+            return metrics
+
+
+def load_task_aggregates(
+    cursor: Any,
+    conditions: Sequence[str],
+    params: Sequence[Any],
+    execute: Optional[Callable[[Any, str, tuple], Any]] = None,
+    cache: Optional[TaskAggregateCache] = None
+) -> TaskAggregates:
+    """
+    Count tasks grouped by status, type, priority and project in one query.
+
+    Args:
+        cursor: Database cursor
+        conditions: SQL conditions on the tasks table, joined with AND
+        params: Parameters for the conditions
+        execute: Optional function(cursor, query, params) used to run the query
+        cache: Optional cache consulted before querying
+
+    Returns:
+        TaskAggregates for the matching tasks
+    """
+    key = (tuple(conditions), tuple(params))
+    if cache is not None:
+        groups = cache.get(key)
+        if groups is not None:
+            return TaskAggregates(groups)
+
+    where_clause = "WHERE " + " AND ".join(conditions) if conditions else ""
+    query = f"""
+        SELECT task_status, task_type, priority, project_id, COUNT(*) AS count
+        FROM tasks
+        {where_clause}
+        GROUP BY task_status, task_type, priority, project_id
+    """
+    if execute is not None:
+        execute(cursor, query, tuple(params))
+    else:
+        cursor.execute(query, tuple(params))
+    groups = [
+        TaskGroup(row["task_status"], row["task_type"], row["priority"], row["project_id"], row["count"])
+        for row in cursor.fetchall()
+    ]
+
+    if cache is not None:
+        cache.put(key, groups)
+    return TaskAggregates(groups)
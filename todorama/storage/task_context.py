@@ -0,0 +1,90 @@
+"""
+Per-task context cache for get_task_context.
+
+get_task_context is the tool agents call most. Assembling a context takes a
+recursive CTE over task_relationships plus three more queries, so an agent
+re-reading the same task pays that every time. TaskContextCache keeps
+assembled contexts for a few seconds, keyed by task ID.
+
+Each entry is stored with a stamp taken from the lineage query every call
+runs anyway: the raw rows of the task and its ancestors, the task's newest
+change_history ID, its project's updated_at, and which of those tasks the
+blocked-subtask overlay marks (from the blocked ancestor index, which follows
+the whole subtree through its feed). A cached context is only served while the
+stamp still matches, so a write to the task (status, lock, fields, updates,
+history), to any ancestor, to the parent relationships, or to a subtask's
+blocked status invalidates it at once, whichever code path or process made
+it. A hit skips the project, updates and change history queries.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TaskContextCache:
+    """Thread-safe LRU of assembled task contexts, validated by a per-task stamp."""
+
+    def __init__(self, ttl: float = 0.0, max_size: int = 1000):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Seconds a context may be reused (0 disables caching)
+            max_size: Maximum number of tasks kept
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, Optional[int]], Tuple[float, Hashable, Dict[str, Any]]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether contexts are cached at all."""
+        return self.ttl > 0
+
+    def get(self, task_id: int, organization_id: Optional[int], stamp: Hashable) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached context if it is fresh and the task has not changed.
+
+        Args:
+            task_id: Task ID
+            organization_id: Organization filter the context was loaded with
+            stamp: Current stamp of the task
+
+        Returns:
+            A copy of the cached context, or None
+        """
+        key = (task_id, organization_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, cached_stamp, context = entry
+            if expires_at <= time.monotonic() or cached_stamp != stamp:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(context)
+
+    def put(self, task_id: int, organization_id: Optional[int], stamp: Hashable, context: Dict[str, Any]) -> None:
+        """Cache a context under the stamp it was loaded with."""
+        if not self.enabled:
+            return
+        key = (task_id, organization_id)
+        entry = (time.monotonic() + self.ttl, stamp, copy.deepcopy(context))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, task_id: Optional[int] = None) -> None:
+        """Drop one task's contexts, or every context if task_id is None."""
+        with self._lock:
+            if task_id is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == task_id]:
+                    del self._entries[key]
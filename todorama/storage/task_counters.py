@@ -0,0 +1,302 @@
+"""
+Incrementally maintained task counters for dashboard analytics.
+
+task_counters holds one row per (organization, project, status, type,
+priority) combination with the number of tasks in it. Triggers on tasks keep
+it current: every INSERT adds one to the new combination, every DELETE takes
+one from the old combination, and an UPDATE that changes any of the five
+columns moves one task between them. Because the triggers run inside the
+writing transaction, create_task(), lock_task(), complete_task(), the bulk
+operations, deletes and any other write path update the counters atomically
+with the task row.
+
+get_task_statistics(), get_completion_rates() and get_system_status() then
+read a table whose size depends on the number of combinations, not the number
+of tasks. reconcile_task_counters() rebuilds the rollup from tasks if it is
+ever suspected to have drifted (e.g. after restoring a backup taken before
+the triggers existed, or manual edits with triggers disabled).
+
+Unique keys cannot contain NULL on both backends in the same way, so missing
+organization_id/project_id are stored as 0 and a missing priority as ''.
+load_task_counters() maps them back to None.
+"""
+import logging
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from todorama.storage.task_aggregates import TaskAggregates, TaskGroup
+
+logger = logging.getLogger(__name__)
+
+COUNTER_KEY_COLUMNS = ("organization_id", "project_id", "task_status", "task_type", "priority")
+
+# Columns of tasks the triggers read; organization_id and priority are added by Alembic migrations
+_REQUIRED_TASK_COLUMNS = set(COUNTER_KEY_COLUMNS)
+
+_COUNTERS_TABLE = """
+    CREATE TABLE IF NOT EXISTS task_counters (
+        organization_id INTEGER NOT NULL DEFAULT 0,
+        project_id INTEGER NOT NULL DEFAULT 0,
+        task_status TEXT NOT NULL,
+        task_type TEXT NOT NULL,
+        priority TEXT NOT NULL DEFAULT '',
+        task_count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (organization_id, project_id, task_status, task_type, priority)
+    )
+"""
+
+
+def _key_values(row: str) -> str:
+    """SQL expressions for the counter key of the OLD or NEW row."""
+    return (
+        f"COALESCE({row}.organization_id, 0), COALESCE({row}.project_id, 0), "
+        f"{row}.task_status, {row}.task_type, COALESCE({row}.priority, '')"
+    )
+
+
+def _key_match(row: str) -> str:
+    """WHERE clause selecting the counter row of the OLD or NEW row."""
+    return (
+        f"organization_id = COALESCE({row}.organization_id, 0) "
+        f"AND project_id = COALESCE({row}.project_id, 0) "
+        f"AND task_status = {row}.task_status AND task_type = {row}.task_type "
+        f"AND priority = COALESCE({row}.priority, '')"
+    )
+
+
+def _increment(row: str, table_prefix: str = "") -> str:
+    return f"""
+        INSERT INTO task_counters (organization_id, project_id, task_status, task_type, priority, task_count)
+        VALUES ({_key_values(row)}, 1)
+        ON CONFLICT (organization_id, project_id, task_status, task_type, priority)
+        DO UPDATE SET task_count = {table_prefix}task_count + 1
+    """
+
+
+def _decrement(row: str) -> str:
+    return f"UPDATE task_counters SET task_count = task_count - 1 WHERE {_key_match(row)}"
+
+
+def _key_changed(distinct: str) -> str:
+    return " OR ".join(f"OLD.{column} {distinct} NEW.{column}" for column in COUNTER_KEY_COLUMNS)
+
+
+_SQLITE_TRIGGERS = {
+    "task_counters_after_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS task_counters_after_insert AFTER INSERT ON tasks
+        BEGIN
+            {_increment("NEW")};
+        END
+    """,
+    "task_counters_after_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS task_counters_after_delete AFTER DELETE ON tasks
+        BEGIN
+            {_decrement("OLD")};
+        END
+    """,
+    "task_counters_after_update": f"""
+        CREATE TRIGGER IF NOT EXISTS task_counters_after_update
+        AFTER UPDATE OF {", ".join(COUNTER_KEY_COLUMNS)} ON tasks
+        WHEN {_key_changed("IS NOT")}
+        BEGIN
+            {_decrement("OLD")};
+            {_increment("NEW")};
+        END
+    """,
+}
+
+_POSTGRESQL_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION task_counters_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            {_decrement("OLD")};
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            {_increment("NEW", table_prefix="task_counters.")};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+_POSTGRESQL_TRIGGERS = {
+    "task_counters_insert_delete": """
+        CREATE TRIGGER task_counters_insert_delete AFTER INSERT OR DELETE ON tasks
+        FOR EACH ROW EXECUTE FUNCTION task_counters_apply()
+    """,
+    "task_counters_update": f"""
+        CREATE TRIGGER task_counters_update
+        AFTER UPDATE OF {", ".join(COUNTER_KEY_COLUMNS)} ON tasks
+        FOR EACH ROW WHEN ({_key_changed("IS DISTINCT FROM")})
+        EXECUTE FUNCTION task_counters_apply()
+    """,
+}
+
+
+def _run(cursor: Any, query: str, params: tuple = (), execute: Optional[Callable] = None) -> None:
+    if execute is not None:
+        execute(cursor, query, params)
+    elif params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+
+def _task_columns(cursor: Any, db_type: str, execute: Optional[Callable]) -> set:
+    if db_type == "postgresql":
+        _run(cursor, "SELECT column_name FROM information_schema.columns WHERE table_name = 'tasks'", execute=execute)
+        return {row["column_name"] for row in cursor.fetchall()}
+    _run(cursor, "PRAGMA table_info(tasks)", execute=execute)
+    return {row["name"] for row in cursor.fetchall()}
+
+
+def _existing_triggers(cursor: Any, db_type: str, execute: Optional[Callable]) -> set:
+    if db_type == "postgresql":
+        _run(cursor, "SELECT tgname AS name FROM pg_trigger WHERE tgname LIKE 'task_counters_%'", execute=execute)
+    else:
+        _run(cursor, "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'task_counters_%'", execute=execute)
+    return {row["name"] for row in cursor.fetchall()}
+
+
+def install_task_counters(cursor: Any, db_type: str, execute: Optional[Callable] = None) -> bool:
+    """
+    Create the task_counters table and the triggers that maintain it.
+
+    The rollup is seeded from tasks whenever a trigger was missing, so it is
+    correct from the moment it is first read. Nothing is installed while the
+    tasks table lacks organization_id or priority (they are added by Alembic
+    migrations); the next start after the migrations installs it.
+
+    Args:
+        cursor: Database cursor inside the schema transaction
+        db_type: 'sqlite' or 'postgresql'
+        execute: Optional function(cursor, query, params) used to run queries
+
+    Returns:
+        True if the counters are installed and maintained by triggers
+    """
+    missing = _REQUIRED_TASK_COLUMNS - _task_columns(cursor, db_type, execute)
+    if missing:
+        logger.info(f"Task counters not installed; tasks is missing columns: {sorted(missing)}")
+        return False
+
+    _run(cursor, _COUNTERS_TABLE, execute=execute)
+    triggers = _POSTGRESQL_TRIGGERS if db_type == "postgresql" else _SQLITE_TRIGGERS
+    existing = _existing_triggers(cursor, db_type, execute)
+    if db_type == "postgresql":
+        _run(cursor, _POSTGRESQL_FUNCTION, execute=execute)
+    for name, ddl in triggers.items():
+        if name not in existing:
+            _run(cursor, ddl, execute=execute)
+
+    if not set(triggers) <= existing:
+        # Writes made while a trigger was missing were not counted
+        reconcile_task_counters(cursor, db_type, execute)
+    return True
+
+
+def reconcile_task_counters(cursor: Any, db_type: str, execute: Optional[Callable] = None) -> Dict[str, int]:
+    """
+    Rebuild task_counters from a full grouped scan of tasks.
+
+    Must run inside a write transaction. On PostgreSQL tasks is locked in
+    SHARE mode so concurrent writes cannot slip between the scan and the
+    rewrite; on SQLite the write transaction already excludes other writers.
+
+    Args:
+        cursor: Database cursor inside a write transaction
+        db_type: 'sqlite' or 'postgresql'
+        execute: Optional function(cursor, query, params) used to run queries
+
+    Returns:
+        Dictionary with the number of counter rows, total tasks, and how many
+        counter rows were wrong (corrected)
+    """
+    if db_type == "postgresql":
+        _run(cursor, "LOCK TABLE tasks IN SHARE MODE", execute=execute)
+
+    key_columns = ", ".join(COUNTER_KEY_COLUMNS)
+    _run(cursor, f"SELECT {key_columns}, task_count FROM task_counters WHERE task_count <> 0", execute=execute)
+    previous = {
+        tuple(row[column] for column in COUNTER_KEY_COLUMNS): row["task_count"]
+        for row in cursor.fetchall()
+    }
+
+    _run(cursor, """
+        SELECT COALESCE(organization_id, 0) AS organization_id,
+               COALESCE(project_id, 0) AS project_id,
+               task_status, task_type,
+               COALESCE(priority, '') AS priority,
+               COUNT(*) AS task_count
+        FROM tasks
+        GROUP BY COALESCE(organization_id, 0), COALESCE(project_id, 0),
+                 task_status, task_type, COALESCE(priority, '')
+    """, execute=execute)
+    current: Dict[Tuple[Any, ...], int] = {
+        tuple(row[column] for column in COUNTER_KEY_COLUMNS): row["task_count"]
+        for row in cursor.fetchall()
+    }
+
+    _run(cursor, "DELETE FROM task_counters", execute=execute)
+    for key, count in current.items():
+        _run(cursor, f"""
+            INSERT INTO task_counters ({key_columns}, task_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, key + (count,), execute=execute)
+
+    corrected = sum(1 for key in set(previous) | set(current) if previous.get(key, 0) != current.get(key, 0))
+    if corrected:
+        logger.warning(f"Reconciled task counters: corrected {corrected} counter rows")
+    return {
+        "rows": len(current),
+        "total": sum(current.values()),
+        "corrected": corrected
+    }
+
+
+def load_task_counters(
+    cursor: Any,
+    project_id: Optional[int] = None,
+    task_type: Optional[str] = None,
+    organization_id: Optional[int] = None,
+    execute: Optional[Callable[[Any, str, tuple], Any]] = None
+) -> TaskAggregates:
+    """
+    Read grouped task counts from the task_counters rollup.
+
+    Args:
+        cursor: Database cursor
+        project_id: Optional project filter
+        task_type: Optional task type filter
+        organization_id: Optional organization filter
+
+    Returns:
+        TaskAggregates equivalent to load_task_aggregates() with the same filters
+    """
+    conditions = ["task_count > 0"]
+    params = []
+    if project_id is not None:
+        conditions.append("project_id = ?")
+        params.append(project_id)
+    if task_type:
+        conditions.append("task_type = ?")
+        params.append(task_type)
+    if organization_id is not None:
+        conditions.append("organization_id = ?")
+        params.append(organization_id)
+
+    _run(cursor, f"""
+        SELECT task_status, task_type, priority, project_id, SUM(task_count) AS count
+        FROM task_counters
+        WHERE {" AND ".join(conditions)}
+        GROUP BY task_status, task_type, priority, project_id
+    """, tuple(params), execute=execute)
+    return TaskAggregates([
+        TaskGroup(
+            row["task_status"],
+            row["task_type"],
+            row["priority"] or None,
+            row["project_id"] or None,
+            row["count"]
+        )
+        for row in cursor.fetchall()
+    ])
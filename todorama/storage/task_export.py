@@ -0,0 +1,173 @@
+"""
+Chunked task export.
+
+Exports used to load every task with one query and then call
+get_related_tasks() and get_task_tags() for each of them, 2N+1 queries with
+the whole result held in memory.
+
+iter_export_chunks() walks the export in keyset order (created_at DESC,
+id DESC) one chunk at a time. Each chunk is one SELECT on tasks plus one
+batched query for the relationships and one for the tags of every task in
+the chunk, so an export of N tasks costs 3 * ceil(N / chunk_size) queries.
+A connection is held only while a chunk is read: a slow client downloading
+a large export never keeps a read transaction (or a pooled connection) open,
+and only one chunk is in memory at a time.
+"""
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from todorama.storage.pagination import TASK_ORDERS, created_id_key, keyset_condition, order_clause
+
+# Tasks per chunk. The relationship query binds every id twice, so this stays
+# under SQLite's historical limit of 999 parameters per statement.
+EXPORT_CHUNK_SIZE = 400
+
+_EXPORT_ORDER = TASK_ORDERS[None]
+
+
+def export_filters(
+    task_type: Optional[str] = None,
+    task_status: Optional[str] = None,
+    project_id: Optional[int] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None
+) -> Tuple[List[str], List[Any]]:
+    """Build WHERE conditions and parameters for an export."""
+    conditions = []
+    params: List[Any] = []
+    if task_type:
+        conditions.append("t.task_type = ?")
+        params.append(task_type)
+    if task_status:
+        conditions.append("t.task_status = ?")
+        params.append(task_status)
+    if project_id is not None:
+        conditions.append("t.project_id = ?")
+        params.append(project_id)
+    if start_date:
+        conditions.append("t.created_at >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append("t.created_at <= ?")
+        params.append(end_date)
+    return conditions, params
+
+
+def attach_relationships_and_tags(
+    cursor: Any,
+    tasks: List[Dict[str, Any]],
+    execute: Callable[[Any, str, tuple], Any]
+) -> None:
+    """
+    Add "relationships" and "tags" lists to each task with two batched queries.
+
+    Relationships use the export format: type, direction ("parent" when the
+    task is the parent), related_task_id and related_task_title.
+
+    Args:
+        cursor: Database cursor
+        tasks: Task dictionaries to enrich in place
+        execute: Function(cursor, query, params) used to run queries
+    """
+    by_id = {task["id"]: task for task in tasks}
+    for task in tasks:
+        task["relationships"] = []
+        task["tags"] = []
+    if not by_id:
+        return
+    ids = tuple(by_id)
+    placeholders = ",".join("?" for _ in ids)
+
+    execute(cursor, f"""
+        SELECT tr.parent_task_id, tr.child_task_id, tr.relationship_type,
+               t1.title AS parent_title, t2.title AS child_title
+        FROM task_relationships tr
+        JOIN tasks t1 ON tr.parent_task_id = t1.id
+        JOIN tasks t2 ON tr.child_task_id = t2.id
+        WHERE tr.parent_task_id IN ({placeholders}) OR tr.child_task_id IN ({placeholders})
+        ORDER BY tr.id
+    """, ids + ids)
+    for rel in cursor.fetchall():
+        parent = by_id.get(rel["parent_task_id"])
+        if parent is not None:
+            parent["relationships"].append({
+                "type": rel["relationship_type"],
+                "direction": "parent",
+                "related_task_id": rel["child_task_id"],
+                "related_task_title": rel["child_title"]
+            })
+        child = by_id.get(rel["child_task_id"])
+        if child is not None:
+            child["relationships"].append({
+                "type": rel["relationship_type"],
+                "direction": "child",
+                "related_task_id": rel["parent_task_id"],
+                "related_task_title": rel["parent_title"]
+            })
+
+    execute(cursor, f"""
+        SELECT tt.task_id, tg.id, tg.name
+        FROM task_tags tt
+        JOIN tags tg ON tg.id = tt.tag_id
+        WHERE tt.task_id IN ({placeholders})
+        ORDER BY tg.name ASC
+    """, ids)
+    for row in cursor.fetchall():
+        by_id[row["task_id"]]["tags"].append({"id": row["id"], "name": row["name"]})
+
+
+def iter_export_chunks(
+    get_connection: Callable[[], Any],
+    close: Callable[[Any], None],
+    execute: Callable[[Any, str, tuple], Any],
+    conditions: List[str],
+    params: List[Any],
+    limit: Optional[int] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield exported tasks, newest first, in chunks with relationships and tags.
+
+    Args:
+        get_connection: Function returning a database connection
+        close: Function releasing a connection
+        execute: Function(cursor, query, params) used to run queries
+        conditions: WHERE conditions from export_filters()
+        params: Parameters for conditions
+        limit: Optional maximum number of tasks; None exports everything
+        chunk_size: Tasks read per chunk
+
+    Yields:
+        Lists of at most chunk_size task dictionaries
+    """
+    after = None
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = chunk_size if remaining is None else min(chunk_size, remaining)
+        chunk_conditions = list(conditions)
+        chunk_params = list(params)
+        if after is not None:
+            condition, after_params = keyset_condition(_EXPORT_ORDER, after)
+            chunk_conditions.append(condition)
+            chunk_params.extend(after_params)
+        where_clause = "WHERE " + " AND ".join(chunk_conditions) if chunk_conditions else ""
+
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            execute(
+                cursor,
+                f"SELECT t.* FROM tasks t {where_clause} {order_clause(_EXPORT_ORDER)} LIMIT ?",
+                tuple(chunk_params + [size])
+            )
+            tasks = [dict(row) for row in cursor.fetchall()]
+            attach_relationships_and_tags(cursor, tasks, execute)
+        finally:
+            close(conn)
+
+        if tasks:
+            yield tasks
+        if len(tasks) < size:
+            return
+        after = created_id_key(tasks[-1])
+        if remaining is not None:
+            remaining -= len(tasks)
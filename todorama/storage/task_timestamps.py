@@ -0,0 +1,78 @@
+"""
+One text format for tasks.updated_at on SQLite.
+
+SQLite stores timestamps as text, and the stale-task predicate compares
+updated_at with datetime('now', '-N hours') as text so that it can range-scan
+idx_tasks_status_updated. That comparison is only correct when every value
+has the 'YYYY-MM-DD HH:MM:SS' form CURRENT_TIMESTAMP writes. Values written
+with isoformat() ('T' separator, fractional seconds, UTC offset) sort after
+every same-day value of that form.
+
+Triggers on tasks rewrite any other parseable value to datetime(value) inside
+the writing transaction, so create_task(), update paths, imports and manual
+SQL all leave updated_at in the canonical form. Rows written before the
+triggers existed are rewritten when they are installed.
+
+PostgreSQL stores updated_at as TIMESTAMP and needs none of this.
+"""
+from typing import Any, Callable, Optional
+
+_NEEDS_NORMALIZING = (
+    "NEW.updated_at IS NOT datetime(NEW.updated_at) AND datetime(NEW.updated_at) IS NOT NULL"
+)
+
+_SQLITE_TRIGGERS = {
+    "tasks_updated_at_after_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_updated_at_after_insert AFTER INSERT ON tasks
+        WHEN {_NEEDS_NORMALIZING}
+        BEGIN
+            UPDATE tasks SET updated_at = datetime(NEW.updated_at) WHERE id = NEW.id;
+        END
+    """,
+    "tasks_updated_at_after_update": f"""
+        CREATE TRIGGER IF NOT EXISTS tasks_updated_at_after_update AFTER UPDATE OF updated_at ON tasks
+        WHEN {_NEEDS_NORMALIZING}
+        BEGIN
+            UPDATE tasks SET updated_at = datetime(NEW.updated_at) WHERE id = NEW.id;
+        END
+    """,
+}
+
+
+def _run(cursor: Any, query: str, params: tuple = (), execute: Optional[Callable] = None) -> None:
+    if execute is not None:
+        execute(cursor, query, params)
+    elif params:
+        cursor.execute(query, params)
+    else:
+        cursor.execute(query)
+
+
+def _existing_triggers(cursor: Any, execute: Optional[Callable]) -> set:
+    _run(cursor, "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'tasks_updated_at_%'", execute=execute)
+    return {row["name"] for row in cursor.fetchall()}
+
+
+def install_timestamp_normalization(cursor: Any, db_type: str, execute: Optional[Callable] = None) -> None:
+    """
+    Create the triggers that keep tasks.updated_at in CURRENT_TIMESTAMP form (SQLite only).
+
+    Existing rows are rewritten whenever a trigger was missing.
+
+    Args:
+        cursor: Database cursor inside the schema transaction
+        db_type: 'sqlite' or 'postgresql'
+        execute: Optional function(cursor, query, params) used to run queries
+    """
+    if db_type != "sqlite":
+        return
+    existing = _existing_triggers(cursor, execute)
+    for name, ddl in _SQLITE_TRIGGERS.items():
+        if name not in existing:
+            _run(cursor, ddl, execute=execute)
+    if not set(_SQLITE_TRIGGERS) <= existing:
+        # Values written while a trigger was missing may have any format
+        _run(cursor, """
+            UPDATE tasks SET updated_at = datetime(updated_at)
+            WHERE updated_at IS NOT datetime(updated_at) AND datetime(updated_at) IS NOT NULL
+        """, execute=execute)
@@ -0,0 +1,72 @@
+"""
+Cached webhook subscription index.
+
+get_webhooks_for_event() ran a query and decoded every webhook's events JSON
+on each task event, so a burst of events re-read the same few rows thousands
+of times. WebhookSubscriptionIndex loads every enabled webhook with one query
+and indexes it by event type. Lookups are then a dictionary read.
+
+The index is dropped whenever this process creates or deletes a webhook.
+Webhooks changed by another process are picked up when the TTL expires.
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+class WebhookSubscriptionIndex:
+    """Thread-safe event type -> enabled webhooks index with a TTL."""
+
+    def __init__(self, ttl: float = 30.0):
+        """
+        Initialize the index.
+
+        Args:
+            ttl: Seconds to keep the index before reloading it (0 disables caching)
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._by_event: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._loaded_at = 0.0
+
+    def invalidate(self) -> None:
+        """Drop the index so the next lookup reloads it."""
+        with self._lock:
+            self._by_event = None
+
+    def get(
+        self,
+        load: Callable[[], List[Dict[str, Any]]],
+        project_id: Optional[int],
+        event_type: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Get enabled webhooks subscribed to an event.
+
+        Args:
+            load: Function returning every enabled webhook row
+            project_id: Only webhooks of this project (None for all projects)
+            event_type: Event type, e.g. 'task.created'
+
+        Returns:
+            List of webhook dictionaries (copies, safe to modify)
+        """
+        with self._lock:
+            by_event = self._by_event
+            if by_event is None or time.monotonic() - self._loaded_at >= self.ttl:
+                by_event = {}
+                for row in load():
+                    webhook = dict(row)
+                    webhook["events"] = json.loads(webhook["events"])
+                    webhook["enabled"] = bool(webhook["enabled"])
+                    for event in webhook["events"]:
+                        by_event.setdefault(event, []).append(webhook)
+                if self.ttl > 0:
+                    self._by_event = by_event
+                    self._loaded_at = time.monotonic()
+        return [
+            dict(webhook, events=list(webhook["events"]))
+            for webhook in by_event.get(event_type, ())
+            if project_id is None or webhook["project_id"] == project_id
+        ]
@@ -0,0 +1,279 @@
+"""
+Server-push task lifecycle events for long-lived MCP SSE connections.
+
+Agents used to poll list_available_tasks in a loop, so idle agents kept the
+database busy with queries that mostly returned nothing new. Every lifecycle
+transition is already recorded in change_history, so the history table
+doubles as an event log:
+
+- one poller per process reads new events with a single indexed range query
+  (change_history.id > last seen ID) while at least one client is connected,
+  and fans them out to every subscriber, however many agents are waiting;
+- the change_history ID is the SSE event ID, so a client that reconnects with
+  Last-Event-ID gets every event it missed, including events written by other
+  processes or before a restart;
+- subscribers filter by project, agent type and organization;
+- idle streams get a heartbeat so proxies keep the connection open.
+
+A subscriber that falls too far behind is disconnected instead of buffering
+without bound; it reconnects with Last-Event-ID and replays from the table.
+
+On PostgreSQL, history IDs are assigned before commit, so a lower ID can
+become visible after a higher one. The poller therefore only moves its cursor
+through IDs that are contiguous: when an ID is missing, events above it are
+held back until it commits or gap_timeout seconds pass (a rolled-back insert
+leaves a permanent gap). Events are pushed in ID order and Last-Event-ID
+resumes exactly. SQLite commits one writer at a time, so IDs become visible
+in order and nothing is held back.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Task types each agent type can claim (see get_available_tasks_for_agent)
+AGENT_TASK_TYPES = {
+    "breakdown": frozenset({"abstract", "epic"}),
+    "implementation": frozenset({"concrete"}),
+}
+
+_stream: Optional["TaskEventStream"] = None
+_stream_lock = threading.Lock()
+
+
+def event_matches(
+    event: Dict[str, Any],
+    project_id: Optional[int] = None,
+    agent_type: Optional[str] = None,
+    organization_id: Optional[int] = None
+) -> bool:
+    """Check whether an event passes a subscriber's filters (None matches everything)."""
+    if project_id is not None and event.get("project_id") != project_id:
+        return False
+    if organization_id is not None and event.get("organization_id") != organization_id:
+        return False
+    if agent_type is not None and event.get("task_type") not in AGENT_TASK_TYPES.get(agent_type, ()):
+        return False
+    return True
+
+
+class _Subscription:
+    """Queue of events for one connected client."""
+
+    def __init__(self, start_id: int):
+        self.start_id = start_id
+        self.queue: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue()
+
+
+class TaskEventStream:
+    """Polls change_history for task lifecycle events and fans them out to subscribers."""
+
+    def __init__(
+        self,
+        get_db: Callable[[], Any],
+        run: Optional[Callable[..., Awaitable[Any]]] = None,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 15.0,
+        batch_size: int = 500,
+        max_pending: int = 1000,
+        gap_timeout: float = 0.0
+    ):
+        """
+        Initialize the event stream.
+
+        Args:
+            get_db: Function returning the TodoDatabase to read events from
+            run: Coroutine function run(func, *args) executing a blocking call
+                 (default: the process-wide database executor)
+            poll_interval: Seconds between polls while clients are connected
+            heartbeat_interval: Seconds of silence before a heartbeat is sent
+            batch_size: Events read per query
+            max_pending: Undelivered events after which a slow client is disconnected
+            gap_timeout: Seconds to hold events back behind a missing history ID
+                         (0 pushes events as soon as they are visible)
+        """
+        self.get_db = get_db
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self._run_func = run
+        self._subscriptions: Set[_Subscription] = set()
+        self.gap_timeout = gap_timeout
+        self._poller: Optional[asyncio.Task] = None
+        self._last_id = 0
+        self._gap_id = 0
+        self._gap_since = 0.0
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._run_func is None:
+            from todorama.db_executor import get_db_executor
+            return await get_db_executor().run(func, *args)
+        return await self._run_func(func, *args)
+
+    def _polling_on(self, loop: asyncio.AbstractEventLoop) -> bool:
+        poller = self._poller
+        return poller is not None and not poller.done() and poller.get_loop() is loop
+
+    async def _subscribe(self) -> _Subscription:
+        loop = asyncio.get_running_loop()
+        if not self._polling_on(loop):
+            latest = await self._run(self.get_db().get_latest_task_event_id)
+            if not self._polling_on(loop):
+                self._subscriptions = set()
+                self._last_id = latest
+                self._poller = loop.create_task(self._poll())
+        subscription = _Subscription(self._last_id)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: _Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def _read_events(self) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """
+        Read the next events the cursor may move through.
+
+        Returns:
+            (events, new cursor, whether more events may be waiting)
+        """
+        db = self.get_db()
+        if self.gap_timeout <= 0:
+            events = db.get_task_events(self._last_id, self.batch_size)
+            return events, events[-1]["id"] if events else self._last_id, len(events) == self.batch_size
+
+        history_ids = db.get_change_history_ids(self._last_id, self.batch_size)
+        through = self._contiguous_through(history_ids)
+        more = len(history_ids) == self.batch_size and through == history_ids[-1]
+        events = db.get_task_events(self._last_id, self.batch_size)
+        if events and events[-1]["id"] < through and len(events) == self.batch_size:
+            # More events below the contiguous range than fit in one batch
+            return events, events[-1]["id"], True
+        return [event for event in events if event["id"] <= through], through, more
+
+    def _contiguous_through(self, history_ids: List[int]) -> int:
+        """Highest history ID the cursor can reach without skipping a possibly uncommitted one."""
+        through = self._last_id
+        for history_id in history_ids:
+            if history_id != through + 1:
+                # through + 1 may belong to a transaction that has not committed yet
+                now = time.monotonic()
+                if self._gap_id != through + 1:
+                    self._gap_id, self._gap_since = through + 1, now
+                if now - self._gap_since < self.gap_timeout:
+                    break
+                logger.debug(f"Skipping change_history IDs {through + 1}-{history_id - 1} after {self.gap_timeout}s")
+            through = history_id
+        return through
+
+    async def _poll(self) -> None:
+        while self._subscriptions:
+            more = False
+            try:
+                events, last_id, more = await self._run(self._read_events)
+            except Exception as e:
+                logger.error(f"Error polling task events: {e}", exc_info=True)
+                events, last_id = [], self._last_id
+            for event in events:
+                self._publish(event)
+            self._last_id = last_id
+            if not more:
+                await asyncio.sleep(self.poll_interval)
+
+    def _publish(self, event: Dict[str, Any]) -> None:
+        for subscription in list(self._subscriptions):
+            if subscription.queue.qsize() >= self.max_pending:
+                logger.warning("Disconnecting task event subscriber that fell behind")
+                self._unsubscribe(subscription)
+                subscription.queue.put_nowait(None)
+            else:
+                subscription.queue.put_nowait(event)
+
+    async def events(
+        self,
+        last_event_id: Optional[int] = None,
+        project_id: Optional[int] = None,
+        agent_type: Optional[str] = None,
+        organization_id: Optional[int] = None
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """
+        Stream matching events until the stream is closed or falls behind.
+
+        Args:
+            last_event_id: Resume after this event ID (None starts with new events)
+            project_id: Only events for this project
+            agent_type: Only events for task types this agent type can claim
+            organization_id: Only events for this organization
+
+        Yields:
+            Event dictionaries from TodoDatabase.get_task_events(), or None
+            after heartbeat_interval seconds without an event
+        """
+        subscription = await self._subscribe()
+        try:
+            sent = max(subscription.start_id, last_event_id or 0)
+            if last_event_id is not None and last_event_id < sent:
+                # Replay what the client missed; newer events are already queued
+                after = last_event_id
+                while after < subscription.start_id:
+                    page = await self._run(self.get_db().get_task_events, after, self.batch_size)
+                    for event in page:
+                        if event["id"] > subscription.start_id:
+                            break
+                        if event_matches(event, project_id, agent_type, organization_id):
+                            yield event
+                    if len(page) < self.batch_size:
+                        break
+                    after = page[-1]["id"]
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return
+                if event["id"] > sent and event_matches(event, project_id, agent_type, organization_id):
+                    sent = event["id"]
+                    yield event
+        finally:
+            self._unsubscribe(subscription)
+
+    def close(self) -> None:
+        """End every open stream and stop polling."""
+        subscriptions, self._subscriptions = self._subscriptions, set()
+        for subscription in subscriptions:
+            subscription.queue.put_nowait(None)
+        if self._poller is not None and not self._poller.done():
+            self._poller.cancel()
+        self._poller = None
+
+
+def get_task_event_stream() -> TaskEventStream:
+    """Get the process-wide task event stream, creating it from settings on first use."""
+    global _stream
+    if _stream is None:
+        with _stream_lock:
+            if _stream is None:
+                from todorama.config import get_settings
+                from todorama.dependencies.services import get_db
+                settings = get_settings()
+                _stream = TaskEventStream(
+                    get_db,
+                    poll_interval=settings.task_events_poll_interval,
+                    heartbeat_interval=settings.task_events_heartbeat_interval,
+                    gap_timeout=0.0 if get_db().db_type == "sqlite" else settings.task_events_gap_timeout
+                )
+    return _stream
+
+
+def shutdown_task_event_stream() -> None:
+    """Close the process-wide stream; the next get_task_event_stream() creates a new one."""
+    global _stream
+    with _stream_lock:
+        stream, _stream = _stream, None
+    if stream is not None:
+        stream.close()
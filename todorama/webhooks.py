@@ -2,11 +2,32 @@
 Webhook notification system for task events.
 
 Handles sending webhook notifications with retry logic and error handling.
+
+notify_webhooks() only enqueues. Deliveries are made by one WebhookDispatcher
+per process, which runs its own event loop on a background thread so callers
+on executor threads (where there is no running loop) are never blocked:
+
+- a bounded in-memory queue; when it is full, deliveries spill to the
+  webhook_outbox table instead of growing without bound;
+- one shared keep-alive HTTP client instead of a new client (and TLS
+  handshake) per attempt;
+- a global limit on deliveries in flight, and a per-endpoint limit so one
+  slow receiver cannot take every slot;
+- a per-endpoint circuit breaker: after consecutive failures, deliveries to
+  that endpoint are held back for a cooldown instead of burning retries;
+- delivery log rows are written in batches with one executemany;
+- on shutdown, the queue is drained for a grace period and whatever is left
+  (queued, held back or waiting for a retry) is saved to webhook_outbox and
+  replayed on the next start.
+
+Delivery is at least once: a delivery cut off by shutdown is sent again.
 """
 import json
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+import threading
+from collections import deque
+from typing import Dict, Any, Optional, List, Callable, Deque
 from datetime import datetime
 import hmac
 import hashlib
@@ -15,6 +36,26 @@ from todorama.adapters import HTTPClientAdapterFactory, TimeoutException, Reques
 
 logger = logging.getLogger(__name__)
 
+_dispatcher: Optional["WebhookDispatcher"] = None
+_dispatcher_lock = threading.Lock()
+
+
+def _webhook_headers(event_type: str, payload_json: str, secret: Optional[str]) -> Dict[str, str]:
+    """Build delivery headers, signing the payload with HMAC-SHA256 if a secret is set."""
+    headers = {
+        "Content-Type": "application/json",
+        "X-Webhook-Event": event_type,
+        "X-Webhook-Timestamp": datetime.utcnow().isoformat()
+    }
+    if secret:
+        signature = hmac.new(
+            secret.encode("utf-8"),
+            payload_json.encode("utf-8"),
+            hashlib.sha256
+        ).hexdigest()
+        headers["X-Webhook-Signature"] = f"sha256={signature}"
+    return headers
+
 
 async def send_webhook_notification(
     db,
@@ -44,22 +85,7 @@ async def send_webhook_notification(
     
     # Prepare payload
     payload_json = json.dumps(payload)
-    
-    # Add signature if secret is provided
-    headers = {
-        "Content-Type": "application/json",
-        "X-Webhook-Event": event_type,
-        "X-Webhook-Timestamp": datetime.utcnow().isoformat()
-    }
-    
-    if secret:
-        # Create HMAC signature
-        signature = hmac.new(
-            secret.encode("utf-8"),
-            payload_json.encode("utf-8"),
-            hashlib.sha256
-        ).hexdigest()
-        headers["X-Webhook-Signature"] = f"sha256={signature}"
+    headers = _webhook_headers(event_type, payload_json, secret)
     
     # Try sending with retries
     last_error = None
@@ -137,14 +163,386 @@ async def send_webhook_notification(
     return False
 
 
-async def notify_webhooks(
+class _Delivery:
+    """One pending webhook delivery."""
+
+    __slots__ = ("db", "webhook", "event_type", "payload_json", "attempt")
+
+    def __init__(self, db, webhook: Dict[str, Any], event_type: str, payload_json: str, attempt: int = 1):
+        self.db = db
+        self.webhook = webhook
+        self.event_type = event_type
+        self.payload_json = payload_json
+        self.attempt = attempt
+
+    def outbox_row(self) -> Dict[str, Any]:
+        return {
+            "webhook_id": self.webhook["id"],
+            "event_type": self.event_type,
+            "payload": self.payload_json,
+            "attempt_number": self.attempt
+        }
+
+
+class _Endpoint:
+    """Concurrency and circuit breaker state for one webhook URL."""
+
+    __slots__ = ("in_flight", "backlog", "failures", "open_until")
+
+    def __init__(self):
+        self.in_flight = 0
+        self.backlog: Deque[_Delivery] = deque()
+        self.failures = 0
+        self.open_until = 0.0
+
+
+class WebhookDispatcher:
+    """Delivers webhooks from a bounded queue on a background event loop."""
+
+    def __init__(
+        self,
+        db,
+        client_factory: Optional[Callable[[], Any]] = None,
+        queue_size: int = 10000,
+        max_concurrency: int = 64,
+        endpoint_concurrency: int = 4,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+        log_batch_size: int = 200,
+        log_flush_interval: float = 1.0,
+        retry_delay: float = 1.0
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            db: Database whose webhook_outbox is replayed on start
+            client_factory: Function returning the shared async HTTP client
+                            (default: HTTPClientAdapterFactory.create_async_client)
+            queue_size: Deliveries held in memory before spilling to webhook_outbox
+            max_concurrency: Deliveries in flight at once
+            endpoint_concurrency: Deliveries in flight per endpoint URL
+            breaker_threshold: Consecutive failures that open an endpoint's circuit
+            breaker_cooldown: Seconds an open circuit holds deliveries back
+            log_batch_size: Delivery log rows per insert
+            log_flush_interval: Seconds between delivery log flushes
+            retry_delay: Delay before the first retry, doubled per attempt (capped at 60s)
+        """
+        self.db = db
+        self.client_factory = client_factory or (lambda: HTTPClientAdapterFactory.create_async_client())
+        self.queue_size = queue_size
+        self.max_concurrency = max_concurrency
+        self.endpoint_concurrency = endpoint_concurrency
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.log_batch_size = log_batch_size
+        self.log_flush_interval = log_flush_interval
+        self.retry_delay = retry_delay
+
+        self._lock = threading.Lock()
+        self._queue: Deque[_Delivery] = deque()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop_deadline: Optional[float] = None
+        self._accepting = False
+        self._closing = False
+
+        # Owned by the dispatcher loop
+        self._client = None
+        self._endpoints: Dict[str, _Endpoint] = {}
+        self._in_flight: Dict[asyncio.Task, _Delivery] = {}
+        self._scheduled: Dict[asyncio.TimerHandle, _Delivery] = {}
+        self._log_rows: List[Any] = []
+
+    def start(self) -> None:
+        """Start the delivery thread and replay deliveries saved at the last shutdown."""
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,), name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self, grace_period: float = 5.0) -> None:
+        """
+        Stop delivering, saving undelivered webhooks to webhook_outbox.
+
+        Args:
+            grace_period: Seconds to keep delivering queued webhooks before saving the rest
+        """
+        thread = self._thread
+        if thread is None:
+            return
+        if thread.is_alive():
+            self._loop.call_soon_threadsafe(self._request_stop, grace_period)
+        thread.join()
+        self._thread = None
+
+    def enqueue(self, db, webhook: Dict[str, Any], event_type: str, payload: Dict[str, Any]) -> None:
+        """
+        Queue a delivery without blocking on it. Safe to call from any thread.
+
+        Args:
+            db: Database to log the delivery to
+            webhook: Webhook configuration dictionary
+            event_type: Type of event (e.g., 'task.created')
+            payload: Payload to send
+        """
+        delivery = _Delivery(db, webhook, event_type, json.dumps(payload))
+        with self._lock:
+            if self._accepting and len(self._queue) < self.queue_size:
+                self._queue.append(delivery)
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+                return
+        logger.warning(f"Webhook queue full or stopped, saving {event_type} delivery to the outbox")
+        db.save_webhook_outbox([delivery.outbox_row()])
+
+    def _run(self, ready: threading.Event) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self._main(ready))
+        except Exception as e:
+            logger.error(f"Webhook dispatcher stopped: {e}", exc_info=True)
+        finally:
+            ready.set()
+            loop.close()
+
+    async def _main(self, ready: threading.Event) -> None:
+        self._wakeup = asyncio.Event()
+        self._client = self.client_factory()
+        self._closing = False
+        self._stop_deadline = None
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            self._accepting = True
+        await self._restore_outbox()
+        ready.set()
+        flusher = asyncio.ensure_future(self._flush_periodically())
+        try:
+            while True:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+                if self._stop_deadline is not None and (
+                    self._loop.time() >= self._stop_deadline or self._idle()
+                ):
+                    break
+                self._pump()
+        finally:
+            flusher.cancel()
+            await self._shutdown()
+
+    def _request_stop(self, grace_period: float) -> None:
+        with self._lock:
+            self._accepting = False
+        self._stop_deadline = self._loop.time() + grace_period
+        self._loop.call_later(grace_period, self._wakeup.set)
+        self._wakeup.set()
+
+    def _idle(self) -> bool:
+        return not self._queue and not self._in_flight and not any(e.backlog for e in self._endpoints.values())
+
+    async def _restore_outbox(self) -> None:
+        try:
+            rows = await self._loop.run_in_executor(None, self.db.take_webhook_outbox)
+        except Exception as e:
+            logger.error(f"Error loading webhook outbox: {e}", exc_info=True)
+            return
+        webhooks: Dict[int, Optional[Dict[str, Any]]] = {}
+        restored = 0
+        for row in rows:
+            webhook_id = row["webhook_id"]
+            if webhook_id not in webhooks:
+                webhooks[webhook_id] = await self._loop.run_in_executor(None, self.db.get_webhook, webhook_id)
+            webhook = webhooks[webhook_id]
+            if webhook is None or not webhook.get("enabled", True):
+                continue
+            with self._lock:
+                self._queue.append(_Delivery(
+                    self.db, webhook, row["event_type"], row["payload"], row["attempt_number"]
+                ))
+            restored += 1
+        if restored:
+            logger.info(f"Restored {restored} webhook deliveries from the outbox")
+            self._wakeup.set()
+
+    def _pump(self) -> None:
+        """Start queued deliveries while there is capacity."""
+        while len(self._in_flight) < self.max_concurrency:
+            with self._lock:
+                if not self._queue:
+                    return
+                delivery = self._queue.popleft()
+            self._dispatch(delivery)
+
+    def _dispatch(self, delivery: _Delivery) -> None:
+        endpoint = self._endpoints.setdefault(delivery.webhook["url"], _Endpoint())
+        now = self._loop.time()
+        if endpoint.open_until > now:
+            # Circuit open: hold the delivery back without spending an attempt
+            self._schedule(delivery, endpoint.open_until - now)
+        elif endpoint.in_flight >= self.endpoint_concurrency:
+            endpoint.backlog.append(delivery)
+        else:
+            self._start(delivery, endpoint)
+
+    def _start(self, delivery: _Delivery, endpoint: _Endpoint) -> None:
+        endpoint.in_flight += 1
+        task = self._loop.create_task(self._deliver(delivery, endpoint))
+        self._in_flight[task] = delivery
+        task.add_done_callback(lambda t: self._finished(t, endpoint))
+
+    def _finished(self, task: asyncio.Task, endpoint: _Endpoint) -> None:
+        self._in_flight.pop(task, None)
+        endpoint.in_flight -= 1
+        if self._closing:
+            return
+        if endpoint.backlog:
+            if endpoint.open_until > self._loop.time():
+                held = list(endpoint.backlog)
+                endpoint.backlog.clear()
+                for delivery in held:
+                    self._dispatch(delivery)
+            else:
+                # Takes over the slot this delivery just freed
+                self._start(endpoint.backlog.popleft(), endpoint)
+        self._wakeup.set()
+
+    def _schedule(self, delivery: _Delivery, delay: float) -> None:
+        def fire():
+            self._scheduled.pop(handle, None)
+            with self._lock:
+                self._queue.append(delivery)
+            self._wakeup.set()
+
+        handle = self._loop.call_later(delay, fire)
+        self._scheduled[handle] = delivery
+
+    async def _deliver(self, delivery: _Delivery, endpoint: _Endpoint) -> None:
+        webhook = delivery.webhook
+        webhook_id = webhook["id"]
+        retry_count = webhook.get("retry_count", 3)
+        headers = _webhook_headers(delivery.event_type, delivery.payload_json, webhook.get("secret"))
+        response_code = None
+        try:
+            response = await self._client.post(
+                webhook["url"],
+                content=delivery.payload_json,
+                headers=headers,
+                timeout=webhook.get("timeout_seconds", 10)
+            )
+            response_code = response.status_code
+            response_body = response.text[:1000] if response.text else None
+            success = response_code < 400
+            error = None if success else f"HTTP {response_code}"
+        except TimeoutException:
+            success, response_body, error = False, "Request timeout", "Timeout"
+        except RequestError as e:
+            success, response_body, error = False, str(e)[:1000], str(e)
+        except Exception as e:
+            logger.error(f"Unexpected error sending webhook {webhook_id}: {str(e)}", exc_info=True)
+            success, response_body, error = False, str(e)[:1000], str(e)
+
+        self._log(delivery, "success" if success else "failed", response_code, response_body)
+        if success:
+            endpoint.failures = 0
+            logger.info(f"Webhook {webhook_id} delivered successfully (attempt {delivery.attempt})")
+            return
+
+        endpoint.failures += 1
+        if endpoint.failures >= self.breaker_threshold:
+            if endpoint.open_until <= self._loop.time():
+                logger.warning(f"Opening circuit for webhook endpoint {webhook['url']} for {self.breaker_cooldown}s")
+            endpoint.open_until = self._loop.time() + self.breaker_cooldown
+        if delivery.attempt < retry_count:
+            logger.warning(
+                f"Webhook {webhook_id} failed: {error} (attempt {delivery.attempt}/{retry_count})"
+            )
+            delay = min(self.retry_delay * 2 ** (delivery.attempt - 1), 60)
+            delivery.attempt += 1
+            self._schedule(delivery, delay)
+        else:
+            logger.error(f"Webhook {webhook_id} failed after {retry_count} attempts. Last error: {error}")
+
+    def _log(self, delivery: _Delivery, status: str, response_code: Optional[int], response_body: Optional[str]) -> None:
+        self._log_rows.append((delivery.db, {
+            "webhook_id": delivery.webhook["id"],
+            "event_type": delivery.event_type,
+            "payload": delivery.payload_json,
+            "status": status,
+            "response_code": response_code,
+            "response_body": response_body,
+            "attempt_number": delivery.attempt
+        }))
+        if len(self._log_rows) >= self.log_batch_size:
+            asyncio.ensure_future(self._flush_logs())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.log_flush_interval)
+            await self._flush_logs()
+
+    async def _flush_logs(self) -> None:
+        rows, self._log_rows = self._log_rows, []
+        if rows:
+            await self._loop.run_in_executor(None, _write_grouped, rows, "record_webhook_deliveries")
+
+    async def _shutdown(self) -> None:
+        self._closing = True
+        with self._lock:
+            self._accepting = False
+            remaining = list(self._queue)
+            self._queue.clear()
+        for task in list(self._in_flight):
+            task.cancel()
+        # Deliveries cut off mid-flight are saved and sent again on the next start
+        remaining.extend(self._in_flight.values())
+        if self._in_flight:
+            await asyncio.gather(*self._in_flight, return_exceptions=True)
+        for endpoint in self._endpoints.values():
+            remaining.extend(endpoint.backlog)
+            endpoint.backlog.clear()
+        for handle, delivery in list(self._scheduled.items()):
+            handle.cancel()
+            remaining.append(delivery)
+        self._scheduled.clear()
+        try:
+            await self._flush_logs()
+            if remaining:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, _write_grouped,
+                    [(delivery.db, delivery.outbox_row()) for delivery in remaining], "save_webhook_outbox"
+                )
+                logger.info(f"Saved {len(remaining)} undelivered webhooks to the outbox")
+        except Exception as e:
+            logger.error(f"Error saving webhook state on shutdown: {e}", exc_info=True)
+        finally:
+            await self._client.aclose()
+
+
+def _write_grouped(rows: List[Any], method: str) -> None:
+    """Write (db, row) pairs with one batched call per database."""
+    by_db: Dict[int, Any] = {}
+    for db, row in rows:
+        by_db.setdefault(id(db), (db, []))[1].append(row)
+    for db, db_rows in by_db.values():
+        try:
+            getattr(db, method)(db_rows)
+        except Exception as e:
+            logger.error(f"Error writing {len(db_rows)} webhook rows: {e}", exc_info=True)
+
+
+def notify_webhooks(
     db,
     project_id: Optional[int],
     event_type: str,
     payload: Dict[str, Any]
-):
+) -> None:
     """
     Notify all webhooks subscribed to an event.
+
+    Returns immediately; deliveries are made by the process-wide dispatcher.
     
     Args:
         db: Database instance
@@ -152,15 +550,48 @@ async def notify_webhooks(
         event_type: Type of event (e.g., 'task.created', 'task.completed', 'task.status_changed')
         payload: Payload to send
     """
-    # Get webhooks subscribed to this event
     webhooks = db.get_webhooks_for_event(project_id, event_type)
-    
     if not webhooks:
         return
     
     logger.info(f"Notifying {len(webhooks)} webhook(s) for event {event_type}")
-    
-    # Send notifications concurrently (fire and forget - don't block on webhook delivery)
+    dispatcher = get_webhook_dispatcher(db)
     for webhook in webhooks:
-        # Create task for each webhook notification (fire and forget)
-        asyncio.create_task(send_webhook_notification(db, webhook, event_type, payload))
+        dispatcher.enqueue(db, webhook, event_type, payload)
+
+
+def get_webhook_dispatcher(db) -> WebhookDispatcher:
+    """
+    Get the process-wide dispatcher, creating and starting it from settings on first use.
+
+    Args:
+        db: Database whose outbox is replayed when the dispatcher starts
+    """
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                from todorama.config import get_settings
+                settings = get_settings()
+                dispatcher = WebhookDispatcher(
+                    db,
+                    queue_size=settings.webhook_queue_size,
+                    max_concurrency=settings.webhook_max_concurrency,
+                    endpoint_concurrency=settings.webhook_endpoint_concurrency,
+                    breaker_threshold=settings.webhook_breaker_threshold,
+                    breaker_cooldown=settings.webhook_breaker_cooldown,
+                    log_batch_size=settings.webhook_log_batch_size,
+                    log_flush_interval=settings.webhook_log_flush_interval
+                )
+                dispatcher.start()
+                _dispatcher = dispatcher
+    return _dispatcher
+
+
+def shutdown_webhook_dispatcher(grace_period: float = 5.0) -> None:
+    """Stop the process-wide dispatcher, saving undelivered webhooks to the outbox."""
+    global _dispatcher
+    with _dispatcher_lock:
+        dispatcher, _dispatcher = _dispatcher, None
+    if dispatcher is not None:
+        dispatcher.stop(grace_period)